@@ -9,6 +9,9 @@ from typing import Literal, Dict, Any, Optional
 from urllib.parse import urlparse
 import logging
 
+from api.brain.context.url_index import classify_url, get_url_index
+from api.utils.keyword_lexicon import Lexicon
+
 logger = logging.getLogger(__name__)
 
 # Known enterprise domains
@@ -49,6 +52,20 @@ KNOWN_LARGE_ECOMMERCE_DOMAINS = {
 # Combined set for brand maturity detection
 ALL_KNOWN_LARGE_DOMAINS = KNOWN_ENTERPRISE_DOMAINS | KNOWN_LARGE_ECOMMERCE_DOMAINS
 
+# Keyword groups for intent and maturity detection, compiled once (see api.utils.keyword_lexicon)
+BRAND_LEXICON = Lexicon({
+    "intent_pricing": ["pricing", "plan", "plans", "per month", "per user", "starter", "enterprise", "tier", "subscription"],
+    "intent_docs": ["docs", "documentation", "api reference", "developers", "developer", "api docs"],
+    "intent_enterprise": ["contact sales", "talk to sales", "request a demo", "enterprise", "sales team"],
+    "intent_lead": ["book a call", "get a quote", "free consultation", "request audit", "contact us", "schedule a call"],
+    "intent_form": ["form", "submit", "email", "phone", "name"],
+    "maturity_enterprise": ["enterprise", "compliance", "security", "soc 2", "gdpr", "iso", "developers", "api"],
+    "maturity_nav": ["developers", "docs", "security", "partners", "pricing", "enterprise", "api"],
+    "maturity_growth": ["pricing", "tier", "plan", "case studies", "customers", "testimonials", "comparison"],
+    "maturity_startup": ["work with me", "personal brand", "freelance", "consultant"],
+    "intent_blog": ["subscribe", "blog"],
+})
+
 
 @dataclass
 class PageIntent:
@@ -111,8 +128,8 @@ def detect_page_intent(page_text: str, page_map: Optional[Dict[str, Any]], url:
     Returns:
         PageIntent with detected intent and confidence
     """
-    page_text_lower = (page_text or "").lower()
-    url_lower = url.lower()
+    hits = BRAND_LEXICON.scan(page_text)
+    url_flags = classify_url(url).flags
     
     signals = {}
     intent_scores = {
@@ -125,9 +142,8 @@ def detect_page_intent(page_text: str, page_map: Optional[Dict[str, Any]], url:
     }
     
     # Pricing detection
-    pricing_keywords = ["pricing", "plan", "plans", "per month", "per user", "starter", "enterprise", "tier", "subscription"]
-    pricing_matches = sum(1 for kw in pricing_keywords if kw in page_text_lower)
-    if "/pricing" in url_lower or "pricing" in url_lower:
+    pricing_matches = hits.count("intent_pricing")
+    if "pricing" in url_flags:
         intent_scores["pricing"] += 3.0
         signals["pricing_url"] = True
     if pricing_matches > 0:
@@ -135,9 +151,8 @@ def detect_page_intent(page_text: str, page_map: Optional[Dict[str, Any]], url:
         signals["pricing_keywords"] = pricing_matches
     
     # Docs detection
-    docs_keywords = ["docs", "documentation", "api reference", "developers", "developer", "api docs"]
-    docs_matches = sum(1 for kw in docs_keywords if kw in page_text_lower)
-    if "/docs" in url_lower or "/developers" in url_lower or "/developer" in url_lower:
+    docs_matches = hits.count("intent_docs")
+    if "docs" in url_flags:
         intent_scores["docs"] += 3.0
         signals["docs_url"] = True
     if docs_matches > 0:
@@ -145,16 +160,15 @@ def detect_page_intent(page_text: str, page_map: Optional[Dict[str, Any]], url:
         signals["docs_keywords"] = docs_matches
     
     # Blog detection
-    if "/blog" in url_lower:
+    if "blog" in url_flags:
         intent_scores["blog"] += 3.0
         signals["blog_url"] = True
-    if "subscribe" in page_text_lower and "blog" in page_text_lower:
+    if "subscribe" in hits and "blog" in hits:
         intent_scores["blog"] += 2.0
         signals["blog_subscribe"] = True
     
     # Enterprise sales detection
-    enterprise_keywords = ["contact sales", "talk to sales", "request a demo", "enterprise", "sales team"]
-    enterprise_matches = sum(1 for kw in enterprise_keywords if kw in page_text_lower)
+    enterprise_matches = hits.count("intent_enterprise")
     if enterprise_matches > 0:
         intent_scores["enterprise_sales"] += min(enterprise_matches * 0.6, 2.5)
         signals["enterprise_keywords"] = enterprise_matches
@@ -168,15 +182,13 @@ def detect_page_intent(page_text: str, page_map: Optional[Dict[str, Any]], url:
             signals["sales_ctas"] = sales_cta_count
     
     # Lead generation detection
-    lead_keywords = ["book a call", "get a quote", "free consultation", "request audit", "contact us", "schedule a call"]
-    lead_matches = sum(1 for kw in lead_keywords if kw in page_text_lower)
+    lead_matches = hits.count("intent_lead")
     if lead_matches > 0:
         intent_scores["lead_generation"] += min(lead_matches * 0.5, 2.0)
         signals["lead_keywords"] = lead_matches
     
     # Check for forms (heuristic: presence of form-related keywords)
-    form_keywords = ["form", "submit", "email", "phone", "name"]
-    form_matches = sum(1 for kw in form_keywords if kw in page_text_lower)
+    form_matches = hits.count("intent_form")
     if form_matches >= 3 and lead_matches > 0:
         intent_scores["lead_generation"] += 1.0
         signals["form_indicators"] = form_matches
@@ -222,8 +234,9 @@ def detect_brand_context(
     Returns:
         BrandContext with maturity classification
     """
-    domain = normalize_domain(url)
-    page_text_lower = (page_text or "").lower()
+    url_facts = classify_url(url)
+    domain = url_facts.domain
+    hits = BRAND_LEXICON.scan(page_text)
     
     signals = {}
     enterprise_score = 0.0
@@ -231,21 +244,19 @@ def detect_brand_context(
     startup_score = 0.0
     
     # Enterprise signals (check both enterprise and large ecommerce)
-    if domain in ALL_KNOWN_LARGE_DOMAINS:
+    if url_facts.domain_tags:
         enterprise_score += 5.0
         signals["known_enterprise_domain"] = domain
-        if domain in KNOWN_LARGE_ECOMMERCE_DOMAINS:
+        if "large_ecommerce" in url_facts.domain_tags:
             signals["known_large_ecommerce"] = True
     
-    enterprise_keywords = ["enterprise", "compliance", "security", "soc 2", "gdpr", "iso", "developers", "api"]
-    enterprise_keyword_matches = sum(1 for kw in enterprise_keywords if kw in page_text_lower)
+    enterprise_keyword_matches = hits.count("maturity_enterprise")
     if enterprise_keyword_matches > 0:
         enterprise_score += min(enterprise_keyword_matches * 0.5, 2.0)
         signals["enterprise_keywords"] = enterprise_keyword_matches
     
     # Check nav items (heuristic: common enterprise nav terms)
-    nav_keywords = ["developers", "docs", "security", "partners", "pricing", "enterprise", "api"]
-    nav_matches = sum(1 for kw in nav_keywords if kw in page_text_lower)
+    nav_matches = hits.count("maturity_nav")
     if nav_matches >= 3:
         enterprise_score += 1.5
         signals["enterprise_nav_indicators"] = nav_matches
@@ -267,15 +278,13 @@ def detect_brand_context(
             signals["high_brand_density"] = True
     
     # Growth signals
-    growth_keywords = ["pricing", "tier", "plan", "case studies", "customers", "testimonials", "comparison"]
-    growth_matches = sum(1 for kw in growth_keywords if kw in page_text_lower)
+    growth_matches = hits.count("maturity_growth")
     if growth_matches >= 3:
         growth_score += min(growth_matches * 0.3, 2.0)
         signals["growth_indicators"] = growth_matches
     
     # Startup signals
-    startup_keywords = ["work with me", "personal brand", "freelance", "consultant"]
-    startup_matches = sum(1 for kw in startup_keywords if kw in page_text_lower)
+    startup_matches = hits.count("maturity_startup")
     if startup_matches > 0:
         startup_score += startup_matches * 0.5
         signals["startup_indicators"] = startup_matches
@@ -330,6 +339,19 @@ def build_context(url: str, page_text: str, page_map: Optional[Dict[str, Any]])
     Returns:
         Dictionary with brand_context, page_intent, and page_type
     """
+    import os
+    context_signals_debug = os.getenv("CONTEXT_SIGNALS_DEBUG", "true").lower() == "true"
+
+    # Same URL and content within the TTL: reuse the previous result
+    return get_url_index().cached_context(
+        url, page_text, page_map,
+        lambda: _build_context(url, page_text, page_map, context_signals_debug),
+        variant="signals" if context_signals_debug else "",
+    )
+
+
+def _build_context(url: str, page_text: str, page_map: Optional[Dict[str, Any]],
+                   context_signals_debug: bool) -> Dict[str, Any]:
     intent = detect_page_intent(page_text, page_map, url)
     brand_ctx = detect_brand_context(url, page_text, page_map, intent)
     
@@ -337,10 +359,6 @@ def build_context(url: str, page_text: str, page_map: Optional[Dict[str, Any]])
     from api.brain.context.page_type import detect_page_type
     page_type = detect_page_type(url, page_text, page_map, intent, brand_ctx)
     
-    # Check if debug signals should be included
-    import os
-    context_signals_debug = os.getenv("CONTEXT_SIGNALS_DEBUG", "true").lower() == "true"
-    
     return {
         "brand_context": {
             "brand_maturity": brand_ctx.brand_maturity,
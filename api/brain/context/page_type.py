@@ -6,11 +6,34 @@ context-aware recommendations.
 """
 from dataclasses import dataclass
 from typing import Literal, Dict, Any, Optional
-from urllib.parse import urlparse
 import logging
 
+from api.brain.context.url_index import classify_url
+from api.utils.keyword_lexicon import Lexicon
+
 logger = logging.getLogger(__name__)
 
+# Keyword groups per page type, compiled once (see api.utils.keyword_lexicon)
+PAGE_TYPE_LEXICON = Lexicon({
+    "ecommerce": ["add to cart", "buy now", "shipping", "returns", "sku", "size", "color", "quantity", "in stock", "out of stock"],
+    "checkout": ["checkout", "payment", "delivery address", "order summary", "billing", "shipping address"],
+    "saas": ["platform", "dashboard", "integrations", "api", "start free trial", "sign up", "features"],
+    "marketplace": ["listings", "sellers", "buyers", "categories", "compare offers", "multiple sellers"],
+    "local": ["book appointment", "call now", "location", "hours", "clinic", "directions", "whatsapp", "visit us", "our location"],
+    "leadgen": ["book a call", "get a quote", "free consultation", "request audit", "contact form", "schedule"],
+    "course": ["curriculum", "lessons", "syllabus", "enroll", "certificate", "instructor", "course", "module"],
+    "app": ["app store", "google play", "download the app", "get the app", "mobile app"],
+    "personal": ["work with me", "consultant", "strategist", "advisor", "coach", "expert"],
+    "b2b": ["solutions", "projects", "clients", "industries", "services", "team", "portfolio"],
+    "b2b_nav": ["projects", "services", "contact", "about", "case studies"],
+    "enterprise": ["compliance", "security", "soc 2", "contact sales", "rfp", "enterprise"],
+    "personal_ctas": ["work with me", "book a call", "contact", "let's talk"],
+    "enterprise_nav": ["security", "enterprise", "partners", "developers"],
+    "ecommerce_signals": ["add to cart", "buy now", "checkout", "shopping cart"],
+    "instant_purchase": ["add to cart", "buy now", "purchase", "checkout"],
+    "misc": ["browse", "products", "create account", "sign up", "calendly", "schedule", "subscribe"],
+})
+
 
 @dataclass
 class PageType:
@@ -57,8 +80,9 @@ def detect_page_type(
     Returns:
         PageType with detected type and confidence
     """
-    url_lower = url.lower()
-    page_text_lower = (page_text or "").lower()
+    url_facts = classify_url(url)
+    url_flags = url_facts.flags
+    hits = PAGE_TYPE_LEXICON.scan(page_text)
     
     signals = {}
     type_scores = {
@@ -80,9 +104,8 @@ def detect_page_type(
     }
     
     # Ecommerce Product
-    ecommerce_keywords = ["add to cart", "buy now", "shipping", "returns", "sku", "size", "color", "quantity", "in stock", "out of stock"]
-    ecommerce_matches = sum(1 for kw in ecommerce_keywords if kw in page_text_lower)
-    if "/product" in url_lower or "/products/" in url_lower:
+    ecommerce_matches = hits.count("ecommerce")
+    if "product" in url_flags:
         type_scores["ecommerce_product"] += 3.0
         signals["ecommerce_product_url"] = True
     if ecommerce_matches > 0:
@@ -90,16 +113,15 @@ def detect_page_type(
         signals["ecommerce_keywords"] = ecommerce_matches
     
     # Ecommerce Collection
-    if "/collection" in url_lower or "/collections/" in url_lower or "/category" in url_lower:
+    if "collection" in url_flags:
         type_scores["ecommerce_collection"] += 3.0
         signals["collection_url"] = True
-    if "browse" in page_text_lower and "products" in page_text_lower:
+    if "browse" in hits and "products" in hits:
         type_scores["ecommerce_collection"] += 1.0
     
     # Ecommerce Checkout
-    checkout_keywords = ["checkout", "payment", "delivery address", "order summary", "billing", "shipping address"]
-    checkout_matches = sum(1 for kw in checkout_keywords if kw in page_text_lower)
-    if "/cart" in url_lower or "/checkout" in url_lower:
+    checkout_matches = hits.count("checkout")
+    if "checkout" in url_flags:
         type_scores["ecommerce_checkout"] += 4.0
         signals["checkout_url"] = True
     if checkout_matches > 0:
@@ -107,9 +129,8 @@ def detect_page_type(
         signals["checkout_keywords"] = checkout_matches
     
     # SaaS Home
-    saas_keywords = ["platform", "dashboard", "integrations", "api", "start free trial", "sign up", "features"]
-    saas_matches = sum(1 for kw in saas_keywords if kw in page_text_lower)
-    if saas_matches >= 3 and "/pricing" not in url_lower and "/signup" not in url_lower:
+    saas_matches = hits.count("saas")
+    if saas_matches >= 3 and "pricing_path" not in url_flags and "signup_path" not in url_flags:
         type_scores["saas_home"] += min(saas_matches * 0.4, 2.5)
         signals["saas_keywords"] = saas_matches
     
@@ -117,35 +138,32 @@ def detect_page_type(
     if intent and intent.intent == "pricing":
         type_scores["saas_pricing"] += 3.0
         signals["pricing_intent"] = True
-    if "/pricing" in url_lower and saas_matches > 0:
+    if "pricing_path" in url_flags and saas_matches > 0:
         type_scores["saas_pricing"] += 2.0
         signals["saas_pricing_url"] = True
     
     # SaaS Signup
-    if "/signup" in url_lower or "/sign-up" in url_lower or "/register" in url_lower:
+    if "signup" in url_flags:
         type_scores["saas_signup"] += 3.0
         signals["signup_url"] = True
-    if "create account" in page_text_lower or "sign up" in page_text_lower:
+    if "create account" in hits or "sign up" in hits:
         type_scores["saas_signup"] += 1.5
     
     # Marketplace
-    marketplace_keywords = ["listings", "sellers", "buyers", "categories", "compare offers", "multiple sellers"]
-    marketplace_matches = sum(1 for kw in marketplace_keywords if kw in page_text_lower)
+    marketplace_matches = hits.count("marketplace")
     if marketplace_matches >= 2:
         type_scores["marketplace"] += min(marketplace_matches * 0.5, 2.5)
         signals["marketplace_keywords"] = marketplace_matches
     
     # Local Service
-    local_keywords = ["book appointment", "call now", "location", "hours", "clinic", "directions", "whatsapp", "visit us", "our location"]
-    local_matches = sum(1 for kw in local_keywords if kw in page_text_lower)
+    local_matches = hits.count("local")
     if local_matches >= 2:
         type_scores["local_service"] += min(local_matches * 0.5, 2.5)
         signals["local_keywords"] = local_matches
     
     # Leadgen Landing
-    leadgen_keywords = ["book a call", "get a quote", "free consultation", "request audit", "contact form", "schedule"]
-    leadgen_matches = sum(1 for kw in leadgen_keywords if kw in page_text_lower)
-    calendly_hints = "calendly" in page_text_lower or "schedule" in page_text_lower
+    leadgen_matches = hits.count("leadgen")
+    calendly_hints = "calendly" in hits or "schedule" in hits
     if leadgen_matches >= 2 or (leadgen_matches > 0 and calendly_hints):
         type_scores["leadgen_landing"] += min(leadgen_matches * 0.5, 2.5)
         signals["leadgen_keywords"] = leadgen_matches
@@ -153,8 +171,7 @@ def detect_page_type(
             signals["calendly_hint"] = True
     
     # Course/Education
-    course_keywords = ["curriculum", "lessons", "syllabus", "enroll", "certificate", "instructor", "course", "module"]
-    course_matches = sum(1 for kw in course_keywords if kw in page_text_lower)
+    course_matches = hits.count("course")
     if course_matches >= 3:
         type_scores["course_or_education"] += min(course_matches * 0.4, 2.5)
         signals["course_keywords"] = course_matches
@@ -163,22 +180,19 @@ def detect_page_type(
     if intent and intent.intent == "blog":
         type_scores["content_blog"] += 3.0
         signals["blog_intent"] = True
-    if "/blog" in url_lower and "subscribe" in page_text_lower:
+    if "blog" in url_flags and "subscribe" in hits:
         type_scores["content_blog"] += 2.0
         signals["blog_subscribe"] = True
     
     # App Download
-    app_keywords = ["app store", "google play", "download the app", "get the app", "mobile app"]
-    app_matches = sum(1 for kw in app_keywords if kw in page_text_lower)
+    app_matches = hits.count("app")
     if app_matches >= 2:
         type_scores["app_download"] += min(app_matches * 0.6, 2.5)
         signals["app_keywords"] = app_matches
     
     # Personal Brand / Consultant
-    personal_keywords = ["work with me", "consultant", "strategist", "advisor", "coach", "expert"]
-    personal_matches = sum(1 for kw in personal_keywords if kw in page_text_lower)
-    personal_ctas = ["work with me", "book a call", "contact", "let's talk"]
-    personal_cta_matches = sum(1 for cta in personal_ctas if cta in page_text_lower)
+    personal_matches = hits.count("personal")
+    personal_cta_matches = hits.count("personal_ctas")
     
     # Check if person name is prominent (in H1 or title)
     person_name_prominent = False
@@ -186,7 +200,7 @@ def detect_page_type(
         headlines = page_map.get("headlines", [])
         title = page_map.get("title", "")
         # Extract potential person name from domain
-        domain = urlparse(url).netloc.lower().replace("www.", "").split(".")[0]
+        domain = url_facts.host_label
         
         # Check if person name appears in H1 or title
         for h in headlines:
@@ -199,7 +213,7 @@ def detect_page_type(
             person_name_prominent = True
     
     # No ecommerce signals (no cart, no pricing grid)
-    has_ecommerce_signals = any(kw in page_text_lower for kw in ["add to cart", "buy now", "checkout", "shopping cart"])
+    has_ecommerce_signals = hits.any("ecommerce_signals")
     
     if personal_matches >= 2 and personal_cta_matches > 0 and not has_ecommerce_signals:
         type_scores["personal_brand_consultant"] += min(personal_matches * 0.6, 3.0)
@@ -210,9 +224,7 @@ def detect_page_type(
             signals["person_name_prominent"] = True
     
     # B2B Corporate Service
-    b2b_keywords = ["solutions", "projects", "clients", "industries", "services", "team", "portfolio"]
-    b2b_matches = sum(1 for kw in b2b_keywords if kw in page_text_lower)
-    b2b_nav_keywords = ["projects", "services", "contact", "about", "case studies"]
+    b2b_matches = hits.count("b2b")
     b2b_nav_matches = 0
     
     if page_map:
@@ -220,10 +232,10 @@ def detect_page_type(
             str(page_map.get("headlines", [])),
             str(page_map.get("ctas", []))
         ]).lower()
-        b2b_nav_matches = sum(1 for kw in b2b_nav_keywords if kw in nav_text)
+        b2b_nav_matches = PAGE_TYPE_LEXICON.scan(nav_text).count("b2b_nav")
     
     # No instant purchase flow
-    has_instant_purchase = any(kw in page_text_lower for kw in ["add to cart", "buy now", "purchase", "checkout"])
+    has_instant_purchase = hits.any("instant_purchase")
     
     if b2b_matches >= 3 and b2b_nav_matches >= 2 and not has_instant_purchase:
         type_scores["b2b_corporate_service"] += min(b2b_matches * 0.5, 3.0)
@@ -232,20 +244,18 @@ def detect_page_type(
     
     # Enterprise B2B (keep existing logic, but check after personal/b2b)
     if brand_ctx and brand_ctx.brand_maturity == "enterprise":
-        enterprise_keywords = ["compliance", "security", "soc 2", "contact sales", "rfp", "enterprise"]
-        enterprise_matches = sum(1 for kw in enterprise_keywords if kw in page_text_lower)
+        enterprise_matches = hits.count("enterprise")
         if enterprise_matches >= 2:
             type_scores["enterprise_b2b"] += min(enterprise_matches * 0.5, 2.5)
             signals["enterprise_keywords"] = enterprise_matches
         
         # Check nav items
         if page_map:
-            nav_keywords = ["security", "enterprise", "partners", "developers"]
             nav_text = " ".join([
                 str(page_map.get("headlines", [])),
                 str(page_map.get("ctas", []))
             ]).lower()
-            nav_matches = sum(1 for kw in nav_keywords if kw in nav_text)
+            nav_matches = PAGE_TYPE_LEXICON.scan(nav_text).count("enterprise_nav")
             if nav_matches >= 2:
                 type_scores["enterprise_b2b"] += 1.5
                 signals["enterprise_nav"] = nav_matches
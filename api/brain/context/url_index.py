@@ -0,0 +1,272 @@
+"""
+URL classification index.
+
+Every analysis used to re-derive the same URL facts: set lookups and substring
+loops over known-domain lists (brand_context, high_trust_platforms,
+detect_channel) and a dozen `"/pricing" in url` checks spread over the intent
+and page-type detectors. This module derives them once per URL:
+
+- DomainSuffixTrie: known domains stored by reversed labels
+  (com -> amazon -> aws), so one walk over the host's labels finds every
+  registered domain it equals or, for entries added with
+  include_subdomains=True, sits under
+- UrlPatternMatcher: all URL substring rules compiled into one regex; a single
+  scan returns every flag (product, pricing, docs, ...) the URL carries
+- UrlIndex.classify(): UrlFacts for a URL, cached with a TTL per host (domain
+  facts) and per URL (path flags)
+- cached_context(): memoizes whole context results (intent, brand, page type)
+  per URL and content fingerprint, so re-analyzing an unchanged page skips
+  the heuristics entirely
+
+Config (env):
+- URL_INDEX_TTL_SECONDS: lifetime of cached facts / contexts (default: 3600)
+- URL_INDEX_MAX_ITEMS: entries per cache (default: 4096)
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Mapping, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from api.core.cache import TTLCache
+from api.core.config import get_env
+
+DEFAULT_TTL_SECONDS = 3600.0
+DEFAULT_MAX_ITEMS = 4096
+
+# URL substring rules, matched against the whole lowercased URL (as the detectors did)
+URL_PATTERNS: Dict[str, Tuple[str, ...]] = {
+    "product": ("/product",),
+    "collection": ("/collection", "/category"),
+    "checkout": ("/cart", "/checkout"),
+    "pricing_path": ("/pricing",),
+    "pricing": ("pricing",),
+    "signup": ("/signup", "/sign-up", "/register"),
+    "signup_path": ("/signup",),
+    "docs": ("/docs", "/developer"),
+    "blog": ("/blog",),
+}
+
+# Marketplace brands for channel detection (substring of the host, as detect_channel did)
+MARKETPLACE_BRANDS = ("amazon", "trendyol", "ebay", "zalando", "booking", "airbnb")
+
+
+class DomainSuffixTrie:
+    """Known domains keyed by reversed labels; lookup is one walk over the host."""
+
+    _TAGS = "\0tags"
+    _SUBTREE_TAGS = "\0subtree"
+
+    def __init__(self) -> None:
+        self._root: Dict[str, Any] = {}
+
+    def add(self, domain: str, tag: str, include_subdomains: bool = False) -> None:
+        node = self._root
+        for label in reversed(domain.lower().strip(".").split(".")):
+            node = node.setdefault(label, {})
+        key = self._SUBTREE_TAGS if include_subdomains else self._TAGS
+        node.setdefault(key, set()).add(tag)
+
+    def lookup(self, host: str) -> FrozenSet[str]:
+        """Tags of the host itself plus those of registered parents that cover subdomains."""
+        tags: set = set()
+        node = self._root
+        for label in reversed(host.lower().strip(".").split(".")):
+            node = node.get(label)
+            if node is None:
+                return frozenset(tags)
+            tags.update(node.get(self._SUBTREE_TAGS, ()))
+        tags.update(node.get(self._TAGS, ()))
+        return frozenset(tags)
+
+
+class UrlPatternMatcher:
+    """All substring rules in one regex; each match position is a zero-width lookahead."""
+
+    def __init__(self, patterns: Mapping[str, Sequence[str]]):
+        self._flags: Dict[str, set] = {}
+        for flag, needles in patterns.items():
+            for needle in needles:
+                self._flags.setdefault(needle, set()).add(flag)
+        # Longest first so a position reports the most specific needle; lookahead
+        # makes matches overlap ("/pricing" and "pricing" both hit)
+        alternation = "|".join(re.escape(n) for n in sorted(self._flags, key=len, reverse=True))
+        self._regex = re.compile(f"(?=({alternation}))")
+        # A longer needle hides shorter ones starting at the same position
+        self._implied = {
+            needle: {flag for other, flags in self._flags.items()
+                     if needle.startswith(other) for flag in flags}
+            for needle in self._flags
+        }
+
+    def match(self, text: str) -> FrozenSet[str]:
+        found: set = set()
+        for m in self._regex.finditer(text):
+            found.update(self._implied[m.group(1)])
+        return frozenset(found)
+
+
+@dataclass(frozen=True)
+class UrlFacts:
+    """Everything the detectors read from a URL (not from page content)."""
+    url: str
+    domain: str  # brand_context.normalize_domain form
+    host: str  # lowercased netloc without "www."
+    host_label: str  # first label of host (personal-brand name heuristics)
+    domain_tags: FrozenSet[str]  # "enterprise", "large_ecommerce", ...
+    high_trust: bool
+    marketplace: bool
+    flags: FrozenSet[str]  # URL_PATTERNS keys present in the URL
+
+    @property
+    def channel(self) -> str:
+        return "marketplace_product" if self.marketplace else "generic_saas"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "domain": self.domain,
+            "host": self.host,
+            "domain_tags": sorted(self.domain_tags),
+            "high_trust": self.high_trust,
+            "channel": self.channel,
+            "url_flags": sorted(self.flags),
+        }
+
+
+def _host(url: str) -> str:
+    try:
+        return urlparse(url.lower()).netloc.lower().replace("www.", "")
+    except Exception:
+        return ""
+
+
+class UrlIndex:
+    def __init__(
+        self,
+        trie: DomainSuffixTrie,
+        matcher: UrlPatternMatcher,
+        high_trust_labels: Iterable[str],
+        marketplace_brands: Iterable[str],
+        normalize_domain: Callable[[str], str],
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_items: int = DEFAULT_MAX_ITEMS,
+    ):
+        self.trie = trie
+        self.matcher = matcher
+        self.high_trust_labels = frozenset(high_trust_labels)
+        self._marketplace_re = re.compile("|".join(re.escape(b) for b in marketplace_brands))
+        self._normalize_domain = normalize_domain
+        self.domains = TTLCache(ttl, max_items)
+        self.urls = TTLCache(ttl, max_items)
+        self.contexts = TTLCache(ttl, max_items)
+
+    def _domain_facts(self, url: str) -> Tuple[str, str, str, FrozenSet[str], bool, bool]:
+        domain = self._normalize_domain(url)
+        host = _host(url)
+        key = (domain, host)
+        cached = self.domains.get(key)
+        if cached is not None:
+            return cached
+        parts = host.split(".")
+        facts = (
+            domain,
+            host,
+            parts[0],
+            self.trie.lookup(domain),
+            len(parts) >= 2 and parts[-2] in self.high_trust_labels,
+            self._marketplace_re.search(host) is not None,
+        )
+        self.domains.put(key, facts)
+        return facts
+
+    def classify(self, url: str) -> UrlFacts:
+        url = url or ""
+        facts = self.urls.get(url)
+        if facts is None:
+            domain, host, host_label, tags, high_trust, marketplace = self._domain_facts(url)
+            facts = UrlFacts(
+                url=url,
+                domain=domain,
+                host=host,
+                host_label=host_label,
+                domain_tags=tags,
+                high_trust=high_trust,
+                marketplace=marketplace,
+                flags=self.matcher.match(url.lower()),
+            )
+            self.urls.put(url, facts)
+        return facts
+
+    def cached_context(self, url: str, page_text: str, page_map: Optional[Dict[str, Any]],
+                       build: Callable[[], Dict[str, Any]], variant: str = "") -> Dict[str, Any]:
+        """Return build() for this URL + content, computing it once per TTL window."""
+        key = (url or "", content_fingerprint(page_text, page_map), variant)
+        cached = self.contexts.get(key)
+        if cached is None:
+            cached = build()
+            self.contexts.put(key, cached)
+        return copy.deepcopy(cached)
+
+    def clear(self) -> None:
+        self.domains.clear()
+        self.urls.clear()
+        self.contexts.clear()
+
+
+def content_fingerprint(page_text: str, page_map: Optional[Dict[str, Any]]) -> str:
+    digest = hashlib.blake2b((page_text or "").encode("utf-8", "replace"), digest_size=16)
+    if page_map:
+        try:
+            encoded = json.dumps(page_map, sort_keys=True, default=str)
+        except TypeError:  # keys of mixed types cannot be sorted
+            encoded = repr(page_map)
+        digest.update(encoded.encode("utf-8", "replace"))
+    return digest.hexdigest()
+
+
+_INDEX: Optional[UrlIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def build_url_index() -> UrlIndex:
+    # Imported here: brand_context itself reads the index
+    from api.brain.context.brand_context import (
+        KNOWN_ENTERPRISE_DOMAINS,
+        KNOWN_LARGE_ECOMMERCE_DOMAINS,
+        normalize_domain,
+    )
+    from api.config.high_trust_platforms import HIGH_TRUST_PLATFORMS
+
+    trie = DomainSuffixTrie()
+    for domain in KNOWN_ENTERPRISE_DOMAINS:
+        trie.add(domain, "enterprise")
+    for domain in KNOWN_LARGE_ECOMMERCE_DOMAINS:
+        trie.add(domain, "large_ecommerce")
+    return UrlIndex(
+        trie,
+        UrlPatternMatcher(URL_PATTERNS),
+        HIGH_TRUST_PLATFORMS,
+        MARKETPLACE_BRANDS,
+        normalize_domain,
+        ttl=float(get_env("URL_INDEX_TTL_SECONDS", str(DEFAULT_TTL_SECONDS))),
+        max_items=int(get_env("URL_INDEX_MAX_ITEMS", str(DEFAULT_MAX_ITEMS))),
+    )
+
+
+def get_url_index() -> UrlIndex:
+    global _INDEX
+    if _INDEX is None:
+        with _INDEX_LOCK:
+            if _INDEX is None:
+                _INDEX = build_url_index()
+    return _INDEX
+
+
+def classify_url(url: str) -> UrlFacts:
+    return get_url_index().classify(url)
@@ -8,15 +8,75 @@ Extracts psychological decision signals from:
 Focus: Decision psychology signals only, NOT design quality or creativity.
 """
 
-import re
 import logging
 from typing import Optional, Dict, Any, Literal
 from dataclasses import dataclass
 
 from api.brain.decision_signals import DecisionSignals, create_empty_signals
+from api.utils.keyword_lexicon import Lexicon
 
 logger = logging.getLogger("ad_signals")
 
+# Decision-psychology cue patterns, compiled once and matched against lowercased ad text
+AD_LEXICON = Lexicon({}, patterns={
+    "promise_high": [  # High promise signals
+        r'\d+%',  # Percentages
+        r'\$\d+',  # Dollar amounts
+        r'\d+\s*(?:more|less|faster|better)',  # Quantified improvements
+        r'(?:guarantee|guaranteed|promise|assure)',  # Strong commitment
+        r'(?:free|no cost|zero risk)',  # Risk-free promises
+    ],
+    "promise_medium": [  # Medium promise signals
+        r'(?:improve|increase|boost|enhance|better|best)',  # Improvement words
+        r'(?:save|earn|get|gain)',  # Benefit words
+        r'(?:solution|help|support)',  # Supportive language
+    ],
+    "tone_urgent": [  # Urgent signals
+        r'(?:limited time|act now|hurry|expires|ending soon|last chance)',
+        r'(?:today only|this week|don\'t miss|before it\'s too late)',
+        r'(?:only \d+ left|few remaining|almost gone)',
+    ],
+    "tone_aggressive": [  # Aggressive signals
+        r'(?:must|have to|need to|required|mandatory)',
+        r'(?:stop|quit|avoid|never|don\'t)',
+        r'(?:urgent|critical|immediate|now)',
+    ],
+    "tone_reassuring": [  # Reassuring signals
+        r'(?:trusted|safe|secure|guaranteed|proven|tested)',
+        r'(?:easy|simple|quick|fast|effortless)',
+        r'(?:free|no risk|no obligation|cancel anytime)',
+        r'(?:satisfaction|money back|refund)',
+    ],
+    "pressure_high": [  # High pressure signals
+        r'(?:now|immediately|right now|today|this instant)',
+        r'(?:limited|scarcity|running out|almost gone)',
+        r'(?:act now|don\'t wait|hurry|expires)',
+        r'(?:only \d+|few left|last chance)',
+    ],
+    "pressure_medium": [  # Medium pressure signals
+        r'(?:soon|quickly|fast|don\'t miss)',
+        r'(?:special|exclusive|one-time)',
+    ],
+    "reassurance": [  # High reassurance signals
+        r'(?:guarantee|guaranteed|promise|assure|assured)',
+        r'(?:free|no cost|no risk|no obligation)',
+        r'(?:money back|refund|satisfaction|trial)',
+        r'(?:trusted|proven|tested|verified|certified)',
+        r'(?:safe|secure|protected|insured)',
+    ],
+    "overpromise": [  # Overpromising signals
+        r'(?:instant|immediate|overnight|in minutes)',
+        r'(?:guaranteed|100%|always|never fails)',
+        r'(?:miracle|magic|secret|hidden)',
+        r'(?:#1|best|top|leading|world\'s best)',
+    ],
+    "realistic": [  # Realistic signals
+        r'(?:may|might|could|possible|potential)',
+        r'(?:typically|usually|often|generally)',
+        r'(?:results may vary|individual results)',
+    ],
+})
+
 
 @dataclass
 class AdInput:
@@ -39,26 +99,10 @@ def _analyze_promise_strength(text: str) -> Literal["low", "medium", "high"]:
     if not text:
         return "low"
     
-    text_lower = text.lower()
+    hits = AD_LEXICON.scan(text)
     
-    # High promise signals
-    high_signals = [
-        r'\d+%',  # Percentages
-        r'\$\d+',  # Dollar amounts
-        r'\d+\s*(?:more|less|faster|better)',  # Quantified improvements
-        r'(?:guarantee|guaranteed|promise|assure)',  # Strong commitment
-        r'(?:free|no cost|zero risk)',  # Risk-free promises
-    ]
-    
-    # Medium promise signals
-    medium_signals = [
-        r'(?:improve|increase|boost|enhance|better|best)',  # Improvement words
-        r'(?:save|earn|get|gain)',  # Benefit words
-        r'(?:solution|help|support)',  # Supportive language
-    ]
-    
-    high_count = sum(1 for pattern in high_signals if re.search(pattern, text_lower))
-    medium_count = sum(1 for pattern in medium_signals if re.search(pattern, text_lower))
+    high_count = hits.pattern_count("promise_high")
+    medium_count = hits.pattern_count("promise_medium")
     
     if high_count >= 2:
         return "high"
@@ -80,33 +124,11 @@ def _analyze_emotional_tone(text: str) -> Literal["calm", "urgent", "aggressive"
     if not text:
         return "calm"
     
-    text_lower = text.lower()
+    hits = AD_LEXICON.scan(text)
     
-    # Urgent signals
-    urgent_patterns = [
-        r'(?:limited time|act now|hurry|expires|ending soon|last chance)',
-        r'(?:today only|this week|don\'t miss|before it\'s too late)',
-        r'(?:only \d+ left|few remaining|almost gone)',
-    ]
-    
-    # Aggressive signals
-    aggressive_patterns = [
-        r'(?:must|have to|need to|required|mandatory)',
-        r'(?:stop|quit|avoid|never|don\'t)',
-        r'(?:urgent|critical|immediate|now)',
-    ]
-    
-    # Reassuring signals
-    reassuring_patterns = [
-        r'(?:trusted|safe|secure|guaranteed|proven|tested)',
-        r'(?:easy|simple|quick|fast|effortless)',
-        r'(?:free|no risk|no obligation|cancel anytime)',
-        r'(?:satisfaction|money back|refund)',
-    ]
-    
-    urgent_count = sum(1 for pattern in urgent_patterns if re.search(pattern, text_lower))
-    aggressive_count = sum(1 for pattern in aggressive_patterns if re.search(pattern, text_lower))
-    reassuring_count = sum(1 for pattern in reassuring_patterns if re.search(pattern, text_lower))
+    urgent_count = hits.pattern_count("tone_urgent")
+    aggressive_count = hits.pattern_count("tone_aggressive")
+    reassuring_count = hits.pattern_count("tone_reassuring")
     
     if aggressive_count >= 2:
         return "aggressive"
@@ -125,24 +147,10 @@ def _analyze_pressure_level(text: str) -> Literal["low", "medium", "high"]:
     if not text:
         return "low"
     
-    text_lower = text.lower()
+    hits = AD_LEXICON.scan(text)
     
-    # High pressure signals
-    high_pressure = [
-        r'(?:now|immediately|right now|today|this instant)',
-        r'(?:limited|scarcity|running out|almost gone)',
-        r'(?:act now|don\'t wait|hurry|expires)',
-        r'(?:only \d+|few left|last chance)',
-    ]
-    
-    # Medium pressure signals
-    medium_pressure = [
-        r'(?:soon|quickly|fast|don\'t miss)',
-        r'(?:special|exclusive|one-time)',
-    ]
-    
-    high_count = sum(1 for pattern in high_pressure if re.search(pattern, text_lower))
-    medium_count = sum(1 for pattern in medium_pressure if re.search(pattern, text_lower))
+    high_count = hits.pattern_count("pressure_high")
+    medium_count = hits.pattern_count("pressure_medium")
     
     if high_count >= 2:
         return "high"
@@ -159,18 +167,9 @@ def _analyze_reassurance_level(text: str) -> Literal["low", "medium", "high"]:
     if not text:
         return "low"
     
-    text_lower = text.lower()
-    
-    # High reassurance signals
-    reassurance_patterns = [
-        r'(?:guarantee|guaranteed|promise|assure|assured)',
-        r'(?:free|no cost|no risk|no obligation)',
-        r'(?:money back|refund|satisfaction|trial)',
-        r'(?:trusted|proven|tested|verified|certified)',
-        r'(?:safe|secure|protected|insured)',
-    ]
+    hits = AD_LEXICON.scan(text)
     
-    count = sum(1 for pattern in reassurance_patterns if re.search(pattern, text_lower))
+    count = hits.pattern_count("reassurance")
     
     if count >= 3:
         return "high"
@@ -191,25 +190,10 @@ def _analyze_expectation_gap(text: str) -> Literal["low", "medium", "high"]:
     if not text:
         return "medium"
     
-    text_lower = text.lower()
-    
-    # Overpromising signals
-    overpromise_patterns = [
-        r'(?:instant|immediate|overnight|in minutes)',
-        r'(?:guaranteed|100%|always|never fails)',
-        r'(?:miracle|magic|secret|hidden)',
-        r'(?:#1|best|top|leading|world\'s best)',
-    ]
-    
-    # Realistic signals
-    realistic_patterns = [
-        r'(?:may|might|could|possible|potential)',
-        r'(?:typically|usually|often|generally)',
-        r'(?:results may vary|individual results)',
-    ]
+    hits = AD_LEXICON.scan(text)
     
-    overpromise_count = sum(1 for pattern in overpromise_patterns if re.search(pattern, text_lower))
-    realistic_count = sum(1 for pattern in realistic_patterns if re.search(pattern, text_lower))
+    overpromise_count = hits.pattern_count("overpromise")
+    realistic_count = hits.pattern_count("realistic")
     
     if overpromise_count >= 3:
         return "high"
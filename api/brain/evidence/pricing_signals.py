@@ -12,23 +12,24 @@ Focus: Decision psychology signals only, NOT pricing strategy or design.
 
 import re
 import logging
-from typing import Optional, Dict, Any, Literal
-from bs4 import BeautifulSoup
+from typing import Optional, Dict, Any, Literal, Union
 
 from api.brain.decision_signals import DecisionSignals, create_empty_signals
+from api.utils.html_document import ParsedDocument, parse_document
 
 logger = logging.getLogger("pricing_signals")
 
 
-def _count_pricing_tiers(html: str) -> int:
+def _count_pricing_tiers(html: Union[str, ParsedDocument]) -> int:
     """
     Count number of pricing tiers/plans visible on the page.
+    Accepts raw HTML or an already parsed document.
     """
     if not html:
         return 0
     
     try:
-        soup = BeautifulSoup(html, 'html.parser')
+        doc = parse_document(html)
         
         # Common pricing tier selectors
         tier_selectors = [
@@ -41,7 +42,7 @@ def _count_pricing_tiers(html: str) -> int:
         
         tier_count = 0
         for selector in tier_selectors:
-            elements = soup.select(selector)
+            elements = doc.select(selector)
             if elements:
                 tier_count = max(tier_count, len(elements))
         
@@ -51,7 +52,7 @@ def _count_pricing_tiers(html: str) -> int:
                 r'\$\d+',
                 r'\d+\s*(?:USD|EUR|GBP|per month|per year)',
             ]
-            text = soup.get_text()
+            text = doc.text
             matches = []
             for pattern in price_patterns:
                 matches.extend(re.findall(pattern, text, re.I))
@@ -65,7 +66,9 @@ def _count_pricing_tiers(html: str) -> int:
         return 0
 
 
-def _analyze_choice_overload(html: str, text: str) -> Literal["low", "medium", "high"]:
+def _analyze_choice_overload(
+    html: Union[str, ParsedDocument], text: str, tier_count: Optional[int] = None
+) -> Literal["low", "medium", "high"]:
     """
     Analyze choice overload from pricing page.
     
@@ -73,7 +76,8 @@ def _analyze_choice_overload(html: str, text: str) -> Literal["low", "medium", "
     Medium: 3-4 tiers, moderate complexity
     Low: 1-2 tiers, simple structure
     """
-    tier_count = _count_pricing_tiers(html) if html else 0
+    if tier_count is None:
+        tier_count = _count_pricing_tiers(html) if html else 0
     
     # Also check for comparison tables, feature lists
     if text:
@@ -239,12 +243,14 @@ def _analyze_commitment_pressure(html: str, text: str) -> Literal["low", "medium
         return "medium"
 
 
-def extract_pricing_signals(html: Optional[str] = None, text: Optional[str] = None) -> DecisionSignals:
+def extract_pricing_signals(
+    html: Optional[Union[str, ParsedDocument]] = None, text: Optional[str] = None
+) -> DecisionSignals:
     """
     Extract decision signals from pricing page.
     
     Args:
-        html: HTML content of pricing page (optional)
+        html: HTML content of pricing page, raw or parsed (optional)
         text: Plain text content of pricing page (optional)
         
     Returns:
@@ -257,17 +263,21 @@ def extract_pricing_signals(html: Optional[str] = None, text: Optional[str] = No
         signals.confidence = 0.0
         return signals
     
+    # Parse once; tier counting and text extraction share the document
+    doc = parse_document(html) if html else None
+    
     # Extract text from HTML if needed
-    if html and not text:
+    if doc is not None and not text:
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            text = soup.get_text()
+            text = doc.text
         except Exception as e:
             logger.warning(f"Failed to extract text from HTML: {e}")
             text = ""
     
+    tier_count = _count_pricing_tiers(doc) if doc is not None else 0
+    
     # Analyze pricing-specific signals
-    choice_overload = _analyze_choice_overload(html or "", text or "")
+    choice_overload = _analyze_choice_overload(doc or "", text or "", tier_count=tier_count)
     transparency_level = _analyze_transparency_level(html or "", text or "")
     risk_exposure = _analyze_risk_exposure(html or "", text or "")
     commitment_pressure = _analyze_commitment_pressure(html or "", text or "")
@@ -303,7 +313,7 @@ def extract_pricing_signals(html: Optional[str] = None, text: Optional[str] = No
         source="pricing",
         confidence=confidence,
         signals={
-            "tier_count": _count_pricing_tiers(html or ""),
+            "tier_count": tier_count,
             "has_html": bool(html),
             "text_length": len(text or ""),
             "pricing_analysis": {
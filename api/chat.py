@@ -3,15 +3,13 @@ Chat API endpoint - Uses AI brain memory as system prompt
 """
 import os
 from pathlib import Path
-from dotenv import load_dotenv
-from openai import OpenAI
+from api.core.config import load_env
 from api.brain_loader import load_brain_memory
 
 # Load .env file
 project_root = Path(__file__).parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
+load_env()
 
 # Initialize OpenAI client lazily
 _client = None
@@ -47,6 +45,7 @@ def get_client():
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         # Set timeout to 300 seconds (5 minutes) for long-running requests
+        from openai import OpenAI
         _client = OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
     return _client
 
@@ -19,12 +19,13 @@ import re
 from copy import deepcopy
 from typing import List, Optional, Dict, Any, Literal, Tuple
 from pydantic import BaseModel, Field, ValidationError, validator
-from dotenv import load_dotenv
+from api.core.config import load_env
 from pathlib import Path
-from openai import OpenAI
 
+from api.json_utils import JSONParseError, parse_json_object
 from api.models.psychology_dashboard import PsychologyDashboard
 from api.psychology_engine import PsychologyAnalysisResult
+from api.utils.keyword_lexicon import Lexicon
 
 # Load environment variables
 project_root = Path(__file__).parent.parent
@@ -75,10 +76,7 @@ Return ONLY valid JSON with this structure:
   ]
 }
 """
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 # Initialize OpenAI client lazily
 _client = None
@@ -159,6 +157,7 @@ def get_client():
         
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
+        from openai import OpenAI
         _client = OpenAI(
             api_key=api_key,
             timeout=DEFAULT_OPENAI_TIMEOUT,
@@ -3143,6 +3142,81 @@ def generate_outcome_specific_recommendations(
 # MARKETPLACE DETECTION & VALIDATION
 # ====================================================
 
+# Page-classification vocabularies for the SaaS pricing / service-clinic / marketplace
+# detectors below, compiled once; patterns are matched case-insensitively.
+PAGE_CLASS_LEXICON = Lexicon({
+    "saas_pricing": [  # SaaS pricing indicators
+        "pricing", "plan", "tier", "package", "subscription",
+        "monthly", "annual", "per month", "per year",
+        "starter", "professional", "enterprise", "basic", "premium",
+        "free trial", "start free", "get started"
+    ],
+    "booking_ctas": [  # Appointment booking CTAs
+        "book appointment",
+        "schedule",
+        "reserve",
+        "book now",
+        "schedule appointment",
+        "book a visit",
+        "make appointment",
+        "رزرو نوبت",
+        "نوبت گیری",
+        "رزرو",
+        "ثبت نوبت"
+    ],
+    "service": [  # Service/clinic indicators
+        "appointment", "booking", "provider", "doctor", "physician",
+        "consultant", "specialist", "clinic", "practice", "medical",
+        "healthcare", "service", "treatment", "consultation",
+        "پزشک", "دکتر", "کلینیک", "خدمات", "درمان"
+    ],
+    "marketplace_ctas": [  # Marketplace CTAs
+        "add to cart",
+        "افزودن به سبد",
+        "buy now",
+        "خرید",
+        "افزودن به سبد خرید",
+        "add to basket",
+        "افزودن",
+        "خرید آنلاین",
+        "order now",
+        "purchase",
+        "خریداری"
+    ],
+    "product": [  # Product-specific signals
+        "review", "rating", "star", "امتیاز", "نظرات",
+        "spec", "specification", "مشخصات",
+        "warranty", "guarantee", "ضمانت",
+        "delivery", "shipping", "ارسال",
+        "return", "refund", "بازگشت"
+    ],
+    "provider": [  # Provider profile signals
+        "profile", "doctor", "physician", "provider", "specialist",
+        "credentials", "experience", "education", "board certified",
+        "پروفایل", "تجربه", "مدرک"
+    ],
+    "rating": [  # Ratings/reviews
+        "rating", "review", "star", "patient review", "testimonial",
+        "امتیاز", "نظر", "نظرات بیماران"
+    ],
+    "saas_ctas": [  # SaaS-specific CTAs
+        "start free", "free trial", "get started", "sign up", "try free"
+    ],
+}, patterns={
+    "plan_indicators": [  # Multiple plans (plan names, tiers, or pricing cards)
+        r"(?:plan|tier|package)\s*(?:1|2|3|one|two|three|i|ii|iii)",
+        r"(?:starter|basic|professional|enterprise|premium)",
+        r"\$\d+.*\$\d+",  # Multiple prices
+        r"(?:monthly|annual).*(?:monthly|annual)",  # Multiple billing options
+    ],
+    "price": [  # Price patterns
+        r'\$\d+[\d,.]*',  # $99.99
+        r'\d+[\d,.]*\s*(?:TL|TRY|USD|EUR|£|تومان|ریال)',  # 99.99 TL or تومان
+        r'(?:price|cost|fee|قیمت)[:\s]*\$?\d+',  # Price: $99
+    ],
+}, pattern_flags=re.I)
+
+
 def detect_saas_pricing_page(
     raw_text: str,
     page_structure: Optional[Dict[str, Any]] = None
@@ -3160,41 +3234,24 @@ def detect_saas_pricing_page(
     if not raw_text:
         return False, False
     
-    text_lower = raw_text.lower()
+    hits = PAGE_CLASS_LEXICON.scan(raw_text)
     
-    # SaaS pricing indicators
-    pricing_keywords = [
-        "pricing", "plan", "tier", "package", "subscription",
-        "monthly", "annual", "per month", "per year",
-        "starter", "professional", "enterprise", "basic", "premium",
-        "free trial", "start free", "get started"
-    ]
-    
-    # Check for multiple plans (look for plan names, tiers, or pricing cards)
-    plan_indicators = [
-        r"(?:plan|tier|package)\s*(?:1|2|3|one|two|three|i|ii|iii)",
-        r"(?:starter|basic|professional|enterprise|premium)",
-        r"\$\d+.*\$\d+",  # Multiple prices
-        r"(?:monthly|annual).*(?:monthly|annual)",  # Multiple billing options
-    ]
-    
-    has_pricing_keywords = any(keyword in text_lower for keyword in pricing_keywords)
-    has_multiple_plans = any(re.search(pattern, text_lower, re.I) for pattern in plan_indicators)
+    has_pricing_keywords = hits.any("saas_pricing")
+    has_multiple_plans = hits.pattern_any("plan_indicators")
     
     # Check page structure if available
     if page_structure:
         pricing_section = page_structure.get("pricing_section", "")
         if isinstance(pricing_section, str) and pricing_section:
-            pricing_lower = pricing_section.lower()
-            has_pricing_keywords = has_pricing_keywords or any(kw in pricing_lower for kw in pricing_keywords)
+            section_hits = PAGE_CLASS_LEXICON.scan(pricing_section)
+            has_pricing_keywords = has_pricing_keywords or section_hits.any("saas_pricing")
             # Count plan mentions in pricing section
-            plan_count = sum(1 for pattern in plan_indicators if re.search(pattern, pricing_lower, re.I))
+            plan_count = section_hits.pattern_count("plan_indicators")
             if plan_count >= 2:
                 has_multiple_plans = True
     
     # Also check for SaaS-specific CTAs
-    saas_ctas = ["start free", "free trial", "get started", "sign up", "try free"]
-    has_saas_cta = any(cta in text_lower for cta in saas_ctas)
+    has_saas_cta = hits.any("saas_ctas")
     
     is_saas_pricing = has_pricing_keywords and (has_saas_cta or has_multiple_plans)
     
@@ -3355,61 +3412,29 @@ def detect_service_clinic_page(
     if not raw_text:
         return False
     
-    text_lower = raw_text.lower()
-    
-    # Appointment booking CTAs
-    booking_cta_patterns = [
-        "book appointment",
-        "schedule",
-        "reserve",
-        "book now",
-        "schedule appointment",
-        "book a visit",
-        "make appointment",
-        "رزرو نوبت",
-        "نوبت گیری",
-        "رزرو",
-        "ثبت نوبت"
-    ]
-    
-    # Service/clinic indicators
-    service_indicators = [
-        "appointment", "booking", "provider", "doctor", "physician",
-        "consultant", "specialist", "clinic", "practice", "medical",
-        "healthcare", "service", "treatment", "consultation",
-        "پزشک", "دکتر", "کلینیک", "خدمات", "درمان"
-    ]
+    hits = PAGE_CLASS_LEXICON.scan(raw_text)
     
     # Check for appointment booking UI
-    has_booking_cta = any(pattern in text_lower for pattern in booking_cta_patterns)
+    has_booking_cta = hits.any("booking_ctas")
     
     # Check for provider profile signals
-    provider_signals = [
-        "profile", "doctor", "physician", "provider", "specialist",
-        "credentials", "experience", "education", "board certified",
-        "پروفایل", "تجربه", "مدرک"
-    ]
-    has_provider_profile = any(signal in text_lower for signal in provider_signals)
+    has_provider_profile = hits.any("provider")
     
     # Check for ratings/reviews
-    rating_signals = [
-        "rating", "review", "star", "patient review", "testimonial",
-        "امتیاز", "نظر", "نظرات بیماران"
-    ]
-    has_ratings = any(signal in text_lower for signal in rating_signals)
+    has_ratings = hits.any("rating")
     
     # Check for service indicators
-    has_service_indicators = any(indicator in text_lower for indicator in service_indicators)
+    has_service_indicators = hits.any("service")
     
     # Check page structure if available
     if page_structure:
-        primary_cta = page_structure.get("primary_cta", "").lower() if isinstance(page_structure.get("primary_cta"), str) else ""
-        if any(pattern in primary_cta for pattern in booking_cta_patterns):
+        primary_cta = page_structure.get("primary_cta") if isinstance(page_structure.get("primary_cta"), str) else ""
+        if PAGE_CLASS_LEXICON.scan(primary_cta).any("booking_ctas"):
             has_booking_cta = True
         
         social_proof = page_structure.get("social_proof_section", "")
         if isinstance(social_proof, str) and social_proof:
-            if any(signal in social_proof.lower() for signal in rating_signals):
+            if PAGE_CLASS_LEXICON.scan(social_proof).any("rating"):
                 has_ratings = True
     
     # Service/clinic detection: booking CTA AND (provider profile OR ratings OR service indicators)
@@ -3575,50 +3600,19 @@ def detect_marketplace_product_page(
     if not raw_text:
         return False
     
-    text_lower = raw_text.lower()
-    
-    # Marketplace CTA patterns
-    marketplace_cta_patterns = [
-        "add to cart",
-        "افزودن به سبد",
-        "buy now",
-        "خرید",
-        "افزودن به سبد خرید",
-        "add to basket",
-        "افزودن",
-        "خرید آنلاین",
-        "order now",
-        "purchase",
-        "خریداری"
-    ]
-    
-    # Check for price patterns
-    price_patterns = [
-        r'\$\d+[\d,.]*',  # $99.99
-        r'\d+[\d,.]*\s*(?:TL|TRY|USD|EUR|£|تومان|ریال)',  # 99.99 TL or تومان
-        r'(?:price|cost|fee|قیمت)[:\s]*\$?\d+',  # Price: $99
-    ]
+    hits = PAGE_CLASS_LEXICON.scan(raw_text)
     
-    has_price = any(re.search(pattern, text_lower, re.I) for pattern in price_patterns)
+    has_price = hits.pattern_any("price")
     
     # Check for marketplace CTAs
-    has_marketplace_cta = any(pattern in text_lower for pattern in marketplace_cta_patterns)
-    
-    # Check for product-specific signals
-    product_signals = [
-        "review", "rating", "star", "امتیاز", "نظرات",
-        "spec", "specification", "مشخصات",
-        "warranty", "guarantee", "ضمانت",
-        "delivery", "shipping", "ارسال",
-        "return", "refund", "بازگشت"
-    ]
+    has_marketplace_cta = hits.any("marketplace_ctas")
     
-    has_product_signals = any(signal in text_lower for signal in product_signals)
+    has_product_signals = hits.any("product")
     
     # Check page structure if available
     if page_structure:
-        primary_cta = page_structure.get("primary_cta", "").lower() if isinstance(page_structure.get("primary_cta"), str) else ""
-        if any(pattern in primary_cta for pattern in marketplace_cta_patterns):
+        primary_cta = page_structure.get("primary_cta") if isinstance(page_structure.get("primary_cta"), str) else ""
+        if PAGE_CLASS_LEXICON.scan(primary_cta).any("marketplace_ctas"):
             has_marketplace_cta = True
     
     # Marketplace detection: price AND (marketplace CTA OR product signals)
@@ -3808,8 +3802,8 @@ def analyze_cognitive_friction(
         raise InvalidAIResponseError("Empty response from model", raw_output or "")
 
     try:
-        payload = json.loads(raw_output)
-    except json.JSONDecodeError as exc:
+        payload = parse_json_object(raw_output, context="cognitive friction analysis")
+    except JSONParseError as exc:
         logger.error("Model returned non-JSON payload: %s", raw_output[:200])
         raise InvalidAIResponseError("Model response was not valid JSON.", raw_output) from exc
 
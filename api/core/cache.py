@@ -0,0 +1,562 @@
+"""
+Two-tier cache shared by all workers.
+
+Each uvicorn / gunicorn worker used to warm its own copy of every cache, so
+with N workers the hit rate dropped to roughly 1/N. Cache puts a small
+process-local tier in front of a backend that every worker on the host (or,
+with Redis, every host) reads and writes:
+
+- local: TTLCache, a bounded LRU of encoded values, so a hit never touches
+  the shared tier and callers always get a fresh copy
+- shared: a CacheBackend. SQLiteCacheBackend is a single file on local disk
+  (the default; entries expire by TTL and the least recently read ones are
+  evicted past CACHE_SQLITE_MAX_BYTES). RespCacheBackend speaks the Redis
+  protocol over a plain socket, so it needs no client library
+- get_cache(namespace): one Cache per namespace (capture, llm, visual, ...).
+  Keys are namespaced (and versioned) in the backend; values are JSON, or
+  raw bytes with codec="bytes"; values over max_value_bytes stay local
+- a failing backend is skipped for CACHE_BACKEND_RETRY_SECONDS: the cache
+  degrades to process-local instead of slowing every request down
+
+Config (env):
+- CACHE_BACKEND: sqlite | redis | none (default: sqlite)
+- CACHE_SQLITE_PATH: shared cache file (default: api/cache/shared_cache.db)
+- CACHE_SQLITE_MAX_BYTES: size limit of the file's entries (default: 512 MiB)
+- CACHE_REDIS_URL: redis://[:password@]host:port/db (default: redis://localhost:6379/0)
+- CACHE_KEY_PREFIX: prefix for every backend key (default: "nima:")
+- CACHE_LOCAL_MAX_ITEMS: entries in each namespace's local tier (default: 256)
+- CACHE_LOCAL_TTL_SECONDS: max age of a local copy (default: 60)
+- CACHE_BACKEND_RETRY_SECONDS: pause after a backend error (default: 30)
+- LLM_CACHE_TTL_SECONDS: lifetime of cached LLM answers, 0 disables (default: 86400)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import socket
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from api.core.config import get_env
+from api.memory.store import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SQLITE_PATH = Path(__file__).resolve().parent.parent / "cache" / "shared_cache.db"
+DEFAULT_SQLITE_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_KEY_PREFIX = "nima:"
+DEFAULT_LOCAL_MAX_ITEMS = 256
+DEFAULT_LOCAL_TTL_SECONDS = 60.0
+DEFAULT_MAX_VALUE_BYTES = 8 * 1024 * 1024
+DEFAULT_RETRY_SECONDS = 30.0
+DEFAULT_LLM_TTL_SECONDS = 86400.0
+
+# Reads refresh an entry's LRU timestamp at most this often (a write per read would serialize workers)
+_TOUCH_INTERVAL_SECONDS = 60.0
+
+
+class TTLCache:
+    """Bounded LRU whose entries expire after `ttl` seconds (thread-safe)."""
+
+    def __init__(self, ttl: float, max_items: int, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_items = max_items
+        self._clock = clock
+        self._data: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Any, value: Any, ttl: Optional[float] = None) -> None:
+        with self._lock:
+            self._data[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+# ----------------------------------------------------------------------
+# Shared backends
+# ----------------------------------------------------------------------
+
+
+class CacheBackend:
+    """Byte store shared between processes. ttl is in seconds; None or 0 never expires."""
+
+    name = "none"
+
+    def get(self, key: str) -> Optional[bytes]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    def clear(self, prefix: str = "") -> None:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    expires_at REAL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries(accessed_at);
+"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """Cache file on local disk, shared by every worker on the host."""
+
+    name = "sqlite"
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        max_bytes: int = DEFAULT_SQLITE_MAX_BYTES,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.store = SQLiteStore(Path(path) if path else DEFAULT_SQLITE_PATH, SQLITE_SCHEMA)
+        self.max_bytes = max(1, int(max_bytes))
+        self._clock = clock
+        self._written = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        conn = self.store.connection()
+        row = conn.execute(
+            "SELECT value, expires_at, accessed_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        now = self._clock()
+        if row is None or (row["expires_at"] is not None and row["expires_at"] <= now):
+            return None
+        if row["accessed_at"] < now - _TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return bytes(row["value"])
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        now = self._clock()
+        self.store.connection().execute(
+            "INSERT OR REPLACE INTO cache_entries (key, value, size, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, value, len(value), now + ttl if ttl else None, now),
+        )
+        with self._lock:
+            self._written += len(value)
+            due = self._written >= self.max_bytes // 16
+            if due:
+                self._written = 0
+        if due:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        self.store.connection().execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+
+    def clear(self, prefix: str = "") -> None:
+        self.store.connection().execute(
+            "DELETE FROM cache_entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+
+    def evict(self) -> int:
+        """Drop expired entries, then the least recently read ones until under 90% of max_bytes."""
+        with self.store.transaction() as tx:
+            removed = tx.execute(
+                "DELETE FROM cache_entries WHERE expires_at IS NOT NULL AND expires_at <= ?", (self._clock(),)
+            ).rowcount
+            total = tx.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+            excess = total - int(self.max_bytes * 0.9) if total > self.max_bytes else 0
+            victims: List[Tuple[str]] = []
+            for row in tx.execute("SELECT key, size FROM cache_entries ORDER BY accessed_at"):
+                if excess <= 0:
+                    break
+                victims.append((row["key"],))
+                excess -= row["size"]
+            tx.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+        return removed + len(victims)
+
+    def close(self) -> None:
+        self.store.close_all()
+
+
+class RespError(Exception):
+    """Error reply from a Redis-protocol server."""
+
+
+class RespCacheBackend(CacheBackend):
+    """
+    Minimal Redis-protocol (RESP2) client: GET, SET with PX, DEL, SCAN. One
+    connection per thread, reopened after an error. Size limits are the
+    server's (maxmemory / eviction policy).
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str = DEFAULT_REDIS_URL, timeout: float = 2.0) -> None:
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> Tuple[socket.socket, Any]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+            conn = self._local.conn = (sock, sock.makefile("rb"))
+            try:
+                if self.password:
+                    self._command("AUTH", self.password)
+                if self.db:
+                    self._command("SELECT", self.db)
+            except Exception:
+                self._disconnect()
+                raise
+        return conn
+
+    def _disconnect(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            conn[1].close()
+            conn[0].close()
+
+    def _command(self, *args: Any) -> Any:
+        sock, reader = self._connection()
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        try:
+            sock.sendall(b"".join(parts))
+            return self._read_reply(reader)
+        except OSError:
+            self._disconnect()
+            raise
+
+    def _read_reply(self, reader: Any) -> Any:
+        line = reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("Connection closed by cache server")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise RespError(body.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            size = int(body)
+            return None if size < 0 else reader.read(size + 2)[:-2]
+        if kind == b"*":
+            count = int(body)
+            return None if count < 0 else [self._read_reply(reader) for _ in range(count)]
+        raise ConnectionError(f"Unexpected reply from cache server: {line[:32]!r}")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._command("GET", key)
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            self._command("SET", key, value, "PX", max(1, int(ttl * 1000)))
+        else:
+            self._command("SET", key, value)
+
+    def delete(self, key: str) -> None:
+        self._command("DEL", key)
+
+    def clear(self, prefix: str = "") -> None:
+        pattern = "".join("\\" + ch if ch in "*?[]\\" else ch for ch in prefix) + "*"
+        cursor = "0"
+        while True:
+            cursor, keys = self._command("SCAN", cursor, "MATCH", pattern, "COUNT", 500)
+            cursor = cursor.decode("ascii")
+            if keys:
+                self._command("DEL", *keys)
+            if cursor == "0":
+                return
+
+    def ping(self) -> bool:
+        return self._command("PING") == "PONG"
+
+    def close(self) -> None:
+        self._disconnect()
+
+
+# ----------------------------------------------------------------------
+# Namespaced two-tier cache
+# ----------------------------------------------------------------------
+
+
+def make_key(*parts: Any) -> str:
+    """Stable short key for arbitrary JSON-able parts (URLs, prompts, options)."""
+    raw = json.dumps(parts, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class Cache:
+    def __init__(
+        self,
+        namespace: str,
+        backend: Optional[CacheBackend] = None,
+        ttl: Optional[float] = None,
+        version: str = "",
+        codec: str = "json",
+        local_max_items: int = DEFAULT_LOCAL_MAX_ITEMS,
+        local_ttl: float = DEFAULT_LOCAL_TTL_SECONDS,
+        max_value_bytes: int = DEFAULT_MAX_VALUE_BYTES,
+        key_prefix: str = DEFAULT_KEY_PREFIX,
+        retry_seconds: float = DEFAULT_RETRY_SECONDS,
+    ) -> None:
+        if codec not in ("json", "bytes"):
+            raise ValueError(f"Unknown cache codec: {codec}")
+        self.namespace = namespace
+        self.backend = backend
+        self.ttl = ttl
+        self.codec = codec
+        self.max_value_bytes = max_value_bytes
+        self.retry_seconds = retry_seconds
+        self.prefix = f"{key_prefix}{namespace}:{version + ':' if version else ''}"
+        self.local_ttl = min(local_ttl, ttl) if ttl else local_ttl
+        self.local = TTLCache(self.local_ttl, local_max_items)
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {"local": 0, "shared": 0, "miss": 0, "errors": 0}
+
+    def _encode(self, value: Any) -> bytes:
+        if self.codec == "bytes":
+            return bytes(value)
+        return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def _decode(self, data: bytes) -> Any:
+        return data if self.codec == "bytes" else json.loads(data)
+
+    def _count(self, what: str) -> None:
+        with self._lock:
+            self.stats[what] += 1
+
+    def _backend_usable(self) -> bool:
+        return self.backend is not None and time.monotonic() >= self._down_until
+
+    def _backend_failed(self, action: str, exc: Exception) -> None:
+        self._down_until = time.monotonic() + self.retry_seconds
+        self._count("errors")
+        logger.warning(
+            "Cache backend %s %s failed (%s); using the local tier for %.0fs",
+            self.backend.name if self.backend else "-", action, exc, self.retry_seconds,
+        )
+
+    # Shared tier (blocking)
+
+    def _shared_get(self, key: str) -> Optional[bytes]:
+        if not self._backend_usable():
+            return None
+        try:
+            return self.backend.get(self.prefix + key)
+        except Exception as exc:  # noqa: BLE001
+            self._backend_failed("read", exc)
+            return None
+
+    def _shared_set(self, key: str, data: bytes, ttl: Optional[float]) -> None:
+        if len(data) > self.max_value_bytes or not self._backend_usable():
+            return
+        try:
+            self.backend.set(self.prefix + key, data, ttl)
+        except Exception as exc:  # noqa: BLE001
+            self._backend_failed("write", exc)
+
+    # Public API
+
+    def get(self, key: str) -> Optional[Any]:
+        data = self.local.get(key)
+        if data is not None:
+            self._count("local")
+            return self._decode(data)
+        data = self._shared_get(key)
+        return self._shared_hit(key, data)
+
+    def _shared_hit(self, key: str, data: Optional[bytes]) -> Optional[Any]:
+        if data is None:
+            self._count("miss")
+            return None
+        try:
+            value = self._decode(data)
+        except ValueError:
+            self._count("miss")
+            return None
+        self.local.put(key, data)
+        self._count("shared")
+        return value
+
+    def _prepare(self, key: str, value: Any, ttl: Optional[float]) -> Optional[Tuple[bytes, Optional[float]]]:
+        try:
+            data = self._encode(value)
+        except (TypeError, ValueError) as exc:
+            logger.debug("Not caching %s%s: %s", self.prefix, key, exc)
+            return None
+        ttl = self.ttl if ttl is None else ttl
+        self.local.put(key, data, min(self.local_ttl, ttl) if ttl else None)
+        return data, ttl
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key; ttl (seconds) overrides the namespace default."""
+        prepared = self._prepare(key, value, ttl)
+        if prepared is not None:
+            self._shared_set(key, *prepared)
+
+    def delete(self, key: str) -> None:
+        self.local.pop(key)
+        if self._backend_usable():
+            try:
+                self.backend.delete(self.prefix + key)
+            except Exception as exc:  # noqa: BLE001
+                self._backend_failed("delete", exc)
+
+    def clear(self) -> None:
+        """Drop every entry of this namespace (and version), locally and in the backend."""
+        self.local.clear()
+        if self._backend_usable():
+            try:
+                self.backend.clear(self.prefix)
+            except Exception as exc:  # noqa: BLE001
+                self._backend_failed("clear", exc)
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() for async code: the shared tier is read on a worker thread."""
+        data = self.local.get(key)
+        if data is not None:
+            self._count("local")
+            return self._decode(data)
+        data = await asyncio.to_thread(self._shared_get, key) if self._backend_usable() else None
+        return self._shared_hit(key, data)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        prepared = self._prepare(key, value, ttl)
+        if prepared is not None and self._backend_usable():
+            await asyncio.to_thread(self._shared_set, key, *prepared)
+
+
+# ----------------------------------------------------------------------
+# Process-wide registry
+# ----------------------------------------------------------------------
+
+_backend: Optional[CacheBackend] = None
+_backend_ready = False
+_caches: Dict[str, Cache] = {}
+_registry_lock = threading.Lock()
+
+
+def _create_backend() -> Optional[CacheBackend]:
+    kind = (get_env("CACHE_BACKEND", "sqlite") or "sqlite").lower()
+    if kind in ("none", "off", "false", "0"):
+        return None
+    if kind == "redis":
+        return RespCacheBackend(get_env("CACHE_REDIS_URL", DEFAULT_REDIS_URL))
+    if kind != "sqlite":
+        logger.warning("Unknown CACHE_BACKEND %r, using sqlite", kind)
+    return SQLiteCacheBackend(
+        get_env("CACHE_SQLITE_PATH"),
+        max_bytes=int(get_env("CACHE_SQLITE_MAX_BYTES", str(DEFAULT_SQLITE_MAX_BYTES))),
+    )
+
+
+def shared_backend() -> Optional[CacheBackend]:
+    """The configured shared backend (None when CACHE_BACKEND=none)."""
+    global _backend, _backend_ready
+    if not _backend_ready:
+        with _registry_lock:
+            if not _backend_ready:
+                _backend = _create_backend()
+                _backend_ready = True
+    return _backend
+
+
+def get_cache(namespace: str, ttl: Optional[float] = None, version: str = "", codec: str = "json") -> Cache:
+    """
+    The process-wide Cache for namespace (created on first use with these
+    settings; later calls return the same instance).
+    """
+    name = f"{namespace}:{version}"
+    cache = _caches.get(name)
+    if cache is None:
+        backend = shared_backend()
+        with _registry_lock:
+            cache = _caches.get(name)
+            if cache is None:
+                cache = _caches[name] = Cache(
+                    namespace,
+                    backend,
+                    ttl=ttl,
+                    version=version,
+                    codec=codec,
+                    local_max_items=int(get_env("CACHE_LOCAL_MAX_ITEMS", str(DEFAULT_LOCAL_MAX_ITEMS))),
+                    local_ttl=float(get_env("CACHE_LOCAL_TTL_SECONDS", str(DEFAULT_LOCAL_TTL_SECONDS))),
+                    key_prefix=get_env("CACHE_KEY_PREFIX", DEFAULT_KEY_PREFIX) or "",
+                    retry_seconds=float(get_env("CACHE_BACKEND_RETRY_SECONDS", str(DEFAULT_RETRY_SECONDS))),
+                )
+    return cache
+
+
+def cache_stats() -> Dict[str, Any]:
+    return {
+        "backend": _backend.name if _backend else "none",
+        "namespaces": {name.rstrip(":"): dict(cache.stats) for name, cache in list(_caches.items())},
+    }
+
+
+def cached_completion_text(create: Callable[..., Any], **request: Any) -> str:
+    """
+    Text of create(**request).choices[0].message.content, cached in the "llm"
+    namespace by the full request (model, messages, temperature, ...).
+    """
+    ttl = float(get_env("LLM_CACHE_TTL_SECONDS", str(DEFAULT_LLM_TTL_SECONDS)))
+    if ttl <= 0:
+        return create(**request).choices[0].message.content or ""
+    cache = get_cache("llm", ttl=ttl)
+    key = make_key(request)
+    text = cache.get(key)
+    if text is None:
+        text = create(**request).choices[0].message.content or ""
+        if text:
+            cache.set(key, text)
+    return text
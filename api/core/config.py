@@ -8,20 +8,35 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
-# Load .env file at module import time
-# Try project root first, then api directory
 project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    # Fallback to api/.env if it exists
-    api_env = Path(__file__).parent.parent / ".env"
-    if api_env.exists():
-        load_dotenv(api_env, override=True)
+_env_loaded = False
+
+
+def load_env() -> None:
+    """
+    Load .env once per process: project root first, then api/, then the
+    working directory. Modules call this at import instead of running
+    load_dotenv themselves; only the first call reads a file.
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    _env_loaded = True
+    if env_file.exists():
+        load_dotenv(env_file, override=True)
     else:
-        # Last resort: load from current directory
-        load_dotenv()
+        # Fallback to api/.env if it exists
+        api_env = Path(__file__).parent.parent / ".env"
+        if api_env.exists():
+            load_dotenv(api_env, override=True)
+        else:
+            # Last resort: load from current directory
+            load_dotenv()
+
+
+# Load .env file at module import time
+load_env()
 
 
 def get_env(name: str, default: str | None = None) -> str | None:
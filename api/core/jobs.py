@@ -0,0 +1,136 @@
+"""
+Background jobs for long-running maintenance endpoints.
+
+Endpoints that rebuild datasets or export files used to do the work inline,
+holding the request (and, for sync code in async routes, the event loop)
+for as long as it took. JobRunner runs such work on a small thread pool and
+hands back a job record right away:
+
+- submit(name, fn): queues fn and returns its Job. Submitting a name that
+  already has a queued job returns that job instead of queueing another one:
+  it has not started yet, so it will see the same inputs. A running job
+  does not coalesce; its inputs may have changed since it started
+- get(job_id) / list(): job records (status queued | running | succeeded |
+  failed, timestamps, result or error); the most recent JOBS_HISTORY jobs
+  are kept
+- wait(job): await a job from async code (for ?wait=true callers)
+
+Jobs are in-process: a restart forgets them, and each worker has its own.
+
+Config (env):
+- JOBS_MAX_WORKERS: jobs running at the same time (default: 1)
+- JOBS_HISTORY: finished jobs kept for status queries (default: 50)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from api.core.config import get_env
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 1
+DEFAULT_HISTORY = 50
+
+
+@dataclass
+class Job:
+    id: str
+    name: str
+    status: str = "queued"  # queued | running | succeeded | failed
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Any = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = self.result.to_dict() if hasattr(self.result, "to_dict") else self.result
+        duration = None
+        if self.started_at is not None and self.finished_at is not None:
+            duration = round((self.finished_at - self.started_at) * 1000, 1)
+        return {
+            "id": self.id,
+            "name": self.name,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_ms": duration,
+            "result": result,
+            "error": self.error,
+        }
+
+
+class JobRunner:
+    def __init__(self, max_workers: Optional[int] = None, history: Optional[int] = None) -> None:
+        self.max_workers = int(max_workers or get_env("JOBS_MAX_WORKERS", str(DEFAULT_MAX_WORKERS)))
+        self.history = int(history or get_env("JOBS_HISTORY", str(DEFAULT_HISTORY)))
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def submit(self, name: str, fn: Callable[[], Any]) -> Job:
+        with self._lock:
+            for job in reversed(self._jobs.values()):
+                if job.name == name and job.status == "queued":
+                    return job
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+            job = Job(id=uuid.uuid4().hex[:12], name=name)
+            self._jobs[job.id] = job
+            self._trim()
+            job.future = self._executor.submit(self._run, job, fn)
+        logger.info("Job %s (%s) queued", job.id, name)
+        return job
+
+    def _run(self, job: Job, fn: Callable[[], Any]) -> None:
+        # Outcomes live on the job; the future itself never raises
+        job.status, job.started_at = "running", time.time()
+        try:
+            job.result = fn()
+            status = "succeeded"
+        except Exception as exc:
+            job.error = f"{type(exc).__name__}: {exc}"
+            status = "failed"
+            logger.exception("Job %s (%s) failed", job.id, job.name)
+        job.finished_at = time.time()
+        job.status = status
+
+    def _trim(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self, name_prefix: str = "") -> List[Job]:
+        with self._lock:
+            return [job for job in reversed(self._jobs.values()) if job.name.startswith(name_prefix)]
+
+    async def wait(self, job: Job, timeout: Optional[float] = None) -> Job:
+        """
+        Wait up to timeout for job to finish. Neither a failure nor the timeout
+        raises (check job.status); the job keeps running after a timeout.
+        """
+        if job.future is not None:
+            await asyncio.wait([asyncio.wrap_future(job.future)], timeout=timeout)
+        return job
+
+
+jobs = JobRunner()
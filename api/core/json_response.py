@@ -0,0 +1,160 @@
+"""
+Fast JSON responses.
+
+FastAPI renders a plain dict result in two steps: jsonable_encoder rebuilds the
+whole tree, then json.dumps serializes it. Reports are large nested dicts
+(page maps, evidence, base64 screenshots), so both steps show up in profiles,
+and jsonable_encoder cannot handle numpy scalars, which is why services used to
+scrub them by hand.
+
+- dumps(): orjson with OPT_SERIALIZE_NUMPY (stdlib json fallback), with a
+  default hook for pydantic models, numpy leftovers, sets, paths, and so on
+- FastJSONResponse: the app-wide default response class, built on dumps()
+- FastJSONRoute: route class that renders untyped endpoint results (no
+  response model, or just a dict / Any annotation) with FastJSONResponse
+  directly, which skips the jsonable_encoder pass. Routes with a pydantic
+  response model keep FastAPI's validation and serialization.
+- register_fast_model(): models in this registry are serialized by pydantic's
+  Rust core (model_dump_json) and embedded as-is when they appear inside a
+  payload (needs orjson >= 3.9, which added Fragment); otherwise model_dump()
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import inspect
+import json
+import logging
+import types
+from decimal import Decimal
+from pathlib import PurePath
+from typing import Any, Callable, Optional, Set, Type, get_args, get_origin
+
+from fastapi.datastructures import Default, DefaultPlaceholder
+from fastapi.dependencies.utils import get_typed_return_annotation
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from starlette.responses import Response
+
+from api.utils.response_sanitizer import to_builtin
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+
+    HAS_ORJSON = True
+    _OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+    _Fragment = getattr(orjson, "Fragment", None)
+except ImportError:  # pragma: no cover - depends on environment
+    orjson = None  # type: ignore[assignment]
+    HAS_ORJSON = False
+    _OPTIONS = 0
+    _Fragment = None
+
+_FAST_MODELS: Set[Type[BaseModel]] = set()
+
+
+def register_fast_model(*models: Type[BaseModel]) -> None:
+    """Serialize these models with model_dump_json when they are embedded in a payload."""
+    _FAST_MODELS.update(models)
+
+
+def _default(obj: Any) -> Any:
+    """Encode what orjson / json do not handle natively (mirrors jsonable_encoder)."""
+    if isinstance(obj, BaseModel):
+        if _Fragment is not None and type(obj) in _FAST_MODELS:
+            return _Fragment(obj.model_dump_json(by_alias=True))
+        return obj.model_dump(by_alias=True)
+    if type(obj).__module__ == "numpy":
+        converted = to_builtin(obj)
+        if converted is not obj:
+            return converted
+    if isinstance(obj, (set, frozenset, types.GeneratorType)):
+        return list(obj)
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, PurePath):
+        return str(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes."""
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=_OPTIONS)
+    return json.dumps(
+        content,
+        default=_default,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _is_untyped(annotation: Any) -> bool:
+    """True for return types that carry no schema worth validating against."""
+    if annotation in (None, Any, dict, inspect.Signature.empty):
+        return True
+    if inspect.isclass(annotation) and issubclass(annotation, Response):
+        return True
+    if get_origin(annotation) is dict:
+        args = get_args(annotation)
+        return not args or args[1] is Any
+    return False
+
+
+def _render_directly(endpoint: Callable[..., Any], status_code: Optional[int]) -> Callable[..., Any]:
+    def render(result: Any) -> Any:
+        if isinstance(result, Response):
+            return result
+        return FastJSONResponse(result, status_code=status_code or 200)
+
+    if inspect.iscoroutinefunction(endpoint):
+        @functools.wraps(endpoint)
+        async def async_endpoint(*args: Any, **kwargs: Any) -> Any:
+            return render(await endpoint(*args, **kwargs))
+        return async_endpoint
+
+    @functools.wraps(endpoint)
+    def sync_endpoint(*args: Any, **kwargs: Any) -> Any:
+        return render(endpoint(*args, **kwargs))
+    return sync_endpoint
+
+
+class FastJSONRoute(APIRoute):
+    """
+    APIRoute that serializes untyped results with FastJSONResponse itself.
+
+    Only applies when neither a response model nor a response class was
+    declared and the endpoint is a plain function (not a generator). Headers
+    set on an injected `Response` parameter are not merged into the result, so
+    endpoints that need them should return a Response.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        response_model = kwargs.get("response_model", Default(None))
+        if isinstance(response_model, DefaultPlaceholder):
+            # What FastAPI would infer from the return annotation
+            response_model = get_typed_return_annotation(endpoint)
+        response_class = kwargs.get("response_class", Default(JSONResponse))
+        # Either nothing was declared, or the app default (FastJSONResponse) was passed down
+        default_class = isinstance(response_class, DefaultPlaceholder) or response_class is FastJSONResponse
+        plain_function = not (inspect.isgeneratorfunction(endpoint) or inspect.isasyncgenfunction(endpoint))
+        if plain_function and default_class and _is_untyped(response_model):
+            endpoint = _render_directly(endpoint, kwargs.get("status_code"))
+            kwargs["response_model"] = None
+        super().__init__(path, endpoint, **kwargs)
+
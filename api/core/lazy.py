@@ -0,0 +1,222 @@
+"""
+Deferred imports for heavy modules and routers.
+
+Importing api.main used to pull in every engine and route module, OpenCV and
+the OpenAI SDK before uvicorn could answer a health check. This module lets
+the app start with only what its own endpoints need:
+
+- LazyModule: a module proxy (cv2, pytesseract, ...) that imports on first
+  attribute access; `available` tries the import once and caches the answer
+- include_lazy_router(): registers a placeholder route for a router's path
+  prefixes. The first request under one of them imports the router module
+  (in a worker thread), includes the router at the placeholder's position,
+  so route precedence is the same as an eager include, and dispatches the
+  request again
+- load_lazy_routers(): imports every pending router; run in the background
+  after startup so the first real request does not pay for it. The OpenAPI
+  schema also loads them first, so /docs always lists every route
+- pending_lazy_routers(): what readiness reports until preloading is done
+
+Routers loaded this way must not rely on their own startup/shutdown
+handlers: they are included after the app has started.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from types import ModuleType
+from typing import Any, Dict, List, Optional, Sequence
+
+import anyio
+from fastapi import FastAPI
+from starlette.routing import BaseRoute, Match, NoMatchFound, get_route_path
+from starlette.types import Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+
+class LazyModule:
+    """Proxy for an optional module that is imported on first use."""
+
+    def __init__(self, name: str, missing_warning: Optional[str] = None):
+        self._name = name
+        self._missing_warning = missing_warning
+        self._module: Optional[ModuleType] = None
+        self._error: Optional[BaseException] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            with self._lock:
+                if self._module is None and self._error is None:
+                    try:
+                        self._module = importlib.import_module(self._name)
+                    except ImportError as e:
+                        self._error = e
+                        if self._missing_warning:
+                            logger.warning(self._missing_warning)
+            if self._module is None:
+                raise ImportError(f"{self._name} is not available: {self._error}")
+        return self._module
+
+    @property
+    def available(self) -> bool:
+        try:
+            self._load()
+        except ImportError:
+            return False
+        return True
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name} ({state})>"
+
+
+class LazyRouter:
+    """A router that is imported and included on first use."""
+
+    def __init__(
+        self,
+        app: FastAPI,
+        module: str,
+        paths: Sequence[str],
+        attr: str = "router",
+        optional: bool = False,
+        include_kwargs: Optional[Dict[str, Any]] = None,
+    ):
+        self.app = app
+        self.module = module
+        self.paths = tuple(p.rstrip("/") or "/" for p in paths)
+        self.attr = attr
+        self.optional = optional
+        self.include_kwargs = include_kwargs or {}
+        self.placeholder = _LazyRouterRoute(self)
+        self.installed = False
+        self.error: Optional[str] = None
+        self._router: Any = None
+        self._imported = False
+        self._lock = threading.Lock()
+
+    def handles(self, path: str) -> bool:
+        return any(path == p or path.startswith(p + "/") for p in self.paths)
+
+    def import_router(self) -> Any:
+        """Import the router module (thread-safe, once). None if an optional router is missing."""
+        with self._lock:
+            if not self._imported:
+                try:
+                    self._router = getattr(importlib.import_module(self.module), self.attr)
+                except ImportError as e:
+                    if not self.optional:
+                        raise
+                    self.error = str(e)
+                    logger.warning("Optional router %s not available: %s", self.module, e)
+                self._imported = True
+            return self._router
+
+    def install(self) -> None:
+        """
+        Replace the placeholder with the imported router.
+
+        Mutates app.router.routes, so it runs on the event loop thread (or
+        before serving), never while another thread iterates the routes.
+        """
+        if self.installed:
+            return
+        router = self.import_router()
+        routes = self.app.router.routes
+        position = routes.index(self.placeholder)
+        if router is not None:
+            before = len(routes)
+            self.app.include_router(router, **self.include_kwargs)
+            added = routes[before:]
+            del routes[before:]
+            routes[position:position + 1] = added
+        else:
+            del routes[position]
+        self.installed = True
+        self.app.openapi_schema = None
+        logger.info("Loaded router %s", self.module)
+
+    async def ensure_installed(self) -> None:
+        if not self.installed:
+            await anyio.to_thread.run_sync(self.import_router)
+            self.install()
+
+
+class _LazyRouterRoute(BaseRoute):
+    """Placeholder that claims a lazy router's paths until the router is loaded."""
+
+    def __init__(self, lazy: LazyRouter):
+        self.lazy = lazy
+        self.include_in_schema = False
+
+    def matches(self, scope: Scope):
+        if scope["type"] in ("http", "websocket") and self.lazy.handles(get_route_path(scope)):
+            return Match.FULL, {}
+        return Match.NONE, {}
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        raise NoMatchFound(name, path_params)
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await self.lazy.ensure_installed()
+        # The real routes now sit where the placeholder was: route the request again
+        await self.lazy.app.router.app(scope, receive, send)
+
+
+def _registry(app: FastAPI) -> List[LazyRouter]:
+    registry = getattr(app.state, "lazy_routers", None)
+    if registry is None:
+        registry = app.state.lazy_routers = []
+        openapi = app.openapi
+
+        def openapi_with_lazy_routers() -> Dict[str, Any]:
+            for lazy in registry:
+                lazy.install()
+            return openapi()
+
+        app.openapi = openapi_with_lazy_routers  # type: ignore[method-assign]
+    return registry
+
+
+def include_lazy_router(
+    app: FastAPI,
+    module: str,
+    paths: Sequence[str],
+    attr: str = "router",
+    optional: bool = False,
+    **include_kwargs: Any,
+) -> LazyRouter:
+    """
+    app.include_router() for `module`.`attr`, imported on first use.
+
+    Args:
+        app: The application
+        module: Dotted module path of the router
+        paths: Path prefixes the router serves (after include prefix)
+        attr: Router attribute in the module
+        optional: Missing module (ImportError) means "not installed" instead of an error
+        include_kwargs: Passed to app.include_router (prefix, tags, ...)
+    """
+    lazy = LazyRouter(app, module, paths, attr=attr, optional=optional, include_kwargs=include_kwargs)
+    _registry(app).append(lazy)
+    app.router.routes.append(lazy.placeholder)
+    return lazy
+
+
+def pending_lazy_routers(app: FastAPI) -> List[str]:
+    return [lazy.module for lazy in getattr(app.state, "lazy_routers", []) if not lazy.installed]
+
+
+async def load_lazy_routers(app: FastAPI) -> None:
+    """Import and include every pending router (imports run in a worker thread)."""
+    for lazy in list(getattr(app.state, "lazy_routers", [])):
+        try:
+            await lazy.ensure_installed()
+        except Exception:
+            logger.exception("Failed to load router %s", lazy.module)
@@ -0,0 +1,137 @@
+"""
+Startup warm-up.
+
+Everything the API loads lazily (the brain prompt, lazy routers, the visual
+trust model, OpenCV, the SQLite schema, Playwright's browser) used to be paid
+for by the first request that needed it. The warm-up runner does that work
+right after startup, in the background, so health checks answer immediately
+and /ready turns 200 only once the instance is warm.
+
+- WarmupRunner.register(): add a named task (sync tasks run in worker
+  threads, coroutine functions on the loop); tasks run concurrently
+- WarmupRunner.run(): runs the selected tasks, each with a timeout, and
+  records status / duration / error per task. A failed task is reported
+  but does not keep the instance out of rotation: the code path it warms
+  still works (or fails) lazily, as before
+- WarmupRunner.ready: True once run() has finished, or when warm-up is off
+
+Config (env):
+- WARMUP_ENABLED: run warm-up at startup (default: true)
+- WARMUP_TASKS: comma-separated task names to run (default: all default tasks)
+- WARMUP_SKIP: comma-separated task names not to run
+- WARMUP_TIMEOUT_SECONDS: per-task timeout (default: 120)
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+from api.core.config import get_env
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT_SECONDS = 120.0
+
+
+def _env_list(name: str) -> Optional[List[str]]:
+    value = get_env(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+@dataclass
+class WarmupTask:
+    name: str
+    fn: Callable[[], Any]
+    default: bool = True  # runs unless WARMUP_TASKS / WARMUP_SKIP say otherwise
+    status: str = "pending"  # pending | running | ok | failed | timeout | skipped
+    duration_ms: Optional[float] = None
+    detail: Any = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "status": self.status,
+            "duration_ms": self.duration_ms,
+            "detail": self.detail,
+            "error": self.error,
+        }
+
+
+class WarmupRunner:
+    def __init__(self, enabled: Optional[bool] = None, timeout: Optional[float] = None):
+        if enabled is None:
+            enabled = (get_env("WARMUP_ENABLED", "true") or "true").lower() == "true"
+        self.enabled = enabled
+        self.timeout = timeout if timeout is not None else float(
+            get_env("WARMUP_TIMEOUT_SECONDS", str(DEFAULT_TIMEOUT_SECONDS))
+        )
+        self.tasks: Dict[str, WarmupTask] = {}
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._finished = False
+
+    def register(self, name: str, fn: Callable[[], Any], default: bool = True) -> None:
+        """Add (or replace) a task. fn's return value is reported as the task detail."""
+        self.tasks[name] = WarmupTask(name=name, fn=fn, default=default)
+
+    def selected(self) -> List[WarmupTask]:
+        only = _env_list("WARMUP_TASKS")
+        skip = set(_env_list("WARMUP_SKIP") or ())
+        return [
+            task for task in self.tasks.values()
+            if (task.name in only if only is not None else task.default) and task.name not in skip
+        ]
+
+    @property
+    def ready(self) -> bool:
+        return not self.enabled or self._finished
+
+    async def _run_task(self, task: WarmupTask) -> None:
+        task.status = "running"
+        t0 = time.perf_counter()
+        try:
+            if inspect.iscoroutinefunction(task.fn):
+                detail = await asyncio.wait_for(task.fn(), self.timeout)
+            else:
+                # A timed-out thread keeps running; the task is only reported as such
+                detail = await asyncio.wait_for(asyncio.to_thread(task.fn), self.timeout)
+            task.status, task.detail = "ok", detail
+        except asyncio.TimeoutError:
+            task.status, task.error = "timeout", f"did not finish within {self.timeout:.0f}s"
+        except Exception as e:
+            task.status, task.error = "failed", f"{type(e).__name__}: {e}"
+        task.duration_ms = round((time.perf_counter() - t0) * 1000, 1)
+        log = logger.info if task.status == "ok" else logger.warning
+        log("Warm-up %s: %s in %.0f ms%s", task.name, task.status, task.duration_ms,
+            f" ({task.error})" if task.error else "")
+
+    async def run(self) -> Dict[str, Any]:
+        """Run the selected tasks concurrently; returns status()."""
+        if not self.enabled:
+            return self.status()
+        selected = self.selected()
+        for task in self.tasks.values():
+            if task not in selected:
+                task.status = "skipped"
+        self.started_at = time.time()
+        t0 = time.perf_counter()
+        await asyncio.gather(*(self._run_task(task) for task in selected))
+        self.finished_at = time.time()
+        self._finished = True
+        logger.info("Warm-up finished in %.0f ms", (time.perf_counter() - t0) * 1000)
+        return self.status()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "ready": self.ready,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "tasks": {name: task.to_dict() for name, task in self.tasks.items()},
+        }
@@ -0,0 +1,273 @@
+"""
+Write-behind persistence queue.
+
+Per-request side effects that nobody waits for (the analysis memory row,
+screenshot artifacts, debug overlays, dataset CSV rows) are handed to a
+background writer instead of being written on the request path:
+
+- put(sink, item): O(1), queues the item and returns. Callers that need an
+  identifier allocate it up front (see brain_memory.queue_analysis)
+- one daemon thread drains the queue. Items of the same sink are handed to
+  its handler together (up to WRITE_BEHIND_BATCH_SIZE at a time), so a burst
+  of analyses becomes one SQLite transaction and CSV rows for the same file
+  one append. A failing batch is retried item by item, so one bad item does
+  not take its neighbours down with it
+- built-in sinks: write_bytes() (atomic: tmp file + rename, so a reader never
+  sees half a file; pending_bytes() serves the data until it is on disk),
+  append_csv_row() and call() (run any function off the request path)
+- flush() blocks until everything queued so far is written; it runs on
+  shutdown (app shutdown event and atexit)
+- stats() reports queue depth and counters (exposed on /ready)
+
+When the queue holds WRITE_BEHIND_MAX_DEPTH items the caller writes its item
+itself (write-through), so memory stays bounded if the disk falls behind.
+
+Single worker only: the queue and pending_bytes() live in the process that
+accepted the write. With several workers, a follow-up request for a just
+created artifact or analysis can land on another worker and get a 404 until
+the writer flushes. So when WEB_CONCURRENCY (the worker count uvicorn and
+gunicorn read) is above 1 and WRITE_BEHIND_ENABLED is not set, writes go
+through on the caller.
+
+Config (env):
+- WRITE_BEHIND_ENABLED: "false" writes synchronously on the caller, "true"
+  forces the queue (default: enabled with a single worker)
+- WRITE_BEHIND_BATCH_SIZE: max items per handler call (default: 128)
+- WRITE_BEHIND_MAX_DEPTH: queued items before callers write through (default: 10000)
+- WRITE_BEHIND_FLUSH_TIMEOUT_SECONDS: how long shutdown waits for the queue (default: 10)
+"""
+from __future__ import annotations
+
+import atexit
+import csv
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+from api.core.config import get_env
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 128
+DEFAULT_MAX_DEPTH = 10000
+DEFAULT_FLUSH_TIMEOUT_SECONDS = 10.0
+
+Handler = Callable[[List[Any]], None]
+
+
+def _default_enabled() -> bool:
+    configured = get_env("WRITE_BEHIND_ENABLED")
+    if configured is not None:
+        return configured.lower() != "false"
+    try:
+        workers = int(get_env("WEB_CONCURRENCY", "1") or "1")
+    except ValueError:
+        workers = 1
+    if workers > 1:
+        logger.info("WEB_CONCURRENCY=%d: write-behind disabled (pending writes are per process)", workers)
+        return False
+    return True
+
+
+def _write_files(items: List[Tuple[Path, bytes]]) -> None:
+    for path, data in items:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+
+def _append_csv_rows(items: List[Tuple[Path, Sequence[Any]]]) -> None:
+    by_path: Dict[Path, List[Sequence[Any]]] = {}
+    for path, row in items:
+        by_path.setdefault(path, []).append(row)
+    for path, rows in by_path.items():
+        with path.open(mode="a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(rows)
+
+
+def _run_calls(items: List[Tuple[Callable[..., Any], tuple, dict]]) -> None:
+    for fn, args, kwargs in items:
+        fn(*args, **kwargs)
+
+
+class WriteBehindQueue:
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        max_depth: Optional[int] = None,
+    ) -> None:
+        if enabled is None:
+            enabled = _default_enabled()
+        self.enabled = enabled
+        self.batch_size = int(batch_size or get_env("WRITE_BEHIND_BATCH_SIZE", str(DEFAULT_BATCH_SIZE)))
+        self.max_depth = int(max_depth or get_env("WRITE_BEHIND_MAX_DEPTH", str(DEFAULT_MAX_DEPTH)))
+        self._handlers: Dict[str, Handler] = {}
+        self._queue: Deque[Tuple[str, Any]] = deque()
+        self._pending_files: Dict[Path, bytes] = {}
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self._counters = {"queued": 0, "written": 0, "failed": 0, "batches": 0, "write_through": 0}
+        self.register("files", self._write_files)
+        self.register("csv", _append_csv_rows)
+        self.register("calls", _run_calls)
+
+    def register(self, sink: str, handler: Handler) -> None:
+        """handler(items) persists a batch of items (in submission order) or raises."""
+        self._handlers[sink] = handler
+
+    # --- submitting ----------------------------------------------------
+
+    def put(self, sink: str, item: Any) -> None:
+        """Queue one item for sink's handler; returns without waiting for the write."""
+        if sink not in self._handlers:
+            raise KeyError(f"Unknown write-behind sink: {sink}")
+        with self._cond:
+            self._ensure_writer()
+            write_through = not self.enabled or len(self._queue) + self._in_flight >= self.max_depth
+            if not write_through:
+                self._queue.append((sink, item))
+                self._counters["queued"] += 1
+                self._cond.notify_all()
+                return
+            self._counters["write_through"] += 1
+        if self.enabled:
+            logger.warning("Write-behind queue full (%d items), writing %s item on the caller", self.max_depth, sink)
+        self._write(sink, [item])
+
+    def write_bytes(self, path: Path | str, data: bytes) -> None:
+        path = Path(path)
+        if self.enabled:
+            with self._cond:
+                self._pending_files[path] = data
+        self.put("files", (path, data))
+
+    def append_csv_row(self, path: Path | str, row: Sequence[Any]) -> None:
+        self.put("csv", (Path(path), list(row)))
+
+    def call(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+        self.put("calls", (fn, args, kwargs))
+
+    def pending_bytes(self, path: Path | str) -> Optional[bytes]:
+        """Data queued for path that is not on disk yet (None if there is none)."""
+        with self._cond:
+            return self._pending_files.get(Path(path))
+
+    # --- writing -------------------------------------------------------
+
+    def _write_files(self, items: List[Tuple[Path, bytes]]) -> None:
+        _write_files(items)
+        with self._cond:
+            for path, data in items:
+                if self._pending_files.get(path) is data:
+                    del self._pending_files[path]
+
+    def _ensure_writer(self) -> None:
+        if self._pid != os.getpid():  # forked: the parent's thread and queue are not ours
+            self._pid, self._thread, self._queue, self._in_flight = os.getpid(), None, deque(), 0
+            self._pending_files = {}
+        if self.enabled and (self._thread is None or not self._thread.is_alive()):
+            self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+            self._thread.start()
+
+    def _take_batch(self) -> Tuple[str, List[Any]]:
+        """Up to batch_size items of the sink at the head of the queue (order kept per sink)."""
+        sink = self._queue[0][0]
+        batch: List[Any] = []
+        kept: Deque[Tuple[str, Any]] = deque()
+        while self._queue and len(batch) < self.batch_size:
+            entry = self._queue.popleft()
+            if entry[0] == sink:
+                batch.append(entry[1])
+            else:
+                kept.append(entry)
+        kept.extend(self._queue)
+        self._queue = kept
+        self._in_flight = len(batch)
+        return sink, batch
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                sink, batch = self._take_batch()
+            try:
+                self._write(sink, batch)
+            finally:
+                with self._cond:
+                    self._in_flight = 0
+                    self._cond.notify_all()
+
+    def _write(self, sink: str, batch: List[Any]) -> None:
+        handler = self._handlers[sink]
+        try:
+            handler(batch)
+            written, failed = len(batch), 0
+        except Exception as exc:
+            if len(batch) == 1:
+                logger.warning("Write-behind %s item failed: %s", sink, exc)
+                written, failed = 0, 1
+            else:
+                written = failed = 0
+                for item in batch:
+                    try:
+                        handler([item])
+                        written += 1
+                    except Exception as item_exc:
+                        logger.warning("Write-behind %s item failed: %s", sink, item_exc)
+                        failed += 1
+        with self._cond:
+            self._counters["written"] += written
+            self._counters["failed"] += failed
+            self._counters["batches"] += 1
+            if failed and sink == "files":
+                for path, data in batch:
+                    if self._pending_files.get(path) is data:
+                        del self._pending_files[path]
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything queued so far is written; False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            if self._pid != os.getpid():
+                return True
+            while self._queue or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    break  # interpreter shutdown: write the rest below
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    logger.warning("Write-behind flush timed out with %d items queued", len(self._queue))
+                    return False
+                self._cond.wait(remaining)
+            leftover, self._queue = list(self._queue), deque()
+        for sink, item in leftover:
+            self._write(sink, [item])
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "enabled": self.enabled,
+                "depth": len(self._queue) + self._in_flight,
+                "max_depth": self.max_depth,
+                **self._counters,
+            }
+
+
+write_behind = WriteBehindQueue()
+
+
+def flush_on_shutdown() -> bool:
+    timeout = float(get_env("WRITE_BEHIND_FLUSH_TIMEOUT_SECONDS", str(DEFAULT_FLUSH_TIMEOUT_SECONDS)))
+    return write_behind.flush(timeout)
+
+
+atexit.register(flush_on_shutdown)
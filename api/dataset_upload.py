@@ -1,16 +1,17 @@
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from fastapi.responses import JSONResponse
+from api.core.json_response import FastJSONRoute
+from api.core.write_behind import write_behind
+from api.services.dataset_manifest import dataset_manifest
 from pathlib import Path
 from typing import Literal
-import shutil
 import csv
 import os
-from datetime import datetime
 
 # Trust labels allowed for this first version
 TrustLabel = Literal["high", "medium", "low"]
 
-router = APIRouter(prefix="/api/dataset", tags=["dataset"])
+router = APIRouter(prefix="/api/dataset", tags=["dataset"], route_class=FastJSONRoute)
 
 
 def get_project_root() -> Path:
@@ -54,40 +55,15 @@ def ensure_directories_and_csv(label_folder: Path, labels_csv: Path) -> None:
             writer.writerow(["filename", "trust_label"])
 
 
-def save_uploaded_file(label_folder: Path, upload_file: UploadFile) -> Path:
-    """
-    Save the uploaded image file to the target folder.
-    Uses a timestamp prefix to avoid collisions.
-    """
-    original_name = os.path.basename(upload_file.filename or "")
-    if not original_name:
-        raise HTTPException(status_code=400, detail="Uploaded file must have a filename.")
-
-    # Add timestamp prefix to avoid overwriting existing files
-    timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
-    target_name = f"{timestamp}_{original_name}"
-    target_path = label_folder / target_name
-
-    try:
-        with target_path.open("wb") as buffer:
-            shutil.copyfileobj(upload_file.file, buffer)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to save file: {e}")
-    finally:
-        upload_file.file.close()
-
-    return target_path
-
-
 def append_csv_log(labels_csv: Path, filename: str, trust_label: TrustLabel) -> None:
     """
     Append a new row to labels.csv with filename and trust label.
     Assumes file and header exist (handled by ensure_directories_and_csv).
+    The row is written by the write-behind queue; concurrent uploads to the
+    same CSV are appended together.
     """
     try:
-        with labels_csv.open(mode="a", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow([filename, trust_label])
+        write_behind.append_csv_row(labels_csv, [filename, trust_label])
     except Exception as e:
         # Logging CSV failure but not failing the whole request
         # to avoid losing the saved image if CSV append fails.
@@ -104,7 +80,10 @@ async def upload_labeled_image(
 
     - Accepts multipart/form-data.
     - Validates trust_label against allowed values.
-    - Saves the file to dataset/images/<label_folder>/ with a timestamped filename.
+    - Stores the file under dataset/images/<label_folder>/ and indexes it in the
+      dataset manifest (api/services/dataset_manifest.py): content hash,
+      dimensions, split, perceptual hash. An exact duplicate of an image that
+      is already in the dataset is not stored again ("duplicate": true).
     - Appends a row to dataset/labels.csv.
     """
     normalized_label = trust_label.strip().lower()
@@ -116,26 +95,41 @@ async def upload_labeled_image(
             detail=f'Invalid trust_label "{trust_label}". Must be one of: "high", "medium", "low".',
         )
 
+    original_name = os.path.basename(file.filename or "")
+    if not original_name:
+        raise HTTPException(status_code=400, detail="Uploaded file must have a filename.")
+
     try:
         label_folder, labels_csv = get_dataset_paths(normalized_label)  # type: ignore[arg-type]
         ensure_directories_and_csv(label_folder, labels_csv)
 
-        saved_path = save_uploaded_file(label_folder, file)
+        try:
+            content = await file.read()
+        finally:
+            await file.close()
+        try:
+            # Hashing, decoding and the manifest transaction run off the event loop
+            entry = await dataset_manifest.store.run(dataset_manifest.add, content, normalized_label, original_name)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
 
         # Log to CSV (filename relative to dataset/images for portability)
-        relative_filename = saved_path.name
-        append_csv_log(labels_csv, relative_filename, normalized_label)  # type: ignore[arg-type]
+        if not entry["duplicate"]:
+            append_csv_log(labels_csv, Path(entry["path"]).name, normalized_label)  # type: ignore[arg-type]
 
         # Return JSON response
-        project_root = get_project_root()
-        relative_path = saved_path.relative_to(project_root)
+        relative_path = (dataset_manifest.root / entry["path"]).relative_to(get_project_root())
 
         return JSONResponse(
             status_code=200,
             content={
                 "success": True,
                 "path": str(relative_path),
-                "label": normalized_label,
+                "label": entry["label"],
+                "sha256": entry["sha256"],
+                "split": entry["split"],
+                "status": entry["status"],
+                "duplicate": entry["duplicate"],
             },
         )
     except HTTPException:
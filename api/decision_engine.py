@@ -14,19 +14,23 @@ import logging
 import os
 import re
 from collections import defaultdict, deque, Counter
-from typing import Literal, Optional, Deque, Dict, List, Any
+from typing import TYPE_CHECKING, Literal, Optional, Deque, Dict, List, Any
 from pydantic import BaseModel, Field, ValidationError, validator
-from dotenv import load_dotenv
+from api.core.config import load_env
 from pathlib import Path
 from urllib.parse import urlparse
-from openai import OpenAI
 from fastapi import APIRouter, HTTPException, Query, Request
 from fastapi import Request as FastAPIRequest
+from api.core.json_response import FastJSONRoute
+from api.memory.event_log import event_log
 import httpx
-from bs4 import BeautifulSoup
+from api.utils.html_document import has_excluded_ancestor, parse_document
 import asyncio
 
-router = APIRouter()
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger("decision_engine")
 
 # Import decision memory layer
@@ -68,10 +72,7 @@ except ImportError:
 # Load environment variables
 project_root = Path(__file__).parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 # ====================================================
 # PLATFORM DETECTION
@@ -801,10 +802,10 @@ def validate_decision_output(data: dict, url: Optional[str] = None, should_suppr
 # OPENAI CLIENT
 # ====================================================
 
-_client: Optional[OpenAI] = None
+_client: Optional["OpenAI"] = None
 
 
-def get_client() -> OpenAI:
+def get_client() -> "OpenAI":
     """Get or create OpenAI client"""
     global _client
     if _client is None:
@@ -835,6 +836,7 @@ def get_client() -> OpenAI:
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable is not set")
         # Set timeout to 300 seconds (5 minutes) for long-running requests
+        from openai import OpenAI
         _client = OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
     return _client
 
@@ -1417,6 +1419,16 @@ YOU MUST CHOOSE: Outcome Unclear, Effort Too High, or Commitment Anxiety."""
                 except Exception as mem_error:
                     logger.warning(f"Failed to save to enhanced memory: {mem_error}", exc_info=True)
             
+            try:
+                event_log.append(
+                    source="decision_engine",
+                    domain=urlparse(page_url).netloc if page_url else "",
+                    blocker=validated_data.get('decision_blocker', ''),
+                    score=adjusted_confidence,
+                )
+            except Exception as log_error:
+                logger.debug(f"Failed to append decision event: {log_error}")
+            
             # Also save to legacy memory store for backward compatibility
             if page_url:
                 try:
@@ -1721,42 +1733,40 @@ class ReportFromUrlInput(BaseModel):
     timeoutSec: Optional[int] = Field(45, description="HTTP request timeout in seconds")
 
 
-def _extract_content_from_html(html: str, max_chars: int = 6000) -> str:
+def _extract_content_from_html(html, max_chars: int = 6000) -> str:
     """
-    Extract meaningful content from HTML:
+    Extract meaningful content from HTML (or a ParsedDocument):
     - Title and meta description
     - h1/h2/h3 headings
     - Body visible text (strip script/style/nav/footer)
     """
-    # BeautifulSoup will handle encoding from the already-decoded string
-    soup = BeautifulSoup(html, "lxml", from_encoding="utf-8")
-    
-    # Remove script, style, nav, footer
-    for tag in soup(["script", "style", "nav", "footer", "header"]):
-        tag.decompose()
+    doc = parse_document(html)
+    # Skipped instead of decompose()d - the parsed document is shared
+    excluded = ("script", "style", "nav", "footer", "header")
     
     parts = []
     
     # Title
-    title_tag = soup.find("title")
-    if title_tag:
-        parts.append(f"Title: {title_tag.get_text(strip=True)}")
+    if doc.soup.find("title") is not None:
+        parts.append(f"Title: {doc.title}")
     
     # Meta description
-    meta_desc = soup.find("meta", attrs={"name": "description"})
-    if meta_desc and meta_desc.get("content"):
-        parts.append(f"Meta Description: {meta_desc.get('content')}")
+    meta_desc = doc.meta.get("description")
+    if meta_desc:
+        parts.append(f"Meta Description: {meta_desc}")
     
     # Headings
-    for heading in soup.find_all(["h1", "h2", "h3"]):
+    for heading in doc.headings_by_tag("h1", "h2", "h3"):
+        if has_excluded_ancestor(heading, excluded):
+            continue
         text = heading.get_text(strip=True)
         if text:
             parts.append(text)
     
     # Body text
-    body = soup.find("body")
+    body = doc.body
     if body:
-        body_text = body.get_text(separator="\n", strip=True)
+        body_text = doc.text_excluding(excluded, separator="\n", strip=True, root=body)
         # Clean up excessive whitespace
         lines = [line.strip() for line in body_text.splitlines() if line.strip()]
         body_clean = "\n".join(lines)
@@ -3,93 +3,283 @@ Safe JSON parsing utilities for handling model responses.
 
 This module provides safe JSON parsing functions that handle cases where
 the model might return markdown, bullet points, or other non-JSON text.
+
+Model output is parsed in up to three steps, cheapest first:
+1. the JSON value is located (code fences and leading prose are skipped) and
+   decoded with the C decoder, which ignores trailing text
+2. if that fails, PartialJSONParser walks the text token by token (strings
+   and scalars are matched by regex, not character by character) and cuts it
+   back to the last complete value, closing any open containers, so output
+   cut off by max_tokens still yields every complete field
+3. when a pydantic schema is given, clean output is parsed and validated in
+   one pass by pydantic (model_validate_json); repaired output is validated
+   from the recovered dict
+
+PartialJSONParser also accepts streamed chunks (feed()), keeping its scan
+state between chunks so a stream is scanned once overall.
 """
 
 import json
-from typing import Any, Dict, Optional
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# strict=False: models sometimes emit raw newlines / tabs inside strings
+_DECODER = json.JSONDecoder(strict=False)
+_FENCE_RE = re.compile(r"```(?:json|JSON)?[ \t]*\n?")
+_LEAD_RE = re.compile(r"\s*(?:```(?:json|JSON)?[ \t]*\n?\s*)?")
+# One token per match: a complete string, a structural character, a scalar run, or whitespace
+_TOKEN_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\],:]|[^\s{}\[\],:"]+|\s+', re.S)
+_CLOSERS = {"{": "}", "[": "]"}
+
+
+class JSONParseError(ValueError):
+    """Model output could not be parsed as JSON (schema errors stay pydantic ValidationErrors)."""
+
+
+def _strip_fences(text: str) -> str:
+    """Return the content of the first ``` fenced block (closing fence optional)."""
+    match = _FENCE_RE.search(text)
+    if match is None:
+        return text
+    end = text.find("```", match.end())
+    block = text[match.end():end if end != -1 else len(text)].strip()
+    # A stray closing fence after the payload: keep the text as-is
+    return block if "{" in block or "[" in block else text
+
+
+def _locate_json(text: str) -> int:
+    """Index where the JSON value starts (after whitespace / an opening fence), or -1."""
+    i = _LEAD_RE.match(text).end()
+    if text[i:i + 1] in ("{", "["):
+        return i
+    # Prose before the payload ("Here is the analysis: {...}"): only accept an object
+    return text.find("{")
+
+
+class PartialJSONParser:
+    """
+    Incremental parser for (possibly truncated) JSON text.
+
+    feed() takes more text and returns the best value so far: the complete
+    value once the root container closes, otherwise the prefix up to the last
+    complete member with its open containers closed (None until one exists).
+    Incomplete strings, numbers and keys are dropped, never guessed.
+    """
+
+    def __init__(self) -> None:
+        self._text = ""
+        self._pos = 0
+        self._start = -1
+        self._stack: List[List[Any]] = []  # [opener, expecting_key]
+        self._safe_end = -1
+        self._safe_closers = ""
+        self._cache: Tuple[int, Any] = (-1, None)
+        self.complete = False
+        self.end = -1
+
+    def feed(self, chunk: str) -> Optional[Any]:
+        if chunk and not self.complete:
+            self._text += chunk
+            self._scan(final=False)
+        return self.value()
+
+    def close(self) -> Optional[Any]:
+        """
+        End of input: a trailing true / false / null counts as complete. A
+        trailing number does not (the cut may be inside it: 7 of 72), and
+        the root is always a container, so it is still open here.
+        """
+        if not self.complete:
+            self._scan(final=True)
+        return self.value()
+
+    def value(self) -> Optional[Any]:
+        if self.complete:
+            end, closers = self.end, ""
+        elif self._safe_end != -1:
+            end, closers = self._safe_end, self._safe_closers
+        else:
+            return None
+        if self._cache[0] != end:
+            try:
+                self._cache = (end, _DECODER.decode(self._text[self._start:end] + closers))
+            except ValueError:
+                return None  # e.g. an invalid escape inside a string
+        return self._cache[1]
+
+    def _mark_safe(self, end: int) -> None:
+        self._safe_end = end
+        self._safe_closers = "".join(_CLOSERS[level[0]] for level in reversed(self._stack))
+
+    def _value_done(self, end: int) -> None:
+        if not self._stack:
+            self.complete, self.end = True, end
+            return
+        self._mark_safe(end)
 
+    def _scan(self, final: bool) -> None:
+        text = self._text
+        if self._start == -1:
+            start = _locate_json(text)
+            if start == -1:
+                return  # no payload yet
+            self._start = self._pos = start
+        pos, n = self._pos, len(text)
+        while pos < n and not self.complete:
+            match = _TOKEN_RE.match(text, pos)
+            if match is None:
+                break  # unterminated string: wait for more text
+            token, end = match.group(), match.end()
+            first = token[0]
+            if first in "{[":
+                self._stack.append([first, first == "{"])
+                self._mark_safe(end)
+            elif first in "}]":
+                if not self._stack or _CLOSERS[self._stack[-1][0]] != first:
+                    break  # malformed: keep the last good prefix
+                self._stack.pop()
+                self._value_done(end)
+            elif first == ",":
+                if self._stack and self._stack[-1][0] == "{":
+                    self._stack[-1][1] = True
+            elif first == ":":
+                if self._stack:
+                    self._stack[-1][1] = False
+            elif first == '"':
+                if self._stack and self._stack[-1][0] == "{" and self._stack[-1][1]:
+                    pass  # a key; the member completes with its value
+                else:
+                    self._value_done(end)
+            elif not first.isspace():
+                if end == n and not (final and token in ("true", "false", "null")):
+                    break  # a number or literal may continue in the next chunk
+                try:
+                    json.loads(token)
+                except ValueError:
+                    break
+                self._value_done(end)
+            pos = end
+        self._pos = pos
+
+
+def parse_partial_json(text: str) -> Tuple[Optional[Any], bool]:
+    """
+    Parse JSON that may be wrapped in fences / prose or cut off.
+
+    Returns (value, complete). value is None when nothing usable was found.
+    """
+    text = _strip_fences(text.strip())
+    start = _locate_json(text)
+    if start == -1:
+        return None, False
+    try:
+        value, _ = _DECODER.raw_decode(text, start)
+        return value, True
+    except json.JSONDecodeError:
+        pass
+    parser = PartialJSONParser()
+    parser.feed(text[start:])
+    value = parser.close()
+    return value, parser.complete
+
+
+def _not_json_error(trimmed: str, context: str) -> JSONParseError:
+    preview = trimmed[:200] if len(trimmed) > 200 else trimmed
+    return JSONParseError(
+        f"{context} is not valid JSON. "
+        f"Expected JSON object or array, but got text starting with: {repr(preview[:50])}"
+    )
 
-def safe_parse_json(raw: str, context: str = "model response") -> Dict[str, Any]:
+
+def safe_parse_json(
+    raw: str,
+    context: str = "model response",
+    schema: Optional[Type[ModelT]] = None,
+    allow_partial: bool = True,
+) -> Any:
     """
     Safely parse JSON from model output, handling common edge cases.
-    
+
     Args:
         raw: Raw string output from the model
         context: Context string for error messages (e.g., "cognitive friction analysis")
-    
+        schema: Optional pydantic model; the parsed payload is validated and
+            returned as an instance of it
+        allow_partial: Recover the complete members of truncated output
+            (e.g. cut off by max_tokens) instead of failing
+
     Returns:
-        Parsed JSON object as dictionary
-    
+        Parsed JSON object as dictionary (or a `schema` instance)
+
     Raises:
-        ValueError: If the string is clearly not JSON or parsing fails
-        json.JSONDecodeError: If JSON parsing fails after validation
+        JSONParseError: If the string is clearly not JSON or parsing fails
+            (a ValueError, as before)
+        ValidationError: If the payload does not match `schema`
     """
     if not raw:
-        raise ValueError(f"Empty {context} received. Expected JSON object.")
-    
-    # Trim whitespace
-    trimmed = raw.strip()
-    
-    # Check if it looks like JSON (should start with { or [)
-    if not trimmed.startswith("{") and not trimmed.startswith("["):
-        # Log the problematic output for debugging
-        preview = trimmed[:200] if len(trimmed) > 200 else trimmed
-        raise ValueError(
-            f"{context} is not valid JSON. "
-            f"Expected JSON object or array, but got text starting with: {repr(preview[:50])}"
-        )
-    
-    # Try to extract JSON if it's wrapped in markdown code blocks
-    if "```json" in trimmed:
-        # Extract content between ```json and ```
-        start = trimmed.find("```json") + 7
-        end = trimmed.find("```", start)
-        if end != -1:
-            trimmed = trimmed[start:end].strip()
-    elif "```" in trimmed:
-        # Extract content between ``` and ```
-        start = trimmed.find("```") + 3
-        end = trimmed.find("```", start)
-        if end != -1:
-            trimmed = trimmed[start:end].strip()
-    
-    # Try to find JSON object boundaries if there's extra text
-    if trimmed.startswith("{"):
-        # Find the matching closing brace
-        brace_count = 0
-        json_end = -1
-        for i, char in enumerate(trimmed):
-            if char == "{":
-                brace_count += 1
-            elif char == "}":
-                brace_count -= 1
-                if brace_count == 0:
-                    json_end = i + 1
-                    break
-        if json_end > 0:
-            trimmed = trimmed[:json_end]
-    
-    # Final parse attempt
+        raise JSONParseError(f"Empty {context} received. Expected JSON object.")
+
+    trimmed = _strip_fences(raw.strip())
+    start = _locate_json(trimmed)
+    if start == -1:
+        raise _not_json_error(trimmed, context)
+
+    if schema is not None and start == 0:
+        # Clean output: parse and validate in one pass inside pydantic
+        try:
+            return schema.model_validate_json(trimmed)
+        except ValidationError:
+            pass  # trailing text, truncation or a real schema error: handled below
+
     try:
-        return json.loads(trimmed)
+        payload, _ = _DECODER.raw_decode(trimmed, start)
     except json.JSONDecodeError as e:
-        # Log the problematic output for debugging
-        preview = trimmed[:500] if len(trimmed) > 500 else trimmed
-        # Check for common error patterns
-        error_str = str(e)
-        if "No number after minus sign" in error_str or trimmed.startswith("-"):
-            print(f"⚠️ Model returned markdown/bullet point instead of JSON: {repr(preview[:100])}")
-            raise ValueError(
-                f"{context} returned non-JSON format (likely markdown or bullet points). "
-                f"Expected JSON object starting with '{{' or '['. "
-                f"Got: {repr(preview[:50])}"
-            ) from e
-        
-        error_msg = (
-            f"Failed to parse {context} as JSON. "
-            f"Error: {error_str}. "
-            f"Raw output preview: {repr(preview)}"
+        payload = None
+        if allow_partial:
+            parser = PartialJSONParser()
+            parser.feed(trimmed[start:])
+            payload = parser.close()
+        if not payload:
+            # Nothing complete before the cut (or not JSON at all)
+            raise _parse_error(trimmed, context, e) from e
+        logger.warning("Recovered the complete fields of truncated %s JSON: %s", context, e)
+
+    if schema is not None:
+        return schema.model_validate(payload)
+    return payload
+
+
+def _parse_error(trimmed: str, context: str, e: json.JSONDecodeError) -> JSONParseError:
+    preview = trimmed[:500] if len(trimmed) > 500 else trimmed
+    # Check for common error patterns
+    error_str = str(e)
+    if "No number after minus sign" in error_str or trimmed.startswith("-"):
+        logger.warning("Model returned markdown/bullet point instead of JSON: %r", preview[:100])
+        return JSONParseError(
+            f"{context} returned non-JSON format (likely markdown or bullet points). "
+            f"Expected JSON object starting with '{{' or '['. "
+            f"Got: {repr(preview[:50])}"
         )
-        print(f"⚠️ {error_msg}")
-        raise ValueError(error_msg) from e
 
+    error_msg = (
+        f"Failed to parse {context} as JSON. "
+        f"Error: {error_str}. "
+        f"Raw output preview: {repr(preview)}"
+    )
+    logger.warning(error_msg)
+    return JSONParseError(error_msg)
+
+
+def parse_json_object(raw: str, context: str = "model response") -> Dict[str, Any]:
+    """safe_parse_json for call sites that need a JSON object."""
+    payload = safe_parse_json(raw, context=context)
+    if not isinstance(payload, dict):
+        raise JSONParseError(f"{context} is not a JSON object")
+    return payload
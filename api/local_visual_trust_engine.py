@@ -10,8 +10,14 @@ from typing import Dict
 def get_model_status() -> str:
     """
     DEPRECATED: TensorFlow model loading removed.
-    Returns status message indicating OpenCV-based implementation is used.
+    Returns status message indicating OpenCV-based implementation is used,
+    plus the exported lightweight model if one is loaded.
     """
+    from api.vision.trust_model_runtime import get_trust_model
+
+    runtime = get_trust_model()
+    if runtime is not None:
+        return f"VisualTrust: Using OpenCV + local extractor + learned model ({runtime.backend})"
     return "VisualTrust: Using OpenCV + local extractor (TensorFlow removed)"
 
 
@@ -8,21 +8,9 @@ Deployment:
   Module path: api.main:app
 """
 # Load environment variables FIRST, before any other imports that might use os.getenv()
-from dotenv import load_dotenv
-from pathlib import Path
+from api.core.config import load_env
 
-# Load .env from project root
-project_root = Path(__file__).parent.parent
-env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    # Fallback to api/.env if it exists
-    api_env = Path(__file__).parent / ".env"
-    if api_env.exists():
-        load_dotenv(api_env, override=True)
-    else:
-        load_dotenv()  # Load from current directory or system env
+load_env()
 
 import sys
 import asyncio
@@ -39,7 +27,13 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.exceptions import RequestValidationError
 from pydantic import BaseModel, ValidationError
+from api.core.cache import cache_stats
 from api.core.errors import http_exception_handler, unhandled_exception_handler
+from api.core.json_response import FastJSONResponse, FastJSONRoute, register_fast_model
+from api.core.lazy import include_lazy_router, load_lazy_routers, pending_lazy_routers
+from api.core.warmup import WarmupRunner
+from api.core.write_behind import flush_on_shutdown, write_behind
+from api.services.warmup import register_default_tasks
 import os
 import sys
 import base64
@@ -48,7 +42,6 @@ import logging
 import io
 from pathlib import Path
 from typing import Optional, Dict, Any
-from uuid import uuid4
 from PIL import Image
 import numpy as np
 
@@ -84,70 +77,65 @@ from api.psychology_engine import (
 )
 from api.rewrite_engine import rewrite_text
 from api.models.rewrite_models import RewriteInput, RewriteOutput
-from api.decision_engine import router as decision_engine_router
-# Check OpenCV availability first
-try:
-    import cv2  # noqa: F401
-    OPENCV_AVAILABLE = True
-except Exception:
-    OPENCV_AVAILABLE = False
+from api.schemas.human_report_v1 import HumanReportV1
+# OpenCV, the local visual extractor and VisualTrust are imported on first use
+# (or by the startup preload), not at import: see _visual_trust()
+_VISUAL_TRUST: Optional[Dict[str, Any]] = None
 
-# Check if local visual extractor can be loaded
-extractor_loaded_ok = False
-try:
-    from api.vision.local_visual_extractor import extract_visual_elements
-    extractor_loaded_ok = True
-except Exception:
-    extractor_loaded_ok = False
-
-# Lazy import VisualTrust to prevent startup crashes
-VISUAL_TRUST_AVAILABLE = False
-analyze_visual_trust_from_path = None
-if OPENCV_AVAILABLE and extractor_loaded_ok:
-    try:
-        from api.visual_trust_engine import analyze_visual_trust_from_path
-        VISUAL_TRUST_AVAILABLE = True
-    except (ImportError, Exception) as e:
-        # VisualTrust not available - app will still start
-        import logging
-        logger = logging.getLogger("brain")
-        logger.warning(f"VisualTrust import failed (non-fatal): {e}")
-        print(f"⚠️  VisualTrust not available: {e}")
-else:
-    import logging
+
+def _visual_trust() -> Dict[str, Any]:
+    """Import VisualTrust and its dependencies once; reports what is available."""
+    global _VISUAL_TRUST
+    if _VISUAL_TRUST is not None:
+        return _VISUAL_TRUST
     logger = logging.getLogger("brain")
-    if not OPENCV_AVAILABLE:
-        logger.warning("OpenCV not available - VisualTrust will use fallback mode")
-        print("⚠️  OpenCV not available - VisualTrust will use fallback mode")
-    if not extractor_loaded_ok:
-        logger.warning("Local visual extractor not available - VisualTrust will use fallback mode")
-        print("⚠️  Local visual extractor not available - VisualTrust will use fallback mode")
+    status: Dict[str, Any] = {"opencv": False, "extractor": False, "analyze": None, "analyze_bytes": None}
+    try:
+        import cv2  # noqa: F401
+        status["opencv"] = True
+    except Exception:
+        pass
+    try:
+        from api.vision.local_visual_extractor import extract_visual_elements  # noqa: F401
+        status["extractor"] = True
+    except Exception:
+        pass
+    if status["opencv"] and status["extractor"]:
+        try:
+            from api.visual_trust_engine import analyze_visual_trust_from_path, run_visual_trust_from_bytes
+            status["analyze"] = analyze_visual_trust_from_path
+            status["analyze_bytes"] = run_visual_trust_from_bytes
+        except (ImportError, Exception) as e:
+            # VisualTrust not available - app keeps serving in fallback mode
+            logger.warning(f"VisualTrust import failed (non-fatal): {e}")
+            print(f"⚠️  VisualTrust not available: {e}")
+    else:
+        if not status["opencv"]:
+            logger.warning("OpenCV not available - VisualTrust will use fallback mode")
+            print("⚠️  OpenCV not available - VisualTrust will use fallback mode")
+        if not status["extractor"]:
+            logger.warning("Local visual extractor not available - VisualTrust will use fallback mode")
+            print("⚠️  Local visual extractor not available - VisualTrust will use fallback mode")
+    _VISUAL_TRUST = status
+    return status
+
+
+def _visual_trust_status() -> str:
+    status = _visual_trust()
+    if status["analyze"] is not None:
+        return "Available (OpenCV + local extractor)"
+    if status["opencv"] and not status["extractor"]:
+        return "Limited / Fallback mode (OpenCV available, extractor failed)"
+    if not status["opencv"] and status["extractor"]:
+        return "Limited / Fallback mode (OpenCV not available, extractor OK)"
+    return "Limited / Fallback mode (OpenCV not available, extractor not available)"
+
+
 # TensorFlow removed - no model loading needed
-from api.routes.image_trust_local import router as image_trust_local_router
-from api.routes.image_trust import router as image_trust_router
-from api.routes.training_landing_friction import router as landing_friction_training_router
-from api.routes.analyze_url import router as analyze_url_router
-from api.routes.analyze_url_human import router as analyze_url_human_router
-from api.routes.analyze_human import router as analyze_human_router
-from api.routes.analyze_image_human import router as analyze_image_human_router
-from api.routes.analyze_text_human import router as analyze_text_human_router
-from api.routes.debug_screenshot import router as debug_screenshot_router
 from api.routes.debug import router as debug_router
 from api.routes.brain_features import router as brain_features_router
 from api.routes.explain import router as explain_router
 
-# Import evidence router
-try:
-    from api.routes.evidence import router as evidence_router
-except ImportError:
-    evidence_router = None
-
-# Import proxy router
-try:
-    from api.routes.proxy import router as proxy_router
-except ImportError:
-    proxy_router = None
-
 # Import decision scan router
 try:
     from api.routes.decision_scan import router as decision_scan_router
@@ -168,14 +156,7 @@ except ImportError:
     get_all_packages = None
     PricingTier = None
 
-# Load environment variables
-# Try loading from project root .env file
 project_root = Path(__file__).parent.parent
-env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
 
 PSYCHOLOGY_FINE_TUNE_MODEL_PATH = (
     project_root / "data" / "psychology_training" / "fine_tune" / "last_model.json"
@@ -219,7 +200,10 @@ def load_psychology_finetune_model_id() -> str:
     return model_id
 
 # Initialize FastAPI app
-app = FastAPI(title="Nima AI Brain API", version="1.0.0")
+app = FastAPI(title="Nima AI Brain API", version="1.0.0", default_response_class=FastJSONResponse)
+# Untyped (dict) results skip jsonable_encoder and go straight to orjson
+app.router.route_class = FastJSONRoute
+register_fast_model(CognitiveFrictionResult, PsychologyAnalysisResult, HumanReportV1)
 
 # Register standardized error handlers
 # These must be registered BEFORE other exception handlers to take precedence
@@ -236,15 +220,18 @@ from api.paths import ARTIFACTS_DIR, DEBUG_SHOTS_DIR
 
 # Define route handler for artifacts BEFORE mount (so it takes precedence over StaticFiles)
 @app.get("/api/artifacts/{filename:path}")
-async def serve_artifact(filename: str):
+async def serve_artifact(filename: str, request: Request):
     """
     Serve artifact files directly (works better than StaticFiles mount in Railway).
     
     Returns:
-        - FileResponse with Cache-Control headers if file exists
+        - File response with Cache-Control and ETag (the content hash from the
+          artifact index) if file exists; 304 when If-None-Match matches. The
+          copy is left to the server / proxy where possible (see
+          api/services/artifacts.py artifact_response)
         - 404 JSON with clear error detail if not found
     """
-    from fastapi.responses import FileResponse, JSONResponse
+    from fastapi.responses import JSONResponse, Response
     from fastapi import HTTPException
     from api.core.errors import error_payload
     import logging
@@ -269,7 +256,15 @@ async def serve_artifact(filename: str):
         f"cwd={os.getcwd()}"
     )
     
-    if not file_path.exists() or not file_path.is_file():
+    # Dotfiles (the artifact index, write-behind temp files) are never artifacts
+    if file_path.name.startswith(".") or not file_path.exists() or not file_path.is_file():
+        # Queued by save_artifact_bytes but not written yet: serve from memory
+        from api.services.artifacts import pending_artifact_bytes
+        pending = pending_artifact_bytes(filename)
+        if pending:
+            media_type = "image/png" if filename.lower().endswith(".png") else "application/octet-stream"
+            return Response(content=pending, media_type=media_type, headers={"Cache-Control": "no-store"})
+
         # Log available files for debugging
         try:
             # Get all PNG files, sorted by modification time (newest first)
@@ -334,31 +329,53 @@ async def serve_artifact(filename: str):
             )
         )
     
-    # Determine media type based on extension
-    media_type = "image/png" if filename.lower().endswith(".png") else "application/octet-stream"
-    
+    from api.services.artifacts import artifact_info, artifact_response
+
+    info = await asyncio.to_thread(artifact_info, file_path)
     logger.info(f"Serving artifact: {filename}, size: {file_size} bytes")
     
-    # Create response with Cache-Control header for immutable filenames
-    response = FileResponse(
-        path=str(file_path),
-        media_type=media_type,
-        filename=filename
-    )
-    
-    # Add Cache-Control header for immutable filenames (filenames with epoch are immutable)
+    # Filenames with an epoch suffix are immutable
     if "_" in filename and filename.split("_")[-1].replace(".png", "").isdigit():
-        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        cache_control = "public, max-age=31536000, immutable"
     else:
         # For other files, shorter cache
-        response.headers["Cache-Control"] = "public, max-age=3600"
+        cache_control = "public, max-age=3600"
     
-    return response
+    if info is not None and request.headers.get("if-none-match") == info.etag:
+        return Response(status_code=304, headers={"ETag": info.etag, "Cache-Control": cache_control})
+    return artifact_response(file_path, info, headers={"Cache-Control": cache_control})
+
+
+@app.get("/api/artifact-info/{filename}")
+async def get_artifact_info(filename: str):
+    """
+    Size, sha256, media type and image dimensions of an artifact, from the
+    artifact index (no image decode).
+    """
+    from api.services.artifacts import artifact_info
+
+    info = None if filename.startswith(".") else await asyncio.to_thread(artifact_info, filename)
+    if info is None:
+        raise HTTPException(status_code=404, detail=f"Artifact not found: {filename}")
+    return info.to_dict()
 
 # Note: We use route handler instead of mount for /api/artifacts to ensure it works in Railway
 # Mount debug_shots directory (static files work fine for this)
 app.mount("/api/debug_shots", StaticFiles(directory=str(DEBUG_SHOTS_DIR)), name="debug_shots")
 
+async def _warm_routers() -> Dict[str, Any]:
+    await load_lazy_routers(app)
+    return {"pending": pending_lazy_routers(app)}
+
+
+# Startup warm-up (api/core/warmup.py): runs in the background after startup;
+# /ready reports 503 until it has finished
+warmup = WarmupRunner()
+warmup.register("routers", _warm_routers)
+warmup.register("visual_trust", _visual_trust_status)
+register_default_tasks(warmup)
+
+
 # Startup event: Log environment configuration (non-blocking)
 @app.on_event("startup")
 async def startup_event():
@@ -388,18 +405,13 @@ async def startup_event():
     
     print(f"Quality Engine: {'Enabled' if quality_enabled else 'Disabled'}")
     
-    # VisualTrust status with detailed info
-    if VISUAL_TRUST_AVAILABLE:
-        vt_status = "Available (OpenCV + local extractor)"
-    elif OPENCV_AVAILABLE and not extractor_loaded_ok:
-        vt_status = "Limited / Fallback mode (OpenCV available, extractor failed)"
-    elif not OPENCV_AVAILABLE and extractor_loaded_ok:
-        vt_status = "Limited / Fallback mode (OpenCV not available, extractor OK)"
-    else:
-        vt_status = "Limited / Fallback mode (OpenCV not available, extractor not available)"
-    
-    print(f"VisualTrust: {vt_status}")
+    print("VisualTrust: Will load during warm-up (lazy loading)")
+    print(f"Warm-up: {', '.join(t.name for t in warmup.selected()) if warmup.enabled else 'Disabled'}")
     print("=" * 60)
+
+    # Routers, models, browser and caches load off the request path
+    if warmup.enabled:
+        app.state.warmup_task = asyncio.create_task(warmup.run())
     
     try:
         from api.core.config import get_main_brain_backend_url, is_local_dev
@@ -425,6 +437,22 @@ async def startup_event():
         print(f"⚠️  Could not load backend URL config: {e}")
         print("   Server will continue, but some features may not work.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write everything still queued for write-behind before the process exits."""
+    logger = logging.getLogger("brain")
+    depth = write_behind.stats()["depth"]
+    if depth:
+        logger.info(f"Flushing {depth} queued writes before shutdown")
+    if not await asyncio.to_thread(flush_on_shutdown):
+        logger.warning(f"Write-behind queue not drained at shutdown: {write_behind.stats()}")
+    try:
+        from api.memory.event_log import event_log
+        event_log.flush()
+    except Exception as e:
+        logger.warning(f"Event log flush at shutdown failed: {e}")
+
+
 # Add CORS middleware
 # Production: allow frontend domains
 # Development: allow localhost for local testing
@@ -489,6 +517,11 @@ else:
         allow_headers=["*"],
     )
 
+# Page HTML parsed once per request and released with it (api/utils/html_document.py)
+from api.utils.html_document import DocumentScopeMiddleware
+
+app.add_middleware(DocumentScopeMiddleware)
+
 # Exception handler for validation errors (422)
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -569,7 +602,7 @@ def include_dataset_router(app: FastAPI) -> None:
         )
         logger.error("Dataset upload router disabled: %s", exc)
 
-        fallback_router = APIRouter(prefix="/api/dataset", tags=["dataset"])
+        fallback_router = APIRouter(prefix="/api/dataset", tags=["dataset"], route_class=FastJSONRoute)
 
         @fallback_router.post("/upload-image")
         async def dataset_upload_unavailable() -> dict[str, str]:
@@ -582,29 +615,35 @@ def include_dataset_router(app: FastAPI) -> None:
 
 
 include_dataset_router(app)
-app.include_router(image_trust_router, prefix="/api/analyze/image-trust", tags=["image-trust"])
-app.include_router(image_trust_local_router)
-app.include_router(landing_friction_training_router)
-app.include_router(analyze_url_router)
-app.include_router(analyze_url_human_router)
-app.include_router(analyze_human_router)  # Unified intake endpoint
-app.include_router(analyze_image_human_router)  # Image analysis endpoint
-app.include_router(analyze_text_human_router)  # Text analysis endpoint
-app.include_router(debug_screenshot_router)
+# Heavy routers (engines, OpenCV, the OpenAI SDK) are imported on first request
+# or by the background preload after startup; see api/core/lazy.py
+include_lazy_router(
+    app, "api.routes.image_trust", paths=["/api/analyze/image-trust"],
+    prefix="/api/analyze/image-trust", tags=["image-trust"],
+)
+include_lazy_router(app, "api.routes.image_trust_local", paths=["/api/analyze/image-trust-local"])
+include_lazy_router(app, "api.routes.training_landing_friction", paths=["/api/training/landing-friction"])
+include_lazy_router(
+    app, "api.routes.analyze_url",
+    paths=["/analyze-url", "/api/analyze/url-decision", "/api/analyze/url-signals"],
+)
+include_lazy_router(app, "api.routes.analyze_url_human", paths=["/api/analyze/url-human"])
+include_lazy_router(app, "api.routes.analyze_human", paths=["/api/analyze/human"])  # Unified intake endpoint
+include_lazy_router(app, "api.routes.analyze_image_human", paths=["/api/analyze/image-human"])  # Image analysis endpoint
+include_lazy_router(app, "api.routes.analyze_text_human", paths=["/api/analyze/text-human"])  # Text analysis endpoint
+include_lazy_router(app, "api.routes.debug_screenshot", paths=["/debug/screenshot"])
 app.include_router(debug_router)
 app.include_router(brain_features_router)
 if brain_memory_router:
     app.include_router(brain_memory_router)
 app.include_router(explain_router, prefix="", tags=["Explanation"])
-app.include_router(
-    decision_engine_router,
+include_lazy_router(
+    app, "api.decision_engine", paths=["/api/brain/decision-engine"],
     prefix="/api/brain",
     tags=["Decision Engine"]
 )
-if evidence_router:
-    app.include_router(evidence_router)
-if proxy_router:
-    app.include_router(proxy_router)
+include_lazy_router(app, "api.routes.evidence", paths=["/api/brain/evidence"], optional=True)
+include_lazy_router(app, "api.routes.proxy", paths=["/api/proxy"], optional=True)
 if decision_scan_router:
     app.include_router(decision_scan_router)
 
@@ -912,11 +951,6 @@ def _safe_visual_trust_analysis(
     if not image_bytes:
         return base_response
 
-    tmp_dir = project_root / "dataset" / "tmp_visual_trust"
-    tmp_dir.mkdir(parents=True, exist_ok=True)
-    ext = Path(image_name or "").suffix or ".png"
-    tmp_path = tmp_dir / f"visual_trust_{uuid4().hex}{ext}"
-
     def _score_for_label(scores: Dict[str, Any], label_keyword: str) -> float:
         for key, value in (scores or {}).items():
             if label_keyword in key.lower():
@@ -927,11 +961,10 @@ def _safe_visual_trust_analysis(
         return 0.0
 
     try:
-        with tmp_path.open("wb") as buffer:
-            buffer.write(image_bytes)
-
-        if VISUAL_TRUST_AVAILABLE and analyze_visual_trust_from_path:
-            vt = analyze_visual_trust_from_path(str(tmp_path))
+        # Analyzed from the bytes in hand (no temp file round-trip)
+        run_visual_trust_from_bytes = _visual_trust()["analyze_bytes"]
+        if run_visual_trust_from_bytes:
+            vt = run_visual_trust_from_bytes(image_bytes)
         else:
             vt = {"trust_label": "unknown", "trust_scores": {}, "trust_score_numeric": 0.0}
         trust_scores = vt.get("trust_scores") or {}
@@ -954,12 +987,6 @@ def _safe_visual_trust_analysis(
         response = base_response.copy()
         response["error"] = f"visual_trust_analysis_failed: {err}"
         return response
-    finally:
-        try:
-            if tmp_path.exists():
-                tmp_path.unlink()
-        except Exception:
-            pass
 
 
 # Lazy load system prompt (moved to startup event to prevent timeout)
@@ -1426,6 +1453,38 @@ def health():
     return {"status": "ok"}
 
 
+@app.get("/live")
+def live():
+    """
+    Liveness probe: the process is up and the event loop answers.
+
+    No dependency checks; a failing liveness probe means "restart me".
+    """
+    return {"status": "alive"}
+
+
+@app.get("/ready")
+def ready():
+    """
+    Readiness probe: 503 until startup warm-up has finished.
+
+    Also reports the write-behind queue (depth, written / failed counters)
+    and the shared cache (backend, hits per tier and namespace).
+
+    With WARMUP_ENABLED=false the instance is ready immediately and
+    everything loads on first use.
+    """
+    content = {
+        "status": "ready" if warmup.ready else "starting",
+        "warmup": warmup.status(),
+        "write_behind": write_behind.stats(),
+        "cache": cache_stats(),
+    }
+    if not warmup.ready:
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+
 @app.get("/api/_build")
 def build_info():
     """
@@ -2221,7 +2280,9 @@ async def image_trust_endpoint(input_data: CognitiveFrictionInput):
                 response["error"] = "invalid_image_payload"
                 return {"visual_trust_analysis": response}
 
-        visual_payload = _safe_visual_trust_analysis(
+        # CPU-bound inference: keep it off the event loop
+        visual_payload = await asyncio.to_thread(
+            _safe_visual_trust_analysis,
             image_bytes=image_bytes,
             image_name=input_data.image_name,
         )
@@ -2369,15 +2430,9 @@ async def psychology_analysis_with_image(
     visual_trust_result = None
 
     if image is not None:
-        project_root = Path(__file__).parent.parent
-        tmp_dir = project_root / "dataset" / "tmp_images"
-        tmp_dir.mkdir(parents=True, exist_ok=True)
-
-        ext = Path(image.filename or "").suffix or ".jpg"
-        tmp_path = tmp_dir / f"psychology_visual_{uuid4().hex}{ext}"
-
         try:
-            # Save uploaded image to a temporary file
+            # The upload is analyzed in memory (it used to round-trip through
+            # dataset/tmp_images on the request path)
             print(f"[VISUAL_ANALYSIS] Reading image file: {image.filename}, content_type: {image.content_type}")
             
             # Reset file pointer to beginning (in case it was read before)
@@ -2389,17 +2444,9 @@ async def psychology_analysis_with_image(
             
             print(f"[VISUAL_ANALYSIS] Image read successfully: {len(content)} bytes")
             
-            with tmp_path.open("wb") as buffer:
-                buffer.write(content)
-            
-            # Verify file was written
-            if not tmp_path.exists() or tmp_path.stat().st_size == 0:
-                raise ValueError(f"Failed to save image to temporary path: {tmp_path}")
-            
-            print(f"[VISUAL_ANALYSIS] Image saved to: {tmp_path} ({tmp_path.stat().st_size} bytes)")
-            
-            if VISUAL_TRUST_AVAILABLE and analyze_visual_trust_from_path:
-                vt = analyze_visual_trust_from_path(str(tmp_path))
+            analyze_visual_trust_from_bytes = _visual_trust()["analyze_bytes"]
+            if analyze_visual_trust_from_bytes:
+                vt = await asyncio.to_thread(analyze_visual_trust_from_bytes, content)
                 print(f"[VISUAL_ANALYSIS] Visual trust analysis completed: {vt.get('trust_label', 'unknown')}")
             else:
                 vt = {"trust_label": "unknown", "trust_scores": {}, "trust_score_numeric": 0.0}
@@ -2441,7 +2488,7 @@ async def psychology_analysis_with_image(
                 visual_layer = {
                     "visual_trust_label": "N/A",
                     "visual_trust_score": None,
-                    "visual_comment": "Visual trust analysis in fallback mode (OpenCV or extractor not available)" if not VISUAL_TRUST_AVAILABLE else "Visual trust analysis uses OpenCV + local extractor (no TensorFlow model required)"
+                    "visual_comment": "Visual trust analysis in fallback mode (OpenCV or extractor not available)" if _visual_trust()["analyze"] is None else "Visual trust analysis uses OpenCV + local extractor (no TensorFlow model required)"
                 }
                 # Build fallback VisualTrustResult - Temporarily disabled
                 # visual_trust_result = _build_visual_trust_result(
@@ -2489,14 +2536,6 @@ async def psychology_analysis_with_image(
             #     notes=f"Visual analysis encountered an error: {error_msg}"
             # )
             visual_trust_result = None
-        finally:
-            # Clean up temporary file
-            try:
-                if tmp_path.exists():
-                    tmp_path.unlink()
-            except Exception:
-                # Non-fatal if cleanup fails
-                pass
 
     # Step 3: Merge visual trust into final response
     if visual_trust is not None:
@@ -4,93 +4,252 @@ Decision Brain memory storage (SQLite).
 Stores:
 - analyses: per-page analysis snapshots
 - feedback: user feedback on analyses
+- analysis_issues: the issue ids of each analysis, in report order
+- issue_stats: running suggested / accurate / wrong counters per
+  (page_type, issue_id), updated in the same transaction as the analysis or
+  feedback row that changes them; dirty marks pairs whose weight is stale
 - weights: calibration weights per (page_type, issue_id)
+
+Calibration only recomputes the dirty pairs (O(changed pairs), no JSON
+parsing); calibrate_weights(full=True) rebuilds the counters from the
+analyses / feedback tables first and reports how many pairs had drifted.
+
+Weight lookups (brain_rules, once per report) are served from an in-process
+WeightCache: one snapshot dict per page_type, dropped when the
+weights_version row in meta changes. Calibration bumps that row, and other
+workers notice on their next version check (at most every
+BRAIN_WEIGHTS_CACHE_CHECK_SECONDS, default 1; 0 checks on every lookup).
+
+Request handlers use queue_analysis(): the analysis ID comes from a block
+reserved up front (AnalysisIds, meta row next_analysis_id) and the row is
+written by the write-behind queue (api/core/write_behind.py), batched with
+other queued analyses in one transaction. analysis_exists() also answers for
+queued analyses, so feedback can arrive before the row is written.
+
+Each logged analysis is also appended to the analysis event log
+(api/memory/event_log.py) for offline aggregation.
+
+Access goes through a pooled, WAL-mode SQLiteStore (api/memory/store.py); the
+schema is created once per process. Async routes use the *_async variants,
+which run the same functions on a worker thread.
+
+Config (env):
+- BRAIN_MEMORY_ID_BLOCK: analysis ids reserved per database round trip (default: 32)
+- BRAIN_WEIGHTS_CACHE_CHECK_SECONDS: see WeightCache (default: 1)
 """
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import sqlite3
-from dataclasses import dataclass
+import threading
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple
 
 from urllib.parse import urlparse
 
+from api.core.config import get_env
+from api.core.write_behind import flush_on_shutdown, write_behind
+from api.memory.event_log import event_log
+from api.memory.store import SQLiteStore
 
 BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = BASE_DIR / "brain_memory.db"
+DEFAULT_ID_BLOCK = 32
+ANALYSES_SINK = "brain_memory.analyses"
+
+# At exit (LIFO): drain queued analyses first, then the events they append
+atexit.register(event_log.flush)
+atexit.register(flush_on_shutdown)
 
 
 def _utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
-def _get_conn() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    url TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    ruleset_version TEXT NOT NULL,
+    decision_probability REAL,
+    top_issues_json TEXT NOT NULL,
+    screenshots_json TEXT,
+    report_hash TEXT
+);
+
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    analysis_id INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    label TEXT NOT NULL,
+    notes TEXT,
+    wrong_issues_json TEXT,
+    FOREIGN KEY (analysis_id) REFERENCES analyses(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS weights (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    updated_at TEXT NOT NULL,
+    page_type TEXT NOT NULL,
+    issue_id TEXT NOT NULL,
+    weight REAL NOT NULL,
+    evidence_json TEXT NOT NULL,
+    UNIQUE(page_type, issue_id)
+);
+
+CREATE TABLE IF NOT EXISTS analysis_issues (
+    analysis_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    page_type TEXT NOT NULL,
+    issue_id TEXT NOT NULL,
+    PRIMARY KEY (analysis_id, position),
+    FOREIGN KEY (analysis_id) REFERENCES analyses(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS issue_stats (
+    page_type TEXT NOT NULL,
+    issue_id TEXT NOT NULL,
+    suggested REAL NOT NULL DEFAULT 0,
+    accurate REAL NOT NULL DEFAULT 0,
+    wrong REAL NOT NULL DEFAULT 0,
+    dirty INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (page_type, issue_id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO meta (key, value) VALUES ('weights_version', 0);
+
+CREATE INDEX IF NOT EXISTS idx_analyses_page_type ON analyses(page_type);
+CREATE INDEX IF NOT EXISTS idx_analyses_domain_created ON analyses(domain, created_at);
+CREATE INDEX IF NOT EXISTS idx_feedback_analysis_id ON feedback(analysis_id);
+CREATE INDEX IF NOT EXISTS idx_issue_stats_dirty ON issue_stats(dirty) WHERE dirty = 1;
+"""
 
+# (page_type, issue_id) -> [suggested, accurate, wrong]
+Stats = Dict[Tuple[str, str], List[float]]
 
-def init_db() -> None:
-    """Create tables if they do not exist."""
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
 
-        # Analyses table
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS analyses (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                created_at TEXT NOT NULL,
-                url TEXT NOT NULL,
-                domain TEXT NOT NULL,
-                page_type TEXT NOT NULL,
-                ruleset_version TEXT NOT NULL,
-                decision_probability REAL,
-                top_issues_json TEXT NOT NULL,
-                screenshots_json TEXT,
-                report_hash TEXT
-            )
-            """
-        )
+def _issue_ids(top_issues: Any) -> List[str]:
+    return [
+        str(issue.get("id"))
+        for issue in top_issues or []
+        if isinstance(issue, dict) and issue.get("id")
+    ]
 
-        # Feedback table
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS feedback (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                analysis_id INTEGER NOT NULL,
-                created_at TEXT NOT NULL,
-                label TEXT NOT NULL,
-                notes TEXT,
-                wrong_issues_json TEXT,
-                FOREIGN KEY (analysis_id) REFERENCES analyses(id) ON DELETE CASCADE
-            )
-            """
-        )
 
-        # Weights table
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS weights (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                updated_at TEXT NOT NULL,
-                page_type TEXT NOT NULL,
-                issue_id TEXT NOT NULL,
-                weight REAL NOT NULL,
-                evidence_json TEXT NOT NULL,
-                UNIQUE(page_type, issue_id)
-            )
-            """
+def _add(stats: Stats, page_type: str, issue_id: str, column: int, delta: float) -> None:
+    stats.setdefault((page_type, issue_id), [0.0, 0.0, 0.0])[column] += delta
+
+
+def _feedback_deltas(
+    stats: Stats,
+    label: Optional[str],
+    wrong_issues: Any,
+    page_type: str,
+    issue_ids: List[str],
+) -> None:
+    """Add one feedback row's contribution to stats."""
+    label = (label or "").lower()
+    # Accurate / partial feedback applies to all issues in the analysis
+    if label in {"accurate", "partial"}:
+        delta = 1.0 if label == "accurate" else 0.5
+        for issue_id in issue_ids:
+            _add(stats, page_type, issue_id, 1, delta)
+
+    wrong_set = {str(i) for i in wrong_issues or [] if i}
+    if wrong_set:
+        # Explicit wrong issues
+        for issue_id in wrong_set:
+            _add(stats, page_type, issue_id, 2, 1.0)
+    elif label == "wrong":
+        # Entire analysis considered wrong
+        for issue_id in issue_ids:
+            _add(stats, page_type, issue_id, 2, 1.0)
+
+
+def _apply_stats(conn: sqlite3.Connection, stats: Stats) -> None:
+    """Add deltas to the running counters and mark the pairs dirty."""
+    conn.executemany(
+        """
+        INSERT INTO issue_stats (page_type, issue_id, suggested, accurate, wrong, dirty)
+        VALUES (?, ?, ?, ?, ?, 1)
+        ON CONFLICT(page_type, issue_id) DO UPDATE SET
+            suggested = suggested + excluded.suggested,
+            accurate = accurate + excluded.accurate,
+            wrong = wrong + excluded.wrong,
+            dirty = 1
+        """,
+        [(page_type, issue_id, *counts) for (page_type, issue_id), counts in stats.items()],
+    )
+
+
+def _load_json_list(value: Optional[str]) -> List[Any]:
+    try:
+        return json.loads(value or "[]")
+    except json.JSONDecodeError:
+        return []
+
+
+def _rebuild_stats(conn: sqlite3.Connection) -> Stats:
+    """Counters recomputed from analysis_issues + feedback."""
+    stats: Stats = {}
+    issues_by_analysis: Dict[int, List[str]] = {}
+    for row in conn.execute(
+        "SELECT analysis_id, page_type, issue_id FROM analysis_issues ORDER BY analysis_id, position"
+    ):
+        issues_by_analysis.setdefault(row["analysis_id"], []).append(row["issue_id"])
+        _add(stats, row["page_type"], row["issue_id"], 0, 1.0)
+
+    for row in conn.execute(
+        """
+        SELECT f.analysis_id, f.label, f.wrong_issues_json, a.page_type
+        FROM feedback f
+        JOIN analyses a ON f.analysis_id = a.id
+        """
+    ):
+        _feedback_deltas(
+            stats,
+            row["label"],
+            _load_json_list(row["wrong_issues_json"]),
+            str(row["page_type"]),
+            issues_by_analysis.get(row["analysis_id"], []),
         )
+    return stats
 
-        conn.commit()
-    finally:
-        conn.close()
+
+def _migrate_normalize_issues(conn: sqlite3.Connection) -> None:
+    """v1: backfill analysis_issues from top_issues_json and seed issue_stats."""
+    rows = conn.execute("SELECT id, page_type, top_issues_json FROM analyses").fetchall()
+    conn.executemany(
+        "INSERT OR IGNORE INTO analysis_issues (analysis_id, position, page_type, issue_id) VALUES (?, ?, ?, ?)",
+        [
+            (row["id"], position, str(row["page_type"]), issue_id)
+            for row in rows
+            for position, issue_id in enumerate(_issue_ids(_load_json_list(row["top_issues_json"])))
+        ],
+    )
+    conn.execute("DELETE FROM issue_stats")
+    _apply_stats(conn, _rebuild_stats(conn))
+
+
+store = SQLiteStore(DB_PATH, SCHEMA, migrations=[_migrate_normalize_issues])
+
+
+def init_db() -> None:
+    """Create tables and indexes if they do not exist (once per process)."""
+    store.init_schema()
 
 
 def _get_domain(url: str) -> str:
@@ -101,6 +260,132 @@ def _get_domain(url: str) -> str:
         return url
 
 
+class AnalysisIds:
+    """
+    Analysis ids handed out from blocks reserved in meta (next_analysis_id),
+    so an analysis queued for write-behind has its id before its row exists.
+    A block is reserved per process (and per store); ids left in a block
+    when the process exits are skipped, like AUTOINCREMENT gaps.
+    """
+
+    def __init__(self, block_size: Optional[int] = None) -> None:
+        self.block_size = int(block_size or get_env("BRAIN_MEMORY_ID_BLOCK", str(DEFAULT_ID_BLOCK)))
+        self._lock = threading.Lock()
+        self._owner: Optional[Tuple[SQLiteStore, int]] = None
+        self._next = self._end = 0
+
+    def remaining(self) -> int:
+        if self._owner != (store, os.getpid()):
+            return 0
+        return self._end - self._next
+
+    def next(self) -> int:
+        with self._lock:
+            if self.remaining() <= 0:
+                self._reserve()
+            analysis_id = self._next
+            self._next += 1
+            return analysis_id
+
+    def _reserve(self) -> None:
+        with store.transaction() as conn:
+            # MAX(id) too: rows inserted without a reserved id must not be reused
+            start = int(conn.execute(
+                """
+                SELECT MAX(
+                    COALESCE((SELECT value FROM meta WHERE key = 'next_analysis_id'), 1),
+                    (SELECT COALESCE(MAX(id), 0) + 1 FROM analyses)
+                )
+                """
+            ).fetchone()[0])
+            conn.execute(
+                """
+                INSERT INTO meta (key, value) VALUES ('next_analysis_id', ?)
+                ON CONFLICT(key) DO UPDATE SET value = excluded.value
+                """,
+                (start + self.block_size,),
+            )
+        self._owner, self._next, self._end = (store, os.getpid()), start, start + self.block_size
+
+
+analysis_ids = AnalysisIds()
+
+# Ids of analyses queued for write-behind whose row is not committed yet
+_pending_analyses: Set[int] = set()
+_pending_lock = threading.Lock()
+
+
+def _insert_analysis(
+    conn: sqlite3.Connection,
+    *,
+    analysis_id: int,
+    url: str,
+    page_type: str,
+    ruleset_version: str,
+    top_issues: List[Dict[str, Any]],
+    screenshots: Optional[Dict[str, Any]] = None,
+    decision_probability: Optional[float] = None,
+    report_hash: Optional[str] = None,
+    created_at: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Insert one analysis (rows, issues, counters); returns its event log fields."""
+    cur = conn.cursor()
+    domain = _get_domain(url)
+    cur.execute(
+        """
+        INSERT INTO analyses (
+            id,
+            created_at,
+            url,
+            domain,
+            page_type,
+            ruleset_version,
+            decision_probability,
+            top_issues_json,
+            screenshots_json,
+            report_hash
+        )
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (
+            analysis_id,
+            created_at or _utc_iso(),
+            url,
+            domain,
+            page_type,
+            ruleset_version,
+            decision_probability,
+            json.dumps(top_issues or [], ensure_ascii=False),
+            json.dumps(screenshots or {}, ensure_ascii=False),
+            report_hash,
+        ),
+    )
+
+    issue_ids = _issue_ids(top_issues)
+    cur.executemany(
+        "INSERT INTO analysis_issues (analysis_id, position, page_type, issue_id) VALUES (?, ?, ?, ?)",
+        [(analysis_id, position, page_type, issue_id) for position, issue_id in enumerate(issue_ids)],
+    )
+    stats: Stats = {}
+    for issue_id in issue_ids:
+        _add(stats, page_type, issue_id, 0, 1.0)
+    # Feedback stored before its analysis existed starts counting now
+    for row in cur.execute(
+        "SELECT label, wrong_issues_json FROM feedback WHERE analysis_id = ?", (analysis_id,)
+    ).fetchall():
+        _feedback_deltas(stats, row["label"], _load_json_list(row["wrong_issues_json"]), page_type, issue_ids)
+    _apply_stats(conn, stats)
+
+    return {
+        "analysis_id": analysis_id,
+        "domain": domain,
+        "page_type": page_type,
+        "blocker": issue_ids[0] if issue_ids else "",
+        "issues": issue_ids,
+        "score": decision_probability,
+    }
+
+
 def log_analysis(
     *,
     url: str,
@@ -117,44 +402,48 @@ def log_analysis(
     top_issues is a list of dicts, typically with at least {id, severity}.
     screenshots is a dict like {"desktop_atf": url, "mobile_atf": url}.
     """
-    init_db()
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
-        created_at = _utc_iso()
-        domain = _get_domain(url)
-
-        cur.execute(
-            """
-            INSERT INTO analyses (
-                created_at,
-                url,
-                domain,
-                page_type,
-                ruleset_version,
-                decision_probability,
-                top_issues_json,
-                screenshots_json,
-                report_hash
-            )
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                created_at,
-                url,
-                domain,
-                page_type,
-                ruleset_version,
-                decision_probability,
-                json.dumps(top_issues or [], ensure_ascii=False),
-                json.dumps(screenshots or {}, ensure_ascii=False),
-                report_hash,
-            ),
+    analysis_id = analysis_ids.next()
+    with store.transaction() as conn:
+        event = _insert_analysis(
+            conn,
+            analysis_id=analysis_id,
+            url=url,
+            page_type=page_type,
+            ruleset_version=ruleset_version,
+            top_issues=top_issues,
+            screenshots=screenshots,
+            decision_probability=decision_probability,
+            report_hash=report_hash,
         )
-        conn.commit()
-        return int(cur.lastrowid)
+    event_log.append(source="analysis", **event)
+    return analysis_id
+
+
+def log_analyses(items: List[Dict[str, Any]]) -> None:
+    """Write-behind sink: insert queued analyses (queue_analysis kwargs) in one transaction."""
+    try:
+        with store.transaction() as conn:
+            events = [_insert_analysis(conn, **item) for item in items]
     finally:
-        conn.close()
+        with _pending_lock:
+            _pending_analyses.difference_update(item["analysis_id"] for item in items)
+    for event in events:
+        event_log.append(source="analysis", **event)
+
+
+write_behind.register(ANALYSES_SINK, log_analyses)
+
+
+def queue_analysis(**kwargs: Any) -> int:
+    """
+    log_analysis() without waiting for the write: returns the analysis ID now
+    and hands the row to the write-behind queue (api/core/write_behind.py).
+    """
+    analysis_id = analysis_ids.next()
+    with _pending_lock:
+        _pending_analyses.add(analysis_id)
+    write_behind.put(ANALYSES_SINK, dict(kwargs, analysis_id=analysis_id, created_at=_utc_iso()))
+    return analysis_id
 
 
 def insert_feedback(
@@ -165,9 +454,7 @@ def insert_feedback(
     wrong_issues: Optional[List[str]] = None,
 ) -> int:
     """Insert feedback for a given analysis and return feedback ID."""
-    init_db()
-    conn = _get_conn()
-    try:
+    with store.transaction() as conn:
         cur = conn.cursor()
         created_at = _utc_iso()
         cur.execute(
@@ -189,203 +476,217 @@ def insert_feedback(
                 json.dumps(wrong_issues or [], ensure_ascii=False),
             ),
         )
-        conn.commit()
-        return int(cur.lastrowid)
-    finally:
-        conn.close()
+        feedback_id = int(cur.lastrowid)
+
+        # Feedback on an unknown analysis counts once the analysis is logged
+        analysis = cur.execute("SELECT page_type FROM analyses WHERE id = ?", (analysis_id,)).fetchone()
+        if analysis is not None:
+            issue_ids = [
+                row["issue_id"]
+                for row in cur.execute(
+                    "SELECT issue_id FROM analysis_issues WHERE analysis_id = ? ORDER BY position",
+                    (analysis_id,),
+                )
+            ]
+            stats: Stats = {}
+            _feedback_deltas(stats, label, wrong_issues, str(analysis["page_type"]), issue_ids)
+            _apply_stats(conn, stats)
+        return feedback_id
 
 
 def analysis_exists(analysis_id: int) -> bool:
-    """Check if an analysis with the given ID exists."""
-    init_db()
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
-        cur.execute("SELECT 1 FROM analyses WHERE id = ? LIMIT 1", (analysis_id,))
-        row = cur.fetchone()
-        return row is not None
-    finally:
-        conn.close()
+    """Check if an analysis with the given ID exists (or is queued for writing)."""
+    with _pending_lock:
+        if analysis_id in _pending_analyses:
+            return True
+    conn = store.connection()
+    cur = conn.cursor()
+    cur.execute("SELECT 1 FROM analyses WHERE id = ? LIMIT 1", (analysis_id,))
+    row = cur.fetchone()
+    return row is not None
+
+
+def _load_weights(page_type: str) -> Dict[str, float]:
+    conn = store.connection()
+    cur = conn.cursor()
+    cur.execute(
+        """
+        SELECT issue_id, weight
+        FROM weights
+        WHERE page_type = ?
+        """,
+        (page_type,),
+    )
+    rows = cur.fetchall()
+    return {str(row["issue_id"]): float(row["weight"]) for row in rows}
+
+
+def _weights_version() -> int:
+    row = store.connection().execute("SELECT value FROM meta WHERE key = 'weights_version'").fetchone()
+    return int(row["value"]) if row else 0
+
+
+class WeightCache:
+    """Read-through per-page_type weight snapshots, invalidated by weights_version."""
+
+    def __init__(self, check_interval: Optional[float] = None) -> None:
+        if check_interval is None:
+            check_interval = float(get_env("BRAIN_WEIGHTS_CACHE_CHECK_SECONDS", "1") or 1)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Mapping[str, float]] = {}
+        self._version: Optional[int] = None
+        self._checked_at = float("-inf")
+        self.stats: Dict[str, int] = {"hits": 0, "loads": 0, "invalidations": 0}
+
+    def get(self, page_type: str) -> Mapping[str, float]:
+        if time.monotonic() - self._checked_at >= self.check_interval:
+            self._check_version()
+        snapshot = self._snapshots.get(page_type)
+        if snapshot is not None:
+            self.stats["hits"] += 1
+            return snapshot
+        with self._lock:
+            snapshot = self._snapshots.get(page_type)
+            if snapshot is None:
+                snapshot = MappingProxyType(_load_weights(page_type))
+                self._snapshots[page_type] = snapshot
+                self.stats["loads"] += 1
+        return snapshot
+
+    def _check_version(self) -> None:
+        version = _weights_version()
+        with self._lock:
+            if version != self._version:
+                if self._version is not None:
+                    self.stats["invalidations"] += 1
+                self._snapshots = {}
+                self._version = version
+            self._checked_at = time.monotonic()
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshots = {}
+            self._version = None
+            self._checked_at = float("-inf")
+
+
+weight_cache = WeightCache()
+
+
+def get_issue_weights_for_page_type(page_type: str) -> Mapping[str, float]:
+    """Return a read-only mapping of issue_id -> weight for a given page_type (cached)."""
+    return weight_cache.get(page_type)
+
+
+def _weight(suggested: float, accurate: float, wrong: float) -> Tuple[float, Dict[str, float]]:
+    suggested = max(1.0, float(suggested))
+    raw_weight = 1.0 + 0.6 * (float(accurate) - float(wrong)) / suggested
+    # Clamp to [0.2, 1.8]
+    weight = max(0.2, min(1.8, raw_weight))
+    evidence = {
+        "suggested_count": suggested,
+        "accurate_count": float(accurate),
+        "wrong_count": float(wrong),
+    }
+    return weight, evidence
+
+
+def calibrate_weights(full: bool = False) -> Dict[str, Any]:
+    """
+    Recompute weights for the (page_type, issue_id) pairs whose counters changed
+    since the last calibration.
 
-def get_issue_weights_for_page_type(page_type: str) -> Dict[str, float]:
-    """Return a mapping of issue_id -> weight for a given page_type."""
-    init_db()
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
-        cur.execute(
+    With full=True the counters are first rebuilt from analyses + feedback and
+    every pair is recomputed; drift_pairs counts the pairs whose running
+    counters disagreed with the rebuild (expected: 0).
+
+    Returns a summary dict with counts.
+    """
+    with store.transaction() as conn:
+        drift = None
+        if full:
+            rebuilt = _rebuild_stats(conn)
+            current = {
+                (row["page_type"], row["issue_id"]): [row["suggested"], row["accurate"], row["wrong"]]
+                for row in conn.execute("SELECT page_type, issue_id, suggested, accurate, wrong FROM issue_stats")
+            }
+            drift = sum(
+                1 for key in rebuilt.keys() | current.keys()
+                if rebuilt.get(key, [0.0, 0.0, 0.0]) != current.get(key, [0.0, 0.0, 0.0])
+            )
+            conn.execute("DELETE FROM issue_stats")
+            _apply_stats(conn, rebuilt)
+
+        rows = conn.execute(
+            "SELECT page_type, issue_id, suggested, accurate, wrong FROM issue_stats WHERE dirty = 1"
+        ).fetchall()
+
+        now = _utc_iso()
+        upserts = []
+        for row in rows:
+            weight, evidence = _weight(row["suggested"], row["accurate"], row["wrong"])
+            upserts.append(
+                (now, row["page_type"], row["issue_id"], weight, json.dumps(evidence, ensure_ascii=False))
+            )
+        conn.executemany(
             """
-            SELECT issue_id, weight
-            FROM weights
-            WHERE page_type = ?
+            INSERT INTO weights (
+                updated_at,
+                page_type,
+                issue_id,
+                weight,
+                evidence_json
+            )
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(page_type, issue_id) DO UPDATE SET
+                updated_at = excluded.updated_at,
+                weight = excluded.weight,
+                evidence_json = excluded.evidence_json
             """,
-            (page_type,),
+            upserts,
         )
-        rows = cur.fetchall()
-        return {str(row["issue_id"]): float(row["weight"]) for row in rows}
-    finally:
-        conn.close()
+        conn.execute("UPDATE issue_stats SET dirty = 0 WHERE dirty = 1")
+        if upserts:
+            conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'weights_version'")
+        distinct_pairs = conn.execute("SELECT COUNT(*) FROM issue_stats").fetchone()[0]
 
+        summary: Dict[str, Any] = {
+            "status": "ok",
+            "mode": "full" if full else "incremental",
+            "weights_updated": len(upserts),
+            "distinct_pairs": distinct_pairs,
+        }
+        if drift is not None:
+            summary["drift_pairs"] = drift
 
-def calibrate_weights() -> Dict[str, Any]:
-    """
-    Recompute weights for all (page_type, issue_id) pairs based on analyses + feedback.
+    if upserts:
+        weight_cache.invalidate()
+    return summary
 
-    Returns a summary dict with counts.
-    """
-    init_db()
-    conn = _get_conn()
-    try:
-        cur = conn.cursor()
 
-        # Load all analyses
-        cur.execute("SELECT id, page_type, top_issues_json FROM analyses")
-        analyses_rows = cur.fetchall()
-
-        # Build suggested counts
-        stats: Dict[Tuple[str, str], Dict[str, float]] = {}
-        for row in analyses_rows:
-            page_type = str(row["page_type"])
-            try:
-                top_issues = json.loads(row["top_issues_json"] or "[]")
-            except json.JSONDecodeError:
-                top_issues = []
-            issue_ids = [
-                str(issue.get("id"))
-                for issue in top_issues
-                if isinstance(issue, dict) and issue.get("id")
-            ]
-            for issue_id in issue_ids:
-                key = (page_type, issue_id)
-                if key not in stats:
-                    stats[key] = {
-                        "suggested": 0.0,
-                        "accurate": 0.0,
-                        "wrong": 0.0,
-                    }
-                stats[key]["suggested"] += 1.0
-
-        # Load feedback joined with analyses
-        cur.execute(
-            """
-            SELECT
-                f.label,
-                f.wrong_issues_json,
-                a.page_type,
-                a.top_issues_json
-            FROM feedback f
-            JOIN analyses a ON f.analysis_id = a.id
-            """
-        )
-        fb_rows = cur.fetchall()
-
-        for row in fb_rows:
-            label = (row["label"] or "").lower()
-            page_type = str(row["page_type"])
-            try:
-                top_issues = json.loads(row["top_issues_json"] or "[]")
-            except json.JSONDecodeError:
-                top_issues = []
-            issue_ids = [
-                str(issue.get("id"))
-                for issue in top_issues
-                if isinstance(issue, dict) and issue.get("id")
-            ]
+async def log_analysis_async(**kwargs: Any) -> int:
+    return await store.run(log_analysis, **kwargs)
 
-            try:
-                wrong_list = json.loads(row["wrong_issues_json"] or "[]")
-            except json.JSONDecodeError:
-                wrong_list = []
-            wrong_set = {str(i) for i in wrong_list if i}
-
-            # Accurate / partial feedback applies to all issues in the analysis
-            if label in {"accurate", "partial"}:
-                delta = 1.0 if label == "accurate" else 0.5
-                for issue_id in issue_ids:
-                    key = (page_type, issue_id)
-                    if key not in stats:
-                        stats[key] = {
-                            "suggested": 0.0,
-                            "accurate": 0.0,
-                            "wrong": 0.0,
-                        }
-                    stats[key]["accurate"] += delta
-
-            # Wrong feedback
-            if wrong_set:
-                # Explicit wrong issues
-                for issue_id in wrong_set:
-                    key = (page_type, issue_id)
-                    if key not in stats:
-                        stats[key] = {
-                            "suggested": 0.0,
-                            "accurate": 0.0,
-                            "wrong": 0.0,
-                        }
-                    stats[key]["wrong"] += 1.0
-            elif label == "wrong":
-                # Entire analysis considered wrong
-                for issue_id in issue_ids:
-                    key = (page_type, issue_id)
-                    if key not in stats:
-                        stats[key] = {
-                            "suggested": 0.0,
-                            "accurate": 0.0,
-                            "wrong": 0.0,
-                        }
-                    stats[key]["wrong"] += 1.0
-
-        # Compute weights and upsert
-        updated = 0
-        now = _utc_iso()
-        for (page_type, issue_id), s in stats.items():
-            suggested = max(1.0, float(s.get("suggested", 0.0)))
-            accurate = float(s.get("accurate", 0.0))
-            wrong = float(s.get("wrong", 0.0))
-
-            raw_weight = 1.0 + 0.6 * (accurate - wrong) / suggested
-            # Clamp to [0.2, 1.8]
-            weight = max(0.2, min(1.8, raw_weight))
-
-            evidence = {
-                "suggested_count": suggested,
-                "accurate_count": accurate,
-                "wrong_count": wrong,
-            }
 
-            cur.execute(
-                """
-                INSERT INTO weights (
-                    updated_at,
-                    page_type,
-                    issue_id,
-                    weight,
-                    evidence_json
-                )
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(page_type, issue_id) DO UPDATE SET
-                    updated_at = excluded.updated_at,
-                    weight = excluded.weight,
-                    evidence_json = excluded.evidence_json
-                """,
-                (
-                    now,
-                    page_type,
-                    issue_id,
-                    weight,
-                    json.dumps(evidence, ensure_ascii=False),
-                ),
-            )
-            updated += 1
+async def queue_analysis_async(**kwargs: Any) -> int:
+    # Only reserving a new id block touches the database
+    if analysis_ids.remaining() > 0:
+        return queue_analysis(**kwargs)
+    return await store.run(queue_analysis, **kwargs)
 
-        conn.commit()
 
-        return {
-            "status": "ok",
-            "weights_updated": updated,
-            "distinct_pairs": len(stats),
-        }
-    finally:
-        conn.close()
+async def insert_feedback_async(**kwargs: Any) -> int:
+    return await store.run(insert_feedback, **kwargs)
+
+
+async def analysis_exists_async(analysis_id: int) -> bool:
+    return await store.run(analysis_exists, analysis_id)
+
+
+async def get_issue_weights_for_page_type_async(page_type: str) -> Mapping[str, float]:
+    return await store.run(get_issue_weights_for_page_type, page_type)
 
 
+async def calibrate_weights_async(full: bool = False) -> Dict[str, Any]:
+    return await store.run(calibrate_weights, full)
@@ -0,0 +1,598 @@
+"""
+Append-only analysis event log with columnar compaction.
+
+Every logged analysis also becomes one compact event record:
+    {"t": epoch seconds, "src": source, "a": analysis id, "d": domain,
+     "pt": page type, "b": blocker / top issue, "i": [issue ids], "s": score}
+
+- append(): O(1), puts the record in an in-memory buffer. A background thread
+  writes buffered records in batches (EVENT_LOG_BATCH_SIZE records or every
+  EVENT_LOG_FLUSH_SECONDS) as JSON lines to segments/<day>/<host>-<pid>.jsonl,
+  so requests never wait on disk and each worker owns its segment files
+- compact(): turns the segments of finished days into one columnar partition
+  per day (partitions/<day>.parquet with pyarrow, partitions/<day>.npz with
+  NumPy otherwise) and deletes them. Categorical columns are dictionary
+  encoded; issue lists are stored as flat codes + offsets. A segment is
+  claimed by renaming it to a uniquely named *.compacting file under an
+  flock, so an append racing with compaction reopens a fresh segment instead
+  of writing into a deleted one. The partition records the claimed segments
+  it contains (in the same file, so it is one atomic replace): a run that
+  crashed before deleting them is finished by the next one without counting
+  them twice, and load() skips them meanwhile
+- query(): EventQuery over partitions and not-yet-compacted segments, with
+  vectorized (NumPy bincount / lexsort) aggregations over blockers, issues,
+  page types, domains and scores
+
+Config (env):
+- EVENT_LOG_ENABLED: "false" disables appends (default: enabled)
+- EVENT_LOG_DIR: root directory (default: api/memory/events)
+- EVENT_LOG_BATCH_SIZE: records per write (default: 256)
+- EVENT_LOG_FLUSH_SECONDS: max age of buffered records (default: 2)
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.core.config import get_env
+
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # Windows: no segment locking (compaction should not overlap writes there)
+    fcntl = None  # type: ignore[assignment]
+    HAS_FCNTL = False
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    HAS_PYARROW = True
+except ImportError:
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+    HAS_PYARROW = False
+
+logger = logging.getLogger("event_log")
+
+DEFAULT_ROOT = Path(__file__).resolve().parent / "events"
+DEFAULT_BATCH_SIZE = 256
+DEFAULT_FLUSH_SECONDS = 2.0
+STALE_LOCK_SECONDS = 3600
+
+CATEGORICAL = ("source", "domain", "page_type", "blocker")
+_KEYS = {"source": "src", "domain": "d", "page_type": "pt", "blocker": "b"}
+
+
+def _day(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+def _inode(path: Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_ino
+    except FileNotFoundError:
+        return None
+
+
+def _append_text(path: Path, text: str) -> None:
+    """Append under an exclusive lock; reopen if compaction claimed the file meanwhile."""
+    while True:
+        with open(path, "a", encoding="utf-8") as f:
+            if HAS_FCNTL:
+                fcntl.flock(f, fcntl.LOCK_EX)
+                if os.fstat(f.fileno()).st_ino != _inode(path):
+                    continue
+            f.write(text)
+            return
+
+
+def _claim(segment: Path) -> Path:
+    """Rename a segment out of the writers' way and wait for an in-flight append to finish."""
+    # Unique: the same writer's next segment gets claimed under a different name
+    claimed = segment.with_name(f"{segment.stem}.{time.time_ns()}.compacting")
+    os.replace(segment, claimed)
+    if HAS_FCNTL:
+        with open(claimed, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+    return claimed
+
+
+def _encode(values: Iterable[str], categories: Optional[List[str]] = None) -> Tuple[np.ndarray, List[str]]:
+    categories = list(categories or [])
+    index = {value: code for code, value in enumerate(categories)}
+    codes = []
+    for value in values:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(categories)
+            categories.append(value)
+        codes.append(code)
+    return np.asarray(codes, dtype=np.int32), categories
+
+
+def _remap(codes: np.ndarray, local: Sequence[str], merged: List[str]) -> Tuple[np.ndarray, List[str]]:
+    """Re-express codes over `local` categories as codes over `merged` (extended in place)."""
+    mapping, merged = _encode(local, merged)
+    return (mapping[codes] if len(codes) else codes.astype(np.int32)), merged
+
+
+@dataclass
+class EventColumns:
+    """Column-oriented events; categorical columns are (codes, categories)."""
+    ts: np.ndarray
+    analysis_id: np.ndarray
+    score: np.ndarray
+    codes: Dict[str, np.ndarray]
+    categories: Dict[str, List[str]]
+    issue_codes: np.ndarray
+    issue_offsets: np.ndarray  # row i owns issue_codes[issue_offsets[i]:issue_offsets[i + 1]]
+    issue_categories: List[str]
+    segments: List[str] = field(default_factory=list)  # claimed segment files a partition contains
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    @classmethod
+    def empty(cls) -> "EventColumns":
+        return cls.from_records([])
+
+    @classmethod
+    def from_records(cls, records: Sequence[Dict[str, Any]]) -> "EventColumns":
+        codes, categories = {}, {}
+        for name in CATEGORICAL:
+            codes[name], categories[name] = _encode(str(r.get(_KEYS[name]) or "") for r in records)
+        issue_lists = [[str(i) for i in r.get("i") or ()] for r in records]
+        issue_codes, issue_categories = _encode(i for issues in issue_lists for i in issues)
+        offsets = np.zeros(len(records) + 1, dtype=np.int64)
+        np.cumsum([len(issues) for issues in issue_lists], out=offsets[1:])
+        return cls(
+            ts=np.asarray([float(r.get("t") or 0.0) for r in records], dtype=np.float64),
+            analysis_id=np.asarray([r.get("a") if r.get("a") is not None else -1 for r in records], dtype=np.int64),
+            score=np.asarray([r.get("s") if r.get("s") is not None else np.nan for r in records], dtype=np.float64),
+            codes=codes,
+            categories=categories,
+            issue_codes=issue_codes,
+            issue_offsets=offsets,
+            issue_categories=issue_categories,
+        )
+
+    @classmethod
+    def concat(cls, parts: Sequence["EventColumns"]) -> "EventColumns":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return cls.empty()
+        if len(parts) == 1:
+            return parts[0]
+        codes, categories = {}, {}
+        for name in CATEGORICAL:
+            merged: List[str] = []
+            chunks = []
+            for part in parts:
+                remapped, merged = _remap(part.codes[name], part.categories[name], merged)
+                chunks.append(remapped)
+            codes[name], categories[name] = np.concatenate(chunks), merged
+        merged_issues: List[str] = []
+        issue_chunks, offset_chunks, base = [], [np.zeros(1, dtype=np.int64)], 0
+        for part in parts:
+            remapped, merged_issues = _remap(part.issue_codes, part.issue_categories, merged_issues)
+            issue_chunks.append(remapped)
+            offset_chunks.append(part.issue_offsets[1:] + base)
+            base += int(part.issue_offsets[-1])
+        return cls(
+            ts=np.concatenate([p.ts for p in parts]),
+            analysis_id=np.concatenate([p.analysis_id for p in parts]),
+            score=np.concatenate([p.score for p in parts]),
+            codes=codes,
+            categories=categories,
+            issue_codes=np.concatenate(issue_chunks),
+            issue_offsets=np.concatenate(offset_chunks),
+            issue_categories=merged_issues,
+        )
+
+    def take(self, mask: np.ndarray) -> "EventColumns":
+        """Rows where mask is True."""
+        lengths = np.diff(self.issue_offsets)
+        issue_mask = np.repeat(mask, lengths)
+        offsets = np.zeros(int(mask.sum()) + 1, dtype=np.int64)
+        np.cumsum(lengths[mask], out=offsets[1:])
+        return EventColumns(
+            ts=self.ts[mask],
+            analysis_id=self.analysis_id[mask],
+            score=self.score[mask],
+            codes={name: c[mask] for name, c in self.codes.items()},
+            categories=self.categories,
+            issue_codes=self.issue_codes[issue_mask],
+            issue_offsets=offsets,
+            issue_categories=self.issue_categories,
+        )
+
+    # --- storage -------------------------------------------------------
+
+    def save(self, path: Path) -> None:
+        if path.suffix == ".parquet":
+            self._save_parquet(path)
+            return
+        arrays = {
+            "ts": self.ts, "analysis_id": self.analysis_id, "score": self.score,
+            "issue_codes": self.issue_codes, "issue_offsets": self.issue_offsets,
+            "issue_categories": np.asarray(self.issue_categories, dtype=str),
+            "segments": np.asarray(self.segments, dtype=str),
+        }
+        for name in CATEGORICAL:
+            arrays[f"{name}_codes"] = self.codes[name]
+            arrays[f"{name}_categories"] = np.asarray(self.categories[name], dtype=str)
+        with open(path, "wb") as f:
+            np.savez_compressed(f, **arrays)
+
+    @classmethod
+    def load(cls, path: Path) -> "EventColumns":
+        if path.suffix == ".parquet":
+            return cls._load_parquet(path)
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                ts=data["ts"], analysis_id=data["analysis_id"], score=data["score"],
+                codes={name: data[f"{name}_codes"] for name in CATEGORICAL},
+                categories={name: data[f"{name}_categories"].tolist() for name in CATEGORICAL},
+                issue_codes=data["issue_codes"], issue_offsets=data["issue_offsets"],
+                issue_categories=data["issue_categories"].tolist(),
+                segments=data["segments"].tolist() if "segments" in data.files else [],
+            )
+
+    def _save_parquet(self, path: Path) -> None:
+        columns = {"ts": self.ts, "analysis_id": self.analysis_id, "score": self.score}
+        for name in CATEGORICAL:
+            columns[name] = pa.DictionaryArray.from_arrays(
+                pa.array(self.codes[name], type=pa.int32()), pa.array(self.categories[name], type=pa.string())
+            )
+        issues = pa.DictionaryArray.from_arrays(
+            pa.array(self.issue_codes, type=pa.int32()), pa.array(self.issue_categories, type=pa.string())
+        )
+        columns["issues"] = pa.ListArray.from_arrays(pa.array(self.issue_offsets.astype(np.int32)), issues)
+        table = pa.table(columns).replace_schema_metadata({"segments": json.dumps(self.segments)})
+        pq.write_table(table, path)
+
+    @classmethod
+    def _load_parquet(cls, path: Path) -> "EventColumns":
+        table = pq.read_table(path)
+
+        def dictionary(array) -> Tuple[np.ndarray, List[str]]:
+            if not pa.types.is_dictionary(array.type):
+                array = array.dictionary_encode()
+            return array.indices.to_numpy(zero_copy_only=False).astype(np.int32), array.dictionary.to_pylist()
+
+        codes, categories = {}, {}
+        for name in CATEGORICAL:
+            codes[name], categories[name] = dictionary(table.column(name).combine_chunks())
+        issues = table.column("issues").combine_chunks()
+        issue_codes, issue_categories = dictionary(issues.flatten())
+        metadata = table.schema.metadata or {}
+        return cls(
+            ts=table.column("ts").to_numpy(), analysis_id=table.column("analysis_id").to_numpy(),
+            score=table.column("score").to_numpy(), codes=codes, categories=categories,
+            issue_codes=issue_codes, issue_offsets=issues.offsets.to_numpy().astype(np.int64),
+            issue_categories=issue_categories,
+            segments=json.loads(metadata.get(b"segments", b"[]")),
+        )
+
+
+class EventQuery:
+    """Vectorized aggregations over a set of events."""
+
+    def __init__(self, events: EventColumns) -> None:
+        self.events = events
+
+    def filter(self, **equals: str) -> "EventQuery":
+        """Keep events whose categorical columns equal the given values (e.g. page_type="pricing")."""
+        mask = np.ones(len(self.events), dtype=bool)
+        for name, value in equals.items():
+            if value is None:
+                continue
+            categories = self.events.categories[name]
+            code = categories.index(value) if value in categories else -1
+            mask &= self.events.codes[name] == code
+        return EventQuery(self.events.take(mask))
+
+    def count(self) -> int:
+        return len(self.events)
+
+    def count_by(self, field: str, by: Optional[str] = None, top: Optional[int] = None) -> Any:
+        """
+        Event counts per value of a categorical field, most common first:
+        [(value, count), ...], or {by_value: [(value, count), ...]} with `by`.
+        """
+        codes, categories = self.events.codes[field], self.events.categories[field]
+        return self._grouped_counts(codes, categories, by, np.arange(len(self.events)), top)
+
+    def issue_counts(self, by: Optional[str] = None, top: Optional[int] = None) -> Any:
+        """Occurrences of each issue id (optionally per page_type / domain / ...)."""
+        rows = np.repeat(np.arange(len(self.events)), np.diff(self.events.issue_offsets))
+        return self._grouped_counts(self.events.issue_codes, self.events.issue_categories, by, rows, top)
+
+    def _grouped_counts(self, codes, categories, by, rows, top):
+        width = max(len(categories), 1)
+        if by is None:
+            counts = np.bincount(codes, minlength=width)
+            return self._ranked(counts, categories, top)
+        group_codes = self.events.codes[by][rows]
+        groups = self.events.categories[by]
+        counts = np.bincount(group_codes.astype(np.int64) * width + codes, minlength=len(groups) * width)
+        counts = counts.reshape(len(groups), width) if groups else counts.reshape(0, width)
+        return {groups[g]: self._ranked(counts[g], categories, top) for g in range(len(groups)) if counts[g].any()}
+
+    @staticmethod
+    def _ranked(counts: np.ndarray, categories: List[str], top: Optional[int]) -> List[Tuple[str, int]]:
+        order = np.argsort(-counts, kind="stable")
+        ranked = [(categories[i], int(counts[i])) for i in order if counts[i] > 0]
+        return ranked[:top] if top else ranked
+
+    def score_stats(self, by: Optional[str] = None) -> Dict[str, Dict[str, float]]:
+        """count / mean / p50 / p90 / min / max of scored events, overall ("*") or per group."""
+        scored = ~np.isnan(self.events.score)
+        scores = self.events.score[scored]
+        if by is None:
+            group_codes, groups = np.zeros(len(scores), dtype=np.int64), ["*"]
+        else:
+            group_codes, groups = self.events.codes[by][scored].astype(np.int64), self.events.categories[by]
+        if not len(scores):
+            return {}
+        order = np.lexsort((scores, group_codes))
+        sorted_scores, sorted_groups = scores[order], group_codes[order]
+        counts = np.bincount(sorted_groups, minlength=len(groups))
+        sums = np.bincount(sorted_groups, weights=sorted_scores, minlength=len(groups))
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        stats = {}
+        for g in np.flatnonzero(counts):
+            start, n = starts[g], counts[g]
+            stats[groups[g]] = {
+                "count": int(n),
+                "mean": float(sums[g] / n),
+                "p50": float(sorted_scores[start + (n - 1) // 2]),
+                "p90": float(sorted_scores[start + int(np.ceil(0.9 * n)) - 1]),
+                "min": float(sorted_scores[start]),
+                "max": float(sorted_scores[start + n - 1]),
+            }
+        return stats
+
+
+class AnalysisEventLog:
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        enabled: Optional[bool] = None,
+        batch_size: Optional[int] = None,
+        flush_seconds: Optional[float] = None,
+    ) -> None:
+        self.root = Path(root or get_env("EVENT_LOG_DIR") or DEFAULT_ROOT)
+        if enabled is None:
+            enabled = (get_env("EVENT_LOG_ENABLED", "true") or "true").lower() != "false"
+        self.enabled = enabled
+        self.batch_size = int(batch_size or get_env("EVENT_LOG_BATCH_SIZE", str(DEFAULT_BATCH_SIZE)))
+        self.flush_seconds = float(flush_seconds or get_env("EVENT_LOG_FLUSH_SECONDS", str(DEFAULT_FLUSH_SECONDS)))
+        self._buffer: List[Dict[str, Any]] = []
+        self._cond = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._pid = os.getpid()
+        self.stats = {"appended": 0, "written": 0, "batches": 0, "write_errors": 0}
+
+    @property
+    def segments_dir(self) -> Path:
+        return self.root / "segments"
+
+    @property
+    def partitions_dir(self) -> Path:
+        return self.root / "partitions"
+
+    # --- writing -------------------------------------------------------
+
+    def append(
+        self,
+        *,
+        source: str,
+        domain: str = "",
+        page_type: str = "",
+        blocker: str = "",
+        issues: Sequence[str] = (),
+        score: Optional[float] = None,
+        analysis_id: Optional[int] = None,
+        ts: Optional[float] = None,
+    ) -> None:
+        """Buffer one event; it reaches disk with the next batch."""
+        if not self.enabled:
+            return
+        record = {"t": round(ts if ts is not None else time.time(), 3), "src": source, "d": domain,
+                  "pt": page_type, "b": blocker, "i": list(issues)}
+        if score is not None:
+            record["s"] = float(score)
+        if analysis_id is not None:
+            record["a"] = int(analysis_id)
+        with self._cond:
+            self._ensure_writer()
+            self._buffer.append(record)
+            self.stats["appended"] += 1
+            if len(self._buffer) >= self.batch_size:
+                self._cond.notify()
+
+    def _ensure_writer(self) -> None:
+        if self._pid != os.getpid():  # forked: the parent's thread and buffer are not ours
+            self._pid, self._thread, self._buffer = os.getpid(), None, []
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if len(self._buffer) < self.batch_size:
+                    self._cond.wait(self.flush_seconds)
+            self.flush()
+
+    def flush(self) -> int:
+        """Write buffered events now; returns how many were written."""
+        with self._cond:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return 0
+        by_day: Dict[str, List[str]] = {}
+        for record in batch:
+            by_day.setdefault(_day(record["t"]), []).append(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+        name = f"{socket.gethostname()}-{os.getpid()}.jsonl"
+        try:
+            with self._write_lock:
+                for day, lines in by_day.items():
+                    directory = self.segments_dir / day
+                    directory.mkdir(parents=True, exist_ok=True)
+                    _append_text(directory / name, "\n".join(lines) + "\n")
+        except OSError as exc:
+            self.stats["write_errors"] += 1
+            logger.warning("Event log write failed, %d events dropped: %s", len(batch), exc)
+            return 0
+        self.stats["written"] += len(batch)
+        self.stats["batches"] += 1
+        return len(batch)
+
+    # --- compaction ----------------------------------------------------
+
+    def _partition_path(self, day: str) -> Path:
+        return self.partitions_dir / f"{day}.{'parquet' if HAS_PYARROW else 'npz'}"
+
+    def _existing_partition(self, day: str) -> Optional[Path]:
+        for suffix in ("parquet", "npz"):
+            path = self.partitions_dir / f"{day}.{suffix}"
+            if path.exists() and (suffix == "npz" or HAS_PYARROW):
+                return path
+        return None
+
+    @staticmethod
+    def _read_segments(paths: Iterable[Path]) -> List[Dict[str, Any]]:
+        records = []
+        for path in paths:
+            try:
+                f = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue  # compacted and deleted since it was listed
+            with f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue  # a line still being written by another worker
+        return records
+
+    def compact(self, until_day: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Fold the segments of every day before until_day (default: today, UTC)
+        into that day's columnar partition and delete them.
+        """
+        self.flush()
+        until_day = until_day or _day(time.time())
+        lock = self.root / ".compact.lock"
+        self.root.mkdir(parents=True, exist_ok=True)
+        try:
+            if lock.exists() and time.time() - lock.stat().st_mtime > STALE_LOCK_SECONDS:
+                lock.unlink()
+            fd = os.open(lock, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return {"status": "busy", "partitions": []}
+        os.close(fd)
+
+        compacted = []
+        try:
+            self.partitions_dir.mkdir(parents=True, exist_ok=True)
+            days = sorted(d.name for d in self.segments_dir.glob("*") if d.is_dir()) if self.segments_dir.exists() else []
+            for day in days:
+                if day >= until_day:
+                    continue
+                existing = self._existing_partition(day)
+                previous = EventColumns.load(existing) if existing is not None else None
+                # Left over by a run that crashed after writing the partition: already in it
+                for name in previous.segments if previous is not None else ():
+                    (self.segments_dir / day / name).unlink(missing_ok=True)
+                # *.compacting: claimed by this run, or left over by one that crashed before its write
+                for segment in (self.segments_dir / day).glob("*.jsonl"):
+                    _claim(segment)
+                segments = sorted((self.segments_dir / day).glob("*.compacting"))
+                columns = EventColumns.from_records(self._read_segments(segments))
+                if previous is not None:
+                    columns = EventColumns.concat([previous, columns])
+                columns.segments = [segment.name for segment in segments]
+                target = self._partition_path(day)
+                tmp = target.with_name(f".{target.name}")  # keeps the suffix save() dispatches on
+                columns.save(tmp)
+                os.replace(tmp, target)
+                if existing is not None and existing != target:
+                    existing.unlink()
+                for segment in segments:
+                    segment.unlink()
+                try:
+                    (self.segments_dir / day).rmdir()
+                except OSError:
+                    pass
+                compacted.append({"day": day, "events": len(columns), "path": str(target)})
+                logger.info("Compacted %s: %d events -> %s", day, len(columns), target.name)
+        finally:
+            lock.unlink(missing_ok=True)
+        return {"status": "ok", "partitions": compacted}
+
+    # --- reading -------------------------------------------------------
+
+    def load(self, since: Optional[float] = None, until: Optional[float] = None) -> EventColumns:
+        """Events with since <= t < until from partitions and live segments."""
+        self.flush()
+        first = _day(since) if since is not None else None
+        last = _day(until) if until is not None else None
+
+        def wanted(day: str) -> bool:
+            return (first is None or day >= first) and (last is None or day <= last)
+
+        parts = []
+        covered: Dict[str, set] = {}  # day -> claimed segments already in its partition
+        if self.partitions_dir.exists():
+            for path in sorted(self.partitions_dir.iterdir()):
+                day, _, suffix = path.name.partition(".")
+                if suffix in ("parquet", "npz") and wanted(day) and (suffix == "npz" or HAS_PYARROW):
+                    partition = EventColumns.load(path)
+                    covered.setdefault(day, set()).update(partition.segments)
+                    parts.append(partition)
+        if self.segments_dir.exists():
+            for directory in sorted(self.segments_dir.iterdir()):
+                if directory.is_dir() and wanted(directory.name):
+                    skip = covered.get(directory.name, set())
+                    segments = sorted(
+                        path for path in [*directory.glob("*.jsonl"), *directory.glob("*.compacting")]
+                        if path.name not in skip
+                    )
+                    parts.append(EventColumns.from_records(self._read_segments(segments)))
+
+        events = EventColumns.concat(parts)
+        if since is not None or until is not None:
+            mask = np.ones(len(events), dtype=bool)
+            if since is not None:
+                mask &= events.ts >= since
+            if until is not None:
+                mask &= events.ts < until
+            events = events.take(mask)
+        return events
+
+    def query(self, since: Optional[float] = None, until: Optional[float] = None, days: Optional[int] = None) -> EventQuery:
+        """EventQuery over [since, until), or over the last `days` days."""
+        if days is not None and since is None:
+            since = (datetime.now(timezone.utc) - timedelta(days=days)).timestamp()
+        return EventQuery(self.load(since, until))
+
+
+event_log = AnalysisEventLog()
+atexit.register(event_log.flush)
@@ -0,0 +1,165 @@
+"""
+Pooled SQLite access for the memory databases.
+
+Each SQLiteStore owns one database file:
+- the schema script runs once per process, not once per call
+- migrations are applied in order after the schema, each in its own
+  transaction, tracked with PRAGMA user_version (migration i brings the
+  database to version i + 1)
+- connections are pooled per thread (sqlite3 connections must not be shared
+  across threads) and reopened after a fork, so every uvicorn worker gets
+  its own
+- WAL journaling with synchronous=NORMAL: readers never block the writer and
+  concurrent workers only serialize on the write itself; busy_timeout makes a
+  second writer wait instead of failing with "database is locked"
+- transaction() takes the write lock up front (BEGIN IMMEDIATE), so a
+  read-then-write transaction cannot deadlock against another writer
+- run() executes a function on a worker thread, for use from async routes
+
+Config (env):
+- BRAIN_MEMORY_BUSY_TIMEOUT_MS: how long a writer waits for the lock (default: 5000)
+- BRAIN_MEMORY_MMAP_BYTES: mmap_size pragma (default: 64 MiB, 0 disables)
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, TypeVar
+
+from api.core.config import get_env
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_BUSY_TIMEOUT_MS = 5000
+DEFAULT_MMAP_BYTES = 64 * 1024 * 1024
+
+
+class SQLiteStore:
+    def __init__(
+        self,
+        path: Path | str,
+        schema: str = "",
+        migrations: Sequence[Callable[[sqlite3.Connection], None]] = (),
+        busy_timeout_ms: Optional[int] = None,
+        mmap_bytes: Optional[int] = None,
+    ) -> None:
+        self.path = Path(path)
+        self.schema = schema
+        self.migrations = list(migrations)
+        self.busy_timeout_ms = int(
+            busy_timeout_ms if busy_timeout_ms is not None
+            else get_env("BRAIN_MEMORY_BUSY_TIMEOUT_MS", str(DEFAULT_BUSY_TIMEOUT_MS))
+        )
+        self.mmap_bytes = int(
+            mmap_bytes if mmap_bytes is not None
+            else get_env("BRAIN_MEMORY_MMAP_BYTES", str(DEFAULT_MMAP_BYTES))
+        )
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._pid = os.getpid()
+        self._connections: List[sqlite3.Connection] = []
+
+    def _open(self) -> sqlite3.Connection:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode: transactions are explicit (see transaction())
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.busy_timeout_ms / 1000,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA busy_timeout={self.busy_timeout_ms}")
+        conn.execute(f"PRAGMA mmap_size={self.mmap_bytes}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _ensure_schema(self, conn: sqlite3.Connection) -> None:
+        if self._schema_ready:
+            return
+        with self._lock:
+            if not self._schema_ready:
+                if self.schema:
+                    conn.executescript(self.schema)
+                self._migrate(conn)
+                self._schema_ready = True
+
+    def _migrate(self, conn: sqlite3.Connection) -> None:
+        for version, migration in enumerate(self.migrations, start=1):
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Re-read under the write lock: another process may have migrated
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= version:
+                    conn.execute("ROLLBACK")
+                    continue
+                migration(conn)
+                conn.execute(f"PRAGMA user_version={version}")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            logger.info("Migrated %s to version %d", self.path.name, version)
+
+    def _check_fork(self) -> None:
+        # Connections inherited from the parent process must not be used
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._local = threading.local()
+                    self._connections = []
+                    self._schema_ready = False
+                    self._pid = os.getpid()
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (opened and schema-checked on first use)."""
+        self._check_fork()
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open()
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
+        self._ensure_schema(conn)
+        return conn
+
+    def init_schema(self) -> None:
+        self.connection()
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction: BEGIN IMMEDIATE, COMMIT on success, ROLLBACK on error."""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run fn(*args, **kwargs) on a worker thread (and its pooled connection)."""
+        return await asyncio.to_thread(functools.partial(fn, *args, **kwargs))
+
+    def close_all(self) -> None:
+        """Close every pooled connection (tests, shutdown)."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+            self._local = threading.local()
+            self._schema_ready = False
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error as exc:
+                logger.debug("Closing %s failed: %s", self.path, exc)
@@ -29,19 +29,15 @@ import os
 import time
 from typing import List, Optional, Dict, Any, Literal
 from pydantic import BaseModel, Field, ValidationError
-from dotenv import load_dotenv
+from api.core.config import load_env
 from pathlib import Path
-from openai import OpenAI
 
 from api.json_utils import safe_parse_json
 
 # Load environment variables
 project_root = Path(__file__).parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 # Initialize OpenAI client lazily
 _client = None
@@ -78,6 +74,7 @@ def get_client():
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         # Set timeout to 300 seconds (5 minutes) for long-running requests
+        from openai import OpenAI
         _client = OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
     return _client
 
@@ -4781,9 +4778,12 @@ def analyze_advanced_psychology(
         print('=== RAW MODEL OUTPUT START ===')
         print(raw_content[:1500])
         print('=== RAW MODEL OUTPUT END ===')
-        payload = safe_parse_json(raw_content, context="advanced psychological view")
-        view = AdvancedPsychologicalView(**payload)
-        return view
+        # Parsed and validated in one pass; truncated output keeps its complete fields
+        return safe_parse_json(
+            raw_content,
+            context="advanced psychological view",
+            schema=AdvancedPsychologicalView,
+        )
     except (json.JSONDecodeError, ValidationError, ValueError) as parsing_error:
         logger.warning(
             "[advanced_view] Failed to parse response; returning fallback. Error: %s",
@@ -4923,7 +4923,6 @@ VIOLATION OF REWRITE SAFETY RULES IS UNACCEPTABLE.{visual_mode_context}"""
         
         # Parse JSON response safely
         try:
-            from json_utils import safe_parse_json
             data = safe_parse_json(raw_content, context="psychology analysis")
             
             # Validate structure
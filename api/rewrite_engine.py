@@ -12,20 +12,17 @@ API Endpoint: POST /api/brain/rewrite (in main.py)
 import json
 import os
 import sys
-from dotenv import load_dotenv
+from api.core.config import load_env
 from pathlib import Path
-from openai import OpenAI
 
 # Import models - using relative import (no sys.path manipulation needed)
 from api.models.rewrite_models import RewriteInput, RewriteOutput
+from api.json_utils import safe_parse_json
 
 # Load environment variables
 project_root = Path(__file__).parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 # Initialize OpenAI client lazily
 _client = None
@@ -61,6 +58,7 @@ def get_client():
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable not set")
         # Set timeout to 300 seconds (5 minutes) for long-running requests
+        from openai import OpenAI
         _client = OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
     return _client
 
@@ -213,7 +211,6 @@ async def rewrite_text(input: RewriteInput) -> dict:
         
         # Parse JSON safely
         try:
-            from json_utils import safe_parse_json
             data = safe_parse_json(raw_content, context="rewrite analysis")
             
             # Ensure all required fields exist with defaults
@@ -11,14 +11,22 @@ import logging
 import base64
 from typing import Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Request
+from api.core.json_response import FastJSONRoute
 from api.services.intake.unified_intake import build_page_map
 from api.services.decision.report_from_map import report_from_page_map
 from api.utils.english_only import enforce_english_only, safe_en, FALLBACK_TEXTS
-from api.utils.output_sanitize import deep_fix_strings, enforce_english_only as sanitize_english_only
+from api.utils.output_sanitize import fix_mojibake, enforce_english_only as sanitize_english_only
+from api.utils.response_sanitizer import ResponseSanitizer
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+# Debug payloads are never shown to users; any Persian string is replaced wholesale
+_DEBUG_SANITIZER = ResponseSanitizer(
+    repairs=(fix_mojibake,),
+    non_english=lambda text, path: "Analysis completed.",
+)
+
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.post("/api/analyze/human")
@@ -385,32 +393,8 @@ async def analyze_human(request: Request) -> Dict[str, Any]:
         if not isinstance(debug_dict, dict):
             debug_dict = {}
         
-        # Sanitize debug to remove any Persian content (fix mojibake and remove Persian)
-        debug_dict = deep_fix_strings(debug_dict)
-        
-        # Recursively scrub Persian from debug (especially after_heuristics.quick_wins)
-        def scrub_persian_from_debug(obj: Any) -> Any:
-            """Recursively remove Persian content from debug structure."""
-            if isinstance(obj, str):
-                # Check for Persian characters
-                has_persian = any("\u0600" <= ch <= "\u06FF" or "\u0750" <= ch <= "\u077F" or "\u08A0" <= ch <= "\u08FF" for ch in obj)
-                if has_persian:
-                    # Replace with safe English
-                    if "quick_win" in str(type(obj).__name__).lower() or "action" in str(type(obj).__name__).lower():
-                        return "Quick improvement opportunity identified."
-                    elif "issue" in str(type(obj).__name__).lower():
-                        return "Conversion barrier detected."
-                    else:
-                        return "Analysis completed."
-                return obj
-            elif isinstance(obj, list):
-                return [scrub_persian_from_debug(x) for x in obj]
-            elif isinstance(obj, dict):
-                return {k: scrub_persian_from_debug(v) for k, v in obj.items()}
-            else:
-                return obj
-        
-        debug_dict = scrub_persian_from_debug(debug_dict)
+        # Sanitize debug in one pass: fix mojibake and replace any Persian string
+        debug_dict = _DEBUG_SANITIZER.sanitize(debug_dict)
         
         response, stats = enforce_english_only(response, mode=mode, debug=debug_dict, page_map=page_map, summary=summary)
         
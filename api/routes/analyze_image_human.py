@@ -6,11 +6,12 @@ Accepts image file and returns decision report.
 import logging
 from typing import Dict, Any
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from api.core.json_response import FastJSONRoute
 from api.services.intake.unified_intake import build_page_map
 from api.services.decision.report_from_map import report_from_page_map
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.post("/api/analyze/image-human")
@@ -8,9 +8,9 @@ from typing import List, Dict, Any
 import os
 
 import httpx
-from bs4 import BeautifulSoup
 from fastapi import APIRouter, Query, HTTPException
 from fastapi.responses import JSONResponse, FileResponse
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel
 
 try:
@@ -33,6 +33,7 @@ from api.services.signal_detector_v1 import build_signal_report_v1
 from api.services.decision_logic_v1 import build_decision_logic_v1
 from api.services.page_capture import capture_page_artifacts
 from api.services.page_extract import extract_page_map
+from api.utils.html_document import parse_document
 import asyncio
 
 # Playwright timeout compatibility
@@ -42,7 +43,7 @@ except Exception:
     class PlaywrightTimeoutError(Exception):
         ...
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger("analyze_url")
 
 
@@ -54,20 +55,17 @@ class UrlAnalyzeIn(BaseModel):
 # Text sanitization moved to api/utils/text_sanitize.py
 
 
-def extract_text(html: str) -> str:
+def extract_text(html) -> str:
     """
-    Extract text from HTML string.
+    Extract text from HTML string (or a ParsedDocument from api.utils.html_document).
     HTML should already be properly decoded as UTF-8 string.
     """
+    doc = parse_document(html)
     if Document:
-        doc = Document(html)
-        # BeautifulSoup will handle encoding from the already-decoded string
-        soup = BeautifulSoup(doc.summary(html_partial=True), "lxml", from_encoding="utf-8")
-        text = soup.get_text("\n", strip=True)
+        summary = Document(doc.html).summary(html_partial=True)
+        text = parse_document(summary).text_excluding(separator="\n", strip=True)
     else:
-        # BeautifulSoup will handle encoding from the already-decoded string
-        soup = BeautifulSoup(html, "lxml", from_encoding="utf-8")
-        text = soup.get_text("\n", strip=True)
+        text = doc.text_excluding(separator="\n", strip=True)
     return "\n".join(text.splitlines()[:250])
 
 
@@ -580,7 +578,7 @@ async def analyze_url_signals(payload: UrlAnalyzeIn):
     capture = None
     dom_data = None
     try:
-        capture = await capture_page_artifacts(url)
+        capture = await capture_page_artifacts(url, refresh=bool(payload.refresh))
         if capture:
             dom_data = extract_page_map(capture)
     except Exception as e:
@@ -740,7 +738,7 @@ async def analyze_url_decision(payload: UrlAnalyzeIn):
     capture = None
     dom_data = None
     try:
-        capture = await capture_page_artifacts(url)
+        capture = await capture_page_artifacts(url, refresh=bool(payload.refresh))
         if capture:
             dom_data = extract_page_map(capture)
     except Exception as e:
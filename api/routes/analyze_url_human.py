@@ -9,6 +9,7 @@ import os
 from pathlib import Path
 from fastapi import APIRouter, HTTPException, Request, Request as FastAPIRequest
 from fastapi.responses import JSONResponse
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel, HttpUrl, field_validator
 from typing import Optional, Literal, Dict, Any
 
@@ -27,11 +28,11 @@ from api.utils.output_sanitize import normalize_response_shape, enforce_english_
 
 # Optional import for memory logging (may not be available in all environments)
 try:
-    from api.memory.brain_memory import log_analysis
+    from api.memory.brain_memory import queue_analysis_async
 except ImportError:
-    log_analysis = None
+    queue_analysis_async = None
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 Goal = Literal["leads", "sales", "booking", "contact", "subscribe", "other"]
 Locale = Literal["fa", "en", "tr"]
@@ -446,10 +447,11 @@ async def analyze_url_human(payload: AnalyzeUrlHumanRequest, request: FastAPIReq
             }
             report_hash = hashlib.sha256((human_report or "").encode("utf-8")).hexdigest()
 
-            # Log analysis to memory if available (optional feature)
+            # Log analysis to memory if available (optional feature); the row
+            # is written behind the response, the id is known right away
             analysis_id = None
-            if log_analysis:
-                analysis_id = log_analysis(
+            if queue_analysis_async:
+                analysis_id = await queue_analysis_async(
                     url=str(payload.url),
                     page_type=page_type_name,
                     ruleset_version="human_report_v2",
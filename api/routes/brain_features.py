@@ -1,9 +1,10 @@
 from fastapi import APIRouter
+from api.core.json_response import FastJSONRoute
 
 from api.schemas.page_features import PageFeatures
 from api.brain.decision_brain import analyze_decision
 
-router = APIRouter(prefix="/api/brain", tags=["brain-features"])
+router = APIRouter(prefix="/api/brain", tags=["brain-features"], route_class=FastJSONRoute)
 
 
 @router.post("/analyze-features")
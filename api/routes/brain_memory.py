@@ -1,12 +1,17 @@
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, HTTPException
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel, Field
 
-from api.memory.brain_memory import insert_feedback, calibrate_weights, analysis_exists
+from api.memory.brain_memory import (
+    analysis_exists_async,
+    calibrate_weights_async,
+    insert_feedback_async,
+)
 
 
-router = APIRouter(prefix="/api/brain", tags=["brain-memory"])
+router = APIRouter(prefix="/api/brain", tags=["brain-memory"], route_class=FastJSONRoute)
 
 
 class FeedbackRequest(BaseModel):
@@ -30,7 +35,7 @@ async def submit_feedback(payload: FeedbackRequest) -> Dict[str, Any]:
     }
     """
     # Validate analysis_id exists
-    if not analysis_exists(payload.analysis_id):
+    if not await analysis_exists_async(payload.analysis_id):
         raise HTTPException(
             status_code=404,
             detail=f"Analysis with id={payload.analysis_id} not found",
@@ -45,7 +50,7 @@ async def submit_feedback(payload: FeedbackRequest) -> Dict[str, Any]:
         )
 
     try:
-        feedback_id = insert_feedback(
+        feedback_id = await insert_feedback_async(
             analysis_id=payload.analysis_id,
             label=payload.label,
             notes=payload.notes,
@@ -60,10 +65,14 @@ async def submit_feedback(payload: FeedbackRequest) -> Dict[str, Any]:
 
 
 @router.post("/calibrate")
-async def calibrate() -> Dict[str, Any]:
+async def calibrate(full: bool = False) -> Dict[str, Any]:
     """
     Run daily calibration job (can be called manually).
 
+    Counters are kept up to date as analyses and feedback arrive; calibration
+    recomputes the weights of the pairs that changed. ?full=true rebuilds the
+    counters from history first and reports drift_pairs (expected 0).
+
     For each (page_type, issue_id):
       suggested_count = count where issue_id appears in analyses.top_issues
       accurate_count  = count feedback.label == accurate (partial counts as 0.5)
@@ -72,12 +81,15 @@ async def calibrate() -> Dict[str, Any]:
     weight = clamp(0.2, 1.8, 1.0 + 0.6*(accurate_count - wrong_count)/max(1, suggested_count))
     """
     try:
-        result = calibrate_weights()
-        return {
+        result = await calibrate_weights_async(full)
+        response = {
             "status": "ok",
             "weights_updated": result.get("weights_updated", 0),
             "distinct_pairs": result.get("distinct_pairs", 0),
         }
+        if "drift_pairs" in result:
+            response["drift_pairs"] = result["drift_pairs"]
+        return response
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
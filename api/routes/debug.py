@@ -1,6 +1,7 @@
 from fastapi import APIRouter
+from api.core.json_response import FastJSONRoute
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 # Note: /debug/screenshot endpoint is implemented in routes/debug_screenshot.py
 
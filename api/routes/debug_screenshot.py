@@ -1,13 +1,14 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from fastapi.responses import Response
+from api.core.json_response import FastJSONRoute
 from playwright.sync_api import sync_playwright
 from PIL import Image
 from io import BytesIO
 import logging
 
 logger = logging.getLogger(__name__)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 PNG_MAGIC = b"\x89PNG\r\n\x1a\n"
 JPEG_MAGIC = b"\xFF\xD8"
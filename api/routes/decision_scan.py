@@ -10,13 +10,14 @@ Unified endpoint for decision analysis supporting:
 import logging
 from fastapi import APIRouter, HTTPException, UploadFile, File, Form, Request
 from fastapi.responses import JSONResponse
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel, Field
 from typing import Optional, Literal, Dict, Any, List
 import json
 
 logger = logging.getLogger("decision_scan")
 
-router = APIRouter(prefix="", tags=["Decision Scan"])
+router = APIRouter(prefix="", tags=["Decision Scan"], route_class=FastJSONRoute)
 
 
 class DecisionScanRequest(BaseModel):
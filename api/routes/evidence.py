@@ -8,6 +8,7 @@ Provides endpoints for extracting decision signals from:
 """
 
 from fastapi import APIRouter, HTTPException
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 
@@ -16,7 +17,7 @@ from api.brain.evidence.ad_signals import AdInput
 from api.brain.evidence.landing_signals import extract_landing_signals
 from api.schemas.page_features import PageFeatures
 
-router = APIRouter(prefix="/api/brain/evidence", tags=["Evidence"])
+router = APIRouter(prefix="/api/brain/evidence", tags=["Evidence"], route_class=FastJSONRoute)
 
 
 class AdEvidenceInput(BaseModel):
@@ -10,29 +10,21 @@ import logging
 import os
 from typing import Dict, Any, List, Literal, Optional
 from fastapi import APIRouter, HTTPException
+from api.core.json_response import FastJSONRoute
+from api.json_utils import JSONParseError, safe_parse_json
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
+from api.core.config import load_env
 from pathlib import Path
 
-# Import OpenAI client - use direct initialization to ensure env vars are loaded
-from openai import OpenAI
-
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = logging.getLogger("explain")
 
 # Load environment variables
 # Use the same loading strategy as main.py
 project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    # Fallback to api/.env if it exists
-    api_env = Path(__file__).parent.parent / ".env"
-    if api_env.exists():
-        load_dotenv(api_env, override=True)
-    else:
-        load_dotenv()  # Load from current directory or system env
+load_env()
 
 
 class ExplainRequest(BaseModel):
@@ -257,6 +249,7 @@ async def _generate_explanation(
         )
     
     try:
+        from openai import OpenAI
         client = OpenAI(api_key=api_key, timeout=300.0, max_retries=3)
     except Exception as e:
         raise HTTPException(
@@ -301,8 +294,8 @@ async def _generate_explanation(
         if not content:
             raise ValueError("Empty response from OpenAI")
         
-        # Parse JSON
-        explanation = json.loads(content)
+        # Parse JSON (fences and truncated output are handled)
+        explanation = safe_parse_json(content, context="explanation")
         
         # Validate structure
         if not isinstance(explanation, dict):
@@ -332,7 +325,7 @@ async def _generate_explanation(
         
         return result
         
-    except json.JSONDecodeError as e:
+    except JSONParseError as e:
         logger.error(f"Failed to parse OpenAI JSON response: {e}")
         raise HTTPException(
             status_code=500,
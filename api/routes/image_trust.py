@@ -13,15 +13,26 @@ This version is stabilized:
 
 from __future__ import annotations
 
+import asyncio
 import base64
 import json
 import logging
 from typing import Any, Dict, Literal, Optional, List
 
 from fastapi import APIRouter, File, HTTPException, UploadFile, Query
+from fastapi.responses import StreamingResponse
+from api.core.json_response import FastJSONRoute
+from api.json_utils import parse_json_object
 
 # Use OpenCV + local extractor (no TensorFlow dependency)
-from api.services.image_trust_service import analyze_image_trust_bytes
+from api.services.image_trust_service import (
+    BATCH_MAX_IMAGES,
+    BatchBudget,
+    BatchLimitError,
+    analyze_image_trust_bytes,
+    iter_image_trust_batch,
+    iter_zip_images,
+)
 
 # Optional: OpenAI Vision endpoint (kept, but isolated)
 from api.cognitive_friction_engine import (
@@ -57,7 +68,7 @@ def _normalize_label(label: Optional[str]) -> Optional[Label]:
 
 
 # Router (NOTE: prefix is typically applied in app.py via include_router)
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 
 @router.get("/")
@@ -70,6 +81,7 @@ async def image_trust_root():
             "health": "/api/analyze/image-trust/health",
             "analyze": "/api/analyze/image-trust",
             "vision": "/api/analyze/image-trust/vision",
+            "batch": "/api/analyze/image-trust/batch",
         },
         "engine": "opencv-local-extractor",
     }
@@ -90,6 +102,7 @@ async def image_trust_health():
 async def analyze_image(
     file: UploadFile = File(...),
     debug: bool = Query(False, description="(Reserved) kept for compatibility."),
+    tiled: bool = Query(False, description="Analyze a tall full-page screenshot in overlapping bands (adds per-section report)."),
 ) -> Dict[str, Any]:
     """
     Main endpoint used by UI and /analyze-url pipeline.
@@ -110,7 +123,7 @@ async def analyze_image(
             raise HTTPException(status_code=400, detail="Empty file provided. Please upload a valid image file.")
 
         # Use OpenCV + local extractor (no TensorFlow)
-        analysis = analyze_image_trust_bytes(file_bytes, debug=debug)
+        analysis = analyze_image_trust_bytes(file_bytes, debug=debug, tiled=tiled)
 
         # Normalize label casing if present
         if isinstance(analysis, dict) and "label" in analysis:
@@ -139,6 +152,70 @@ async def analyze_image(
         }
 
 
+MAX_BATCH_IMAGES = BATCH_MAX_IMAGES
+
+
+@router.post("/batch")
+@router.post("/batch/")
+async def analyze_image_batch(
+    files: Optional[List[UploadFile]] = File(None, description="Multiple image files (multipart)."),
+    archive: Optional[UploadFile] = File(None, description="Zip archive of images."),
+    workers: Optional[int] = Query(None, ge=1, le=32, description="Worker pool size (default: CPU-based)."),
+) -> StreamingResponse:
+    """
+    Batch visual trust analysis.
+
+    Accepts many images as multipart ``files`` and/or a zip ``archive``.
+    Images are decoded and analyzed in parallel across a worker pool and
+    streamed back as NDJSON, one line per image as it completes:
+
+        {"type": "result", "index": 0, "filename": "...", "success": true, "analysis": {...}, "elapsed_ms": 12.3}
+
+    The last line is a summary trailer with throughput figures:
+
+        {"type": "summary", "count": 120, "ok": 118, "failed": 2, "images_per_s": 41.7, ...}
+
+    Batches over the image count, per-image or total byte limits
+    (IMAGE_TRUST_BATCH_MAX_*) are refused with 413 before they are read.
+    """
+    # Limits are checked before each image is read, so an oversized upload or
+    # a zip bomb is refused without being held in memory
+    budget = BatchBudget(max_images=MAX_BATCH_IMAGES)
+    images: List[tuple[str, bytes]] = []
+    try:
+        for f in files or []:
+            name = f.filename or f"image_{len(images)}"
+            budget.reserve(name, f.size)
+            data = await f.read()
+            if f.size is None:
+                budget.add_bytes(name, len(data))
+            images.append((name, data))
+        if archive is not None:
+            # Read members straight from the spooled upload, not a copy of the archive
+            try:
+                images.extend(await asyncio.to_thread(list, iter_zip_images(archive.file, budget)))
+            except BatchLimitError:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {e}")
+    except BatchLimitError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+
+    if not images:
+        raise HTTPException(status_code=400, detail="No images provided. Upload 'files' or a zip 'archive'.")
+
+    logger.info("Image trust batch request: images=%d workers=%s", len(images), workers or "auto")
+
+    def _ndjson():
+        for item in iter_image_trust_batch(images, max_workers=workers):
+            analysis = item.get("analysis")
+            if isinstance(analysis, dict) and "label" in analysis:
+                analysis["label"] = _normalize_label(analysis.get("label")) or analysis.get("label")
+            yield json.dumps(item, ensure_ascii=False, default=str) + "\n"
+
+    return StreamingResponse(_ndjson(), media_type="application/x-ndjson")
+
+
 @router.post("/vision")
 @router.post("/vision/")
 async def analyze_image_trust_vision(file: UploadFile = File(...)) -> VisualTrustResult:
@@ -183,13 +260,8 @@ async def analyze_image_trust_vision(file: UploadFile = File(...)) -> VisualTrus
 
         raw_json = response.choices[0].message.content or ""
 
-        # Extract JSON (handle markdown code blocks if present)
-        if "```json" in raw_json:
-            raw_json = raw_json.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_json:
-            raw_json = raw_json.split("```")[1].split("```")[0].strip()
-
-        data = json.loads(raw_json)
+        # Handles code fences and output cut off by max_tokens
+        data = parse_json_object(raw_json, context="visual trust analysis")
 
         elements: List[VisualElement] = []
         for e in data.get("elements", []):
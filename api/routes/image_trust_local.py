@@ -1,8 +1,9 @@
 from fastapi import APIRouter, UploadFile, File
+from api.core.json_response import FastJSONRoute
 
 from api.services.image_trust_service import analyze_image_trust_bytes
 
-router = APIRouter(prefix="/api/analyze", tags=["image-trust-local"])
+router = APIRouter(prefix="/api/analyze", tags=["image-trust-local"], route_class=FastJSONRoute)
 
 
 @router.post("/image-trust-local")
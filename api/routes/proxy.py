@@ -6,6 +6,7 @@ These endpoints act as aliases or proxies to existing backend endpoints.
 """
 
 from fastapi import APIRouter, HTTPException
+from api.core.json_response import FastJSONRoute
 from pydantic import BaseModel, Field
 from typing import Optional, Dict, Any
 import logging
@@ -15,7 +16,7 @@ from api.brain.evidence.integration import EvidenceContext, extract_all_evidence
 from api.brain.evidence.ad_signals import AdInput
 from api.schemas.page_features import PageFeatures
 
-router = APIRouter(prefix="/api/proxy", tags=["Proxy"])
+router = APIRouter(prefix="/api/proxy", tags=["Proxy"], route_class=FastJSONRoute)
 
 logger = logging.getLogger("proxy")
 
@@ -1,11 +1,21 @@
 """
 FastAPI router for landing friction dataset training operations.
+
+build-dataset and prepare-finetune run as background jobs (api/core/jobs.py):
+they answer 202 with the job record, to be polled at
+/api/training/landing-friction/jobs/{job_id}. Pass wait=true to get the
+result in the response instead, as before.
 """
 
 from __future__ import annotations
 
+import functools
 import logging
+from typing import Any, Callable
+
 from fastapi import APIRouter, HTTPException
+from api.core.jobs import jobs
+from api.core.json_response import FastJSONResponse, FastJSONRoute
 
 from landing_friction.pipeline import (
     build_landing_friction_dataset,
@@ -15,26 +25,61 @@ from landing_friction.pipeline import (
     start_landing_friction_finetune,
 )
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 LOGGER = logging.getLogger("landing_friction")
 
 
+JOB_PREFIX = "landing-friction:"
+
+
+async def _run_job(name: str, fn: Callable[[], Any], wait: bool) -> Any:
+    job = jobs.submit(JOB_PREFIX + name, fn)
+    if not wait:
+        return FastJSONResponse(job.to_dict(), status_code=202)
+    await jobs.wait(job)
+    if job.status == "failed":
+        raise HTTPException(status_code=500, detail=job.error)
+    return job.result.to_dict()
+
+
 @router.post("/api/training/landing-friction/build-dataset")
-async def build_landing_friction_dataset_endpoint() -> dict:
+async def build_landing_friction_dataset_endpoint(full: bool = False, wait: bool = False) -> Any:
     """
-    Build the merged landing friction dataset.
+    Build the merged landing friction dataset (only changed samples are
+    re-validated unless full=true).
     """
-    result = build_landing_friction_dataset()
-    return result.to_dict()
+    name = "build-dataset:full" if full else "build-dataset"
+    return await _run_job(name, functools.partial(build_landing_friction_dataset, full=full), wait)
 
 
 @router.post("/api/training/landing-friction/prepare-finetune")
-async def prepare_landing_friction_finetune_endpoint(force_rebuild: bool = False) -> dict:
+async def prepare_landing_friction_finetune_endpoint(force_rebuild: bool = False, wait: bool = False) -> Any:
     """
     Prepare fine-tune JSONL file, optionally rebuilding the dataset first.
     """
-    result = prepare_landing_friction_finetune(force_rebuild=force_rebuild)
-    return result.to_dict()
+    name = "prepare-finetune:rebuild" if force_rebuild else "prepare-finetune"
+    return await _run_job(
+        name, functools.partial(prepare_landing_friction_finetune, force_rebuild=force_rebuild), wait
+    )
+
+
+@router.get("/api/training/landing-friction/jobs")
+async def list_landing_friction_jobs() -> dict:
+    """
+    Return recent dataset / fine-tune preparation jobs, newest first.
+    """
+    return {"jobs": [job.to_dict() for job in jobs.list(JOB_PREFIX)]}
+
+
+@router.get("/api/training/landing-friction/jobs/{job_id}")
+async def get_landing_friction_job(job_id: str) -> dict:
+    """
+    Return one dataset / fine-tune preparation job.
+    """
+    job = jobs.get(job_id)
+    if not job or not job.name.startswith(JOB_PREFIX):
+        raise HTTPException(status_code=404, detail="Job not found.")
+    return job.to_dict()
 
 
 @router.post("/api/training/landing-friction/start-finetune")
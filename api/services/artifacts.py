@@ -2,16 +2,80 @@
 Artifact management service - single source of truth for file artifacts.
 
 Handles saving, serving, and URL generation for screenshots and other artifacts.
+
+Artifact bytes are written by the write-behind queue (api/core/write_behind.py)
+so the request does not wait on the disk; until the file lands,
+pending_artifact_bytes() returns the queued data for serving.
+
+Reading artifacts without copying them:
+- save_artifact_bytes() records size, sha256, media type and image
+  dimensions (parsed from the PNG / JPEG header) in an index next to the
+  files, so artifact_info() answers without reading or decoding the image.
+  Entries hold the file's size and mtime; a rewritten file is read again
+- artifact_view() yields a memoryview over the mmapped file (or the queued
+  bytes); base64 and hashing work on it directly
+- artifact_response() leaves the copy to the server: X-Accel-Redirect when
+  ARTIFACTS_ACCEL_REDIRECT is set (nginx sendfile), the ASGI zerocopy /
+  pathsend extensions when the server offers them, large chunks otherwise
+
+Config (env):
+- ARTIFACTS_ACCEL_REDIRECT: internal nginx location serving ARTIFACTS_DIR,
+  e.g. "/_artifacts/" (default: unset, the app sends the file itself)
 """
 import os
 import base64
+import hashlib
+import io
 import logging
+import mmap
+import sqlite3
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
+from starlette.responses import FileResponse, Response
+from api.core.cache import TTLCache
 from api.core.config import get_artifacts_dir, get_public_base_url, get_env
+from api.core.write_behind import write_behind
+from api.memory.store import SQLiteStore
 
 logger = logging.getLogger(__name__)
 
+# Dot-prefixed so it is never served as an artifact (serve_artifact refuses dotfiles)
+ARTIFACT_INDEX_NAME = ".artifact_index.db"
+
+ARTIFACT_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    filename TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    created_at REAL NOT NULL,
+    mtime_ns INTEGER
+);
+"""
+
+
+def _migrate_add_mtime(conn: sqlite3.Connection) -> None:
+    """v1: mtime_ns column (rows without it are re-read on the next lookup)."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(artifacts)")}
+    if "mtime_ns" not in columns:
+        conn.execute("ALTER TABLE artifacts ADD COLUMN mtime_ns INTEGER")
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (all carry height / width at the same offsets)
+_JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+_index_stores: Dict[Path, SQLiteStore] = {}
+_index_lock = threading.Lock()
+# Recently saved / looked up artifacts (covers files still queued for writing)
+_recent_info = TTLCache(ttl=3600.0, max_items=1024)
+
 
 def ensure_artifacts_dir() -> Path:
     """
@@ -28,7 +92,7 @@ def ensure_artifacts_dir() -> Path:
 
 def save_artifact_bytes(filename: str, data: bytes, base_url: Optional[str] = None) -> str:
     """
-    Save artifact bytes to disk and return public URL.
+    Queue artifact bytes for writing to disk and return public URL.
     
     Args:
         filename: Filename to save (e.g., "atf_desktop_1234567890.png")
@@ -42,9 +106,12 @@ def save_artifact_bytes(filename: str, data: bytes, base_url: Optional[str] = No
     file_path = artifacts_dir / filename
     
     try:
-        # Save file
-        file_path.write_bytes(data)
-        logger.info(f"Saved artifact: {filename}, size: {len(data)} bytes, path: {file_path}")
+        # Save file (written behind the response; served from the queue until then)
+        write_behind.write_bytes(file_path, data)
+        info = describe_artifact(filename, data)
+        _recent_info.put(str(file_path), info)
+        write_behind.call(_index_artifact, artifacts_dir, info)
+        logger.info(f"Queued artifact: {filename}, size: {len(data)} bytes, path: {file_path}")
         
         # Generate public URL
         if base_url:
@@ -64,6 +131,11 @@ def save_artifact_bytes(filename: str, data: bytes, base_url: Optional[str] = No
         raise
 
 
+def pending_artifact_bytes(filename: str) -> Optional[bytes]:
+    """Bytes of an artifact that is queued for writing but not on disk yet."""
+    return write_behind.pending_bytes(get_artifacts_dir() / filename)
+
+
 def artifact_public_url(filename: str, base_url: Optional[str] = None) -> str:
     """
     Generate public URL for an artifact (without saving).
@@ -98,8 +170,8 @@ def file_to_data_uri(file_path: Path, mime: str = "image/png") -> str:
         Data URI string (e.g., "data:image/png;base64,...")
     """
     try:
-        data = file_path.read_bytes()
-        b64 = base64.b64encode(data).decode("utf-8")
+        with artifact_view(file_path) as view:
+            b64 = base64.b64encode(view).decode("ascii")
         return f"data:{mime};base64,{b64}"
     except Exception as e:
         logger.error(f"Failed to read file for data URI: {file_path}: {type(e).__name__}: {e}")
@@ -120,3 +192,231 @@ def bytes_to_data_uri(data: bytes, mime: str = "image/png") -> str:
     b64 = base64.b64encode(data).decode("utf-8")
     return f"data:{mime};base64,{b64}"
 
+
+
+# ----------------------------------------------------------------------
+# Zero-copy access and metadata index
+# ----------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class ArtifactInfo:
+    filename: str
+    size: int
+    sha256: str
+    media_type: str
+    width: Optional[int] = None
+    height: Optional[int] = None
+    created_at: float = 0.0
+    mtime_ns: Optional[int] = None  # of the file the info was read from (None: not on disk yet)
+
+    @property
+    def etag(self) -> str:
+        return f'"{self.sha256[:32]}"'
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def image_header_info(data: Any) -> Tuple[str, Optional[Tuple[int, int]]]:
+    """
+    Media type and (width, height) of image bytes / memoryview, read from the
+    file header: PNG and JPEG are parsed directly, other formats fall back to
+    PIL, which also only reads the header. (None for the size if unknown.)
+    """
+    head = bytes(data[:32])
+    if head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+        return "image/png", struct.unpack(">II", head[16:24])
+    if head.startswith(b"\xff\xd8"):
+        return "image/jpeg", _jpeg_size(data)
+    try:
+        from PIL import Image
+
+        with Image.open(io.BytesIO(data)) as image:
+            return Image.MIME.get(image.format or "", "application/octet-stream"), image.size
+    except Exception:  # noqa: BLE001
+        return "application/octet-stream", None
+
+
+def _jpeg_size(data: Any) -> Optional[Tuple[int, int]]:
+    i, end = 2, len(data)
+    while i + 9 <= end:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            i += 1 if marker == 0xFF else 2
+            continue
+        if marker in _JPEG_SOF:
+            height, width = struct.unpack(">HH", data[i + 5 : i + 9])
+            return width, height
+        i += 2 + struct.unpack(">H", data[i + 2 : i + 4])[0]
+    return None
+
+
+def describe_artifact(filename: str, data: Any, mtime_ns: Optional[int] = None) -> ArtifactInfo:
+    media_type, size = image_header_info(data)
+    return ArtifactInfo(
+        filename=filename,
+        size=len(data),
+        sha256=hashlib.sha256(data).hexdigest(),
+        media_type=media_type,
+        width=size[0] if size else None,
+        height=size[1] if size else None,
+        created_at=time.time(),
+        mtime_ns=mtime_ns,
+    )
+
+
+def _artifact_path(artifact: Path | str) -> Path:
+    path = Path(artifact)
+    return path if path.is_absolute() or len(path.parts) > 1 else get_artifacts_dir() / path
+
+
+def _index_store(artifacts_dir: Path) -> SQLiteStore:
+    store = _index_stores.get(artifacts_dir)
+    if store is None:
+        with _index_lock:
+            store = _index_stores.get(artifacts_dir)
+            if store is None:
+                store = _index_stores[artifacts_dir] = SQLiteStore(
+                    artifacts_dir / ARTIFACT_INDEX_NAME, ARTIFACT_INDEX_SCHEMA, migrations=[_migrate_add_mtime]
+                )
+    return store
+
+
+def _index_artifact(artifacts_dir: Path, info: ArtifactInfo) -> None:
+    if info.mtime_ns is None:
+        # Queued by save_artifact_bytes: stamp it with the written file. Should the
+        # file not be written yet, its next write changes the mtime and the row is stale
+        try:
+            stat = os.stat(artifacts_dir / info.filename)
+        except FileNotFoundError:
+            return
+        if stat.st_size != info.size:
+            return
+        info = replace(info, mtime_ns=stat.st_mtime_ns)
+    _index_store(artifacts_dir).connection().execute(
+        "INSERT OR REPLACE INTO artifacts (filename, size, sha256, media_type, width, height, created_at, mtime_ns) "
+        "VALUES (:filename, :size, :sha256, :media_type, :width, :height, :created_at, :mtime_ns)",
+        info.to_dict(),
+    )
+
+
+@contextmanager
+def artifact_view(artifact: Path | str) -> Iterator[memoryview]:
+    """
+    Read-only memoryview of an artifact (a filename in the artifacts directory
+    or a path): the mmapped file, or the queued bytes if it is not written
+    yet. The view and anything sliced from it must not outlive the block.
+    Raises FileNotFoundError if there is neither.
+    """
+    path = _artifact_path(artifact)
+    pending = write_behind.pending_bytes(path)
+    if pending is not None:
+        yield memoryview(pending)
+        return
+    with open(path, "rb") as fp:
+        if os.fstat(fp.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            view = memoryview(mapped)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def read_artifact_bytes(artifact: Path | str) -> bytes:
+    """Artifact contents as bytes (for decoders that need them), queued or on disk."""
+    path = _artifact_path(artifact)
+    pending = write_behind.pending_bytes(path)
+    return pending if pending is not None else path.read_bytes()
+
+
+def artifact_info(artifact: Path | str) -> Optional[ArtifactInfo]:
+    """
+    Size, sha256, media type and image dimensions of an artifact, from the
+    recent / index entry when it is current (same size and mtime on disk);
+    otherwise the file header is read through artifact_view() and the index
+    updated. None if missing.
+    """
+    path = _artifact_path(artifact)
+    key = str(path)
+    info = _recent_info.get(key)
+    if info is not None and write_behind.pending_bytes(path) is not None:
+        return info  # saved, not written yet: the queued bytes are what gets served
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        stat = None
+    if info is not None and stat is not None and (info.size, info.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        return info
+    artifacts_dir = get_artifacts_dir()
+    indexed = path.parent.resolve() == artifacts_dir
+    if indexed and stat is not None:
+        row = _index_store(artifacts_dir).connection().execute(
+            "SELECT filename, size, sha256, media_type, width, height, created_at, mtime_ns "
+            "FROM artifacts WHERE filename = ?",
+            (path.name,),
+        ).fetchone()
+        if row is not None and (row["size"], row["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            info = ArtifactInfo(**dict(row))
+            _recent_info.put(key, info)
+            return info
+    try:
+        # stat before reading: a rewrite in between leaves an older mtime, so the entry goes stale
+        with artifact_view(path) as view:
+            info = describe_artifact(path.name, view, mtime_ns=stat.st_mtime_ns if stat is not None else None)
+    except FileNotFoundError:
+        return None
+    if indexed and info.mtime_ns is not None:
+        _index_artifact(artifacts_dir, info)
+    _recent_info.put(key, info)
+    return info
+
+
+class ArtifactFileResponse(FileResponse):
+    """
+    FileResponse that hands the file to the server when it can copy it
+    in-kernel: the ASGI zerocopy extension gets the open file (sendfile),
+    pathsend is handled by FileResponse itself. Otherwise the file is sent
+    in larger chunks than the default.
+    """
+
+    chunk_size = 256 * 1024
+
+    async def __call__(self, scope: Any, receive: Any, send: Any) -> None:
+        zerocopy = (
+            scope["type"] == "http"
+            and "http.response.zerocopy" in scope.get("extensions", {})
+            and scope["method"].upper() != "HEAD"
+            and not any(name == b"range" for name, _ in scope.get("headers", []))
+        )
+        if not zerocopy:
+            await super().__call__(scope, receive, send)
+            return
+        with open(self.path, "rb") as fp:
+            stat_result = os.fstat(fp.fileno())
+            self.set_stat_headers(stat_result)
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": "http.response.zerocopy", "file": fp, "count": stat_result.st_size, "more_body": False})
+
+
+def artifact_response(
+    file_path: Path,
+    info: Optional[ArtifactInfo],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Response serving an artifact file without a userland copy where possible."""
+    headers = dict(headers or {})
+    media_type = info.media_type if info else None
+    if info is not None:
+        headers["ETag"] = info.etag
+    accel = get_env("ARTIFACTS_ACCEL_REDIRECT")
+    if accel:
+        headers["X-Accel-Redirect"] = f"{accel.rstrip('/')}/{file_path.name}"
+        return Response(status_code=200, media_type=media_type, headers=headers)
+    return ArtifactFileResponse(path=str(file_path), media_type=media_type, filename=file_path.name, headers=headers)
@@ -0,0 +1,446 @@
+"""
+Manifest store for the labeled visual trust dataset.
+
+The dataset used to be "whatever is in the label folders": every consumer
+re-walked dataset/images/ and decoded loose files, and labels.csv was
+appended to by concurrent uploads. The manifest is a SQLite index over the
+same folders with one row per image:
+
+- sha256 of the bytes (exact duplicates), 64-bit dHash with band columns
+  (near duplicates, same scheme as api/services/visual_cache.py), label,
+  width / height, byte size and mtime
+- split (train / val / test): derived from the sha256, so an image keeps its
+  split as the dataset grows. A near duplicate inherits the split of the
+  image it duplicates, so the two never end up on both sides of train / val
+- status: ok | duplicate | invalid (undecodable) | missing (file gone)
+
+add() is the upload path: hashing and decoding happen outside the lock, then
+one BEGIN IMMEDIATE transaction checks for the sha256 and inserts, so
+concurrent uploads (threads or workers) never store an exact duplicate twice.
+Files are written under a temporary name and renamed into place.
+
+scan() picks up files added or changed by hand. Only files whose size or
+mtime differ from the manifest are re-read; vanished files become missing.
+
+export_shards() writes the ok images of a split as fixed-size shards
+(NumPy .npz, or TFRecord when TensorFlow is installed) of resized uint8
+pixels plus an index.json, so training reads a few large files sequentially
+instead of decoding thousands of loose images. An export whose image set is
+unchanged is skipped.
+
+Config (env):
+- DATASET_MANIFEST_DB: SQLite path (default: dataset/manifest.db)
+- DATASET_VAL_FRACTION: share of images in the val split (default: 0.2)
+- DATASET_TEST_FRACTION: share of images in the test split (default: 0)
+"""
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image
+
+from api.core.config import get_env
+from api.core.lazy import LazyModule
+from api.memory.store import SQLiteStore
+from api.services.visual_cache import (
+    DEFAULT_PHASH_THRESHOLD,
+    _bands,
+    _from_signed64,
+    _to_signed64,
+    compute_dhash,
+    hamming_distance,
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_ROOT = PROJECT_ROOT / "dataset"
+DEFAULT_VAL_FRACTION = 0.2
+DEFAULT_TEST_FRACTION = 0.0
+DEFAULT_SHARD_SIZE = 1024
+DEFAULT_IMAGE_SIZE = (224, 224)
+SCAN_BATCH = 256
+
+# Stable class mapping, same as training/train_visual_trust_model.py
+CLASS_NAMES = ["low", "medium", "high"]
+LABEL_FOLDERS = {"high": "high_trust", "medium": "medium_trust", "low": "low_trust"}
+# Upload layout (high_trust/...) and training layout (high/...)
+FOLDER_LABELS = {**{folder: label for label, folder in LABEL_FOLDERS.items()}, **{c: c for c in CLASS_NAMES}}
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
+EXPORT_FORMATS = ("npz", "tfrecord")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS images (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    path TEXT NOT NULL UNIQUE,
+    sha256 TEXT NOT NULL,
+    label TEXT NOT NULL,
+    split TEXT NOT NULL,
+    status TEXT NOT NULL,
+    duplicate_of INTEGER,
+    width INTEGER,
+    height INTEGER,
+    bytes INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    phash INTEGER,
+    band0 INTEGER,
+    band1 INTEGER,
+    band2 INTEGER,
+    band3 INTEGER,
+    created_at TEXT NOT NULL,
+    validated_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idx_images_sha256 ON images(sha256);
+CREATE INDEX IF NOT EXISTS idx_images_split_status ON images(split, status);
+CREATE INDEX IF NOT EXISTS idx_images_band0 ON images(band0);
+CREATE INDEX IF NOT EXISTS idx_images_band1 ON images(band1);
+CREATE INDEX IF NOT EXISTS idx_images_band2 ON images(band2);
+CREATE INDEX IF NOT EXISTS idx_images_band3 ON images(band3);
+"""
+
+# Optional, TFRecord export only; imported on first use (not by the API)
+tf = LazyModule("tensorflow")
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def normalize_label(label: str) -> str:
+    value = (label or "").strip().lower()
+    value = FOLDER_LABELS.get(value, value)
+    if value not in CLASS_NAMES:
+        raise ValueError(f'Invalid trust label "{label}". Must be one of: "high", "medium", "low".')
+    return value
+
+
+def _probe(data: bytes) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """(width, height, dhash) of image bytes; all None if they do not decode."""
+    try:
+        image = Image.open(io.BytesIO(data))
+        image.verify()  # catches truncated files that open() alone accepts
+        image = Image.open(io.BytesIO(data))
+        width, height = image.size
+        return width, height, compute_dhash(data, image=image)
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("Dataset image does not decode: %s", exc)
+        return None, None, None
+
+
+def _load_pixels(path: Path, image_size: Tuple[int, int]) -> np.ndarray:
+    with Image.open(path) as image:
+        # (height, width) like Keras image_size; PIL wants (width, height)
+        resized = image.convert("RGB").resize((image_size[1], image_size[0]), Image.BILINEAR)
+        return np.asarray(resized, dtype=np.uint8)
+
+
+class DatasetManifest:
+    def __init__(
+        self,
+        root: Path | str | None = None,
+        db_path: Path | str | None = None,
+        val_fraction: Optional[float] = None,
+        test_fraction: Optional[float] = None,
+        phash_threshold: int = DEFAULT_PHASH_THRESHOLD,
+    ) -> None:
+        self.root = Path(root) if root else DEFAULT_ROOT
+        db_path = db_path or get_env("DATASET_MANIFEST_DB") or self.root / "manifest.db"
+        self.val_fraction = float(
+            val_fraction if val_fraction is not None
+            else get_env("DATASET_VAL_FRACTION", str(DEFAULT_VAL_FRACTION))
+        )
+        self.test_fraction = float(
+            test_fraction if test_fraction is not None
+            else get_env("DATASET_TEST_FRACTION", str(DEFAULT_TEST_FRACTION))
+        )
+        self.phash_threshold = phash_threshold
+        self.store = SQLiteStore(db_path, SCHEMA)
+
+    @property
+    def images_dir(self) -> Path:
+        return self.root / "images"
+
+    def split_for(self, sha256: str) -> str:
+        """Deterministic split from the content hash (stable as the dataset grows)."""
+        bucket = int(sha256[:8], 16) / 0x100000000
+        if bucket < self.test_fraction:
+            return "test"
+        if bucket < self.test_fraction + self.val_fraction:
+            return "val"
+        return "train"
+
+    # --- indexing ------------------------------------------------------
+
+    def _original(self, conn: sqlite3.Connection, sha256: str, phash: Optional[int], path: str) -> Optional[sqlite3.Row]:
+        """The earliest live image that this one duplicates (exactly or perceptually)."""
+        row = conn.execute(
+            "SELECT COALESCE(duplicate_of, id) AS id, split, label FROM images "
+            "WHERE sha256 = ? AND path != ? AND status IN ('ok', 'duplicate') ORDER BY id LIMIT 1",
+            (sha256, path),
+        ).fetchone()
+        if row is not None or phash is None or self.phash_threshold <= 0:
+            return row
+        where = " OR ".join(f"band{i} = ?" for i in range(4))
+        best: Optional[Tuple[int, int, sqlite3.Row]] = None
+        for candidate in conn.execute(
+            f"SELECT COALESCE(duplicate_of, id) AS id, split, label, phash FROM images "
+            f"WHERE status IN ('ok', 'duplicate') AND path != ? AND ({where})",
+            (path, *_bands(phash)),
+        ):
+            distance = hamming_distance(phash, _from_signed64(candidate["phash"]))
+            if distance <= self.phash_threshold and (best is None or (distance, candidate["id"]) < best[:2]):
+                best = (distance, candidate["id"], candidate)
+        return best[2] if best else None
+
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        path: str,
+        label: str,
+        data: bytes,
+        probe: Tuple[Optional[int], Optional[int], Optional[int]],
+        mtime: float,
+        sha256: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        sha256 = sha256 or hashlib.sha256(data).hexdigest()
+        width, height, phash = probe
+        original = None if width is None else self._original(conn, sha256, phash, path)
+        if width is None:
+            status, split, duplicate_of = "invalid", self.split_for(sha256), None
+        elif original is not None:
+            status, split, duplicate_of = "duplicate", original["split"], original["id"]
+        else:
+            status, split, duplicate_of = "ok", self.split_for(sha256), None
+        bands = _bands(phash) if phash is not None else (None,) * 4
+        now = _utc_iso()
+        conn.execute(
+            """
+            INSERT INTO images (
+                path, sha256, label, split, status, duplicate_of, width, height, bytes, mtime,
+                phash, band0, band1, band2, band3, created_at, validated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                sha256 = excluded.sha256, label = excluded.label, split = excluded.split,
+                status = excluded.status, duplicate_of = excluded.duplicate_of,
+                width = excluded.width, height = excluded.height, bytes = excluded.bytes,
+                mtime = excluded.mtime, phash = excluded.phash, band0 = excluded.band0,
+                band1 = excluded.band1, band2 = excluded.band2, band3 = excluded.band3,
+                validated_at = excluded.validated_at
+            """,
+            (
+                path, sha256, label, split, status, duplicate_of, width, height, len(data), mtime,
+                _to_signed64(phash) if phash is not None else None, *bands, now, now,
+            ),
+        )
+        if original is not None and original["label"] != label:
+            logger.warning("Dataset image %s duplicates image %d with a different label", path, original["id"])
+        return {"path": path, "sha256": sha256, "label": label, "split": split, "status": status,
+                "duplicate_of": duplicate_of}
+
+    def add(self, data: bytes, label: str, filename: str) -> Dict[str, Any]:
+        """
+        Store an uploaded image and index it. An exact duplicate is not stored
+        again: the existing entry is returned with duplicate=True.
+        """
+        label = normalize_label(label)
+        sha256 = hashlib.sha256(data).hexdigest()
+        probe = _probe(data)
+        if probe[0] is None:
+            raise ValueError("Uploaded file is not a readable image.")
+
+        folder = self.images_dir / LABEL_FOLDERS[label]
+        folder.mkdir(parents=True, exist_ok=True)
+        name = os.path.basename(filename or "") or "image.png"
+        timestamp = datetime.utcnow().strftime("%Y%m%d-%H%M%S-%f")
+        target = folder / f"{timestamp}_{sha256[:8]}_{name}"
+        tmp = folder / f".{target.name}.tmp"
+        tmp.write_bytes(data)
+        try:
+            with self.store.transaction() as conn:
+                existing = conn.execute(
+                    "SELECT path, sha256, label, split, status, duplicate_of FROM images "
+                    "WHERE sha256 = ? AND status != 'missing' ORDER BY id LIMIT 1",
+                    (sha256,),
+                ).fetchone()
+                if existing is not None:
+                    return {**dict(existing), "duplicate": True}
+                os.replace(tmp, target)
+                rel = target.relative_to(self.root).as_posix()
+                entry = self._upsert(conn, rel, label, data, probe, target.stat().st_mtime, sha256)
+                return {**entry, "duplicate": False}
+        finally:
+            if tmp.exists():
+                tmp.unlink()
+
+    def scan(self) -> Dict[str, int]:
+        """Incrementally re-validate the label folders against the manifest."""
+        counts = {"seen": 0, "unchanged": 0, "indexed": 0, "invalid": 0, "duplicates": 0, "missing": 0}
+        conn = self.store.connection()
+        known = {
+            row["path"]: (row["bytes"], row["mtime"], row["status"])
+            for row in conn.execute("SELECT path, bytes, mtime, status FROM images")
+        }
+        changed: List[Tuple[str, str, Path, float]] = []
+        for folder, label in FOLDER_LABELS.items():
+            directory = self.images_dir / folder
+            if not directory.is_dir():
+                continue
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file() or Path(entry.name).suffix.lower() not in IMAGE_EXTS:
+                        continue
+                    counts["seen"] += 1
+                    rel = f"images/{folder}/{entry.name}"
+                    stat = entry.stat()
+                    previous = known.pop(rel, None)
+                    if previous and previous[2] != "missing" and previous[:2] == (stat.st_size, stat.st_mtime):
+                        counts["unchanged"] += 1
+                        continue
+                    changed.append((rel, label, Path(entry.path), stat.st_mtime))
+
+        # Read + decode outside the write lock, then write in batches
+        for start in range(0, len(changed), SCAN_BATCH):
+            batch = changed[start:start + SCAN_BATCH]
+            loaded = []
+            for rel, label, path, mtime in batch:
+                try:
+                    data = path.read_bytes()
+                except OSError as exc:
+                    logger.warning("Dataset image %s unreadable: %s", path, exc)
+                    continue
+                loaded.append((rel, label, data, _probe(data), mtime))
+            with self.store.transaction() as conn:
+                for rel, label, data, probe, mtime in loaded:
+                    status = self._upsert(conn, rel, label, data, probe, mtime)["status"]
+                    counts["indexed"] += 1
+                    counts["invalid"] += status == "invalid"
+                    counts["duplicates"] += status == "duplicate"
+
+        vanished = [path for path, (_, _, status) in known.items() if status != "missing"]
+        if vanished:
+            with self.store.transaction() as conn:
+                conn.executemany(
+                    "UPDATE images SET status = 'missing', validated_at = ? WHERE path = ?",
+                    [(_utc_iso(), path) for path in vanished],
+                )
+            counts["missing"] = len(vanished)
+        return counts
+
+    # --- reading -------------------------------------------------------
+
+    def entries(
+        self,
+        split: Optional[str] = None,
+        label: Optional[str] = None,
+        statuses: Sequence[str] = ("ok",),
+    ) -> List[sqlite3.Row]:
+        sql = f"SELECT * FROM images WHERE status IN ({', '.join('?' * len(statuses))})"
+        params: List[Any] = list(statuses)
+        if split:
+            sql += " AND split = ?"
+            params.append(split)
+        if label:
+            sql += " AND label = ?"
+            params.append(normalize_label(label))
+        return self.store.connection().execute(sql + " ORDER BY id", params).fetchall()
+
+    def summary(self) -> Dict[str, Any]:
+        conn = self.store.connection()
+        by_label: Dict[str, Dict[str, int]] = {}
+        for row in conn.execute(
+            "SELECT label, split, COUNT(*) AS n FROM images WHERE status = 'ok' GROUP BY label, split"
+        ):
+            by_label.setdefault(row["label"], {})[row["split"]] = row["n"]
+        by_status = {
+            row["status"]: row["n"]
+            for row in conn.execute("SELECT status, COUNT(*) AS n FROM images GROUP BY status")
+        }
+        return {"by_label": by_label, "by_status": by_status}
+
+    # --- export --------------------------------------------------------
+
+    def export_shards(
+        self,
+        out_dir: Path | str,
+        split: str,
+        fmt: str = "npz",
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        image_size: Tuple[int, int] = DEFAULT_IMAGE_SIZE,
+        workers: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Write the ok images of split as shards under out_dir/split/ (see module docstring)."""
+        if fmt not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {fmt}")
+        if fmt == "tfrecord" and not tf.available:
+            raise RuntimeError("TFRecord export needs tensorflow; use fmt='npz'")
+        rows = self.entries(split=split)
+        digest = hashlib.sha256(
+            json.dumps([fmt, list(image_size), shard_size, [(r["sha256"], r["label"]) for r in rows]]).encode()
+        ).hexdigest()
+        split_dir = Path(out_dir) / split
+        index_path = split_dir / "index.json"
+        previous: Dict[str, Any] = {}
+        if index_path.exists():
+            previous = json.loads(index_path.read_text(encoding="utf-8"))
+            if previous.get("digest") == digest:
+                return {**previous, "skipped": True}
+
+        split_dir.mkdir(parents=True, exist_ok=True)
+        shards = []
+        with ThreadPoolExecutor(max_workers=workers or min(8, os.cpu_count() or 1)) as pool:
+            for number, start in enumerate(range(0, len(rows), shard_size)):
+                chunk = rows[start:start + shard_size]
+                pixels = list(pool.map(lambda r: _load_pixels(self.root / r["path"], image_size), chunk))
+                labels = np.array([CLASS_NAMES.index(r["label"]) for r in chunk], dtype=np.int64)
+                name = f"{split}-{number:05d}.{fmt}"
+                self._write_shard(split_dir / name, fmt, np.stack(pixels), labels, [r["sha256"] for r in chunk])
+                shards.append({"file": name, "count": len(chunk)})
+
+        for stale in previous.get("shards", [])[len(shards):]:
+            (split_dir / stale["file"]).unlink(missing_ok=True)
+        index = {
+            "split": split,
+            "format": fmt,
+            "image_size": list(image_size),
+            "class_names": CLASS_NAMES,
+            "count": len(rows),
+            "digest": digest,
+            "shards": shards,
+            "exported_at": _utc_iso(),
+        }
+        tmp = split_dir / ".index.json.tmp"
+        tmp.write_text(json.dumps(index, indent=2), encoding="utf-8")
+        os.replace(tmp, index_path)
+        return {**index, "skipped": False}
+
+    @staticmethod
+    def _write_shard(path: Path, fmt: str, images: np.ndarray, labels: np.ndarray, shas: Iterable[str]) -> None:
+        tmp = path.with_name(f".{path.name}.tmp")
+        if fmt == "npz":
+            with open(tmp, "wb") as f:
+                np.savez(f, images=images, labels=labels, sha256=np.array(list(shas)))
+        else:
+            with tf.io.TFRecordWriter(str(tmp)) as writer:
+                for image, label, sha in zip(images, labels, shas):
+                    feature = {
+                        "image_raw": tf.train.Feature(bytes_list=tf.train.BytesList(value=[image.tobytes()])),
+                        "label": tf.train.Feature(int64_list=tf.train.Int64List(value=[int(label)])),
+                        "sha256": tf.train.Feature(bytes_list=tf.train.BytesList(value=[sha.encode()])),
+                    }
+                    writer.write(tf.train.Example(features=tf.train.Features(feature=feature)).SerializeToString())
+        os.replace(tmp, path)
+
+
+dataset_manifest = DatasetManifest()
@@ -0,0 +1,229 @@
+"""
+In-browser DOM extraction.
+
+Runs one page.evaluate() inside the already-open Playwright page (see
+page_capture._capture_viewport_sync) and returns compact structured data with
+real layout information:
+
+- headings, ctas, forms, prices, badges
+- each item: text, tag, bbox [x, y, w, h] in document CSS pixels (multiply by
+  viewport.dpr for full-page screenshot pixels), atf (above the fold), visible,
+  and a few computed styles
+- readable text (body innerText) so the capture needs no extra round trip
+
+extract_page_map uses this instead of re-parsing html_excerpt, and
+element_detection can answer from it instead of a vision call.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger("dom_extract")
+
+MAX_ITEMS_PER_KIND = 40
+MAX_READABLE_CHARS = 20000
+
+DOM_EXTRACT_JS = r"""
+(opts) => {
+  const maxItems = opts.maxItems;
+  const vh = window.innerHeight, vw = window.innerWidth;
+  const sx = window.scrollX, sy = window.scrollY;
+  const clean = (s) => (s || "").replace(/\s+/g, " ").trim().slice(0, 160);
+
+  const info = (el, extra) => {
+    const r = el.getBoundingClientRect();
+    const cs = getComputedStyle(el);
+    const top = Math.round(r.top + sy);
+    const visible = r.width > 0 && r.height > 0 && cs.display !== "none" &&
+      cs.visibility !== "hidden" && parseFloat(cs.opacity || "1") > 0;
+    return Object.assign({
+      text: clean(el.innerText || el.value || el.getAttribute("aria-label") || el.getAttribute("alt") || ""),
+      tag: el.tagName.toLowerCase(),
+      bbox: [Math.round(r.left + sx), top, Math.round(r.width), Math.round(r.height)],
+      atf: visible && top < vh,
+      visible: visible,
+      style: {
+        fontSize: parseFloat(cs.fontSize) || 0,
+        fontWeight: cs.fontWeight,
+        color: cs.color,
+        bg: cs.backgroundColor,
+      },
+    }, extra || {});
+  };
+
+  const take = (nodes, fn) => {
+    const out = [];
+    for (const el of nodes) {
+      if (out.length >= maxItems) break;
+      const item = fn(el);
+      if (item) out.push(item);
+    }
+    return out;
+  };
+
+  const headings = take(document.querySelectorAll("h1,h2,h3"), (el) => {
+    const it = info(el);
+    return it.text ? it : null;
+  });
+
+  const ctas = take(
+    document.querySelectorAll("a[href],button,input[type=submit],input[type=button],[role=button]"),
+    (el) => {
+      const it = info(el, { href: el.getAttribute("href") || "" });
+      if (!it.visible || (!it.text && !it.href)) return null;
+      const bg = it.style.bg;
+      it.filled = !!bg && bg !== "transparent" && !/rgba\(.*,\s*0\)$/.test(bg);
+      return it;
+    }
+  );
+
+  const forms = take(document.querySelectorAll("form"), (el) => {
+    const fields = el.querySelectorAll("input:not([type=hidden]):not([type=submit]):not([type=button]),select,textarea");
+    const submit = el.querySelector("button,input[type=submit]");
+    const it = info(el, {
+      fields: fields.length,
+      required: el.querySelectorAll("[required]").length,
+      field_types: Array.from(fields).slice(0, 20).map((f) => (f.getAttribute("type") || f.tagName).toLowerCase()),
+      submit: submit ? clean(submit.innerText || submit.value) : "",
+    });
+    it.text = "";
+    return it;
+  });
+
+  const priceRe = /([$€£¥₺]\s?\d[\d.,]*|\d[\d.,]*\s?(USD|EUR|GBP|TL|TRY|\/mo|\/month|per month))/i;
+  const prices = [];
+  const seen = new Set();
+  const walker = document.createTreeWalker(document.body || document.documentElement, NodeFilter.SHOW_TEXT);
+  while (prices.length < maxItems && walker.nextNode()) {
+    const node = walker.currentNode;
+    const m = priceRe.exec(node.nodeValue || "");
+    const el = node.parentElement;
+    if (!m || !el || seen.has(el) || /^(SCRIPT|STYLE|NOSCRIPT)$/.test(el.tagName)) continue;
+    seen.add(el);
+    const it = info(el, { match: m[0].trim() });
+    if (it.visible) prices.push(it);
+  }
+
+  const badgeRe = /(secure|ssl|verified|guarantee|trustpilot|norton|mcafee|certified|award|rating|reviews?|stars?|money.back|bbb)/i;
+  const badges = take(document.querySelectorAll("img,svg,[class*=badge],[class*=trust],[class*=rating]"), (el) => {
+    const label = [el.getAttribute("alt"), el.getAttribute("aria-label"), el.getAttribute("title"),
+      typeof el.className === "string" ? el.className : "", el.getAttribute("src")].join(" ");
+    if (!badgeRe.test(label)) return null;
+    const it = info(el, { label: clean(label) });
+    return it.visible ? it : null;
+  });
+
+  const body = document.body;
+  return {
+    viewport: { width: vw, height: vh, dpr: window.devicePixelRatio || 1 },
+    document: {
+      width: Math.max(document.documentElement.scrollWidth, body ? body.scrollWidth : 0),
+      height: Math.max(document.documentElement.scrollHeight, body ? body.scrollHeight : 0),
+    },
+    lang: document.documentElement.getAttribute("lang") || "",
+    headings, ctas, forms, prices, badges,
+    readable: body ? body.innerText.slice(0, opts.maxReadable) : "",
+  };
+}
+"""
+
+
+def extract_dom_structure(page: Any, max_items: int = MAX_ITEMS_PER_KIND) -> Dict[str, Any]:
+    """Run DOM_EXTRACT_JS in a Playwright page (sync API). Returns {} on failure."""
+    try:
+        result = page.evaluate(DOM_EXTRACT_JS, {"maxItems": max_items, "maxReadable": MAX_READABLE_CHARS})
+        return result if isinstance(result, dict) else {}
+    except Exception as e:
+        logger.warning(f"In-browser DOM extraction failed: {type(e).__name__}: {e}")
+        return {}
+
+
+def _where(item: Dict[str, Any], selector: str) -> Dict[str, Any]:
+    return {
+        "section": "hero" if item.get("atf") else "body",
+        "selector": selector,
+        "bbox": list(item.get("bbox") or [0, 0, 0, 0]),
+    }
+
+
+def structure_to_page_map(structure: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Build extract_page_map's headlines / ctas / forms / trust badges from a DOM structure.
+    Returns None when the structure is missing or empty (caller falls back to HTML parsing).
+    """
+    if not structure or not (structure.get("headings") or structure.get("ctas")):
+        return None
+
+    headlines: List[Dict[str, Any]] = []
+    for tag in ("h1", "h2"):
+        for item in [h for h in structure.get("headings", []) if h.get("tag") == tag][:10]:
+            if item.get("text"):
+                headlines.append({"tag": tag, "text": item["text"], "where": _where(item, tag),
+                                  "atf": bool(item.get("atf")), "style": item.get("style", {})})
+
+    # Visible, above-the-fold, filled buttons first: that is what a visitor reads as the primary CTA
+    ranked = sorted(
+        [c for c in structure.get("ctas", []) if c.get("visible", True)],
+        key=lambda c: (not c.get("atf"), not c.get("filled"), (c.get("bbox") or [0, 0])[1]),
+    )
+    ctas: List[Dict[str, Any]] = []
+    for item in ranked[:30]:
+        ctas.append({
+            "label": (item.get("text") or "")[:80],
+            "type": "primary" if len(ctas) == 0 else "secondary",
+            "href": item.get("href") or "",
+            "where": _where(item, item.get("tag") or "a"),
+            "notes": "",
+            "atf": bool(item.get("atf")),
+            "style": item.get("style", {}),
+        })
+
+    forms = [{
+        "fields": f.get("fields", 0),
+        "required": f.get("required", 0),
+        "field_types": f.get("field_types", []),
+        "submit_label": f.get("submit", ""),
+        "where": _where(f, "form"),
+    } for f in structure.get("forms", [])]
+
+    badges = [{
+        "type": "badge",
+        "text_or_label": b.get("text") or b.get("label", ""),
+        "where": _where(b, b.get("tag") or "img"),
+    } for b in structure.get("badges", [])]
+
+    prices = [{
+        "type": "price",
+        "text": p.get("match") or p.get("text", ""),
+        "where": _where(p, p.get("tag") or "span"),
+    } for p in structure.get("prices", [])]
+
+    return {"headlines": headlines, "ctas": ctas, "forms": forms, "badges": badges, "prices": prices}
+
+
+# Map DOM kinds to element_detection types
+_DETECTION_KINDS = (("headings", "headline"), ("ctas", "cta"), ("prices", "pricing"),
+                    ("badges", "badge"), ("forms", "form"))
+
+
+def structure_to_detections(structure: Dict[str, Any], viewport: str = "desktop") -> Dict[str, Any]:
+    """
+    Same shape as element_detection.detect_elements_in_screenshot, built from the
+    DOM: only visible, above-the-fold elements, bboxes in ATF screenshot pixels.
+    """
+    vp = structure.get("viewport") or {}
+    dpr = float(vp.get("dpr") or 1)
+    width, height = int(vp.get("width", 0) * dpr), int(vp.get("height", 0) * dpr)
+    detected: List[Dict[str, Any]] = []
+    for kind, elem_type in _DETECTION_KINDS:
+        for idx, item in enumerate(i for i in structure.get(kind, []) if i.get("atf") and i.get("visible", True)):
+            x, y, w, h = (item.get("bbox") or [0, 0, 0, 0])[:4]
+            detected.append({
+                "id": f"{elem_type}_{idx + 1}",
+                "type": elem_type,
+                "text": item.get("text") or item.get("match") or None,
+                "bbox": [int(x * dpr), int(y * dpr), max(1, int(w * dpr)), max(1, int(h * dpr))],
+                "confidence": 0.95,
+            })
+    return {"viewport": viewport, "image_size": [width, height], "detected_elements": detected, "source": "dom"}
@@ -3,13 +3,15 @@ Element Detection Service using OpenAI Vision API.
 Detects UI elements (CTA, headline, pricing, etc.) with bounding boxes.
 """
 import os
-import json
 import base64
 from pathlib import Path
 from typing import Dict, Any, List, Optional, Tuple, Literal
 from PIL import Image
 
 from api.chat import get_client
+from api.json_utils import safe_parse_json
+from api.services.artifacts import artifact_info, artifact_view
+from api.services.dom_extract import structure_to_detections
 
 # Element types supported
 ElementType = Literal["cta", "headline", "pricing", "testimonial", "badge", "logo", "nav", "form", "input"]
@@ -34,8 +36,11 @@ Return JSON only, no markdown, no explanations."""
 
 
 def get_image_dimensions(image_path: str) -> Tuple[int, int]:
-    """Get image width and height."""
+    """Get image width and height (from the artifact index or the file header, no decode)."""
     try:
+        info = artifact_info(image_path)
+        if info is not None and info.width and info.height:
+            return (info.width, info.height)
         with Image.open(image_path) as img:
             return img.size  # Returns (width, height)
     except Exception as e:
@@ -45,14 +50,20 @@ def get_image_dimensions(image_path: str) -> Tuple[int, int]:
 
 async def detect_elements_in_screenshot(
     screenshot_path: str,
-    viewport: Literal["desktop", "mobile"] = "desktop"
+    viewport: Literal["desktop", "mobile"] = "desktop",
+    dom_structure: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
     """
     Detect UI elements in a screenshot using OpenAI Vision API.
     
+    When the capture's in-browser DOM extraction is passed (capture["dom"]["structure"]
+    or ["structure_mobile"]) and it found above-the-fold elements, those are
+    returned directly (``"source": "dom"``) and no vision call is made.
+    
     Args:
         screenshot_path: Path to screenshot image file
         viewport: "desktop" or "mobile"
+        dom_structure: Optional DOM extraction from page_capture
         
     Returns:
         {
@@ -70,6 +81,11 @@ async def detect_elements_in_screenshot(
             ]
         }
     """
+    if dom_structure:
+        from_dom = structure_to_detections(dom_structure, viewport=viewport)
+        if from_dom["detected_elements"]:
+            return from_dom
+    
     try:
         # Check if screenshot exists
         if not os.path.exists(screenshot_path):
@@ -82,11 +98,9 @@ async def detect_elements_in_screenshot(
         # Get image dimensions
         img_width, img_height = get_image_dimensions(screenshot_path)
         
-        # Read image and encode to base64
-        with open(screenshot_path, "rb") as f:
-            image_data = f.read()
-        
-        image_b64 = base64.b64encode(image_data).decode("utf-8")
+        # Encode to base64 straight from the mapped file
+        with artifact_view(screenshot_path) as image_data:
+            image_b64 = base64.b64encode(image_data).decode("utf-8")
         mime_type = "image/png"  # Screenshots are PNG
         
         # Call OpenAI Vision API
@@ -109,18 +123,12 @@ async def detect_elements_in_screenshot(
         
         raw_json = response.choices[0].message.content or "[]"
         
-        # Extract JSON (handle markdown code blocks if present)
-        if "```json" in raw_json:
-            raw_json = raw_json.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_json:
-            raw_json = raw_json.split("```")[1].split("```")[0].strip()
-        
-        # Parse JSON
+        # Parse JSON (code fences and output cut off by max_tokens are handled)
         try:
-            elements_data = json.loads(raw_json)
+            elements_data = safe_parse_json(raw_json, context="element detection")
             if not isinstance(elements_data, list):
                 elements_data = []
-        except json.JSONDecodeError as e:
+        except ValueError as e:
             print(f"Error parsing vision API JSON: {e}")
             print(f"Raw response: {raw_json[:500]}")
             elements_data = []
@@ -5,22 +5,11 @@ ENGLISH ONLY - All output must be in English. Persian/Farsi is forbidden.
 import os
 import json
 import re
-from pathlib import Path
 from typing import Dict, Any
-from dotenv import load_dotenv
+from api.core.config import load_env
 
-# Load .env from project root (same as main.py)
-project_root = Path(__file__).parent.parent.parent
-env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    # Fallback to api/.env if it exists
-    api_env = Path(__file__).parent.parent / ".env"
-    if api_env.exists():
-        load_dotenv(api_env, override=True)
-    else:
-        load_dotenv()  # Load from current directory or system env
+# Load .env from project root
+load_env()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
 
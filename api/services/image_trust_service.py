@@ -1,12 +1,20 @@
 from __future__ import annotations
 
 import base64
-import json
+import io
 import logging
 import os
-from typing import Any, Dict, List, Literal, Optional
-
-from api.vision.local_visual_extractor import extract_visual_elements
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+from api.vision.local_visual_extractor import decode_image, extract_visual_elements
+from api.vision.tiled_visual_extractor import extract_visual_elements_tiled
+from api.vision.trust_model_runtime import get_trust_model, predict_trust_distribution
+from api.json_utils import parse_json_object
+from api.services.visual_cache import get_visual_cache
+from api.utils.response_sanitizer import to_builtin
 from api.cognitive_friction_engine import (
     VisualElement,
     VisualTrustResult,
@@ -31,16 +39,7 @@ def _label_from_score(score: float) -> Literal["Low", "Medium", "High"]:
 
 def _py(v: Any) -> Any:
     """Convert numpy scalars and other non-serializable values to plain Python."""
-    try:  # pragma: no cover - defensive
-        import numpy as np  # type: ignore[import-not-found]
-
-        if isinstance(v, np.floating):
-            return float(v)
-        if isinstance(v, np.integer):
-            return int(v)
-    except Exception:  # noqa: BLE001
-        pass
-    return v
+    return to_builtin(v)
 
 
 def _sanitize_analysis(a: dict | None) -> dict:
@@ -85,11 +84,27 @@ def _sanitize_role(role: str | None) -> str:
     return normalize_visual_role(role)
 
 
+def _model_weight() -> float:
+    try:
+        return _clamp(float(os.getenv("VISUAL_TRUST_MODEL_WEIGHT", "0.5")), 0.0, 1.0)
+    except ValueError:
+        return 0.5
+
+
 def _build_local_visual_result(
     file_bytes: bytes,
     extracted: Dict | None = None,
     debug: bool = False,
+    model_probs: Dict[str, float] | None = None,
 ) -> VisualTrustResult:
+    """
+    Build a VisualTrustResult from extractor output.
+
+    ``model_probs`` are the learned classifier's {low, medium, high}
+    probabilities (see api.vision.trust_model_runtime). When present they fill
+    ``distribution`` and are blended into the heuristic score with weight
+    VISUAL_TRUST_MODEL_WEIGHT (default 0.5).
+    """
     if extracted is None:
         extracted = extract_visual_elements(file_bytes, debug=debug)
 
@@ -155,6 +170,14 @@ def _build_local_visual_result(
     if text_block_density > 0.12:
         score -= 8
 
+    distribution: Optional[Dict[str, float]] = None
+    model_score: Optional[float] = None
+    if model_probs:
+        distribution = {k: round(float(model_probs.get(k, 0.0)) * 100.0, 2) for k in ("low", "medium", "high")}
+        model_score = 100.0 * (0.5 * float(model_probs.get("medium", 0.0)) + float(model_probs.get("high", 0.0)))
+        weight = _model_weight()
+        score = (1.0 - weight) * score + weight * model_score
+
     score = _clamp(score)
     label = _label_from_score(score)
 
@@ -189,12 +212,15 @@ def _build_local_visual_result(
         narrative.append("Dense text regions detected; consider simplifying.")
     if has_headline:
         narrative.append("Prominent headline region detected.")
+    if model_score is not None:
+        top = max(model_probs, key=lambda k: model_probs[k])
+        narrative.append(f"Learned visual trust model rates this design '{top}' ({model_probs[top]:.0%}).")
 
     return VisualTrustResult(
         status=status,
         label=label,
         overall_score=score,
-        distribution=None,
+        distribution=distribution,
         notes=notes,
         warnings=warnings,
         elements=elements,
@@ -227,13 +253,8 @@ def _run_openai_fallback(file_bytes: bytes, content_type: str) -> VisualTrustRes
     )
 
     raw_content = response.choices[0].message.content or ""
-    raw_json = raw_content
-    if "```json" in raw_json:
-        raw_json = raw_json.split("```json")[1].split("```")[0].strip()
-    elif "```" in raw_json:
-        raw_json = raw_json.split("```")[1].split("```")[0].strip()
-
-    data = json.loads(raw_json)
+    # max_tokens can cut the element list short; keep the complete elements
+    data = parse_json_object(raw_content, context="visual trust analysis")
     raw_elements = data.get("elements", []) or []
     elements: List[VisualElement] = []
     for e in raw_elements:
@@ -293,13 +314,29 @@ def _run_openai_fallback(file_bytes: bytes, content_type: str) -> VisualTrustRes
     )
 
 
-def analyze_image_trust_bytes(image_bytes: bytes, debug: bool = False) -> Dict[str, Any]:
+def analyze_image_trust_bytes(
+    image_bytes: bytes,
+    debug: bool = False,
+    image: Any = None,
+    tiled: bool = False,
+) -> Dict[str, Any]:
     """
     Core image trust analysis logic.
     Used by both /api/analyze/image-trust and /analyze-url.
     
     Never returns fallback status. Raises exceptions on failure which should be
     caught by callers and converted to error format.
+
+    Results are served from the visual cache when the same (or a visually
+    identical) image was analyzed before; ``cache.tier`` reports which tier
+    answered (memory / sqlite / phash / miss).
+
+    ``image`` is an optional pre-decoded RGB PIL image (see decode_image) shared
+    by the perceptual hash and the extractor so the bytes are decoded once.
+
+    ``tiled=True`` analyzes a tall full-page screenshot in overlapping bands
+    (see api.vision.tiled_visual_extractor) and adds ``sections`` / ``tiles``
+    to the result. Tiled runs bypass the visual cache.
     """
     if not image_bytes:
         raise ValueError("Empty image bytes")
@@ -312,10 +349,37 @@ def analyze_image_trust_bytes(image_bytes: bytes, debug: bool = False) -> Dict[s
     use_openai_fallback = False  # Hardcoded to False - local extractor only
     content_type = "image/png"
 
+    # Debug runs write overlays and must always recompute
+    cache = None if (debug or tiled) else get_visual_cache()
+    cache_key = None
+    if cache is not None:
+        cached, cache_key = cache.lookup(image_bytes, image=image)
+        if cached is not None:
+            logger.info("Visual trust cache hit: tier=%s", cached["cache"]["tier"])
+            return cached
+
     try:
-        extracted = extract_visual_elements(image_bytes, debug=debug)
-        local_result = _build_local_visual_result(image_bytes, extracted=extracted, debug=debug)
+        model = get_trust_model()
+        if image is None and (tiled or model is not None):
+            # Decode once: the tiler and the model share the page
+            image = decode_image(image_bytes)
+        if tiled:
+            extracted = extract_visual_elements_tiled(image_bytes, image=image)
+        else:
+            extracted = extract_visual_elements(image_bytes, debug=debug, image=image)
+        model_probs = None
+        if model is not None and image is not None:
+            model_probs = predict_trust_distribution(image)
+        local_result = _build_local_visual_result(
+            image_bytes, extracted=extracted, debug=debug, model_probs=model_probs
+        )
         result_dict = local_result.dict()
+        if cache is not None and cache_key is not None:
+            cache.store(cache_key, result_dict)
+            result_dict["cache"] = {"tier": "miss", "key": cache_key.sha256[:16], "distance": None}
+        if tiled:
+            result_dict["sections"] = extracted.get("sections")
+            result_dict["tiles"] = extracted.get("tiles")
         debug_info = extracted.get("debug") if isinstance(extracted, dict) else None
         if debug_info:
             result_dict["debug"] = debug_info
@@ -359,3 +423,217 @@ def analyze_image_trust_bytes(image_bytes: bytes, debug: bool = False) -> Dict[s
             # No fallback enabled - re-raise
             raise
 
+
+# ====================================================
+# Batch analysis
+# ====================================================
+
+BATCH_IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp", ".bmp")
+
+
+def _default_batch_workers() -> int:
+    try:
+        configured = int(os.getenv("IMAGE_TRUST_BATCH_WORKERS", "0"))
+    except ValueError:
+        configured = 0
+    if configured > 0:
+        return configured
+    return max(2, min(8, os.cpu_count() or 2))
+
+
+def _batch_limit(env_name: str, default: int) -> int:
+    try:
+        configured = int(os.getenv(env_name, "0"))
+    except ValueError:
+        configured = 0
+    return configured if configured > 0 else default
+
+
+BATCH_MAX_IMAGES = _batch_limit("IMAGE_TRUST_BATCH_MAX_IMAGES", 2000)
+BATCH_MAX_IMAGE_BYTES = _batch_limit("IMAGE_TRUST_BATCH_MAX_IMAGE_BYTES", 25 * 1024 * 1024)
+BATCH_MAX_TOTAL_BYTES = _batch_limit("IMAGE_TRUST_BATCH_MAX_TOTAL_BYTES", 512 * 1024 * 1024)
+
+
+class BatchLimitError(ValueError):
+    """A batch went over its image count or byte limits."""
+
+
+class BatchBudget:
+    """
+    Image count and byte limits for one batch, checked before each image is
+    read into memory (zip members by their declared uncompressed size).
+    """
+
+    def __init__(
+        self,
+        max_images: Optional[int] = None,
+        max_image_bytes: Optional[int] = None,
+        max_total_bytes: Optional[int] = None,
+    ) -> None:
+        self.max_images = max_images or BATCH_MAX_IMAGES
+        self.max_image_bytes = max_image_bytes or BATCH_MAX_IMAGE_BYTES
+        self.max_total_bytes = max_total_bytes or BATCH_MAX_TOTAL_BYTES
+        self.images = 0
+        self.total_bytes = 0
+
+    def reserve(self, name: str, size: Optional[int]) -> None:
+        """Account for one more image of size bytes (None: not known yet, see add_bytes)."""
+        if self.images >= self.max_images:
+            raise BatchLimitError(f"Too many images. Maximum per batch is {self.max_images}.")
+        self.images += 1
+        if size is not None:
+            self.add_bytes(name, size)
+
+    def add_bytes(self, name: str, size: int) -> None:
+        if size > self.max_image_bytes:
+            raise BatchLimitError(f"{name} is {size} bytes. Maximum per image is {self.max_image_bytes}.")
+        self.total_bytes += size
+        if self.total_bytes > self.max_total_bytes:
+            raise BatchLimitError(f"Batch is over {self.max_total_bytes} bytes.")
+
+
+def iter_zip_images(
+    zip_source: bytes | BinaryIO,
+    budget: Optional[BatchBudget] = None,
+) -> Iterator[Tuple[str, bytes]]:
+    """
+    Yield (name, bytes) for every image file inside a zip archive (bytes or a
+    seekable file). With a budget, each member is checked against it before it
+    is decompressed; BatchLimitError stops the iteration.
+    """
+    source = io.BytesIO(zip_source) if isinstance(zip_source, (bytes, bytearray)) else zip_source
+    with zipfile.ZipFile(source) as zf:
+        for info in zf.infolist():
+            name = info.filename
+            if info.is_dir() or name.startswith("__MACOSX/") or name.rsplit("/", 1)[-1].startswith("."):
+                continue
+            if not name.lower().endswith(BATCH_IMAGE_EXTENSIONS):
+                continue
+            if budget is not None:
+                # file_size is what zipfile will decompress at most
+                budget.reserve(name, info.file_size)
+            yield name, zf.read(info)
+
+
+def _analyze_batch_item(index: int, name: str, image_bytes: bytes) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        if not image_bytes:
+            raise ValueError("Empty image bytes")
+        # Decode once; the cache's perceptual hash and the extractor share it
+        image = decode_image(image_bytes)
+        if image is None:
+            raise ValueError("Could not decode image")
+        analysis = analyze_image_trust_bytes(image_bytes, image=image)
+        success = True
+    except Exception as e:  # noqa: BLE001
+        logger.warning("Batch image trust failed for %s: %s", name, e)
+        analysis = {
+            "status": "error",
+            "errorType": type(e).__name__,
+            "errorMessage": str(e),
+            "label": None,
+            "overall_score": None,
+            "distribution": None,
+            "notes": None,
+            "warnings": [],
+            "elements": [],
+            "narrative": [],
+        }
+        success = False
+    return {
+        "type": "result",
+        "index": index,
+        "filename": name,
+        "success": success,
+        "analysis": analysis,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000.0, 2),
+    }
+
+
+def iter_image_trust_batch(
+    images: Iterable[Tuple[str, bytes]],
+    max_workers: Optional[int] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Analyze many images across a worker pool, yielding results as they finish.
+
+    OpenCV and Pillow release the GIL for decode and the heavy detector work,
+    so a thread pool scales across cores without pickling image bytes. At most
+    ``2 * max_workers`` images are in flight, so arbitrarily large inputs run
+    in bounded memory.
+
+    Yields one ``{"type": "result", ...}`` dict per image (completion order, with
+    its input ``index``) followed by a final ``{"type": "summary", ...}`` dict
+    with throughput figures.
+    """
+    workers = max_workers or _default_batch_workers()
+    window = workers * 2
+    started = time.perf_counter()
+    count = ok = failed = cache_hits = 0
+    total_bytes = 0
+
+    source = iter(enumerate(images))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-trust-batch") as pool:
+        pending = set()
+
+        def _fill() -> None:
+            nonlocal total_bytes
+            while len(pending) < window:
+                try:
+                    index, (name, data) = next(source)
+                except StopIteration:
+                    return
+                total_bytes += len(data or b"")
+                pending.add(pool.submit(_analyze_batch_item, index, name, data))
+
+        _fill()
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                pending.discard(fut)
+                item = fut.result()
+                count += 1
+                if item["success"]:
+                    ok += 1
+                    tier = (item["analysis"].get("cache") or {}).get("tier")
+                    if tier and tier != "miss":
+                        cache_hits += 1
+                else:
+                    failed += 1
+                yield item
+            _fill()
+
+    elapsed = time.perf_counter() - started
+    yield {
+        "type": "summary",
+        "count": count,
+        "ok": ok,
+        "failed": failed,
+        "cache_hits": cache_hits,
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "images_per_s": round(count / elapsed, 2) if elapsed > 0 else None,
+        "mb_per_s": round(total_bytes / (1024 * 1024) / elapsed, 2) if elapsed > 0 else None,
+    }
+
+
+def analyze_image_trust_batch(
+    images: Iterable[Tuple[str, bytes]],
+    max_workers: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Python API around iter_image_trust_batch.
+
+    Returns {"results": [...in input order...], "summary": {...}}.
+    """
+    results: List[Dict[str, Any]] = []
+    summary: Dict[str, Any] = {}
+    for item in iter_image_trust_batch(images, max_workers=max_workers):
+        if item["type"] == "summary":
+            summary = item
+        else:
+            results.append(item)
+    results.sort(key=lambda r: r["index"])
+    return {"results": results, "summary": summary}
+
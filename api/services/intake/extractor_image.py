@@ -2,20 +2,23 @@
 Image extractor: converts image bytes into PageMap schema using vision API.
 """
 import logging
-import json
 import os
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+from api.json_utils import JSONParseError, parse_json_object
 from api.schemas.page_map import PageMap, PrimaryCTA, Offer, VisualHierarchy
-from openai import OpenAI
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
-def _get_openai_client() -> OpenAI:
+def _get_openai_client() -> "OpenAI":
     """Get OpenAI client."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set")
+    from openai import OpenAI
     return OpenAI(api_key=api_key)
 
 
@@ -102,8 +105,8 @@ Return ONLY the JSON object, no markdown, no explanation."""
         if not content:
             raise ValueError("Empty response from OpenAI Vision")
         
-        # Parse JSON
-        data = json.loads(content)
+        # Parse JSON (fences and truncated output are handled)
+        data = parse_json_object(content, context="image extraction")
         
         # Build PageMap
         primary_cta_data = data.get("primary_cta", {})
@@ -150,7 +153,7 @@ Return ONLY the JSON object, no markdown, no explanation."""
             language=data.get("language", "en")
         )
         
-    except json.JSONDecodeError as e:
+    except JSONParseError as e:
         logger.error(f"Failed to parse OpenAI Vision JSON: {e}")
         raise ValueError(f"Invalid JSON from vision API: {e}")
     except Exception as e:
@@ -2,20 +2,23 @@
 Text extractor: converts text input into PageMap schema using LLM.
 """
 import logging
-import json
 import os
-from typing import Dict, Any
+from typing import TYPE_CHECKING, Dict, Any
+from api.json_utils import JSONParseError, parse_json_object
 from api.schemas.page_map import PageMap, PrimaryCTA, Offer, VisualHierarchy
-from openai import OpenAI
+
+if TYPE_CHECKING:
+    from openai import OpenAI
 
 logger = logging.getLogger(__name__)
 
 
-def _get_openai_client() -> OpenAI:
+def _get_openai_client() -> "OpenAI":
     """Get OpenAI client."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OPENAI_API_KEY not set")
+    from openai import OpenAI
     return OpenAI(api_key=api_key)
 
 
@@ -88,8 +91,8 @@ Return ONLY the JSON object, no markdown, no explanation."""
         if not content:
             raise ValueError("Empty response from OpenAI")
         
-        # Parse JSON
-        data = json.loads(content)
+        # Parse JSON (fences and truncated output are handled)
+        data = parse_json_object(content, context="text extraction")
         
         # Build PageMap
         primary_cta_data = data.get("primary_cta", {})
@@ -136,7 +139,7 @@ Return ONLY the JSON object, no markdown, no explanation."""
             language=data.get("language", "en")
         )
         
-    except json.JSONDecodeError as e:
+    except JSONParseError as e:
         logger.error(f"Failed to parse OpenAI JSON: {e}")
         raise ValueError(f"Invalid JSON from LLM: {e}")
     except Exception as e:
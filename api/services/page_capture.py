@@ -1,6 +1,10 @@
 """
 Playwright-based page capture service.
 Renders URL, takes screenshots (ATF + Full), and extracts DOM content.
+
+Config (env):
+- CAPTURE_CACHE_TTL_SECONDS: how long a successful capture is reused, 0
+  disables (default: 300; see api/core/cache.py)
 """
 import os
 import sys
@@ -21,6 +25,12 @@ logger = logging.getLogger(__name__)
 # Use centralized paths from api.paths
 from api.paths import ARTIFACTS_DIR
 from api.services.artifacts import save_artifact_bytes, bytes_to_data_uri, artifact_public_url
+from api.services.dom_extract import extract_dom_structure
+from api.core.cache import get_cache, make_key
+from api.core.config import get_env
+
+# Re-running an analysis minutes later reuses the capture instead of rendering again
+DEFAULT_CAPTURE_CACHE_TTL_SECONDS = 300
 
 
 def png_bytes_to_data_url(png_bytes: bytes) -> str:
@@ -138,7 +148,8 @@ def _capture_viewport_sync(
         is_mobile: Whether to enable mobile emulation
         
     Returns:
-        Tuple of (html, title, readable, atf_bytes, full_bytes)
+        Tuple of (html, title, readable, atf_bytes, full_bytes, structure)
+        where structure is the in-browser DOM extraction (see dom_extract)
     """
     from playwright.sync_api import sync_playwright
     
@@ -153,6 +164,7 @@ def _capture_viewport_sync(
     readable = ""
     atf_bytes = b""
     full_bytes = b""
+    structure: Dict[str, Any] = {}
     
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
@@ -234,12 +246,20 @@ def _capture_viewport_sync(
             # Take full page screenshot - return bytes instead of saving
             full_bytes = page.screenshot(full_page=True, type="png")
             
+            # Structured DOM data with real bounding boxes (one evaluate round trip,
+            # after the lazy-load scroll; coordinates are document-relative)
+            structure = extract_dom_structure(page)
+            
             # Extract content (use desktop page for content extraction)
             if not is_mobile:
                 html = page.content()
                 title = page.title()
-                # Readable text (rough): body innerText
-                readable = page.evaluate("() => document.body ? document.body.innerText : ''")
+                # Readable text (rough): body innerText, collected by the DOM extraction
+                readable = structure.pop("readable", None)
+                if readable is None:
+                    readable = page.evaluate("() => document.body ? document.body.innerText : ''")
+            else:
+                structure.pop("readable", None)
             
             page.close()
             context.close()
@@ -256,12 +276,17 @@ def _capture_viewport_sync(
         finally:
             browser.close()
     
-    return html, title, readable, atf_bytes, full_bytes
+    return html, title, readable, atf_bytes, full_bytes, structure
 
 
-async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[str, Any]:
+async def capture_page_artifacts(
+    url: str,
+    base_url: str | None = None,
+    refresh: bool = False,
+) -> Dict[str, Any]:
     """
-    Capture page artifacts using Playwright:
+    Capture page artifacts using Playwright (successful captures are cached
+    for CAPTURE_CACHE_TTL_SECONDS, shared by all workers):
     - Screenshots (Desktop ATF + Full, Mobile ATF + Full) saved to disk and returned as URLs + data URIs
     - HTML content
     - Readable text
@@ -269,6 +294,7 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
     Args:
         url: URL to capture
         base_url: Base URL for generating public artifact URLs (optional)
+        refresh: Capture again even if a recent capture of the URL is cached
         
     Returns:
         Dictionary with screenshot artifacts (url + data_uri), DOM content, and metadata
@@ -286,6 +312,24 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
             "dom": { ... }
         }
     """
+    ttl = float(get_env("CAPTURE_CACHE_TTL_SECONDS", str(DEFAULT_CAPTURE_CACHE_TTL_SECONDS)))
+    if ttl <= 0:
+        return await _capture_page_artifacts(url, base_url)
+    cache = get_cache("capture", ttl=ttl)
+    key = make_key(url, base_url)
+    if not refresh:
+        cached = await cache.aget(key)
+        if cached is not None:
+            logger.info(f"Capture cache hit for {url} (captured {cached.get('timestamp_utc')})")
+            return cached
+    capture = await _capture_page_artifacts(url, base_url)
+    if capture.get("status") == "ok":
+        await cache.aset(key, capture)
+    return capture
+
+
+async def _capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[str, Any]:
+    """Render url with Playwright and save its artifacts (uncached)."""
     # Desktop viewport
     desktop_viewport = {"width": 1365, "height": 768}
     
@@ -299,6 +343,8 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
     desktop_full_bytes = b""
     mobile_atf_bytes = b""
     mobile_full_bytes = b""
+    desktop_structure: Dict[str, Any] = {}
+    mobile_structure: Dict[str, Any] = {}
     
     # Generate unique filenames using epoch timestamp
     epoch = int(time.time())
@@ -311,7 +357,7 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
         
         # Capture desktop screenshots (also extract HTML/title/readable from desktop)
         try:
-            html, title, readable, desktop_atf_bytes, desktop_full_bytes = await loop.run_in_executor(
+            html, title, readable, desktop_atf_bytes, desktop_full_bytes, desktop_structure = await loop.run_in_executor(
             None,  # Use default executor (ThreadPoolExecutor)
             _capture_viewport_sync,
                 url, desktop_viewport, False
@@ -331,13 +377,14 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
             readable = ""
             desktop_atf_bytes = b""
             desktop_full_bytes = b""
+            desktop_structure = {}
             # Re-raise if it's a critical error (not just timeout or network error)
             if "Timeout" not in error_str and "ERR_NAME_NOT_RESOLVED" not in error_str and "net::" not in error_str:
                 raise
         
         # Capture mobile screenshots (don't extract content again, use desktop)
         try:
-            _, _, _, mobile_atf_bytes, mobile_full_bytes = await loop.run_in_executor(
+            _, _, _, mobile_atf_bytes, mobile_full_bytes, mobile_structure = await loop.run_in_executor(
             None,
             _capture_viewport_sync,
                 url, mobile_viewport, True
@@ -353,6 +400,7 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
             # Set empty defaults if mobile fails
             mobile_atf_bytes = b""
             mobile_full_bytes = b""
+            mobile_structure = {}
             # Re-raise if it's a critical error (not just timeout or network error)
             if "Timeout" not in error_str and "ERR_NAME_NOT_RESOLVED" not in error_str and "net::" not in error_str:
                 raise
@@ -526,7 +574,9 @@ async def capture_page_artifacts(url: str, base_url: str | None = None) -> Dict[
         "dom": {
             "title": title,
             "html_excerpt": html_excerpt,
-            "readable_text_excerpt": readable_excerpt
+            "readable_text_excerpt": readable_excerpt,
+            "structure": desktop_structure,
+            "structure_mobile": mobile_structure,
         }
     }
 
@@ -3,9 +3,15 @@ Extract structured data from page DOM:
 - Headlines (H1/H2)
 - CTAs (buttons, links, form inputs)
 - Trust signals (keywords-based)
+
+When the capture carries the in-browser DOM extraction (dom.structure, see
+dom_extract), headlines / CTAs / forms come from it with real bounding boxes
+and above-the-fold sections; otherwise html_excerpt is parsed.
 """
-from typing import Dict, Any, List
-from bs4 import BeautifulSoup
+from typing import Dict, Any, List, Tuple
+
+from api.services.dom_extract import structure_to_page_map
+from api.utils.html_document import parse_document
 
 
 def _text(el):
@@ -15,32 +21,14 @@ def _text(el):
     return " ".join(el.get_text(" ", strip=True).split())
 
 
-def extract_page_map(capture: Dict[str, Any]) -> Dict[str, Any]:
-    """
-    Extract page structure from captured HTML:
-    - Headlines (H1, H2)
-    - CTAs (links, buttons, submit inputs)
-    - Trust signals (keyword-based detection)
-    
-    Args:
-        capture: Dictionary from capture_page_artifacts()
-        
-    Returns:
-        Dictionary with headlines, ctas, trust_signals, etc.
-    """
-    # Ensure capture is a dict
-    if not isinstance(capture, dict):
-        capture = {}
-    
-    # Safely get HTML
-    dom = capture.get("dom", {}) if isinstance(capture, dict) else {}
-    html = dom.get("html_excerpt", "") if isinstance(dom, dict) else ""
-    soup = BeautifulSoup(html, "lxml")
+def _headlines_and_ctas_from_html(html: str) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Fallback when no in-browser DOM extraction is available: parse html_excerpt."""
+    doc = parse_document(html)
     
     # Extract headlines
     headlines: List[Dict[str, Any]] = []
     for tag in ["h1", "h2"]:
-        for el in soup.find_all(tag)[:10]:
+        for el in doc.headings_by_tag(tag)[:10]:
             txt = _text(el)
             if txt:
                 headlines.append({
@@ -56,7 +44,7 @@ def extract_page_map(capture: Dict[str, Any]) -> Dict[str, Any]:
     # Extract CTAs
     ctas: List[Dict[str, Any]] = []
     # a/button/input submit as basic CTA candidates
-    for el in soup.select("a,button,input[type='submit'],input[type='button']")[:30]:
+    for el in doc.cta_nodes[:30]:
         label = _text(el) or (el.get("value") or "")
         href = el.get("href") or ""
         
@@ -74,6 +62,37 @@ def extract_page_map(capture: Dict[str, Any]) -> Dict[str, Any]:
             },
             "notes": ""
         })
+    return headlines, ctas
+
+
+def extract_page_map(capture: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract page structure from the capture (DOM extraction or HTML):
+    - Headlines (H1, H2)
+    - CTAs (links, buttons, submit inputs)
+    - Trust signals (keyword-based detection)
+    
+    Args:
+        capture: Dictionary from capture_page_artifacts()
+        
+    Returns:
+        Dictionary with headlines, ctas, trust_signals, etc.
+    """
+    # Ensure capture is a dict
+    if not isinstance(capture, dict):
+        capture = {}
+    
+    dom = capture.get("dom", {}) if isinstance(capture, dict) else {}
+    structured = structure_to_page_map(dom.get("structure")) if isinstance(dom, dict) else None
+    if structured is not None:
+        headlines = structured["headlines"]
+        ctas = structured["ctas"]
+        forms = structured["forms"]
+        offer_elements = structured["prices"]
+        badges = structured["badges"]
+    else:
+        headlines, ctas = _headlines_and_ctas_from_html(dom.get("html_excerpt", "") if isinstance(dom, dict) else "")
+        forms, offer_elements, badges = [], [], []
     
     # Very light trust signal extraction (keywords)
     trust_signals: List[Dict[str, Any]] = []
@@ -97,12 +116,14 @@ def extract_page_map(capture: Dict[str, Any]) -> Dict[str, Any]:
                 }
             })
     
+    trust_signals.extend(badges)
+    
     return {
         "headlines": headlines,
         "ctas": ctas,
         "trust_signals": trust_signals,
-        "offer_elements": [],
-        "forms": [],
+        "offer_elements": offer_elements,
+        "forms": forms,
         "navigation": {
             "items": [],
             "language_switch": False
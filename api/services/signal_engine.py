@@ -5,15 +5,19 @@ Always returns 12 signals with consistent schema.
 """
 import os
 import re
-from typing import Dict, Any, List, Optional
-from pathlib import Path
-from dotenv import load_dotenv
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from api.core.cache import cached_completion_text
+from api.core.config import load_env
+
+from api.json_utils import parse_json_object
+from api.services.signal_rules import (
+    Keywords, Outcome, SignalRule, TokenizedPage, Value,
+    all_, any_, compile_plan, eq, gt, gte, is_, lt, lte, not_,
+)
+from api.utils.keyword_lexicon import Lexicon
 
 # Load .env
-project_root = Path(__file__).parent.parent.parent
-env_file = project_root / ".env"
-if env_file.exists():
-    load_dotenv(env_file, override=True)
+load_env()
 
 # Signal definitions (12 signals with categories)
 SIGNAL_DEFINITIONS = [
@@ -82,6 +86,26 @@ PRICING_KEYWORDS = [
 # Bad CTA examples (vague)
 BAD_CTA_EXAMPLES = ["submit", "click here", "read more", "continue", "next"]
 
+# Form friction keywords
+FORM_KEYWORDS = ["form", "input", "field", "required", "submit", "register", "sign up", "email", "password"]
+
+# All keyword lists compiled once; a page is normalized and scanned once for every detector
+SIGNAL_LEXICON = Lexicon({
+    "cta_action": CTA_ACTION_KEYWORDS,
+    "value_prop": VALUE_PROP_KEYWORDS,
+    "vague": VAGUE_RED_FLAGS,
+    "social_proof": SOCIAL_PROOF_KEYWORDS,
+    "risk_reducer": RISK_REDUCER_KEYWORDS,
+    "legitimacy": LEGITIMACY_KEYWORDS,
+    "pricing": PRICING_KEYWORDS,
+    "bad_cta": BAD_CTA_EXAMPLES,
+    "form": FORM_KEYWORDS,
+    # CTA label / structural vocabularies
+    "cta_outcome": ["get", "start", "try", "analyze", "report", "result"],
+    "form_cta": ["sign", "register", "submit"],
+    "conflicting_action": ["buy", "try", "learn", "get", "start"],
+})
+
 
 def _normalize_text(text: str) -> str:
     """Normalize text for keyword matching."""
@@ -92,22 +116,12 @@ def _normalize_text(text: str) -> str:
 
 def _count_keywords(text: str, keywords: List[str]) -> int:
     """Count how many keywords appear in text."""
-    normalized = _normalize_text(text)
-    count = 0
-    for keyword in keywords:
-        if keyword in normalized:
-            count += 1
-    return count
+    return len(_find_keywords_in_text(text, keywords))
 
 
 def _find_keywords_in_text(text: str, keywords: List[str]) -> List[str]:
-    """Find which keywords appear in text."""
-    normalized = _normalize_text(text)
-    found = []
-    for keyword in keywords:
-        if keyword in normalized:
-            found.append(keyword)
-    return found
+    """Find which keywords appear in text (one memoized lexicon scan per text)."""
+    return SIGNAL_LEXICON.scan(text).matches(keywords)
 
 
 def _get_hero_text(page_text: str, headlines: List[Dict[str, Any]]) -> str:
@@ -126,84 +140,328 @@ def _get_hero_text(page_text: str, headlines: List[Dict[str, Any]]) -> str:
     return " ".join(hero_parts)
 
 
-def _detect_value_prop_presence(page_text: str, headlines: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect value proposition presence (CLARITY)."""
-    hero_text = _get_hero_text(page_text, headlines)
-    
-    # Check for at least 2 of: audience + outcome + problem solved
-    value_prop_count = _count_keywords(hero_text, VALUE_PROP_KEYWORDS)
-    found_keywords = _find_keywords_in_text(hero_text, VALUE_PROP_KEYWORDS)
-    
-    # Check if there's a clear sentence (has subject + verb + object structure)
-    has_clear_sentence = len(hero_text.split(".")) > 0 and len(hero_text) > 50
-    
-    if value_prop_count >= 2 and has_clear_sentence:
-        return {
-            "id": "value_prop_presence",
-            "label": "Value Proposition Presence",
-            "category": "clarity",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Clear value proposition found with {value_prop_count} value indicators",
-            "recommendation": "Value proposition is clearly stated",
-            "evidence": {
-                "keywords": found_keywords,
-                "location": "hero"
-            }
-        }
-    elif value_prop_count >= 1 or has_clear_sentence:
-        return {
-            "id": "value_prop_presence",
-            "label": "Value Proposition Presence",
-            "category": "clarity",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": "Value proposition exists but is too generic",
-            "recommendation": "Make value proposition more specific: who it helps, what outcome, what problem solved",
-            "evidence": {
-                "keywords": found_keywords if found_keywords else None,
-                "location": "hero"
-            }
-        }
-    else:
-        return {
-            "id": "value_prop_presence",
-            "label": "Value Proposition Presence",
-            "category": "clarity",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No clear value proposition detected in hero section",
-            "recommendation": "Add a clear value proposition: who you help, what outcome, what problem solved",
-            "evidence": {
-                "location": "hero"
-            }
-        }
+# ---------------------------------------------------------------------------
+# Structural features (computed once per tokenized page, shared by all rules)
+# ---------------------------------------------------------------------------
+
+def _classify_ctas(page: TokenizedPage) -> Tuple[List[str], List[str]]:
+    """Split CTA labels into outcome-focused (clear) and vague ones."""
+    clear_ctas, vague_ctas = [], []
+    for cta, hits in zip(page.ctas, page.cta_hits):
+        cta_text = _normalize_text(cta.get("label", ""))
+        if hits.any("bad_cta"):
+            vague_ctas.append(cta_text)
+        elif hits.any("cta_outcome"):
+            clear_ctas.append(cta_text)
+        else:
+            vague_ctas.append(cta_text)
+    return clear_ctas, vague_ctas
 
 
-async def _detect_value_prop_specificity(page_text: str, headlines: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect value proposition specificity using LLM (CLARITY)."""
-    hero_text = _get_hero_text(page_text, headlines)
-    
+def _early_form(page: TokenizedPage) -> bool:
+    """Form keywords in the first 500 chars: the form appears before value is understood."""
+    positions = page.hits("page").positions
+    return any(start + len(kw) <= 500 for kw in FORM_KEYWORDS for start in positions.get(kw, ()))
+
+
+SIGNAL_SCOPES = {
+    "page": lambda p: p.page_text,
+    "hero": lambda p: p.feature("hero_text"),
+}
+
+SIGNAL_FEATURES = {
+    "hero_text": lambda p: _get_hero_text(p.page_text, p.headlines),
+    "hero_length": lambda p: len(p.feature("hero_text")),
+    "clear_sentence": lambda p: len(p.feature("hero_text").split(".")) > 0 and len(p.feature("hero_text")) > 50,
+    "has_numbers": lambda p: bool(re.search(r"\d+", p.feature("hero_text"))),
+    "page_length": lambda p: len(p.page_text),
+    "word_count": lambda p: len(p.page_text.split()),
+    "page_excerpt": lambda p: p.page_text[:200] if p.page_text else None,
+    "h1_exists": lambda p: any(h.get("tag") == "h1" for h in p.headlines),
+    "h2_exists": lambda p: any(h.get("tag") == "h2" for h in p.headlines),
+    "h1_count": lambda p: len([h for h in p.headlines if h.get("tag") == "h1"]),
+    "h2_count": lambda p: len([h for h in p.headlines if h.get("tag") == "h2"]),
+    "headline_count": lambda p: len(p.headlines),
+    "cta_count": lambda p: len(p.ctas),
+    # First 3 CTAs are likely in the hero
+    "primary_cta_count": lambda p: min(len(p.ctas), 3),
+    "action_cta_count": lambda p: sum(1 for hits in p.cta_hits if hits.any("cta_action")),
+    "form_cta_count": lambda p: sum(1 for hits in p.cta_hits if hits.any("form_cta")),
+    "cta_classes": _classify_ctas,
+    "clear_cta_count": lambda p: len(p.feature("cta_classes")[0]),
+    "vague_cta_count": lambda p: len(p.feature("cta_classes")[1]),
+    "first_clear_cta": lambda p: next(iter(p.feature("cta_classes")[0]), None),
+    "first_vague_cta": lambda p: next(iter(p.feature("cta_classes")[1]), None),
+    "early_form": _early_form,
+}
+
+
+# ---------------------------------------------------------------------------
+# The 12 signals, declared as data (see api/services/signal_rules.py)
+# ---------------------------------------------------------------------------
+
+_INSUFFICIENT = "Insufficient visible evidence in the provided content."
+_VALUE_PROP_ADVICE = "Use specific numbers, results, and concrete details instead of vague claims"
+_COGNITIVE_LOAD_ADVICE = "Reduce text, improve hierarchy with clear H1/H2, remove conflicting messages"
+_COGNITIVE_LOAD_REASON = "~{word_count} words, {h1_count} H1, {h2_count} H2, {conflicting_action} conflicting actions"
+
+SIGNAL_RULES = (
+    # CLARITY
+    SignalRule(
+        id="value_prop_presence", label="Value Proposition Presence", category="clarity",
+        keywords={"value_prop": "hero"},
+        features=("clear_sentence",),
+        outcomes=(
+            Outcome("present", 0.9, "Clear value proposition found with {value_prop} value indicators",
+                    "Value proposition is clearly stated",
+                    when=all_(gte("value_prop", 2), is_("clear_sentence")),
+                    evidence={"keywords": Keywords("value_prop"), "location": "hero"}),
+            Outcome("weak", 0.6, "Value proposition exists but is too generic",
+                    "Make value proposition more specific: who it helps, what outcome, what problem solved",
+                    when=any_(gte("value_prop", 1), is_("clear_sentence")),
+                    evidence={"keywords": Keywords("value_prop"), "location": "hero"}),
+            Outcome("missing", 0.8, "No clear value proposition detected in hero section",
+                    "Add a clear value proposition: who you help, what outcome, what problem solved",
+                    evidence={"location": "hero"}),
+        ),
+    ),
+    # Rule-based fallback; detect_signals asks the LLM first
+    SignalRule(
+        id="value_prop_specificity", label="Value Proposition Specificity", category="clarity",
+        keywords={"vague": "hero"},
+        features=("hero_length", "has_numbers"),
+        outcomes=(
+            Outcome("unclear", 0.3, _INSUFFICIENT,
+                    "Add specific numbers, results, or concrete details to value proposition",
+                    when=lt("hero_length", 20)),
+            Outcome("vague", 0.8, "Found {vague} vague terms, no numbers", _VALUE_PROP_ADVICE,
+                    when=all_(gte("vague", 2), not_(is_("has_numbers"))),
+                    evidence={"keywords": Keywords("vague")}),
+            Outcome("mixed", 0.6, "Found {vague} vague terms, has numbers", _VALUE_PROP_ADVICE,
+                    when=all_(gte("vague", 1), is_("has_numbers")),
+                    evidence={"keywords": Keywords("vague")}),
+            Outcome("mixed", 0.6, "Found {vague} vague terms, no numbers", _VALUE_PROP_ADVICE,
+                    when=gte("vague", 1),
+                    evidence={"keywords": Keywords("vague")}),
+            Outcome("specific", 0.7, "Found {vague} vague terms, has numbers", _VALUE_PROP_ADVICE,
+                    when=is_("has_numbers"),
+                    evidence={"keywords": Keywords("vague")}),
+            Outcome("mixed", 0.7, "Found {vague} vague terms, no numbers", _VALUE_PROP_ADVICE,
+                    evidence={"keywords": Keywords("vague")}),
+        ),
+    ),
+    SignalRule(
+        id="information_hierarchy", label="Information Hierarchy", category="clarity",
+        features=("h1_exists", "h2_exists", "headline_count", "cta_count"),
+        outcomes=(
+            Outcome("present", 0.9, "H1 present, {headline_count} headline(s), {cta_count} CTA(s) - clear hierarchy",
+                    "Information hierarchy is clear: H1 → supporting text → CTA",
+                    when=all_(is_("h1_exists"), gte("cta_count", 1), is_("h2_exists")),
+                    evidence={"location": "hero"}),
+            Outcome("present", 0.8, "H1 present, {headline_count} headline(s), {cta_count} CTA(s) - clear hierarchy",
+                    "Information hierarchy is clear: H1 → supporting text → CTA",
+                    when=all_(is_("h1_exists"), gte("cta_count", 1)),
+                    evidence={"location": "hero"}),
+            Outcome("weak", 0.6, "H1, {cta_count} CTA(s) - incomplete hierarchy",
+                    "Ensure clear hierarchy: H1 → supporting text → CTA",
+                    when=is_("h1_exists"),
+                    evidence={"location": "hero"}),
+            Outcome("weak", 0.6, "No H1, {cta_count} CTA(s) - incomplete hierarchy",
+                    "Ensure clear hierarchy: H1 → supporting text → CTA",
+                    when=gte("cta_count", 1),
+                    evidence={"location": "hero"}),
+            Outcome("missing", 0.8, "No clear H1 or CTA detected - users may not know what to read first",
+                    "Add H1 headline and clear CTA to establish information hierarchy",
+                    evidence={"location": "hero"}),
+        ),
+    ),
+    # ACTION
+    SignalRule(
+        id="primary_cta_presence", label="Primary CTA Presence", category="action",
+        keywords={"cta_action": "page"},
+        features=("action_cta_count",),
+        outcomes=(
+            Outcome("present", 0.9, "Found {action_cta_count} action-oriented CTA(s)",
+                    "Primary CTA is present and action-oriented",
+                    when=gt("action_cta_count", 0),
+                    evidence={"keywords": Keywords("cta_action", 5), "location": "hero"}),
+            Outcome("weak", 0.6, "Found {cta_action} CTA keywords but no clear CTA button",
+                    "Add a prominent action-oriented CTA button (e.g., 'Get Started', 'Try Now')",
+                    when=gte("cta_action", 2),
+                    evidence={"keywords": Keywords("cta_action", 5)}),
+            Outcome("missing", 0.8, "No action-oriented CTA detected",
+                    "Add a clear primary CTA with action verbs (start, get, try, request, book)",
+                    evidence={}),
+        ),
+    ),
+    SignalRule(
+        id="cta_clarity", label="CTA Clarity", category="action",
+        features=("cta_count", "clear_cta_count", "vague_cta_count", "first_clear_cta", "first_vague_cta"),
+        outcomes=(
+            Outcome("unclear", 0.3, _INSUFFICIENT,
+                    "Add a clear CTA that states the outcome (e.g., 'Get Report', 'Start Analysis')",
+                    when=eq("cta_count", 0)),
+            Outcome("present", 0.9, "All {clear_cta_count} CTA(s) clearly state the outcome",
+                    "CTAs are clear and outcome-focused",
+                    when=all_(gt("clear_cta_count", 0), eq("vague_cta_count", 0)),
+                    evidence={"text": Value("first_clear_cta")}),
+            Outcome("weak", 0.6, "{clear_cta_count} clear CTA(s) but {vague_cta_count} vague CTA(s) found",
+                    "Make all CTAs outcome-focused (e.g., 'Get Report' not 'Submit')",
+                    when=gt("clear_cta_count", 0),
+                    evidence={"text": Value("first_vague_cta")}),
+            Outcome("missing", 0.8, "All {vague_cta_count} CTA(s) are vague (e.g., 'Submit', 'Click Here')",
+                    "Replace vague CTAs with outcome-focused ones (e.g., 'Get Report', 'Start Analysis')",
+                    evidence={"text": Value("first_vague_cta")}),
+        ),
+    ),
+    SignalRule(
+        id="cta_competition", label="CTA Competition", category="action",
+        features=("cta_count", "primary_cta_count"),
+        outcomes=(
+            Outcome("unclear", 0.3, _INSUFFICIENT, "Add at least one primary CTA",
+                    when=eq("cta_count", 0)),
+            Outcome("present", 0.9, "Single CTA - no competition, clear focus",
+                    "Single CTA is optimal for conversion",
+                    when=eq("cta_count", 1),
+                    evidence={"location": "hero"}),
+            Outcome("weak", 0.7, "{primary_cta_count} CTA(s) in hero - moderate competition",
+                    "Consider reducing to 1 primary CTA for better focus",
+                    when=lte("primary_cta_count", 2),
+                    evidence={"location": "hero"}),
+            Outcome("missing", 0.8, "{cta_count} CTA(s) found - high competition, unclear focus",
+                    "Too many CTAs confuse users. Focus on 1 primary action",
+                    evidence={"location": "hero"}),
+        ),
+    ),
+    # TRUST
+    SignalRule(
+        id="social_proof_presence", label="Social Proof Presence", category="trust",
+        keywords={"social_proof": "page"},
+        outcomes=(
+            Outcome("present", 0.9, "Found {social_proof} social proof indicators",
+                    "Strong social proof signals present",
+                    when=gte("social_proof", 3),
+                    evidence={"keywords": Keywords("social_proof", 5)}),
+            Outcome("weak", 0.6, "Only {social_proof} social proof indicator(s) found",
+                    "Add testimonials, reviews, customer logos, or 'trusted by' section",
+                    when=gte("social_proof", 1),
+                    evidence={"keywords": Keywords("social_proof", 5)}),
+            Outcome("missing", 0.8, "No social proof detected",
+                    "Add testimonials, reviews, customer logos, or 'trusted by' section",
+                    evidence={}),
+        ),
+    ),
+    SignalRule(
+        id="risk_reducers", label="Risk Reducers", category="trust",
+        keywords={"risk_reducer": "page"},
+        outcomes=(
+            Outcome("present", 0.9, "Found {risk_reducer} risk reduction signals",
+                    "Strong risk reduction signals present",
+                    when=gte("risk_reducer", 2),
+                    evidence={"keywords": Keywords("risk_reducer", 5)}),
+            Outcome("weak", 0.6, "Only {risk_reducer} risk reducer(s) found",
+                    "Add free trial, money-back guarantee, or 'cancel anytime' messaging",
+                    when=gte("risk_reducer", 1),
+                    evidence={"keywords": Keywords("risk_reducer", 5)}),
+            Outcome("missing", 0.8, "No risk reduction signals detected",
+                    "Add free trial, money-back guarantee, or 'cancel anytime' messaging",
+                    evidence={}),
+        ),
+    ),
+    SignalRule(
+        id="legitimacy_signals", label="Legitimacy Signals", category="trust",
+        keywords={"legitimacy": "page"},
+        outcomes=(
+            Outcome("present", 0.9, "Found {legitimacy} legitimacy indicators (contact, about, privacy, terms)",
+                    "Legitimacy signals are present",
+                    when=gte("legitimacy", 3),
+                    evidence={"keywords": Keywords("legitimacy", 5)}),
+            Outcome("weak", 0.6, "Only {legitimacy} legitimacy indicator(s) found",
+                    "Add contact information, about page, privacy policy, and terms of service",
+                    when=gte("legitimacy", 1),
+                    evidence={"keywords": Keywords("legitimacy", 5)}),
+            Outcome("missing", 0.8, "No legitimacy signals detected (contact, about, privacy, terms)",
+                    "Add contact information, about page, privacy policy, and terms of service",
+                    evidence={}),
+        ),
+    ),
+    # FRICTION
+    SignalRule(
+        id="pricing_visibility", label="Pricing Visibility", category="friction",
+        keywords={"pricing": "page"},
+        outcomes=(
+            Outcome("present", 0.9, "Found {pricing} pricing-related keywords - pricing is visible",
+                    "Pricing is clearly visible",
+                    when=gte("pricing", 3),
+                    evidence={"keywords": Keywords("pricing", 5)}),
+            Outcome("weak", 0.6, "Only {pricing} pricing keyword(s) found - pricing path may be unclear",
+                    "Make pricing more prominent and clear to reduce friction",
+                    when=gte("pricing", 1),
+                    evidence={"keywords": Keywords("pricing", 5)}),
+            Outcome("missing", 0.8, "No pricing information detected - unclear pricing path",
+                    "Add clear pricing information to reduce friction",
+                    evidence={}),
+        ),
+    ),
+    SignalRule(
+        id="form_friction", label="Form Friction", category="friction",
+        keywords={"form": "page"},
+        features=("form_cta_count", "early_form"),
+        outcomes=(
+            Outcome("missing", 0.8, "Complex form detected ({form} form keywords) or form appears too early",
+                    "Simplify form or move it after value is communicated",
+                    when=any_(gte("form", 5), all_(gte("form_cta_count", 2), is_("early_form"))),
+                    evidence={"keywords": Keywords("form", 5)}),
+            Outcome("weak", 0.6, "Moderate form complexity ({form} form keywords)",
+                    "Keep forms simple and only ask for essential information",
+                    when=gte("form", 2),
+                    evidence={"keywords": Keywords("form", 5)}),
+            Outcome("present", 0.7, "Minimal form elements detected - low friction",
+                    "Forms appear simple - good for conversion",
+                    evidence={}),
+        ),
+    ),
+    # Rule-based fallback; detect_signals asks the LLM first
+    SignalRule(
+        id="cognitive_load", label="Cognitive Load", category="friction",
+        keywords={"conflicting_action": "page"},
+        features=("page_length", "word_count", "h1_count", "h2_count", "page_excerpt"),
+        outcomes=(
+            Outcome("unclear", 0.3, _INSUFFICIENT, "Ensure content is well-organized with clear headings",
+                    when=lt("page_length", 50)),
+            Outcome("high", 0.8, _COGNITIVE_LOAD_REASON, _COGNITIVE_LOAD_ADVICE,
+                    when=any_(gt("word_count", 1000), gte("conflicting_action", 3)),
+                    evidence={"text": Value("page_excerpt")}),
+            Outcome("moderate", 0.6, _COGNITIVE_LOAD_REASON, _COGNITIVE_LOAD_ADVICE,
+                    when=any_(gt("word_count", 500), gte("conflicting_action", 2)),
+                    evidence={"text": Value("page_excerpt")}),
+            Outcome("low", 0.7, _COGNITIVE_LOAD_REASON, _COGNITIVE_LOAD_ADVICE,
+                    evidence={"text": Value("page_excerpt")}),
+        ),
+    ),
+)
+
+# Compiled once at import: rules validated, keyword groups resolved to lexicon scans per scope
+SIGNAL_PLAN = compile_plan(SIGNAL_RULES, SIGNAL_LEXICON, SIGNAL_SCOPES, SIGNAL_FEATURES, CATEGORY_WEIGHTS)
+
+
+def _parse_llm_json(raw_json: str) -> Dict[str, Any]:
+    return parse_json_object(raw_json, context="signal detection")
+
+
+async def _detect_value_prop_specificity(page: TokenizedPage) -> Dict[str, Any]:
+    """Detect value proposition specificity using LLM (CLARITY); falls back to the declared rule."""
+    fallback = SIGNAL_PLAN.evaluate_rule("value_prop_specificity", page)
+    hero_text = page.feature("hero_text")
     if not hero_text or len(hero_text) < 20:
-        return {
-            "id": "value_prop_specificity",
-            "label": "Value Proposition Specificity",
-            "category": "clarity",
-            "status": "unclear",
-            "confidence": 0.3,
-            "reason": "Insufficient visible evidence in the provided content.",
-            "recommendation": "Add specific numbers, results, or concrete details to value proposition"
-        }
-    
-    # Check for vague red flags
-    vague_count = _count_keywords(hero_text, VAGUE_RED_FLAGS)
-    has_numbers = bool(re.search(r'\d+', hero_text))
-    
+        return fallback
+
     try:
         from ..chat import get_client
-        
+
         client = get_client()
-        response = client.chat.completions.create(
+        text = cached_completion_text(
+            client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {
@@ -218,16 +476,9 @@ async def _detect_value_prop_specificity(page_text: str, headlines: List[Dict[st
             temperature=0.3,
             max_tokens=200,
         )
-        
-        import json
-        raw_json = response.choices[0].message.content or "{}"
-        if "```json" in raw_json:
-            raw_json = raw_json.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_json:
-            raw_json = raw_json.split("```")[1].split("```")[0].strip()
-        
-        data = json.loads(raw_json)
-        
+
+        data = _parse_llm_json(text or "{}")
+
         return {
             "id": "value_prop_specificity",
             "label": "Value Proposition Specificity",
@@ -235,524 +486,29 @@ async def _detect_value_prop_specificity(page_text: str, headlines: List[Dict[st
             "status": data.get("status", "mixed"),
             "confidence": float(data.get("confidence", 0.5)),
             "reason": data.get("reason", "LLM analysis completed"),
-            "recommendation": data.get("recommendation", "Use specific numbers, results, and concrete details instead of vague claims"),
+            "recommendation": data.get("recommendation", _VALUE_PROP_ADVICE),
             "evidence": {
                 "text": hero_text[:200] if hero_text else None,
-                "keywords": _find_keywords_in_text(hero_text, VAGUE_RED_FLAGS) if vague_count > 0 else None
-            }
-        }
-    except Exception as e:
-        # Fallback to rule-based if LLM fails
-        if vague_count >= 2 and not has_numbers:
-            status = "vague"
-            confidence = 0.8
-        elif vague_count >= 1:
-            status = "mixed"
-            confidence = 0.6
-        else:
-            status = "specific" if has_numbers else "mixed"
-            confidence = 0.7
-        
-        return {
-            "id": "value_prop_specificity",
-            "label": "Value Proposition Specificity",
-            "category": "clarity",
-            "status": status,
-            "confidence": confidence,
-            "reason": f"Found {vague_count} vague terms, {'has' if has_numbers else 'no'} numbers",
-            "recommendation": "Use specific numbers, results, and concrete details instead of vague claims",
-            "evidence": {
-                "keywords": _find_keywords_in_text(hero_text, VAGUE_RED_FLAGS) if vague_count > 0 else None
-            }
-        }
-
-
-def _detect_information_hierarchy(headlines: List[Dict[str, Any]], ctas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect information hierarchy: H1 → supporting text → CTA (CLARITY)."""
-    h1_exists = any(h.get("tag") == "h1" for h in headlines)
-    h2_exists = any(h.get("tag") == "h2" for h in headlines)
-    cta_exists = len(ctas) > 0
-    
-    # Check if hierarchy is clear: H1 → supporting text → CTA
-    if h1_exists and cta_exists:
-        return {
-            "id": "information_hierarchy",
-            "label": "Information Hierarchy",
-            "category": "clarity",
-            "status": "present",
-            "confidence": 0.9 if h2_exists else 0.8,
-            "reason": f"H1 present, {len(headlines)} headline(s), {len(ctas)} CTA(s) - clear hierarchy",
-            "recommendation": "Information hierarchy is clear: H1 → supporting text → CTA",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-    elif h1_exists or cta_exists:
-        return {
-            "id": "information_hierarchy",
-            "label": "Information Hierarchy",
-            "category": "clarity",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"{'H1' if h1_exists else 'No H1'}, {len(ctas)} CTA(s) - incomplete hierarchy",
-            "recommendation": "Ensure clear hierarchy: H1 → supporting text → CTA",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-    else:
-        return {
-            "id": "information_hierarchy",
-            "label": "Information Hierarchy",
-            "category": "clarity",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No clear H1 or CTA detected - users may not know what to read first",
-            "recommendation": "Add H1 headline and clear CTA to establish information hierarchy",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-
-
-def _detect_primary_cta_presence(page_text: str, ctas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect primary CTA presence (ACTION)."""
-    # Check CTAs from page_map
-    action_ctas = []
-    for cta in ctas:
-        cta_text = _normalize_text(cta.get("label", ""))
-        if any(keyword in cta_text for keyword in CTA_ACTION_KEYWORDS):
-            action_ctas.append(cta)
-    
-    # Check text for CTA keywords
-    cta_keyword_count = _count_keywords(page_text, CTA_ACTION_KEYWORDS)
-    found_keywords = _find_keywords_in_text(page_text, CTA_ACTION_KEYWORDS)
-    
-    if len(action_ctas) > 0:
-        return {
-            "id": "primary_cta_presence",
-            "label": "Primary CTA Presence",
-            "category": "action",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Found {len(action_ctas)} action-oriented CTA(s)",
-            "recommendation": "Primary CTA is present and action-oriented",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None,
-                "location": "hero"
-            }
-        }
-    elif cta_keyword_count >= 2:
-        return {
-            "id": "primary_cta_presence",
-            "label": "Primary CTA Presence",
-            "category": "action",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Found {cta_keyword_count} CTA keywords but no clear CTA button",
-            "recommendation": "Add a prominent action-oriented CTA button (e.g., 'Get Started', 'Try Now')",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    else:
-        return {
-            "id": "primary_cta_presence",
-            "label": "Primary CTA Presence",
-            "category": "action",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No action-oriented CTA detected",
-            "recommendation": "Add a clear primary CTA with action verbs (start, get, try, request, book)",
-            "evidence": {}
-        }
-
-
-def _detect_cta_clarity(ctas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect CTA clarity: does it say the outcome? (ACTION)."""
-    if len(ctas) == 0:
-        return {
-            "id": "cta_clarity",
-            "label": "CTA Clarity",
-            "category": "action",
-            "status": "unclear",
-            "confidence": 0.3,
-            "reason": "Insufficient visible evidence in the provided content.",
-            "recommendation": "Add a clear CTA that states the outcome (e.g., 'Get Report', 'Start Analysis')"
-        }
-    
-    # Check each CTA
-    clear_ctas = []
-    vague_ctas = []
-    
-    for cta in ctas:
-        cta_text = _normalize_text(cta.get("label", ""))
-        is_bad = any(bad in cta_text for bad in BAD_CTA_EXAMPLES)
-        has_outcome = any(keyword in cta_text for keyword in ["get", "start", "try", "analyze", "report", "result"])
-        
-        if is_bad:
-            vague_ctas.append(cta_text)
-        elif has_outcome:
-            clear_ctas.append(cta_text)
-        else:
-            vague_ctas.append(cta_text)
-    
-    if len(clear_ctas) > 0 and len(vague_ctas) == 0:
-        return {
-            "id": "cta_clarity",
-            "label": "CTA Clarity",
-            "category": "action",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"All {len(clear_ctas)} CTA(s) clearly state the outcome",
-            "recommendation": "CTAs are clear and outcome-focused",
-            "evidence": {
-                "text": clear_ctas[0] if clear_ctas else None
-            }
-        }
-    elif len(clear_ctas) > 0:
-        return {
-            "id": "cta_clarity",
-            "label": "CTA Clarity",
-            "category": "action",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"{len(clear_ctas)} clear CTA(s) but {len(vague_ctas)} vague CTA(s) found",
-            "recommendation": "Make all CTAs outcome-focused (e.g., 'Get Report' not 'Submit')",
-            "evidence": {
-                "text": vague_ctas[0] if vague_ctas else None
-            }
-        }
-    else:
-        return {
-            "id": "cta_clarity",
-            "label": "CTA Clarity",
-            "category": "action",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": f"All {len(vague_ctas)} CTA(s) are vague (e.g., 'Submit', 'Click Here')",
-            "recommendation": "Replace vague CTAs with outcome-focused ones (e.g., 'Get Report', 'Start Analysis')",
-            "evidence": {
-                "text": vague_ctas[0] if vague_ctas else None
-            }
-        }
-
-
-def _detect_cta_competition(ctas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect CTA competition: multiple CTAs at same level (ACTION)."""
-    if len(ctas) == 0:
-        return {
-            "id": "cta_competition",
-            "label": "CTA Competition",
-            "category": "action",
-            "status": "unclear",
-            "confidence": 0.3,
-            "reason": "Insufficient visible evidence in the provided content.",
-            "recommendation": "Add at least one primary CTA"
-        }
-    
-    # Count primary CTAs (first few are usually primary)
-    primary_count = min(len(ctas), 3)  # First 3 are likely in hero
-    total_count = len(ctas)
-    
-    if total_count == 1:
-        return {
-            "id": "cta_competition",
-            "label": "CTA Competition",
-            "category": "action",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": "Single CTA - no competition, clear focus",
-            "recommendation": "Single CTA is optimal for conversion",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-    elif primary_count <= 2:
-        return {
-            "id": "cta_competition",
-            "label": "CTA Competition",
-            "category": "action",
-            "status": "weak",
-            "confidence": 0.7,
-            "reason": f"{primary_count} CTA(s) in hero - moderate competition",
-            "recommendation": "Consider reducing to 1 primary CTA for better focus",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-    else:
-        return {
-            "id": "cta_competition",
-            "label": "CTA Competition",
-            "category": "action",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": f"{total_count} CTA(s) found - high competition, unclear focus",
-            "recommendation": "Too many CTAs confuse users. Focus on 1 primary action",
-            "evidence": {
-                "location": "hero"
-            }
-        }
-
-
-def _detect_social_proof_presence(page_text: str) -> Dict[str, Any]:
-    """Detect social proof presence (TRUST)."""
-    social_count = _count_keywords(page_text, SOCIAL_PROOF_KEYWORDS)
-    found_keywords = _find_keywords_in_text(page_text, SOCIAL_PROOF_KEYWORDS)
-    
-    if social_count >= 3:
-        return {
-            "id": "social_proof_presence",
-            "label": "Social Proof Presence",
-            "category": "trust",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Found {social_count} social proof indicators",
-            "recommendation": "Strong social proof signals present",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
+                "keywords": fallback["evidence"]["keywords"]
             }
         }
-    elif social_count >= 1:
-        return {
-            "id": "social_proof_presence",
-            "label": "Social Proof Presence",
-            "category": "trust",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Only {social_count} social proof indicator(s) found",
-            "recommendation": "Add testimonials, reviews, customer logos, or 'trusted by' section",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    else:
-        return {
-            "id": "social_proof_presence",
-            "label": "Social Proof Presence",
-            "category": "trust",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No social proof detected",
-            "recommendation": "Add testimonials, reviews, customer logos, or 'trusted by' section",
-            "evidence": {}
-        }
+    except Exception:
+        return fallback
 
 
-def _detect_risk_reducers(page_text: str) -> Dict[str, Any]:
-    """Detect risk reducers (TRUST)."""
-    risk_count = _count_keywords(page_text, RISK_REDUCER_KEYWORDS)
-    found_keywords = _find_keywords_in_text(page_text, RISK_REDUCER_KEYWORDS)
-    
-    if risk_count >= 2:
-        return {
-            "id": "risk_reducers",
-            "label": "Risk Reducers",
-            "category": "trust",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Found {risk_count} risk reduction signals",
-            "recommendation": "Strong risk reduction signals present",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    elif risk_count >= 1:
-        return {
-            "id": "risk_reducers",
-            "label": "Risk Reducers",
-            "category": "trust",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Only {risk_count} risk reducer(s) found",
-            "recommendation": "Add free trial, money-back guarantee, or 'cancel anytime' messaging",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    else:
-        return {
-            "id": "risk_reducers",
-            "label": "Risk Reducers",
-            "category": "trust",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No risk reduction signals detected",
-            "recommendation": "Add free trial, money-back guarantee, or 'cancel anytime' messaging",
-            "evidence": {}
-        }
-
-
-def _detect_legitimacy_signals(page_text: str) -> Dict[str, Any]:
-    """Detect legitimacy signals (TRUST)."""
-    legitimacy_count = _count_keywords(page_text, LEGITIMACY_KEYWORDS)
-    found_keywords = _find_keywords_in_text(page_text, LEGITIMACY_KEYWORDS)
-    
-    if legitimacy_count >= 3:
-        return {
-            "id": "legitimacy_signals",
-            "label": "Legitimacy Signals",
-            "category": "trust",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Found {legitimacy_count} legitimacy indicators (contact, about, privacy, terms)",
-            "recommendation": "Legitimacy signals are present",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    elif legitimacy_count >= 1:
-        return {
-            "id": "legitimacy_signals",
-            "label": "Legitimacy Signals",
-            "category": "trust",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Only {legitimacy_count} legitimacy indicator(s) found",
-            "recommendation": "Add contact information, about page, privacy policy, and terms of service",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    else:
-        return {
-            "id": "legitimacy_signals",
-            "label": "Legitimacy Signals",
-            "category": "trust",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No legitimacy signals detected (contact, about, privacy, terms)",
-            "recommendation": "Add contact information, about page, privacy policy, and terms of service",
-            "evidence": {}
-        }
-
-
-def _detect_pricing_visibility(page_text: str) -> Dict[str, Any]:
-    """Detect pricing visibility (FRICTION)."""
-    pricing_count = _count_keywords(page_text, PRICING_KEYWORDS)
-    found_keywords = _find_keywords_in_text(page_text, PRICING_KEYWORDS)
-    
-    if pricing_count >= 3:
-        return {
-            "id": "pricing_visibility",
-            "label": "Pricing Visibility",
-            "category": "friction",
-            "status": "present",
-            "confidence": 0.9,
-            "reason": f"Found {pricing_count} pricing-related keywords - pricing is visible",
-            "recommendation": "Pricing is clearly visible",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    elif pricing_count >= 1:
-        return {
-            "id": "pricing_visibility",
-            "label": "Pricing Visibility",
-            "category": "friction",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Only {pricing_count} pricing keyword(s) found - pricing path may be unclear",
-            "recommendation": "Make pricing more prominent and clear to reduce friction",
-            "evidence": {
-                "keywords": found_keywords[:5] if found_keywords else None
-            }
-        }
-    else:
-        return {
-            "id": "pricing_visibility",
-            "label": "Pricing Visibility",
-            "category": "friction",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": "No pricing information detected - unclear pricing path",
-            "recommendation": "Add clear pricing information to reduce friction",
-            "evidence": {}
-        }
-
-
-def _detect_form_friction(page_text: str, ctas: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect form friction (FRICTION)."""
-    # Look for form-related keywords
-    form_keywords = ["form", "input", "field", "required", "submit", "register", "sign up", "email", "password"]
-    form_count = _count_keywords(page_text, form_keywords)
-    
-    # Check if there are form CTAs
-    form_ctas = [cta for cta in ctas if any(kw in _normalize_text(cta.get("label", "")) for kw in ["sign", "register", "submit"])]
-    
-    # Check if form appears before value is understood (heuristic: form keywords in first 500 chars)
-    early_form = form_count > 0 and len(page_text) > 0 and _count_keywords(page_text[:500], form_keywords) > 0
-    
-    if form_count >= 5 or (len(form_ctas) >= 2 and early_form):
-        return {
-            "id": "form_friction",
-            "label": "Form Friction",
-            "category": "friction",
-            "status": "missing",
-            "confidence": 0.8,
-            "reason": f"Complex form detected ({form_count} form keywords) or form appears too early",
-            "recommendation": "Simplify form or move it after value is communicated",
-            "evidence": {
-                "keywords": _find_keywords_in_text(page_text, form_keywords)[:5] if form_count > 0 else None
-            }
-        }
-    elif form_count >= 2:
-        return {
-            "id": "form_friction",
-            "label": "Form Friction",
-            "category": "friction",
-            "status": "weak",
-            "confidence": 0.6,
-            "reason": f"Moderate form complexity ({form_count} form keywords)",
-            "recommendation": "Keep forms simple and only ask for essential information",
-            "evidence": {
-                "keywords": _find_keywords_in_text(page_text, form_keywords)[:5] if form_count > 0 else None
-            }
-        }
-    else:
-        return {
-            "id": "form_friction",
-            "label": "Form Friction",
-            "category": "friction",
-            "status": "present",
-            "confidence": 0.7,
-            "reason": "Minimal form elements detected - low friction",
-            "recommendation": "Forms appear simple - good for conversion",
-            "evidence": {}
-        }
-
-
-async def _detect_cognitive_load(page_text: str, headlines: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Detect cognitive load (FRICTION)."""
+async def _detect_cognitive_load(page: TokenizedPage) -> Dict[str, Any]:
+    """Detect cognitive load using LLM (FRICTION); falls back to the declared rule."""
+    fallback = SIGNAL_PLAN.evaluate_rule("cognitive_load", page)
+    page_text = page.page_text
     if not page_text or len(page_text) < 50:
-        return {
-            "id": "cognitive_load",
-            "label": "Cognitive Load",
-            "category": "friction",
-            "status": "unclear",
-            "confidence": 0.3,
-            "reason": "Insufficient visible evidence in the provided content.",
-            "recommendation": "Ensure content is well-organized with clear headings"
-        }
-    
-    # Count headlines
-    h1_count = len([h for h in headlines if h.get("tag") == "h1"])
-    h2_count = len([h for h in headlines if h.get("tag") == "h2"])
-    
-    # Estimate text length
-    text_length = len(page_text)
-    word_count = len(page_text.split())
-    
-    # Check for conflicting messages (heuristic: multiple CTAs with different actions)
-    cta_keywords = ["buy", "try", "learn", "get", "start"]
-    conflicting_actions = len(set([kw for kw in cta_keywords if kw in _normalize_text(page_text)]))
-    
+        return fallback
+
     try:
         from ..chat import get_client
-        
+
         client = get_client()
-        response = client.chat.completions.create(
+        text = cached_completion_text(
+            client.chat.completions.create,
             model="gpt-4o-mini",
             messages=[
                 {
@@ -761,22 +517,15 @@ async def _detect_cognitive_load(page_text: str, headlines: List[Dict[str, Any]]
                 },
                 {
                     "role": "user",
-                    "content": f"H1 count: {h1_count}, H2 count: {h2_count}, Word count: ~{word_count}\n\nPage text (first 600 chars): {page_text[:600]}\n\nAssess cognitive load. Return JSON only."
+                    "content": f"H1 count: {page.feature('h1_count')}, H2 count: {page.feature('h2_count')}, Word count: ~{page.feature('word_count')}\n\nPage text (first 600 chars): {page_text[:600]}\n\nAssess cognitive load. Return JSON only."
                 }
             ],
             temperature=0.3,
             max_tokens=200,
         )
-        
-        import json
-        raw_json = response.choices[0].message.content or "{}"
-        if "```json" in raw_json:
-            raw_json = raw_json.split("```json")[1].split("```")[0].strip()
-        elif "```" in raw_json:
-            raw_json = raw_json.split("```")[1].split("```")[0].strip()
-        
-        data = json.loads(raw_json)
-        
+
+        data = _parse_llm_json(text or "{}")
+
         return {
             "id": "cognitive_load",
             "label": "Cognitive Load",
@@ -789,30 +538,8 @@ async def _detect_cognitive_load(page_text: str, headlines: List[Dict[str, Any]]
                 "text": page_text[:200] if page_text else None
             }
         }
-    except Exception as e:
-        # Fallback to rule-based
-        if word_count > 1000 or conflicting_actions >= 3:
-            status = "high"
-            confidence = 0.8
-        elif word_count > 500 or conflicting_actions >= 2:
-            status = "moderate"
-            confidence = 0.6
-        else:
-            status = "low"
-            confidence = 0.7
-        
-        return {
-            "id": "cognitive_load",
-            "label": "Cognitive Load",
-            "category": "friction",
-            "status": status,
-            "confidence": confidence,
-            "reason": f"~{word_count} words, {h1_count} H1, {h2_count} H2, {conflicting_actions} conflicting actions",
-            "recommendation": "Reduce text, improve hierarchy with clear H1/H2, remove conflicting messages",
-            "evidence": {
-                "text": page_text[:200] if page_text else None
-            }
-        }
+    except Exception:
+        return fallback
 
 
 def _calculate_summary(signals: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -822,7 +549,7 @@ def _calculate_summary(signals: List[Dict[str, Any]]) -> Dict[str, Any]:
     for signal in signals:
         if signal.get("status") in ["missing", "weak"]:
             category = signal.get("category", "friction")
-            weight = CATEGORY_WEIGHTS.get(category, 0.15)
+            weight = SIGNAL_PLAN.weights.get(signal.get("id"), CATEGORY_WEIGHTS.get(category, 0.15))
             issues.append({
                 "id": signal.get("id"),
                 "status": signal.get("status"),
@@ -867,28 +594,16 @@ async def detect_signals(
     headlines = page_map.get("headlines", [])
     ctas = page_map.get("ctas", [])
     
-    # Detect all signals
-    signals = []
+    # Tokenize once; every declared rule reads from the same scans and features
+    page = SIGNAL_PLAN.tokenize(page_text, headlines, ctas)
+    signals = SIGNAL_PLAN.evaluate(page)
     
-    # CLARITY (3 signals)
-    signals.append(_detect_value_prop_presence(page_text, headlines))
-    signals.append(await _detect_value_prop_specificity(page_text, headlines))
-    signals.append(_detect_information_hierarchy(headlines, ctas))
-    
-    # ACTION (3 signals)
-    signals.append(_detect_primary_cta_presence(page_text, ctas))
-    signals.append(_detect_cta_clarity(ctas))
-    signals.append(_detect_cta_competition(ctas))
-    
-    # TRUST (3 signals)
-    signals.append(_detect_social_proof_presence(page_text))
-    signals.append(_detect_risk_reducers(page_text))
-    signals.append(_detect_legitimacy_signals(page_text))
-    
-    # FRICTION (3 signals)
-    signals.append(_detect_pricing_visibility(page_text))
-    signals.append(_detect_form_friction(page_text, ctas))
-    signals.append(await _detect_cognitive_load(page_text, headlines))
+    # LLM-refined signals (their declared rules are the fallback)
+    refined = {
+        "value_prop_specificity": await _detect_value_prop_specificity(page),
+        "cognitive_load": await _detect_cognitive_load(page),
+    }
+    signals = [refined.get(s["id"], s) for s in signals]
     
     # Ensure we always return exactly 12 signals in the correct order
     signal_dict = {s["id"]: s for s in signals}
@@ -915,3 +630,21 @@ async def detect_signals(
         "signals": ordered_signals,
         "summary": summary
     }
+
+
+def evaluate_signals_batch(
+    pages: Iterable[Tuple[str, Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]]]
+) -> List[Dict[str, Any]]:
+    """
+    Rule-only evaluation of many pages (no LLM calls).
+    
+    Args:
+        pages: (page_text, headlines, ctas) tuples
+        
+    Returns:
+        One {"signals", "summary"} dict per page, in input order
+    """
+    return [
+        {"signals": signals, "summary": _calculate_summary(signals)}
+        for signals in SIGNAL_PLAN.evaluate_batch(pages)
+    ]
@@ -0,0 +1,321 @@
+"""
+Declarative signal rules.
+
+A signal is data: the keyword groups it counts (and in which scope of the
+page), the structural features it reads, and an ordered list of outcomes,
+each guarded by a condition over those measures:
+
+    SignalRule(
+        id="risk_reducers", label="Risk Reducers", category="trust",
+        keywords={"risk_reducer": "page"},
+        outcomes=(
+            Outcome("present", 0.9, "Found {risk_reducer} risk reduction signals", "...",
+                    when=gte("risk_reducer", 2), evidence={"keywords": Keywords("risk_reducer", 5)}),
+            Outcome("missing", 0.8, "No risk reduction signals detected", "...", evidence={}),
+        ),
+    )
+
+compile_plan() validates the rules once at import (every name a condition,
+reason or evidence uses must be declared) and merges what they need into a
+plan. A page is tokenized once (TokenizedPage: one lexicon scan per scope,
+lazily memoized structural features), and every rule reads from it, so adding
+a signal never adds another pass over the page text. SignalPlan.evaluate_batch
+runs many pages through the same plan.
+"""
+from __future__ import annotations
+
+import operator
+import string
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from api.utils.keyword_lexicon import Lexicon, LexiconHits
+
+Measures = Mapping[str, Any]
+Condition = Callable[[Measures], bool]
+FeatureFn = Callable[["TokenizedPage"], Any]
+
+
+# ---------------------------------------------------------------------------
+# Conditions (compiled to closures when the rule table is built)
+# ---------------------------------------------------------------------------
+
+def _compare(op: Callable[[Any, Any], bool], name: str, value: Any) -> Condition:
+    def cond(m: Measures) -> bool:
+        return op(m[name], value)
+    cond.names = (name,)  # type: ignore[attr-defined]
+    return cond
+
+
+def gte(name: str, value: float) -> Condition:
+    return _compare(operator.ge, name, value)
+
+
+def gt(name: str, value: float) -> Condition:
+    return _compare(operator.gt, name, value)
+
+
+def lte(name: str, value: float) -> Condition:
+    return _compare(operator.le, name, value)
+
+
+def lt(name: str, value: float) -> Condition:
+    return _compare(operator.lt, name, value)
+
+
+def eq(name: str, value: Any) -> Condition:
+    return _compare(operator.eq, name, value)
+
+
+def is_(name: str) -> Condition:
+    return _compare(lambda a, _: bool(a), name, None)
+
+
+def not_(cond: Condition) -> Condition:
+    def negated(m: Measures) -> bool:
+        return not cond(m)
+    negated.names = cond.names  # type: ignore[attr-defined]
+    return negated
+
+
+def all_(*conds: Condition) -> Condition:
+    def conj(m: Measures) -> bool:
+        return all(c(m) for c in conds)
+    conj.names = tuple(n for c in conds for n in c.names)  # type: ignore[attr-defined]
+    return conj
+
+
+def any_(*conds: Condition) -> Condition:
+    def disj(m: Measures) -> bool:
+        return any(c(m) for c in conds)
+    disj.names = tuple(n for c in conds for n in c.names)  # type: ignore[attr-defined]
+    return disj
+
+
+# ---------------------------------------------------------------------------
+# Rule declarations
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class Keywords:
+    """Evidence reference: keywords of a group found in the rule's scope (None if none)."""
+    group: str
+    limit: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Value:
+    """Evidence reference: a measure value, optionally truncated (strings / lists)."""
+    name: str
+    limit: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class Outcome:
+    status: str
+    confidence: float
+    reason: str
+    recommendation: str
+    when: Optional[Condition] = None  # None: always matches (use as the final fallback)
+    evidence: Optional[Dict[str, Any]] = None  # None: the signal has no "evidence" key
+
+
+@dataclass(frozen=True)
+class SignalRule:
+    id: str
+    label: str
+    category: str
+    outcomes: Tuple[Outcome, ...]
+    keywords: Dict[str, str] = field(default_factory=dict)  # lexicon group -> scope
+    features: Tuple[str, ...] = ()
+    weight: Optional[float] = None  # defaults to the category weight
+
+
+# ---------------------------------------------------------------------------
+# Tokenized page
+# ---------------------------------------------------------------------------
+
+class TokenizedPage:
+    """
+    One page, tokenized once for every rule: lexicon scans per scope and
+    structural features, both computed on first use and memoized.
+    """
+
+    def __init__(
+        self,
+        page_text: str,
+        headlines: Sequence[Dict[str, Any]],
+        ctas: Sequence[Dict[str, Any]],
+        lexicon: Lexicon,
+        scopes: Mapping[str, FeatureFn],
+        features: Mapping[str, FeatureFn],
+    ):
+        self.page_text = page_text or ""
+        self.headlines = list(headlines or [])
+        self.ctas = list(ctas or [])
+        self.lexicon = lexicon
+        self._scope_fns = scopes
+        self._feature_fns = features
+        self._scans: Dict[str, LexiconHits] = {}
+        self._features: Dict[str, Any] = {}
+        self._cta_hits: Optional[List[LexiconHits]] = None
+
+    def scope_text(self, scope: str) -> str:
+        return self._scope_fns[scope](self)
+
+    def hits(self, scope: str = "page") -> LexiconHits:
+        scan = self._scans.get(scope)
+        if scan is None:
+            scan = self.lexicon.scan(self.scope_text(scope))
+            self._scans[scope] = scan
+        return scan
+
+    @property
+    def cta_hits(self) -> List[LexiconHits]:
+        """One lexicon scan per CTA label, shared by every CTA feature."""
+        if self._cta_hits is None:
+            self._cta_hits = [self.lexicon.scan(c.get("label", "") or "") for c in self.ctas]
+        return self._cta_hits
+
+    def feature(self, name: str) -> Any:
+        if name not in self._features:
+            self._features[name] = self._feature_fns[name](self)
+        return self._features[name]
+
+
+# ---------------------------------------------------------------------------
+# Compiled plan
+# ---------------------------------------------------------------------------
+
+_FORMATTER = string.Formatter()
+
+
+def _template_names(template: str) -> List[str]:
+    return [name for _, name, _, _ in _FORMATTER.parse(template) if name]
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    rule: SignalRule
+    weight: float
+    keywords: Tuple[Tuple[str, str], ...]
+    features: Tuple[str, ...]
+
+
+class SignalPlan:
+    """Rules compiled against one lexicon and feature registry."""
+
+    def __init__(self, rules: Sequence[_CompiledRule], lexicon: Lexicon,
+                 scopes: Mapping[str, FeatureFn], features: Mapping[str, FeatureFn]):
+        self.rules = tuple(rules)
+        self.lexicon = lexicon
+        self.scopes = dict(scopes)
+        self.features = dict(features)
+        self.weights = {r.rule.id: r.weight for r in self.rules}
+
+    def tokenize(self, page_text: str, headlines: Sequence[Dict[str, Any]],
+                 ctas: Sequence[Dict[str, Any]]) -> TokenizedPage:
+        return TokenizedPage(page_text, headlines, ctas, self.lexicon, self.scopes, self.features)
+
+    def evaluate_rule(self, rule_id: str, page: TokenizedPage) -> Dict[str, Any]:
+        for compiled in self.rules:
+            if compiled.rule.id == rule_id:
+                return self._evaluate(compiled, page)
+        raise KeyError(rule_id)
+
+    def evaluate(self, page: TokenizedPage) -> List[Dict[str, Any]]:
+        return [self._evaluate(compiled, page) for compiled in self.rules]
+
+    def evaluate_batch(
+        self,
+        pages: Iterable[Tuple[str, Sequence[Dict[str, Any]], Sequence[Dict[str, Any]]]],
+    ) -> List[List[Dict[str, Any]]]:
+        """Evaluate (page_text, headlines, ctas) tuples; identical pages are evaluated once."""
+        results: List[List[Dict[str, Any]]] = []
+        seen: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = {}
+        for page_text, headlines, ctas in pages:
+            key = (page_text or "", repr(headlines), repr(ctas))
+            signals = seen.get(key)
+            if signals is None:
+                signals = self.evaluate(self.tokenize(page_text, headlines, ctas))
+                seen[key] = signals
+            results.append([dict(s) for s in signals])
+        return results
+
+    def _evaluate(self, compiled: _CompiledRule, page: TokenizedPage) -> Dict[str, Any]:
+        measures: Dict[str, Any] = {}
+        found: Dict[str, List[str]] = {}
+        for group, scope in compiled.keywords:
+            found[group] = page.hits(scope).found(group)
+            measures[group] = len(found[group])
+        for name in compiled.features:
+            measures[name] = page.feature(name)
+
+        rule = compiled.rule
+        for outcome in rule.outcomes:
+            if outcome.when is None or outcome.when(measures):
+                signal: Dict[str, Any] = {
+                    "id": rule.id,
+                    "label": rule.label,
+                    "category": rule.category,
+                    "status": outcome.status,
+                    "confidence": outcome.confidence,
+                    "reason": outcome.reason.format(**measures),
+                    "recommendation": outcome.recommendation,
+                }
+                if outcome.evidence is not None:
+                    signal["evidence"] = {
+                        key: _resolve(ref, measures, found) for key, ref in outcome.evidence.items()
+                    }
+                return signal
+        raise ValueError(f"Signal rule {rule.id!r} has no matching outcome")
+
+
+def _resolve(ref: Any, measures: Mapping[str, Any], found: Mapping[str, List[str]]) -> Any:
+    if isinstance(ref, Keywords):
+        words = found[ref.group]
+        return (words[:ref.limit] if ref.limit is not None else words) or None
+    if isinstance(ref, Value):
+        value = measures[ref.name]
+        return value[:ref.limit] if ref.limit is not None and value else value
+    return ref
+
+
+def compile_plan(
+    rules: Sequence[SignalRule],
+    lexicon: Lexicon,
+    scopes: Mapping[str, FeatureFn],
+    features: Mapping[str, FeatureFn],
+    category_weights: Mapping[str, float],
+) -> SignalPlan:
+    """Validate rules against the lexicon / feature registry and build the evaluation plan."""
+    compiled: List[_CompiledRule] = []
+    ids = set()
+    for rule in rules:
+        if rule.id in ids:
+            raise ValueError(f"Duplicate signal rule {rule.id!r}")
+        ids.add(rule.id)
+        for group, scope in rule.keywords.items():
+            if group not in lexicon.groups:
+                raise ValueError(f"{rule.id}: unknown keyword group {group!r}")
+            if scope not in scopes:
+                raise ValueError(f"{rule.id}: unknown scope {scope!r}")
+        for name in rule.features:
+            if name not in features:
+                raise ValueError(f"{rule.id}: unknown feature {name!r}")
+        declared = set(rule.keywords) | set(rule.features)
+        if not rule.outcomes or rule.outcomes[-1].when is not None:
+            raise ValueError(f"{rule.id}: the last outcome must be an unconditional fallback")
+        for outcome in rule.outcomes:
+            used = list(getattr(outcome.when, "names", ())) + _template_names(outcome.reason)
+            for ref in (outcome.evidence or {}).values():
+                if isinstance(ref, Keywords):
+                    used.append(ref.group)
+                elif isinstance(ref, Value):
+                    used.append(ref.name)
+            missing = [n for n in used if n not in declared]
+            if missing:
+                raise ValueError(f"{rule.id}: undeclared measure(s) {missing}")
+        weight = rule.weight if rule.weight is not None else category_weights.get(rule.category, 0.15)
+        compiled.append(_CompiledRule(rule, weight, tuple(rule.keywords.items()), tuple(rule.features)))
+    return SignalPlan(compiled, lexicon, scopes, features)
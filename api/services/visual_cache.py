@@ -0,0 +1,376 @@
+"""
+Visual trust result cache.
+
+The same hero screenshot is analyzed many times (re-runs, the same page captured
+minutes apart, desktop ATF reused across endpoints). This cache sits in front of
+the local extractor and returns the prior VisualTrustResult when possible.
+
+Lookup tiers (reported back to callers as ``cache.tier``):
+- memory: exact byte hash hit in the bounded in-process LRU
+- shared: exact byte hash hit in the cross-host cache tier (api/core/cache.py),
+  used when CACHE_BACKEND=redis; the SQLite store is already shared by the
+  workers of one host
+- sqlite: exact byte hash hit in the persistent SQLite store
+- phash:  near-duplicate hit (64-bit dHash within a Hamming threshold)
+- miss:   nothing usable, the caller computes and stores the result
+
+Config (env):
+- VISUAL_CACHE_ENABLED: "false" disables the cache (default: enabled)
+- VISUAL_CACHE_DB: SQLite path (default: api/cache/visual_trust_cache.db)
+- VISUAL_CACHE_MAX_ITEMS: in-memory LRU size (default: 256)
+- VISUAL_CACHE_PHASH_THRESHOLD: max Hamming distance for near-dup hits (default: 3)
+"""
+from __future__ import annotations
+
+import copy
+import hashlib
+import io
+import json
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+
+from api.core.cache import Cache, RespCacheBackend, get_cache, shared_backend
+from api.core.config import get_env
+from api.vision.trust_model_runtime import trust_model_fingerprint
+
+logger = logging.getLogger("visual_cache")
+
+# Bump when the extractor/scoring heuristics change so stale results are not served.
+CACHE_VERSION = "vt1"
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "cache" / "visual_trust_cache.db"
+DEFAULT_MAX_ITEMS = 256
+DEFAULT_PHASH_THRESHOLD = 3
+
+# 64-bit hash split into 4 x 16-bit bands. Two hashes within Hamming distance < 4
+# always share at least one identical band (pigeonhole), so band equality is an
+# exact candidate filter for the default threshold and a good pre-filter above it.
+_BAND_BITS = 16
+_BAND_COUNT = 4
+_BAND_MASK = (1 << _BAND_BITS) - 1
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def compute_dhash(
+    image_bytes: bytes,
+    hash_size: int = 8,
+    image: Optional[Image.Image] = None,
+) -> Optional[int]:
+    """
+    Compute a 64-bit difference hash (dHash) of an image.
+
+    ``image`` may be an already decoded PIL image to avoid a second decode.
+    Returns None if the bytes cannot be decoded as an image.
+    """
+    try:
+        if image is None:
+            image = Image.open(io.BytesIO(image_bytes))
+            # JPEG decoders can downscale while decoding - much cheaper for large shots
+            image.draft("L", (hash_size * 16, hash_size * 16))
+        small = image.convert("L").resize((hash_size + 1, hash_size), Image.BILINEAR)
+    except Exception as exc:  # noqa: BLE001
+        logger.debug("dHash failed: %s", exc)
+        return None
+
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value <<= 1
+            if pixels[offset + col] > pixels[offset + col + 1]:
+                value |= 1
+    return value
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def _bands(phash: int) -> Tuple[int, ...]:
+    return tuple((phash >> (i * _BAND_BITS)) & _BAND_MASK for i in range(_BAND_COUNT))
+
+
+def _to_signed64(v: int) -> int:
+    """SQLite INTEGER is signed 64-bit."""
+    return v - (1 << 64) if v >= (1 << 63) else v
+
+
+def _from_signed64(v: int) -> int:
+    return v + (1 << 64) if v < 0 else v
+
+
+@dataclass
+class VisualCacheKey:
+    sha256: str
+    phash: Optional[int]
+
+
+class VisualResultCache:
+    """Two-tier (memory LRU + SQLite) cache with perceptual near-duplicate lookup."""
+
+    def __init__(
+        self,
+        db_path: Path | str | None = None,
+        max_items: int = DEFAULT_MAX_ITEMS,
+        phash_threshold: int = DEFAULT_PHASH_THRESHOLD,
+        version: str = CACHE_VERSION,
+        shared: Optional[Cache] = None,
+    ) -> None:
+        self.version = version
+        self.shared = shared
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+        self.max_items = max(1, int(max_items))
+        self.phash_threshold = max(0, int(phash_threshold))
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, Tuple[Optional[int], Dict[str, Any]]]" = OrderedDict()
+        self._schema_ready = False
+        self.stats: Dict[str, int] = {"memory": 0, "shared": 0, "sqlite": 0, "phash": 0, "miss": 0}
+
+    # ------------------------------------------------------------------
+    # SQLite helpers
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        conn.row_factory = sqlite3.Row
+        if not self._schema_ready:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS visual_results (
+                    sha256 TEXT PRIMARY KEY,
+                    version TEXT NOT NULL,
+                    phash INTEGER,
+                    band0 INTEGER,
+                    band1 INTEGER,
+                    band2 INTEGER,
+                    band3 INTEGER,
+                    result_json TEXT NOT NULL,
+                    created_at TEXT NOT NULL
+                )
+                """
+            )
+            for i in range(_BAND_COUNT):
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_visual_results_band{i} "
+                    f"ON visual_results(version, band{i})"
+                )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _sqlite_get_exact(self, sha256: str) -> Optional[Tuple[Optional[int], Dict[str, Any]]]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT phash, result_json FROM visual_results WHERE sha256 = ? AND version = ?",
+                (sha256, self.version),
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        phash = _from_signed64(row["phash"]) if row["phash"] is not None else None
+        return phash, json.loads(row["result_json"])
+
+    def _sqlite_get_near(self, phash: int) -> Optional[Tuple[str, int, Dict[str, Any]]]:
+        bands = _bands(phash)
+        where = " OR ".join(f"band{i} = ?" for i in range(_BAND_COUNT))
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT sha256, phash, result_json FROM visual_results "
+                f"WHERE version = ? AND phash IS NOT NULL AND ({where})",
+                (self.version, *bands),
+            ).fetchall()
+        finally:
+            conn.close()
+        best: Optional[Tuple[str, int, str]] = None
+        for row in rows:
+            dist = hamming_distance(phash, _from_signed64(row["phash"]))
+            if dist <= self.phash_threshold and (best is None or dist < best[1]):
+                best = (row["sha256"], dist, row["result_json"])
+        if best is None:
+            return None
+        return best[0], best[1], json.loads(best[2])
+
+    def _sqlite_put(self, key: VisualCacheKey, result: Dict[str, Any]) -> None:
+        bands: Tuple[Optional[int], ...] = _bands(key.phash) if key.phash is not None else (None,) * _BAND_COUNT
+        conn = self._connect()
+        try:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO visual_results (
+                    sha256, version, phash, band0, band1, band2, band3, result_json, created_at
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    key.sha256,
+                    self.version,
+                    _to_signed64(key.phash) if key.phash is not None else None,
+                    *bands,
+                    json.dumps(result, ensure_ascii=False, default=str),
+                    _utc_iso(),
+                ),
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Memory helpers
+    # ------------------------------------------------------------------
+
+    def _memory_put(self, sha256: str, phash: Optional[int], result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._lru[sha256] = (phash, result)
+            self._lru.move_to_end(sha256)
+            while len(self._lru) > self.max_items:
+                self._lru.popitem(last=False)
+
+    def _memory_get_near(self, phash: int) -> Optional[Tuple[str, int, Dict[str, Any]]]:
+        best: Optional[Tuple[str, int, Dict[str, Any]]] = None
+        with self._lock:
+            for sha, (other, result) in self._lru.items():
+                if other is None:
+                    continue
+                dist = hamming_distance(phash, other)
+                if dist <= self.phash_threshold and (best is None or dist < best[1]):
+                    best = (sha, dist, result)
+        return best
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def make_key(self, image_bytes: bytes) -> VisualCacheKey:
+        sha = hashlib.sha256(image_bytes).hexdigest()
+        return VisualCacheKey(sha256=sha, phash=compute_dhash(image_bytes))
+
+    def lookup(
+        self,
+        image_bytes: bytes,
+        image: Optional[Image.Image] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], VisualCacheKey]:
+        """
+        Look up a cached result for image bytes.
+
+        Returns (result_or_None, key). The result is a deep copy annotated with
+        ``cache = {"tier", "key", "distance"}``. The key is reused by ``store``
+        so hashes are computed only once per request. ``image`` is an optional
+        pre-decoded image used for the perceptual hash.
+        """
+        sha = hashlib.sha256(image_bytes).hexdigest()
+
+        with self._lock:
+            entry = self._lru.get(sha)
+            if entry is not None:
+                self._lru.move_to_end(sha)
+        if entry is not None:
+            return self._hit("memory", sha, 0, entry[1]), VisualCacheKey(sha256=sha, phash=entry[0])
+
+        shared = self.shared.get(sha) if self.shared is not None else None
+        if shared is not None:
+            self._memory_put(sha, shared["phash"], shared["result"])
+            return self._hit("shared", sha, 0, shared["result"]), VisualCacheKey(sha256=sha, phash=shared["phash"])
+
+        try:
+            stored = self._sqlite_get_exact(sha)
+        except sqlite3.Error as exc:
+            logger.warning("Visual cache SQLite read failed: %s", exc)
+            stored = None
+        if stored is not None:
+            phash, result = stored
+            self._memory_put(sha, phash, result)
+            return self._hit("sqlite", sha, 0, result), VisualCacheKey(sha256=sha, phash=phash)
+
+        key = VisualCacheKey(sha256=sha, phash=compute_dhash(image_bytes, image=image))
+        if key.phash is not None and self.phash_threshold > 0:
+            near = self._memory_get_near(key.phash)
+            if near is None:
+                try:
+                    near = self._sqlite_get_near(key.phash)
+                except sqlite3.Error as exc:
+                    logger.warning("Visual cache near-duplicate lookup failed: %s", exc)
+                    near = None
+            if near is not None:
+                match_sha, dist, result = near
+                # Remember this exact byte hash too, so the next request is a memory hit
+                self._memory_put(sha, key.phash, result)
+                return self._hit("phash", match_sha, dist, result), key
+
+        with self._lock:
+            self.stats["miss"] += 1
+        return None, key
+
+    def store(self, key: VisualCacheKey, result: Dict[str, Any]) -> None:
+        """Store a freshly computed result (without debug payloads)."""
+        # Deep copy: the caller keeps mutating its result (nested lists/dicts included)
+        clean = copy.deepcopy({k: v for k, v in result.items() if k not in ("debug", "cache")})
+        self._memory_put(key.sha256, key.phash, clean)
+        if self.shared is not None:
+            self.shared.set(key.sha256, {"phash": key.phash, "result": clean})
+        try:
+            self._sqlite_put(key, clean)
+        except (sqlite3.Error, TypeError, ValueError) as exc:
+            logger.warning("Visual cache SQLite write failed: %s", exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            for k in self.stats:
+                self.stats[k] = 0
+
+    def _hit(self, tier: str, sha: str, distance: int, result: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.stats[tier] += 1
+        out = copy.deepcopy(result)
+        out["cache"] = {"tier": tier, "key": sha[:16], "distance": distance}
+        return out
+
+
+_cache: Optional[VisualResultCache] = None
+_cache_lock = threading.Lock()
+
+
+def visual_cache_enabled() -> bool:
+    return (get_env("VISUAL_CACHE_ENABLED", "true") or "true").lower() not in ("0", "false", "no")
+
+
+def get_visual_cache() -> Optional[VisualResultCache]:
+    """Return the process-wide visual cache, or None when disabled."""
+    global _cache
+    if not visual_cache_enabled():
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                # Results depend on the learned model too; a new artifact must not hit old entries
+                fingerprint = trust_model_fingerprint()
+                version = f"{CACHE_VERSION}+{fingerprint}" if fingerprint else CACHE_VERSION
+                _cache = VisualResultCache(
+                    version=version,
+                    shared=(
+                        get_cache("visual", version=version)
+                        if isinstance(shared_backend(), RespCacheBackend) else None
+                    ),
+                    db_path=get_env("VISUAL_CACHE_DB"),
+                    max_items=int(get_env("VISUAL_CACHE_MAX_ITEMS", str(DEFAULT_MAX_ITEMS))),
+                    phash_threshold=int(
+                        get_env("VISUAL_CACHE_PHASH_THRESHOLD", str(DEFAULT_PHASH_THRESHOLD))
+                    ),
+                )
+    return _cache
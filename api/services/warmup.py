@@ -0,0 +1,114 @@
+"""
+Warm-up tasks for the API (see api/core/warmup.py for the runner).
+
+Each task loads what a first request would otherwise load and returns a small
+detail dict for /ready:
+- brain_prompt: the ai_brain markdown files behind the chat system prompt
+- sqlite: the brain memory schema
+- playwright: one Chromium launch (verifies the install, pages the binary in)
+- trust_model: visual trust model load plus one prediction
+- opencv: the local visual extractor on a synthetic image (first cv2 /
+  KMeans / OCR calls)
+- synthetic_analysis: page map, context and rule signals for the bundled
+  HTML fixture (parsers, lexicons, URL index, signal rules). Off unless
+  WARMUP_SYNTHETIC_ANALYSIS=true
+"""
+from __future__ import annotations
+
+import io
+from pathlib import Path
+from typing import Any, Dict
+
+from api.core.config import get_env
+from api.core.warmup import WarmupRunner
+
+FIXTURE_HTML = Path(__file__).with_name("warmup_landing.html")
+FIXTURE_URL = "https://acme-analytics.example/pricing"
+
+
+def warm_brain_prompt() -> Dict[str, Any]:
+    from api.chat import get_system_prompt
+
+    return {"chars": len(get_system_prompt())}
+
+
+def warm_sqlite() -> Dict[str, Any]:
+    from api.memory.brain_memory import DB_PATH, init_db
+
+    init_db()
+    return {"db": str(DB_PATH)}
+
+
+def warm_playwright() -> Dict[str, Any]:
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        try:
+            return {"chromium": browser.version}
+        finally:
+            browser.close()
+
+
+def warm_trust_model() -> Dict[str, Any]:
+    from PIL import Image
+
+    from api.vision.trust_model_runtime import get_trust_model
+
+    runtime = get_trust_model()
+    if runtime is None:
+        return {"model": None}
+    runtime.predict_images([Image.new("RGB", (224, 224), "white")])
+    return {"model": runtime.path, "backend": runtime.backend}
+
+
+def _synthetic_screenshot() -> bytes:
+    """A small landing-page-like PNG: header bar, headline block, button, cards."""
+    from PIL import Image, ImageDraw
+
+    img = Image.new("RGB", (800, 600), "white")
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((0, 0, 800, 60), fill=(30, 30, 60))
+    draw.rectangle((80, 120, 620, 170), fill=(20, 20, 20))
+    draw.text((90, 200), "Understand every visitor in minutes", fill=(40, 40, 40))
+    draw.rectangle((80, 250, 260, 300), fill=(0, 110, 255))
+    for x in (80, 300, 520):
+        draw.rectangle((x, 380, x + 200, 560), outline=(180, 180, 180), width=2)
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def warm_opencv() -> Dict[str, Any]:
+    from api.vision.local_visual_extractor import extract_visual_elements
+
+    result = extract_visual_elements(_synthetic_screenshot())
+    return {"status": result.get("analysisStatus", "ok"), "elements": len(result.get("elements", []))}
+
+
+def run_synthetic_analysis() -> Dict[str, Any]:
+    from api.brain.context.brand_context import build_context
+    from api.services.page_extract import extract_page_map
+    from api.services.signal_engine import evaluate_signals_batch
+    from api.utils.html_document import parse_document
+
+    html = FIXTURE_HTML.read_text(encoding="utf-8")
+    page_map = extract_page_map({"dom": {"html_excerpt": html}})
+    page_text = parse_document(html).visible_text
+    context = build_context(FIXTURE_URL, page_text, page_map)
+    signals = evaluate_signals_batch([(page_text, page_map["headlines"], page_map["ctas"])])[0]
+    return {
+        "page_type": context["page_type"]["type"],
+        "headlines": len(page_map["headlines"]),
+        "signals": len(signals["signals"]),
+    }
+
+
+def register_default_tasks(runner: WarmupRunner) -> None:
+    runner.register("brain_prompt", warm_brain_prompt)
+    runner.register("sqlite", warm_sqlite)
+    runner.register("playwright", warm_playwright)
+    runner.register("trust_model", warm_trust_model)
+    runner.register("opencv", warm_opencv)
+    synthetic = (get_env("WARMUP_SYNTHETIC_ANALYSIS", "false") or "false").lower() == "true"
+    runner.register("synthetic_analysis", run_synthetic_analysis, default=synthetic)
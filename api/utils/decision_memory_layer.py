@@ -1 +1,668 @@
+"""
+Decision Memory Layer v1.1
 
+Remembers every decision analysis per context (usually the page URL) so the
+Decision Engine can reason across analyses: trajectories, decision fatigue,
+trust dynamics, repeated fixes and the decision-stage journey. See
+api/DECISION_MEMORY_LAYER.md for the rules behind the insights.
+
+Storage is SQLite through the pooled, WAL-mode SQLiteStore used by brain
+memory, so history survives restarts and is shared by all workers:
+- decision_outcomes: one row per analysis, indexed by (context_id, id),
+  (context_id, fix_key), (url, created_at) and created_at; each context keeps
+  at most DECISION_MEMORY_MAX_ITEMS rows (oldest evicted on write)
+- decision_contexts: per-context aggregates over the kept rows (outcome
+  counts, recent outcomes, current streak, trust flags, run-length encoded
+  stage trajectory), updated in the same transaction as the insert, so
+  confidence adjustment and history insights read one row instead of
+  replaying the history
+
+Config (env):
+- DECISION_MEMORY_DB: SQLite path (default: api/memory/decision_memory.db)
+- DECISION_MEMORY_MAX_ITEMS: kept analyses per context (default: 50)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from api.core.config import get_env
+from api.memory.store import SQLiteStore
+
+logger = logging.getLogger("decision_memory")
+
+DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "memory" / "decision_memory.db"
+DEFAULT_MAX_ITEMS = 50
+RECENT_WINDOW = 3  # analyses that count as "recent" for trajectories / conflicts
+_RECENT_KEEP = 5
+
+TRUST_OUTCOMES = {"Trust Gap"}
+STAGE_ORDER = ["orientation", "sense_making", "evaluation", "commitment", "post_decision_validation"]
+_STAGE_RANK = {stage: rank for rank, stage in enumerate(STAGE_ORDER)}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decision_outcomes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    context_id TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    url TEXT NOT NULL,
+    primary_outcome TEXT NOT NULL,
+    secondary_outcome TEXT,
+    confidence_score REAL,
+    location TEXT,
+    what_to_change TEXT,
+    fix_key TEXT,
+    expected_lift TEXT,
+    inferred_stage TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_decision_outcomes_context ON decision_outcomes(context_id, id);
+CREATE INDEX IF NOT EXISTS idx_decision_outcomes_fix ON decision_outcomes(context_id, fix_key);
+CREATE INDEX IF NOT EXISTS idx_decision_outcomes_url ON decision_outcomes(url, created_at);
+CREATE INDEX IF NOT EXISTS idx_decision_outcomes_created ON decision_outcomes(created_at);
+
+CREATE TABLE IF NOT EXISTS decision_contexts (
+    context_id TEXT PRIMARY KEY,
+    total_analyses INTEGER NOT NULL,
+    kept INTEGER NOT NULL,
+    outcome_counts_json TEXT NOT NULL,
+    recent_outcomes_json TEXT NOT NULL,
+    streak_outcome TEXT,
+    streak_len INTEGER NOT NULL,
+    trust_flags TEXT NOT NULL,
+    stage_runs_json TEXT NOT NULL,
+    first_at TEXT NOT NULL,
+    last_at TEXT NOT NULL
+);
+"""
+
+
+class FatigueLevel(str, Enum):
+    NONE = "none"
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+@dataclass
+class HistoricalOutcome:
+    """One stored analysis."""
+    context_id: str
+    primary_outcome: str
+    timestamp: str
+    url: str = ""
+    secondary_outcome: Optional[str] = None
+    confidence_score: Optional[float] = None
+    location: str = ""
+    what_to_change: str = ""
+    expected_lift: str = ""
+    inferred_stage: Optional[str] = None
+
+
+@dataclass
+class OutcomeTrajectory:
+    outcome: str
+    pattern: str  # persistent | weakening | shifting | resolved | emerging
+    occurrences: int
+    share: float
+
+
+@dataclass
+class DecisionFatigueAnalysis:
+    fatigue_level: FatigueLevel
+    indicators: List[str]
+    recommendation: str
+
+
+@dataclass
+class TrustDynamics:
+    trust_debt_trend: str  # increasing | decreasing | stable
+    trust_consistency: str  # consistent | inconsistent | improving
+    recommendation: str
+
+
+@dataclass
+class StageTrajectoryAnalysis:
+    trajectory_type: str  # forward_progress | stagnation | regression
+    stage_sequence: List[str]
+    interpretation: str
+    blocker_identified: Optional[str]
+    recommendation: str
+
+
+@dataclass
+class DecisionJourneyInsight:
+    observed_stage_trajectory: str
+    interpretation: str  # progress | stuck | regression
+    what_is_preventing_advancement: str
+    action_recommendation: str  # fix | reframe | unlock | wait
+    trajectory_analysis: Optional[StageTrajectoryAnalysis] = None
+
+
+@dataclass
+class DecisionHistoryInsight:
+    what_failed: List[str] = field(default_factory=list)
+    what_improved: List[str] = field(default_factory=list)
+    what_remains_unresolved: List[str] = field(default_factory=list)
+    why_still_hesitating: str = ""
+    trajectory_summary: str = ""
+    fatigue_analysis: Optional[DecisionFatigueAnalysis] = None
+    trust_dynamics: Optional[TrustDynamics] = None
+    journey_insight: Optional[DecisionJourneyInsight] = None
+
+
+@dataclass
+class _ContextAggregate:
+    """Row of decision_contexts, decoded."""
+    total_analyses: int = 0
+    kept: int = 0
+    outcome_counts: Dict[str, int] = field(default_factory=dict)
+    recent_outcomes: List[str] = field(default_factory=list)
+    streak_outcome: Optional[str] = None
+    streak_len: int = 0
+    trust_flags: str = ""
+    stage_runs: List[List[Any]] = field(default_factory=list)  # [[stage, count], ...]
+    first_at: str = ""
+    last_at: str = ""
+
+
+def _utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def fix_key(text: Optional[str]) -> Optional[str]:
+    """Case, punctuation and whitespace insensitive key of a recommended fix."""
+    normalized = " ".join(re.findall(r"\w+", (text or "").lower()))
+    if not normalized:
+        return None
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize_stage(stage: Any) -> Optional[str]:
+    if stage is None:
+        return None
+    value = getattr(stage, "value", stage)
+    return str(value).lower() or None
+
+
+class DecisionMemoryLayer:
+    def __init__(self, db_path: Path | str | None = None, max_items: Optional[int] = None) -> None:
+        self.db_path = Path(db_path or get_env("DECISION_MEMORY_DB") or DEFAULT_DB_PATH)
+        self.max_items = max(1, int(max_items or get_env("DECISION_MEMORY_MAX_ITEMS", str(DEFAULT_MAX_ITEMS))))
+        self.store = SQLiteStore(self.db_path, SCHEMA)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def add_analysis(
+        self,
+        context_id: str,
+        primary_outcome: str,
+        secondary_outcome: Optional[str] = None,
+        confidence_score: Optional[float] = None,
+        location: str = "",
+        what_to_change: str = "",
+        expected_lift: str = "",
+        url: str = "",
+        inferred_stage: Any = None,
+    ) -> int:
+        """Store one analysis, evict beyond max_items and update the context aggregate."""
+        stage = _normalize_stage(inferred_stage)
+        now = _utc_iso()
+        with self.store.transaction() as conn:
+            cur = conn.execute(
+                """
+                INSERT INTO decision_outcomes (
+                    context_id, created_at, url, primary_outcome, secondary_outcome,
+                    confidence_score, location, what_to_change, fix_key, expected_lift, inferred_stage
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    context_id, now, url or "", primary_outcome, secondary_outcome,
+                    confidence_score, location or "", what_to_change or "", fix_key(what_to_change),
+                    expected_lift or "", stage,
+                ),
+            )
+            outcome_id = int(cur.lastrowid)
+
+            agg = self._load_aggregate(conn, context_id) or _ContextAggregate(first_at=now)
+            agg.total_analyses += 1
+            agg.kept += 1
+            agg.last_at = now
+            agg.outcome_counts[primary_outcome] = agg.outcome_counts.get(primary_outcome, 0) + 1
+            agg.recent_outcomes = (agg.recent_outcomes + [primary_outcome])[-_RECENT_KEEP:]
+            if agg.streak_outcome == primary_outcome:
+                agg.streak_len += 1
+            else:
+                agg.streak_outcome, agg.streak_len = primary_outcome, 1
+            agg.trust_flags += "1" if primary_outcome in TRUST_OUTCOMES else "0"
+            if stage:
+                if agg.stage_runs and agg.stage_runs[-1][0] == stage:
+                    agg.stage_runs[-1][1] += 1
+                else:
+                    agg.stage_runs.append([stage, 1])
+
+            for evicted in self._evict(conn, context_id):
+                self._forget(agg, evicted)
+            self._save_aggregate(conn, context_id, agg)
+        return outcome_id
+
+    def _evict(self, conn: sqlite3.Connection, context_id: str) -> List[sqlite3.Row]:
+        rows = conn.execute(
+            """
+            SELECT id, primary_outcome, inferred_stage FROM decision_outcomes
+            WHERE context_id = ? AND id <= (
+                SELECT id FROM decision_outcomes WHERE context_id = ?
+                ORDER BY id DESC LIMIT 1 OFFSET ?
+            )
+            ORDER BY id
+            """,
+            (context_id, context_id, self.max_items),
+        ).fetchall()
+        if rows:
+            conn.execute(
+                "DELETE FROM decision_outcomes WHERE context_id = ? AND id <= ?",
+                (context_id, rows[-1]["id"]),
+            )
+        return rows
+
+    @staticmethod
+    def _forget(agg: _ContextAggregate, row: sqlite3.Row) -> None:
+        """Remove the oldest kept analysis from the aggregate."""
+        outcome = row["primary_outcome"]
+        agg.kept -= 1
+        remaining = agg.outcome_counts.get(outcome, 0) - 1
+        if remaining > 0:
+            agg.outcome_counts[outcome] = remaining
+        else:
+            agg.outcome_counts.pop(outcome, None)
+        agg.trust_flags = agg.trust_flags[1:]
+        agg.recent_outcomes = agg.recent_outcomes[-agg.kept:] if agg.kept else []
+        agg.streak_len = min(agg.streak_len, agg.kept)
+        if row["inferred_stage"] and agg.stage_runs:
+            agg.stage_runs[0][1] -= 1
+            if agg.stage_runs[0][1] <= 0:
+                agg.stage_runs.pop(0)
+
+    @staticmethod
+    def _load_aggregate(conn: sqlite3.Connection, context_id: str) -> Optional[_ContextAggregate]:
+        row = conn.execute("SELECT * FROM decision_contexts WHERE context_id = ?", (context_id,)).fetchone()
+        if row is None:
+            return None
+        return _ContextAggregate(
+            total_analyses=row["total_analyses"],
+            kept=row["kept"],
+            outcome_counts=json.loads(row["outcome_counts_json"]),
+            recent_outcomes=json.loads(row["recent_outcomes_json"]),
+            streak_outcome=row["streak_outcome"],
+            streak_len=row["streak_len"],
+            trust_flags=row["trust_flags"],
+            stage_runs=json.loads(row["stage_runs_json"]),
+            first_at=row["first_at"],
+            last_at=row["last_at"],
+        )
+
+    @staticmethod
+    def _save_aggregate(conn: sqlite3.Connection, context_id: str, agg: _ContextAggregate) -> None:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO decision_contexts (
+                context_id, total_analyses, kept, outcome_counts_json, recent_outcomes_json,
+                streak_outcome, streak_len, trust_flags, stage_runs_json, first_at, last_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                context_id, agg.total_analyses, agg.kept,
+                json.dumps(agg.outcome_counts, ensure_ascii=False),
+                json.dumps(agg.recent_outcomes, ensure_ascii=False),
+                agg.streak_outcome, agg.streak_len, agg.trust_flags,
+                json.dumps(agg.stage_runs), agg.first_at, agg.last_at,
+            ),
+        )
+
+    def clear(self, context_id: Optional[str] = None) -> None:
+        """Forget one context, or everything."""
+        with self.store.transaction() as conn:
+            if context_id is None:
+                conn.execute("DELETE FROM decision_outcomes")
+                conn.execute("DELETE FROM decision_contexts")
+            else:
+                conn.execute("DELETE FROM decision_outcomes WHERE context_id = ?", (context_id,))
+                conn.execute("DELETE FROM decision_contexts WHERE context_id = ?", (context_id,))
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _aggregate(self, context_id: str) -> _ContextAggregate:
+        return self._load_aggregate(self.store.connection(), context_id) or _ContextAggregate()
+
+    @staticmethod
+    def _to_outcome(row: sqlite3.Row) -> HistoricalOutcome:
+        return HistoricalOutcome(
+            context_id=row["context_id"],
+            primary_outcome=row["primary_outcome"],
+            timestamp=row["created_at"],
+            url=row["url"],
+            secondary_outcome=row["secondary_outcome"],
+            confidence_score=row["confidence_score"],
+            location=row["location"],
+            what_to_change=row["what_to_change"],
+            expected_lift=row["expected_lift"],
+            inferred_stage=row["inferred_stage"],
+        )
+
+    def get_history(self, context_id: str, limit: Optional[int] = None) -> List[HistoricalOutcome]:
+        """Kept analyses for a context, oldest first."""
+        rows = self.store.connection().execute(
+            "SELECT * FROM decision_outcomes WHERE context_id = ? ORDER BY id DESC LIMIT ?",
+            (context_id, limit or self.max_items),
+        ).fetchall()
+        return [self._to_outcome(row) for row in reversed(rows)]
+
+    def get_history_for_url(
+        self, url: str, since: Optional[str] = None, limit: int = DEFAULT_MAX_ITEMS
+    ) -> List[HistoricalOutcome]:
+        """Analyses of a URL across contexts (optionally since an ISO timestamp), oldest first."""
+        rows = self.store.connection().execute(
+            """
+            SELECT * FROM decision_outcomes
+            WHERE url = ? AND created_at >= ?
+            ORDER BY created_at DESC LIMIT ?
+            """,
+            (url, since or "", limit),
+        ).fetchall()
+        return [self._to_outcome(row) for row in reversed(rows)]
+
+    def analyze_trajectory(self, context_id: str) -> List[OutcomeTrajectory]:
+        return self._trajectories(self._aggregate(context_id))
+
+    @staticmethod
+    def _trajectories(agg: _ContextAggregate) -> List[OutcomeTrajectory]:
+        if not agg.kept:
+            return []
+        recent = agg.recent_outcomes[-RECENT_WINDOW:]
+        trajectories = []
+        for outcome, count in sorted(agg.outcome_counts.items(), key=lambda kv: -kv[1]):
+            recent_count = recent.count(outcome)
+            earlier = count - recent_count
+            share = count / agg.kept
+            if recent_count == 0:
+                pattern = "resolved"
+            elif earlier == 0 and agg.kept > RECENT_WINDOW:
+                pattern = "emerging"
+            elif share >= 0.7:
+                pattern = "persistent"
+            elif share >= 0.4:
+                pattern = "weakening"
+            else:
+                pattern = "shifting"
+            trajectories.append(OutcomeTrajectory(outcome, pattern, count, round(share, 2)))
+        return trajectories
+
+    def detect_fatigue(self, context_id: str) -> Optional[DecisionFatigueAnalysis]:
+        return self._fatigue(self._aggregate(context_id))
+
+    @staticmethod
+    def _fatigue(agg: _ContextAggregate) -> Optional[DecisionFatigueAnalysis]:
+        effort = agg.outcome_counts.get("Effort Too High", 0)
+        unclear = agg.outcome_counts.get("Outcome Unclear", 0)
+        indicators = []
+        if effort >= 3:
+            indicators.append(f"Repeated cognitive overload ({effort} times)")
+        if unclear >= 3:
+            indicators.append(f"Repeated outcome unclear ({unclear} times)")
+        if agg.streak_len >= 4:
+            indicators.append(
+                f"No resolution despite exposure: {agg.streak_outcome} in {agg.streak_len} consecutive analyses"
+            )
+
+        repeats = max(effort, unclear, agg.streak_len)
+        if repeats >= 6:
+            level = FatigueLevel.CRITICAL
+            recommendation = "Redesign the decision architecture; incremental fixes have not moved this decision."
+        elif repeats >= 5:
+            level = FatigueLevel.HIGH
+            recommendation = "Apply a deeper structural intervention instead of another surface-level fix."
+        elif repeats >= 3:
+            level = FatigueLevel.MEDIUM
+            recommendation = "Address the root cause comprehensively rather than one element at a time."
+        elif repeats >= 2:
+            level = FatigueLevel.LOW
+            recommendation = "Watch for repetition; the same barrier has appeared more than once."
+        else:
+            return None
+        return DecisionFatigueAnalysis(level, indicators, recommendation)
+
+    def analyze_trust_dynamics(self, context_id: str) -> Optional[TrustDynamics]:
+        return self._trust(self._aggregate(context_id))
+
+    @staticmethod
+    def _trust(agg: _ContextAggregate) -> Optional[TrustDynamics]:
+        flags = agg.trust_flags
+        if len(flags) < 2 or "1" not in flags:
+            return None
+        half = len(flags) // 2
+        older = flags[:half].count("1") / half
+        newer = flags[half:].count("1") / (len(flags) - half)
+        if newer > older + 0.1:
+            trend = "increasing"
+        elif newer < older - 0.1:
+            trend = "decreasing"
+        else:
+            trend = "stable"
+        toggles = sum(1 for a, b in zip(flags, flags[1:]) if a != b)
+
+        if "0" not in flags:
+            consistency = "consistent"
+        elif trend == "decreasing":
+            consistency = "improving"
+        elif toggles >= 2:
+            consistency = "inconsistent"
+        else:
+            consistency = "consistent"
+
+        if trend == "increasing":
+            recommendation = "Trust debt is growing: implement a credibility sequence (proof before promise, risk reversal before the ask)."
+        elif consistency == "inconsistent":
+            recommendation = "Trust signals come and go: keep credibility cues consistent across every touchpoint."
+        elif trend == "decreasing":
+            recommendation = "Trust debt is shrinking: keep the credibility changes that are working."
+        else:
+            recommendation = "Trust issues are stable: address them directly with visible proof at the point of decision."
+        return TrustDynamics(trend, consistency, recommendation)
+
+    # ------------------------------------------------------------------
+    # Memory-aware selection
+    # ------------------------------------------------------------------
+
+    def suppress_repeated_fixes(self, context_id: str, proposed_fix: str) -> Tuple[bool, Optional[str]]:
+        """(True, reason) when the same fix was already recommended for this context."""
+        key = fix_key(proposed_fix)
+        if key is None:
+            return False, None
+        row = self.store.connection().execute(
+            """
+            SELECT COUNT(*) AS n, MAX(created_at) AS last_at FROM decision_outcomes
+            WHERE context_id = ? AND fix_key = ?
+            """,
+            (context_id, key),
+        ).fetchone()
+        if not row["n"]:
+            return False, None
+        return True, (
+            f"This fix was already recommended {row['n']} time(s) for this context "
+            f"(last on {row['last_at'][:10]}); consider an alternative intervention."
+        )
+
+    def adjust_confidence_with_memory(
+        self, context_id: str, blocker: str, base_confidence: float
+    ) -> Tuple[float, str]:
+        return self._adjust_confidence(self._aggregate(context_id), blocker, base_confidence)
+
+    @staticmethod
+    def _adjust_confidence(agg: _ContextAggregate, blocker: str, base_confidence: float) -> Tuple[float, str]:
+        if not agg.kept:
+            return base_confidence, ""
+        if agg.kept < 3:
+            factor, reason = 0.9, f"Limited history available ({agg.kept} prior analyses)"
+        elif agg.outcome_counts.get(blocker, 0) >= 3:
+            factor, reason = 1.1, f"Consistent pattern detected: {blocker} seen {agg.outcome_counts[blocker]} times"
+        elif all(outcome != blocker for outcome in agg.recent_outcomes[-2:]):
+            factor, reason = 0.85, "Conflicting signals detected: recent analyses found different blockers"
+        else:
+            return base_confidence, ""
+        return round(max(0.0, min(100.0, base_confidence * factor)), 1), reason
+
+    def adjust_confidence_with_memory_stage_aware(
+        self, context_id: str, blocker: str, base_confidence: float, current_stage: Any
+    ) -> Tuple[float, str]:
+        agg = self._aggregate(context_id)
+        confidence, reason = self._adjust_confidence(agg, blocker, base_confidence)
+        stage = _normalize_stage(current_stage)
+        if not stage or not agg.stage_runs:
+            return confidence, reason
+
+        last_stage, run = agg.stage_runs[-1]
+        note = ""
+        if last_stage == stage and run >= 2 and agg.streak_outcome == blocker:
+            confidence = min(100.0, confidence * 1.05)
+            note = f"{blocker} persists while the decision stays at {stage}"
+        elif _STAGE_RANK.get(stage, 0) < _STAGE_RANK.get(last_stage, 0):
+            confidence = confidence * 0.95
+            note = f"stage regressed from {last_stage} to {stage}"
+        if note:
+            reason = f"{reason}; {note}" if reason else note
+        return round(max(0.0, min(100.0, confidence)), 1), reason
+
+    # ------------------------------------------------------------------
+    # Insight
+    # ------------------------------------------------------------------
+
+    def generate_history_insight(
+        self,
+        context_id: str,
+        blocker: str,
+        confidence: Optional[float] = None,
+        current_stage: Any = None,
+    ) -> DecisionHistoryInsight:
+        """Build the report's history section from the context aggregate alone."""
+        agg = self._aggregate(context_id)
+        if not agg.kept:
+            return DecisionHistoryInsight(
+                why_still_hesitating="No prior decision history for this context yet.",
+                trajectory_summary="First analysis for this context.",
+            )
+
+        trajectories = self._trajectories(agg)
+        by_pattern: Dict[str, List[OutcomeTrajectory]] = {}
+        for t in trajectories:
+            by_pattern.setdefault(t.pattern, []).append(t)
+
+        what_failed = [
+            f"{t.outcome} (appeared {t.occurrences} times, {t.pattern})"
+            for t in trajectories if t.pattern in {"persistent", "weakening"} and t.occurrences >= 2
+        ]
+        what_improved = [f"{t.outcome} (resolved)" for t in by_pattern.get("resolved", [])]
+        what_unresolved = [
+            f"{t.outcome} (persists across {t.occurrences} analyses)" for t in by_pattern.get("persistent", [])
+        ]
+        if blocker and agg.outcome_counts.get(blocker) and not any(
+            t.outcome == blocker for t in by_pattern.get("persistent", [])
+        ):
+            what_unresolved.append(f"{blocker} (seen {agg.outcome_counts[blocker]} times before)")
+
+        fatigue = self._fatigue(agg)
+        trust = self._trust(agg)
+        reasons = []
+        if fatigue:
+            reasons.append(f"Decision fatigue ({fatigue.fatigue_level.value}): {'; '.join(fatigue.indicators) or 'the same barrier keeps returning'}.")
+        if trust and trust.trust_debt_trend == "increasing":
+            reasons.append("Trust debt is accumulating across analyses.")
+        if blocker and agg.outcome_counts.get(blocker):
+            reasons.append(f"{blocker} has not been resolved by earlier changes.")
+        elif blocker:
+            reasons.append(f"{blocker} is new for this context; earlier blockers shifted rather than resolved.")
+
+        summary_parts = []
+        for pattern, label in (("persistent", "Persistent"), ("emerging", "Emerging"), ("resolved", "Resolved"), ("weakening", "Weakening")):
+            if by_pattern.get(pattern):
+                summary_parts.append(f"{label}: {', '.join(t.outcome for t in by_pattern[pattern])}")
+        summary = ". ".join(summary_parts) or "Outcomes are shifting between analyses"
+
+        return DecisionHistoryInsight(
+            what_failed=what_failed,
+            what_improved=what_improved,
+            what_remains_unresolved=what_unresolved,
+            why_still_hesitating=" ".join(reasons),
+            trajectory_summary=f"{summary} ({agg.kept} analyses, {agg.total_analyses} in total).",
+            fatigue_analysis=fatigue,
+            trust_dynamics=trust,
+            journey_insight=self._journey(agg, blocker, _normalize_stage(current_stage)),
+        )
+
+    @staticmethod
+    def _journey(agg: _ContextAggregate, blocker: str, stage: Optional[str]) -> Optional[DecisionJourneyInsight]:
+        if not stage or not agg.stage_runs:
+            return None
+        last_stage, run = agg.stage_runs[-1]
+        sequence = [s for s, _ in agg.stage_runs[-4:]]
+        if stage != last_stage:
+            sequence.append(stage)
+        observed = " → ".join(sequence)
+
+        if _STAGE_RANK.get(stage, 0) > _STAGE_RANK.get(last_stage, 0):
+            trajectory = StageTrajectoryAnalysis(
+                "forward_progress", sequence,
+                f"The decision moved forward from {last_stage} to {stage}.",
+                None,
+                "Support the next stage; do not push for premature commitment.",
+            )
+            return DecisionJourneyInsight(
+                observed, "progress",
+                f"Nothing is blocking advancement right now; {blocker or 'the current blocker'} is the next barrier.",
+                "wait", trajectory,
+            )
+        if _STAGE_RANK.get(stage, 0) < _STAGE_RANK.get(last_stage, 0):
+            trajectory = StageTrajectoryAnalysis(
+                "regression", sequence,
+                f"The decision fell back from {last_stage} to {stage}.",
+                blocker or None,
+                f"Fix {blocker or 'the blocker'} first; it is pushing users back to an earlier stage.",
+            )
+            return DecisionJourneyInsight(
+                observed, "regression",
+                f"{blocker or 'The current blocker'} is sending users back to {stage}.",
+                "fix", trajectory,
+            )
+
+        stuck_for = run + 1
+        persistent_blocker = agg.streak_outcome == blocker and agg.streak_len >= 2
+        trajectory = StageTrajectoryAnalysis(
+            "stagnation", sequence,
+            f"The decision has stayed at {stage} for {stuck_for} analyses.",
+            blocker or None,
+            (f"Resolve {blocker} to unlock the move out of {stage}." if persistent_blocker
+             else f"Blockers keep changing at {stage}; revisit how the offer is framed for this stage."),
+        )
+        return DecisionJourneyInsight(
+            observed, "stuck",
+            f"{blocker or 'The current blocker'} keeps the decision at {stage}.",
+            "unlock" if persistent_blocker else "reframe",
+            trajectory,
+        )
+
+
+decision_memory_layer = DecisionMemoryLayer()
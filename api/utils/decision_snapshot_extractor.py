@@ -15,8 +15,9 @@ import re
 import logging
 from typing import Optional, Dict
 from urllib.parse import urlparse
-from bs4 import BeautifulSoup
 import requests
+from api.brain.context.url_index import classify_url
+from api.utils.html_document import parse_document
 from api.utils.text_utils import fix_mojibake
 
 # Import Playwright-based URL renderer (ASYNC ONLY)
@@ -49,20 +50,8 @@ def detect_channel(url: str) -> str:
         "marketplace_product" for marketplace domains, "generic_saas" otherwise
     """
     try:
-        parsed = urlparse(url.lower())
-        domain = parsed.netloc.lower()
-        # Remove www. prefix if present
-        domain = domain.replace("www.", "")
-        
-        # Marketplace domains
-        marketplace_domains = ["amazon", "trendyol", "ebay", "zalando", "booking", "airbnb"]
-        
-        for marketplace in marketplace_domains:
-            if marketplace in domain:
-                return "marketplace_product"
-        
-        # Default to generic_saas
-        return "generic_saas"
+        # Marketplace brands (url_index.MARKETPLACE_BRANDS) matched once per host, cached
+        return classify_url(url).channel
     except Exception:
         # If URL parsing fails, default to generic_saas
         return "generic_saas"
@@ -178,9 +167,9 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
         raise ValueError(f"Failed to fetch URL: {e}")
     
     try:
-        # BeautifulSoup will handle encoding from the already-decoded string
-        # Use html.parser (more lenient) or lxml (faster, but requires lxml)
-        soup = BeautifulSoup(html, 'html.parser', from_encoding='utf-8')
+        # Parsed once with lxml; selector lookups and page text are memoized
+        doc = parse_document(html)
+        soup = doc.soup
     except Exception as e:
         raise ValueError(f"Failed to parse HTML: {e}")
     
@@ -202,7 +191,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
         'h1'  # Fallback to first h1
     ]
     for selector in hero_selectors:
-        element = soup.select_one(selector)
+        element = doc.select_one(selector)
         if element:
             hero_headline = element.get_text(strip=True)
             if hero_headline:
@@ -218,7 +207,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
         '.hero p'  # Fallback
     ]
     for selector in subheadline_selectors:
-        element = soup.select_one(selector)
+        element = doc.select_one(selector)
         if element:
             hero_subheadline = element.get_text(strip=True)
             if hero_subheadline and len(hero_subheadline) < 200:  # Reasonable length
@@ -258,7 +247,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
     # Look in common price locations
     price_selectors = ['.price', '.pricing', '[class*="price"]', '[id*="price"]']
     for selector in price_selectors:
-        elements = soup.select(selector)
+        elements = doc.select(selector)
         for elem in elements:
             text = elem.get_text()
             for pattern in price_patterns:
@@ -285,7 +274,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
     ]
     
     for selector in guarantee_selectors:
-        elements = soup.select(selector)
+        elements = doc.select(selector)
         for elem in elements:
             text = elem.get_text(strip=True)
             if any(keyword in text.lower() for keyword in guarantee_keywords):
@@ -306,7 +295,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
     
     # Fallback: search entire page for guarantee keywords
     if not guarantee_risk:
-        all_text = soup.get_text()
+        all_text = doc.text
         for keyword in guarantee_keywords:
             pattern = rf'.{{0,100}}{re.escape(keyword)}.{{0,100}}'
             match = re.search(pattern, all_text, re.I)
@@ -325,7 +314,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
     # Check for free returns
     free_return_keywords = ['free return', 'free returns', 'free shipping and return', 
                            'free returns & exchanges', 'hassle-free return']
-    page_text_lower = soup.get_text().lower()
+    page_text_lower = doc.text_lower
     if any(keyword in page_text_lower for keyword in free_return_keywords):
         has_free_returns = True
     
@@ -334,7 +323,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
                         'delivery by', 'get it by', 'ships from', 'dispatch']
     delivery_selectors = ['[class*="delivery"]', '[class*="shipping"]', '[id*="delivery"]']
     for selector in delivery_selectors:
-        if soup.select_one(selector):
+        if doc.select_one(selector):
             has_delivery_date = True
             break
     if not has_delivery_date and any(keyword in page_text_lower for keyword in delivery_keywords):
@@ -346,7 +335,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
         '[data-rating]', '.rating', '.reviews', '[aria-label*="star"]'
     ]
     for selector in rating_selectors:
-        if soup.select_one(selector):
+        if doc.select_one(selector):
             has_ratings = True
             break
     if not has_ratings:
@@ -366,7 +355,7 @@ async def extract_decision_snapshot(url: str) -> Dict[str, any]:
         '[class*="prime"]', '[aria-label*="badge"]', '[data-badge]'
     ]
     for selector in trust_badge_selectors:
-        if soup.select_one(selector):
+        if doc.select_one(selector):
             has_trust_badges = True
             break
     if not has_trust_badges:
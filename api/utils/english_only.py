@@ -8,11 +8,11 @@ Instead of blanking content, rewrites it to safe English or generates fallback i
 """
 import re
 import logging
-from typing import Any, Tuple, List, Dict
+from typing import Any, Tuple, List, Dict, Sequence
 
-logger = logging.getLogger(__name__)
+from api.utils.response_sanitizer import NON_EN_RE, ResponseSanitizer, key_path
 
-NON_EN_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]")
+logger = logging.getLogger(__name__)
 
 # Fallback texts for specific field types
 FALLBACK_TEXTS = {
@@ -312,48 +312,46 @@ def enforce_english_only(obj: Any, mode: str = "unknown", debug: dict = None, pa
         "low_confidence": False
     }
     
-    def _process_value(value: Any, key_path: str = "") -> Any:
-        """Recursively process a value."""
-        if isinstance(value, str):
-            # Determine context from key_path for better fallback generation
-            context = "content"
-            if "quick_win" in key_path.lower() or "quick_wins" in key_path.lower():
-                if "action" in key_path.lower():
-                    context = "quick_win_action"
-                elif "reason" in key_path.lower():
-                    context = "quick_win_reason"
-                else:
-                    context = "quick_win"
-            elif "issue" in key_path.lower() or "issues" in key_path.lower():
-                if "problem" in key_path.lower():
-                    context = "issue_problem"
-                elif "why_it_hurts" in key_path.lower():
-                    context = "issue_why"
-                else:
-                    context = "issue"
-            elif "human_report" in key_path.lower() or "report" in key_path.lower():
-                context = "description"
-            
-            sanitized, was_rewritten = sanitize_string(value, context=context, page_map=page_map)
-            if was_rewritten:
-                stats["rewrites_count"] += 1
-                stats["low_confidence"] = True
-            return sanitized
-        elif isinstance(value, list):
-            return [_process_value(x, key_path) for x in value]
-        elif isinstance(value, dict):
-            return {k: _process_value(v, f"{key_path}.{k}" if key_path else k) for k, v in value.items()}
-        else:
-            return value
+    def _rewrite(value: str, path: Sequence[Any]) -> str:
+        """Rewrite one non-English string; context comes from its key path."""
+        key_path_lower = key_path(path).lower()
+        # Determine context from key_path for better fallback generation
+        context = "content"
+        if "quick_win" in key_path_lower or "quick_wins" in key_path_lower:
+            if "action" in key_path_lower:
+                context = "quick_win_action"
+            elif "reason" in key_path_lower:
+                context = "quick_win_reason"
+            else:
+                context = "quick_win"
+        elif "issue" in key_path_lower or "issues" in key_path_lower:
+            if "problem" in key_path_lower:
+                context = "issue_problem"
+            elif "why_it_hurts" in key_path_lower:
+                context = "issue_why"
+            else:
+                context = "issue"
+        elif "human_report" in key_path_lower or "report" in key_path_lower:
+            context = "description"
+        
+        sanitized, was_rewritten = sanitize_string(value, context=context, page_map=page_map)
+        if was_rewritten:
+            stats["rewrites_count"] += 1
+            stats["low_confidence"] = True
+        return sanitized
     
-    result = _process_value(obj)
+    # One copy-on-write walk: ASCII strings are skipped, the key path is only
+    # joined for strings that actually contain non-English characters
+    result = ResponseSanitizer(non_english=_rewrite).sanitize(obj)
+    if result is obj and isinstance(result, dict):
+        # Nothing was rewritten; copy before the URL-mode patches below
+        result = dict(result)
     
     # Ensure minimum issues/quick_wins for URL mode using page_map-driven generation
     if mode == "url" and isinstance(result, dict):
         # Get current issues
         issues = result.get("issues", [])
-        if not isinstance(issues, list):
-            issues = []
+        issues = list(issues) if isinstance(issues, list) else []
         
         # Get summary for page_map-driven generation
         result_summary = summary if summary else result.get("summary", {})
@@ -472,8 +470,7 @@ def enforce_english_only(obj: Any, mode: str = "unknown", debug: dict = None, pa
         
         # Get current quick_wins
         quick_wins = result.get("quick_wins", [])
-        if not isinstance(quick_wins, list):
-            quick_wins = []
+        quick_wins = list(quick_wins) if isinstance(quick_wins, list) else []
         
         # Generate page_map-driven quick_wins if we have page_map
         if page_map and len(quick_wins) < 3:
@@ -519,14 +516,14 @@ def enforce_english_only(obj: Any, mode: str = "unknown", debug: dict = None, pa
         # Update summary counts
         result_summary = result.get("summary", {})
         if isinstance(result_summary, dict):
+            result_summary = dict(result_summary)
             result_summary["issues_count"] = len(issues)
             result_summary["quick_wins_count"] = len(result["quick_wins"])
             result["summary"] = result_summary
         
         # Set low_confidence flag in debug
         if stats["low_confidence"]:
-            if "debug" not in result:
-                result["debug"] = {}
+            result["debug"] = dict(result.get("debug") or {})
             result["debug"]["low_confidence"] = True
             result["debug"]["rewrites_count"] = stats["rewrites_count"]
             if debug:
@@ -0,0 +1,218 @@
+"""
+Parse-once HTML document model.
+
+Several extractors used to re-parse the same page HTML (page_extract, analyze_url,
+decision_engine, decision_snapshot_extractor, pricing_signals - the latter with
+the slow html.parser, twice). ParsedDocument parses once with lxml and memoizes
+the derived views those modules need:
+
+- text / visible_text / text_excluding(...)
+- headings, cta_nodes, forms, price_nodes
+- title, meta
+- select(...) / select_one(...) for module-specific selectors
+
+Inside a document_scope() (opened per request by DocumentScopeMiddleware),
+parse_document(html) returns the same document to every call site handling
+the same page, so they share one parse without threading the object through
+every signature. The scope is a contextvar: worker threads started with the
+request's context (asyncio.to_thread, sync routes) share it, and the documents
+are released when the request ends. Outside a scope every call parses anew
+and nothing is retained. Documents are shared: treat the soup as read-only
+(never decompose() / extract() nodes from it).
+"""
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import cached_property
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple, Union
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+# Elements removed when building "visible" text
+INVISIBLE_TAGS: FrozenSet[str] = frozenset({"script", "style", "noscript", "template", "head"})
+CTA_SELECTOR = "a,button,input[type='submit'],input[type='button']"
+PRICE_SELECTOR = ".price, .pricing, [class*='price'], [id*='price']"
+HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+class ParsedDocument:
+    """One lxml parse of a page plus memoized derived views."""
+
+    def __init__(self, html: str):
+        self.html = html or ""
+        self._select_cache: Dict[str, List[Tag]] = {}
+        self._text_cache: Dict[Tuple[FrozenSet[str], str, bool], str] = {}
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, "lxml")
+
+    # ---- generic memoized queries -------------------------------------------------
+
+    def select(self, selector: str) -> List[Tag]:
+        cached = self._select_cache.get(selector)
+        if cached is None:
+            cached = self.soup.select(selector)
+            self._select_cache[selector] = cached
+        return cached
+
+    def select_one(self, selector: str) -> Optional[Tag]:
+        found = self.select(selector)
+        return found[0] if found else None
+
+    def text_excluding(self, exclude: Iterable[str] = (), separator: str = "", strip: bool = False,
+                       root: Optional[Tag] = None) -> str:
+        """
+        Text of the document (or ``root``) skipping any subtree whose tag is in ``exclude``.
+
+        Equivalent to decompose()-ing those tags and calling get_text(separator, strip),
+        without mutating the shared soup.
+        """
+        exclude_set = frozenset(exclude)
+        key = (exclude_set, separator, strip) if root is None else None
+        if key is not None and key in self._text_cache:
+            return self._text_cache[key]
+        parts = list(_iter_strings(root if root is not None else self.soup, exclude_set, strip))
+        text = separator.join(parts)
+        if key is not None:
+            self._text_cache[key] = text
+        return text
+
+    # ---- derived views --------------------------------------------------------------
+
+    @cached_property
+    def text(self) -> str:
+        """Same as soup.get_text()."""
+        return self.text_excluding()
+
+    @cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def visible_text(self) -> str:
+        """Newline-separated, stripped text without script/style/head content."""
+        return self.text_excluding(INVISIBLE_TAGS, separator="\n", strip=True)
+
+    @cached_property
+    def body(self) -> Optional[Tag]:
+        return self.soup.find("body")
+
+    @cached_property
+    def title(self) -> Optional[str]:
+        tag = self.soup.find("title")
+        return tag.get_text(strip=True) if tag else None
+
+    @cached_property
+    def meta(self) -> Dict[str, str]:
+        """<meta name|property=... content=...> as a dict (first occurrence wins)."""
+        out: Dict[str, str] = {}
+        for tag in self.soup.find_all("meta"):
+            key = tag.get("name") or tag.get("property")
+            content = tag.get("content")
+            if key and content and key.lower() not in out:
+                out[key.lower()] = content
+        return out
+
+    @cached_property
+    def headings(self) -> List[Tag]:
+        """h1-h6 elements in document order."""
+        return self.soup.find_all(list(HEADING_TAGS))
+
+    def headings_by_tag(self, *tags: str) -> List[Tag]:
+        wanted = set(tags) or set(HEADING_TAGS)
+        return [h for h in self.headings if h.name in wanted]
+
+    @cached_property
+    def cta_nodes(self) -> List[Tag]:
+        return self.select(CTA_SELECTOR)
+
+    @cached_property
+    def forms(self) -> List[Tag]:
+        return self.soup.find_all("form")
+
+    @cached_property
+    def price_nodes(self) -> List[Tag]:
+        return self.select(PRICE_SELECTOR)
+
+
+def _iter_strings(root: Tag, exclude: FrozenSet[str], strip: bool) -> Iterator[str]:
+    # Iterative walk (deep DOMs would hit the recursion limit)
+    stack = [iter(root.children)]
+    while stack:
+        child = next(stack[-1], None)
+        if child is None:
+            stack.pop()
+            continue
+        if isinstance(child, NavigableString):
+            # Same string types get_text() yields (skips comments, script/style bodies)
+            if type(child) not in (NavigableString, CData):
+                continue
+            s = child.strip() if strip else str(child)
+            if s:
+                yield s
+        elif isinstance(child, Tag) and child.name not in exclude:
+            stack.append(iter(child.children))
+
+
+def has_excluded_ancestor(el: Tag, exclude: Iterable[str]) -> bool:
+    names = set(exclude)
+    return any(parent.name in names for parent in el.parents)
+
+
+class _DocumentScope:
+    def __init__(self) -> None:
+        self.documents: Dict[str, ParsedDocument] = {}
+        self.lock = threading.Lock()
+
+
+_scope: ContextVar[Optional[_DocumentScope]] = ContextVar("html_document_scope", default=None)
+
+
+@contextmanager
+def document_scope() -> Iterator[None]:
+    """Share parses of the same HTML within the block (one request / page analysis)."""
+    token = _scope.set(_DocumentScope())
+    try:
+        yield
+    finally:
+        _scope.reset(token)
+
+
+class DocumentScopeMiddleware:
+    """ASGI middleware running each HTTP request in its own document_scope()."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with document_scope():
+            await self.app(scope, receive, send)
+
+
+def parse_document(html: Union[str, ParsedDocument, None]) -> ParsedDocument:
+    """Return a ParsedDocument for ``html`` (pass-through if it already is one)."""
+    if isinstance(html, ParsedDocument):
+        return html
+    html = html or ""
+    current = _scope.get()
+    if current is None:
+        return ParsedDocument(html)
+    with current.lock:
+        doc = current.documents.get(html)
+        if doc is None:
+            doc = current.documents[html] = ParsedDocument(html)
+    return doc
+
+
+def clear_document_cache() -> None:
+    """Forget the documents of the current scope (no-op outside one)."""
+    current = _scope.get()
+    if current is not None:
+        with current.lock:
+            current.documents.clear()
@@ -0,0 +1,223 @@
+"""
+Compiled keyword lexicon shared by the signal, page-type and evidence detectors.
+
+Detectors used to run ``kw in text.lower()`` for every keyword of every list
+(re-lowercasing the page per list) and ``re.search`` loops over uncompiled
+patterns. A Lexicon compiles a module's keyword groups once; a page is
+normalized once and scanned once, and the result is memoized per text so
+every detector (and repeated count/find calls) reuses it:
+
+    LEXICON = Lexicon({"pricing": [...], "social_proof": [...]})
+    hits = LEXICON.scan(page_text)
+    hits.count("pricing"); hits.found("social_proof"); hits.positions["free trial"]
+
+Backends:
+- pyahocorasick installed: one Aho-Corasick pass yields all hits with positions
+- otherwise: presence via ``in`` on the normalized text (C-level scans beat a
+  Python automaton walk on CPython), positions on demand from one trie-shaped regex
+
+Matching keeps the substring semantics of ``kw in text.lower()`` exactly (no
+word boundaries), including overlapping keywords ("review" / "reviews").
+Regex pattern groups are compiled once and evaluated lazily per scan.
+"""
+from __future__ import annotations
+
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Pattern, Tuple
+
+try:
+    import ahocorasick  # type: ignore[import-not-found]
+    HAS_AHOCORASICK = True
+except ImportError:
+    ahocorasick = None
+    HAS_AHOCORASICK = False
+
+
+def normalize_text(text: Optional[str]) -> str:
+    return (text or "").lower()
+
+
+def _trie_regex(keywords: Iterable[str]) -> str:
+    """
+    Regex matching the longest keyword starting at the current position.
+
+    Built from a character trie, so the regex engine walks one branch per
+    character instead of trying every alternative.
+    """
+    trie: Dict[str, dict] = {}
+    for kw in keywords:
+        node = trie
+        for ch in kw:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        terminal = "" in node
+        branches = []
+        for ch in sorted(k for k in node if k):
+            child = node[ch]
+            # Collapse single-child chains into literals to keep nesting shallow
+            literal = [ch]
+            while len(child) == 1 and "" not in child:
+                (next_ch, child), = child.items()
+                literal.append(next_ch)
+            branches.append(re.escape("".join(literal)) + build(child))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: prefer the longer keyword, fall back to the terminal one
+        return f"(?:{body})?" if terminal else body
+
+    return build(trie)
+
+
+class LexiconHits:
+    """Result of one Lexicon scan over a normalized text."""
+
+    def __init__(self, lexicon: "Lexicon", text: str, present: FrozenSet[str]):
+        self._lexicon = lexicon
+        self.text = text
+        self.present = present
+        self._positions: Optional[Dict[str, List[int]]] = None
+        self._pattern_hits: Dict[str, List[bool]] = {}
+
+    def __contains__(self, keyword: str) -> bool:
+        return keyword.lower() in self.present
+
+    @property
+    def positions(self) -> Dict[str, List[int]]:
+        """keyword -> sorted start offsets (computed on first access)."""
+        if self._positions is None:
+            self._positions = self._lexicon._positions(self.text)
+        return self._positions
+
+    def matches(self, keywords: Iterable[str]) -> List[str]:
+        """Keywords (in the given order) present in the text; works for ad-hoc lists too."""
+        known = self._lexicon.keywords
+        out = []
+        for kw in keywords:
+            kw_norm = kw.lower()
+            if kw_norm in known:
+                if kw_norm in self.present:
+                    out.append(kw)
+            elif kw_norm in self.text:
+                out.append(kw)
+        return out
+
+    def found(self, group: str) -> List[str]:
+        return self.matches(self._lexicon.groups[group])
+
+    def count(self, group: str) -> int:
+        return len(self.found(group))
+
+    def any(self, group: str) -> bool:
+        return any(kw.lower() in self.present for kw in self._lexicon.groups[group])
+
+    def pattern_hits(self, group: str) -> List[bool]:
+        hits = self._pattern_hits.get(group)
+        if hits is None:
+            hits = [bool(p.search(self.text)) for p in self._lexicon.patterns[group]]
+            self._pattern_hits[group] = hits
+        return hits
+
+    def pattern_count(self, group: str) -> int:
+        return sum(self.pattern_hits(group))
+
+    def pattern_any(self, group: str) -> bool:
+        return any(self.pattern_hits(group))
+
+
+class Lexicon:
+    """Keyword groups (and optional regex pattern groups) compiled once."""
+
+    def __init__(
+        self,
+        groups: Mapping[str, Iterable[str]],
+        patterns: Optional[Mapping[str, Iterable[str]]] = None,
+        pattern_flags: int = 0,
+        cache_size: int = 16,
+    ):
+        self.groups: Dict[str, Tuple[str, ...]] = {name: tuple(kws) for name, kws in groups.items()}
+        self.keywords = frozenset(kw.lower() for kws in self.groups.values() for kw in kws if kw)
+        self.patterns: Dict[str, Tuple[Pattern[str], ...]] = {
+            name: tuple(re.compile(p, pattern_flags) for p in pats) for name, pats in (patterns or {}).items()
+        }
+        self._regex = re.compile(_trie_regex(self.keywords)) if self.keywords else None
+        # The scan is non-overlapping (so the regex engine can skip to candidate first
+        # characters). Keywords starting inside a match [s, e) are either contained in it
+        # (implied, fixed offsets) or cross e; the latter can only start at offsets d
+        # where some keyword begins with match[d:] - those are re-checked explicitly.
+        self._implied: Dict[str, Tuple[Tuple[str, int], ...]] = {}
+        self._crossing: Dict[str, Tuple[int, ...]] = {}
+        for kw in self.keywords:
+            implied = []
+            for other in self.keywords:
+                if other != kw and len(other) < len(kw):
+                    start = kw.find(other)
+                    while start != -1:
+                        implied.append((other, start))
+                        start = kw.find(other, start + 1)
+            self._implied[kw] = tuple(implied)
+            self._crossing[kw] = tuple(
+                d for d in range(1, len(kw))
+                if any(len(other) > len(kw) - d and other.startswith(kw[d:]) for other in self.keywords)
+            )
+        self._automaton = None
+        if HAS_AHOCORASICK and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for kw in self.keywords:
+                self._automaton.add_word(kw, kw)
+            self._automaton.make_automaton()
+        self._cache: "OrderedDict[str, LexiconHits]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+
+    def scan(self, text: Optional[str]) -> LexiconHits:
+        raw = text or ""
+        with self._lock:
+            cached = self._cache.get(raw)
+            if cached is not None:
+                self._cache.move_to_end(raw)
+                return cached
+
+        normalized = normalize_text(raw)
+        if self._automaton is not None:
+            positions = self._automaton_positions(normalized)
+            hits = LexiconHits(self, normalized, frozenset(positions))
+            hits._positions = positions
+        else:
+            hits = LexiconHits(self, normalized, frozenset(kw for kw in self.keywords if kw in normalized))
+
+        with self._lock:
+            self._cache[raw] = hits
+            while len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        return hits
+
+    def _automaton_positions(self, text: str) -> Dict[str, List[int]]:
+        found: Dict[str, List[int]] = {}
+        if text:
+            for end, kw in self._automaton.iter(text):
+                found.setdefault(kw, []).append(end - len(kw) + 1)
+        return found
+
+    def _positions(self, text: str) -> Dict[str, List[int]]:
+        found: Dict[str, set] = {}
+        if self._regex is None or not text:
+            return {}
+
+        def record(kw: str, start: int) -> None:
+            found.setdefault(kw, set()).add(start)
+            for other, offset in self._implied[kw]:
+                found.setdefault(other, set()).add(start + offset)
+
+        for m in self._regex.finditer(text):
+            kw, start = m.group(), m.start()
+            record(kw, start)
+            for d in self._crossing[kw]:
+                cross = self._regex.match(text, start + d)
+                if cross is not None:
+                    record(cross.group(), start + d)
+        return {kw: sorted(offsets) for kw, offsets in found.items()}
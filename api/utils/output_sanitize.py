@@ -5,6 +5,8 @@ from __future__ import annotations
 from typing import Any, Dict, List
 import logging
 
+from api.utils.response_sanitizer import NON_EN_RE, ResponseSanitizer
+
 logger = logging.getLogger(__name__)
 import logging
 
@@ -38,14 +40,12 @@ def fix_mojibake(s: str) -> str:
         return s
 
 
+_FIX_SANITIZER = ResponseSanitizer(repairs=(fix_mojibake,))
+
+
 def deep_fix_strings(obj: Any) -> Any:
-    if isinstance(obj, str):
-        return fix_mojibake(obj)
-    if isinstance(obj, list):
-        return [deep_fix_strings(x) for x in obj]
-    if isinstance(obj, dict):
-        return {k: deep_fix_strings(v) for k, v in obj.items()}
-    return obj
+    """Repair mojibake in every string (one copy-on-write walk; unchanged subtrees are shared)."""
+    return _FIX_SANITIZER.sanitize(obj)
 
 
 def enforce_english_only(result: Dict[str, Any]) -> Dict[str, Any]:
@@ -57,21 +57,18 @@ def enforce_english_only(result: Dict[str, Any]) -> Dict[str, Any]:
     if not locale.startswith("en"):
         return result
 
-    # Fix mojibake everywhere first
-    result = deep_fix_strings(result)
+    # Fix mojibake everywhere first; containers patched below are copied first
+    # because unchanged subtrees are shared with the caller's input
+    result = dict(deep_fix_strings(result))
 
     # Detect Persian characters in critical fields
     def has_persian(text: str) -> bool:
-        if not isinstance(text, str):
-            return False
-        for ch in text:
-            # Arabic/Persian Unicode blocks
-            if "\u0600" <= ch <= "\u06FF" or "\u0750" <= ch <= "\u077F" or "\u08A0" <= ch <= "\u08FF":
-                return True
-        return False
+        # Arabic/Persian Unicode blocks
+        return isinstance(text, str) and not text.isascii() and NON_EN_RE.search(text) is not None
 
     # Fields where Persian should never appear in EN mode
     def scrub_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+        issue = dict(issue)
         for key in ("problem", "why_it_hurts"):
             if has_persian(issue.get(key, "")):
                 issue[key] = "This issue is reducing confidence near the primary CTA."
@@ -86,9 +83,11 @@ def enforce_english_only(result: Dict[str, Any]) -> Dict[str, Any]:
         # evidence values
         ev = issue.get("evidence")
         if isinstance(ev, list):
-            for e in ev:
-                if isinstance(e, dict) and has_persian(e.get("value", "")):
-                    e["value"] = "Trust signal not detected near the CTA."
+            issue["evidence"] = [
+                {**e, "value": "Trust signal not detected near the CTA."}
+                if isinstance(e, dict) and has_persian(e.get("value", "")) else e
+                for e in ev
+            ]
         return issue
 
     # Scrub issues
@@ -100,6 +99,7 @@ def enforce_english_only(result: Dict[str, Any]) -> Dict[str, Any]:
         new_qw = []
         for qw in result["quick_wins"]:
             if isinstance(qw, dict) and has_persian(qw.get("action", "")):
+                qw = dict(qw)
                 qw["action"] = "Reduce CTA competition: keep one primary CTA above the fold."
                 qw["reason"] = "Less choice friction, faster decisions."
             new_qw.append(qw)
@@ -108,12 +108,14 @@ def enforce_english_only(result: Dict[str, Any]) -> Dict[str, Any]:
     # Also scrub findings.top_issues + findings.quick_wins if present
     findings = result.get("findings")
     if isinstance(findings, dict):
+        findings = dict(findings)
         if isinstance(findings.get("top_issues"), list):
             findings["top_issues"] = [scrub_issue(i) if isinstance(i, dict) else i for i in findings["top_issues"]]
         if isinstance(findings.get("quick_wins"), list):
             patched = []
             for qw in findings["quick_wins"]:
                 if isinstance(qw, dict) and has_persian(qw.get("action", "")):
+                    qw = dict(qw)
                     qw["action"] = "Make the primary CTA clearer and more specific."
                     qw["reason"] = "Improves next-step clarity."
                 patched.append(qw)
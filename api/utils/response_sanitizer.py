@@ -0,0 +1,104 @@
+"""
+Single-pass response sanitizer.
+
+Reports used to be walked once per concern: mojibake repair
+(output_sanitize.deep_fix_strings, text_sanitize.sanitize_any), English
+enforcement (english_only.enforce_english_only, the debug scrubber in
+analyze_human) and numpy scalar scrubbing (image_trust_service._py). Each walk
+rebuilt every dict and list.
+
+ResponseSanitizer fuses those into one visitor:
+- strings: pure-ASCII strings take the fast path (they cannot hold mojibake or
+  Persian text) unless they contain a configured trigger character (e.g. "&"
+  for HTML entities); others run the repair steps in order, then the
+  non-English hook if NON_EN_RE matches
+- numpy scalars / arrays become plain Python values in the same walk
+- containers are copied on write: a dict or list is only rebuilt when one of
+  its children changed, so unchanged subtrees are shared with the input
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Iterable, List, Optional, Sequence
+
+NON_EN_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]")
+
+# (text, key_path) -> replacement; key_path is the stack of dict keys leading to the string
+NonEnglishHook = Callable[[str, Sequence[Any]], str]
+
+
+def key_path(path: Sequence[Any]) -> str:
+    """Dotted path ("issues.problem") for a key stack; list indices are not part of it."""
+    return ".".join(str(k) for k in path)
+
+
+def to_builtin(value: Any) -> Any:
+    """Convert numpy scalars / arrays to plain Python; everything else is returned as-is."""
+    if type(value).__module__ != "numpy":
+        return value
+    if hasattr(value, "tolist"):
+        # ndarray -> nested lists, numpy scalar -> int / float / bool
+        return value.tolist()
+    return value
+
+
+class ResponseSanitizer:
+    """One recursive walk applying every configured transform."""
+
+    def __init__(
+        self,
+        repairs: Iterable[Callable[[str], str]] = (),
+        ascii_triggers: str = "",
+        non_english: Optional[NonEnglishHook] = None,
+        numpy_scalars: bool = True,
+    ):
+        self.repairs = tuple(repairs)
+        self.ascii_triggers = ascii_triggers
+        self.non_english = non_english
+        self.numpy_scalars = numpy_scalars
+
+    def sanitize(self, obj: Any) -> Any:
+        return self._visit(obj, [])
+
+    def sanitize_string(self, s: str, path: Sequence[Any] = ()) -> str:
+        if not s:
+            return s
+        if s.isascii() and not (self.ascii_triggers and any(c in s for c in self.ascii_triggers)):
+            return s
+        original = s
+        for repair in self.repairs:
+            s = repair(s)
+        if self.non_english is not None and s and NON_EN_RE.search(s):
+            s = self.non_english(s, path)
+        # Keep the input object when nothing changed so the parent is not copied
+        return original if s == original else s
+
+    def _visit(self, obj: Any, path: List[Any]) -> Any:
+        if isinstance(obj, str):
+            return self.sanitize_string(obj, path)
+        if isinstance(obj, dict):
+            out = None
+            for k, v in obj.items():
+                path.append(k)
+                new = self._visit(v, path)
+                path.pop()
+                if new is not v:
+                    if out is None:
+                        out = dict(obj)
+                    out[k] = new
+            return obj if out is None else out
+        if isinstance(obj, list):
+            out_list = None
+            for i, v in enumerate(obj):
+                new = self._visit(v, path)
+                if new is not v:
+                    if out_list is None:
+                        out_list = list(obj)
+                    out_list[i] = new
+            return obj if out_list is None else out_list
+        if self.numpy_scalars:
+            converted = to_builtin(obj)
+            if converted is not obj and isinstance(converted, list):
+                return self._visit(converted, path)
+            return converted
+        return obj
@@ -5,6 +5,8 @@ Production-grade version with multiple repair strategies.
 import re
 import html
 
+from api.utils.response_sanitizer import ResponseSanitizer
+
 MOJIBAKE_RE = re.compile(r"[Ââ€™""–—·]")
 
 # Build replacements from bytes to avoid encoding issues in source file
@@ -55,16 +57,16 @@ def sanitize_any(x):
     """
     Recursively sanitize text in any data structure (dict, list, str, etc.).
     
+    One copy-on-write walk: pure-ASCII strings without HTML entities are skipped,
+    unchanged subtrees are shared with the input.
+    
     Args:
         x: Any object to sanitize
         
     Returns:
         Sanitized object with same structure
     """
-    if isinstance(x, str):
-        return repair_mojibake(x)
-    if isinstance(x, list):
-        return [sanitize_any(i) for i in x]
-    if isinstance(x, dict):
-        return {k: sanitize_any(v) for k, v in x.items()}
-    return x
+    return _SANITIZER.sanitize(x)
+
+
+_SANITIZER = ResponseSanitizer(repairs=(repair_mojibake,), ascii_triggers="&")
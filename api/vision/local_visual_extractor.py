@@ -18,24 +18,23 @@ from typing import Dict, List, Tuple
 import numpy as np
 from PIL import Image
 
+from api.core.lazy import LazyModule
+from api.core.write_behind import write_behind
+
 logger = logging.getLogger(__name__)
 
-# Optional OpenCV for image processing
-try:
-    import cv2
-    HAS_OPENCV = True
-except ImportError:
-    HAS_OPENCV = False
-    cv2 = None
-    logger.warning("opencv-python not available - visual extraction will be limited")
+# Optional OpenCV for image processing and OCR for text extraction; both are
+# imported on first use (HAS_OPENCV / HAS_OCR resolve them, see __getattr__)
+cv2 = LazyModule("cv2", "opencv-python not available - visual extraction will be limited")
+pytesseract = LazyModule("pytesseract", "pytesseract not available - text extraction will be limited")
+
 
-# Optional OCR for text extraction
-try:
-    import pytesseract
-    HAS_OCR = True
-except ImportError:
-    HAS_OCR = False
-    logger.warning("pytesseract not available - text extraction will be limited")
+def __getattr__(name: str):
+    if name == "HAS_OPENCV":
+        return cv2.available
+    if name == "HAS_OCR":
+        return pytesseract.available
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 @dataclass
@@ -412,7 +411,7 @@ def _approx_position(box: Tuple[int, int, int, int], h: int, w: int) -> str:
 
 def _extract_text_from_region(img: Image.Image, box: Tuple[int, int, int, int]) -> str | None:
     """Extract text from a specific region using OCR if available."""
-    if not HAS_OCR:
+    if not pytesseract.available:
         return None
     try:
         x, y, w, h = box
@@ -555,19 +554,44 @@ def _draw_box(img: np.ndarray, box: Tuple[int, int, int, int], color: Tuple[int,
     cv2.putText(img, label, (x, text_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
 
 
-def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
+def _write_overlay(path: Path, overlay: np.ndarray) -> None:
+    """Write-behind job for the debug overlay (raises so the queue counts failures)."""
+    if not cv2.imwrite(str(path), overlay):
+        raise OSError(f"cv2.imwrite reported failure for overlay path: {path}")
+
+
+def decode_image(image_bytes: bytes) -> Image.Image | None:
     """
-    Extract heuristic visual elements and metrics from an image.
+    Decode image bytes into an RGB PIL image (None if undecodable).
+
+    Exposed so batch callers can decode once and share the result between
+    the cache (perceptual hash) and extract_visual_elements.
     """
     if not image_bytes:
+        return None
+    try:
+        return Image.open(io.BytesIO(image_bytes)).convert("RGB")
+    except Exception:
+        return None
+
+
+def extract_visual_elements(image_bytes: bytes, debug: bool = False, image: Image.Image | None = None) -> Dict:
+    """
+    Extract heuristic visual elements and metrics from an image.
+
+    If ``image`` (an already decoded RGB image from decode_image) is given,
+    the bytes are not decoded again.
+    """
+    if not image_bytes and image is None:
         return {"elements": [], "metrics": {}}
 
     # Fallback if OpenCV is not available
-    if not HAS_OPENCV:
+    if not cv2.available:
         logger.warning("OpenCV not available - returning minimal visual extraction")
         try:
-            img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-            w, h = img.size
+            if image is None:
+                image = Image.open(io.BytesIO(image_bytes))
+            w, h = image.size
             return {
                 "elements": [],
                 "metrics": {
@@ -583,9 +607,8 @@ def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
         except Exception:
             return {"elements": [], "metrics": {}}
 
-    try:
-        img = Image.open(io.BytesIO(image_bytes)).convert("RGB")
-    except Exception:
+    img = image if image is not None else decode_image(image_bytes)
+    if img is None:
         return {"elements": [], "metrics": {}}
 
     np_img = np.array(img)[:, :, ::-1]  # RGB -> BGR for OpenCV
@@ -651,7 +674,7 @@ def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
         pos = _approx_position(headline_box, h, w)
         x, y, cw, ch = headline_box
         # Extract text from headline region
-        headline_text = _extract_text_from_region(img, headline_box) if HAS_OCR else None
+        headline_text = _extract_text_from_region(img, headline_box) if pytesseract.available else None
         # Extract colors from headline region
         headline_colors = _extract_color_palette(np_img, headline_box)
         elements.append(
@@ -681,7 +704,7 @@ def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
             continue
         pos = _approx_position((x, y, cw, ch), h, w)
         # Extract text from CTA region
-        cta_text = _extract_text_from_region(img, (x, y, cw, ch)) if HAS_OCR else None
+        cta_text = _extract_text_from_region(img, (x, y, cw, ch)) if pytesseract.available else None
         # Extract colors from CTA region
         cta_colors = _extract_color_palette(np_img, (x, y, cw, ch))
         elements.append(
@@ -736,7 +759,7 @@ def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
         ui_cta_box = ui_cta.get("box")
         if ui_cta_box:
             x, y, cw, ch = ui_cta_box
-            ui_cta_text = _extract_text_from_region(img, ui_cta_box) if HAS_OCR else None
+            ui_cta_text = _extract_text_from_region(img, ui_cta_box) if pytesseract.available else None
             ui_cta_colors = _extract_color_palette(np_img, ui_cta_box)
         else:
             ui_cta_text = None
@@ -841,11 +864,9 @@ def extract_visual_elements(image_bytes: bytes, debug: bool = False) -> Dict:
             debug_dir = get_debug_shots_dir()  # Use shared config
             ts = datetime.utcnow().strftime("%Y%m%d_%H%M%S_%f")
             overlay_path = debug_dir / f"overlay_{ts}.png"
-            written = cv2.imwrite(str(overlay_path), overlay)
-            if written:
-                debug_info["overlayPath"] = str(overlay_path)
-            else:
-                logger.warning("cv2.imwrite reported failure for overlay path: %s", overlay_path)
+            # PNG encoding and the write happen behind the response
+            write_behind.call(_write_overlay, overlay_path, overlay)
+            debug_info["overlayPath"] = str(overlay_path)
         except Exception as exc:
             logger.exception("Failed to write debug overlay: %s", exc)
 
@@ -7,17 +7,14 @@ from __future__ import annotations
 import os
 from pathlib import Path
 from typing import Any, Dict, Optional
-from dotenv import load_dotenv
+from api.core.config import load_env
 
 # Try to find .env file in project root
 project_root = Path(__file__).parent.parent.parent.parent
 env_file = project_root / ".env"
 
 # Load .env file if it exists
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 
 def _client():
@@ -0,0 +1,256 @@
+"""
+Tile-based analysis of tall full-page screenshots.
+
+Full-page captures from capture_page_artifacts can be 1365x15000+ pixels.
+Running extract_visual_elements on the whole frame builds BGR, HSV, gray (and
+overlay) copies of the entire page, and its detectors only look at fixed
+fractions of the frame anyway (top 35% for the headline, 18-45% for the
+social proof band, ...), so most of a tall page is never really inspected.
+
+This module walks the page in overlapping, viewport-sized vertical bands:
+- only one band's working arrays (BGR/HSV/gray) exist at a time, so peak
+  memory is the decoded frame plus one band instead of 4-5 full-page copies
+- every band is analyzed with the regular viewport heuristics
+- detections are mapped back to page coordinates and merged across band seams
+- results are grouped into sections (hero, mid_page, footer)
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+
+from api.vision.local_visual_extractor import decode_image, extract_visual_elements
+
+logger = logging.getLogger(__name__)
+
+# Desktop viewport is 1365x768 -> bands default to the same aspect ratio
+DEFAULT_BAND_ASPECT = 768 / 1365
+MIN_BAND_HEIGHT = 480
+MAX_BAND_HEIGHT = 1600
+DEFAULT_OVERLAP = 0.15
+# Width the viewport extractor downsizes to (see extract_visual_elements)
+EXTRACTOR_MAX_WIDTH = 1440
+# Boxes from adjacent bands sharing this much of the smaller box are one element
+SEAM_MERGE_RATIO = 0.5
+
+SECTIONS = ("hero", "mid_page", "footer")
+# Set by the extractor when a band has too few elements; not a page-level failure
+INSUFFICIENT_UI_ERROR = "vision_model_insufficient_ui_understanding"
+
+
+def default_band_height(width: int) -> int:
+    return int(min(MAX_BAND_HEIGHT, max(MIN_BAND_HEIGHT, round(width * DEFAULT_BAND_ASPECT))))
+
+
+def iter_bands(height: int, band_height: int, overlap: float = DEFAULT_OVERLAP) -> List[Tuple[int, int]]:
+    """Return (top, bottom) pixel ranges covering [0, height) with the given overlap."""
+    if height <= band_height:
+        return [(0, height)]
+    step = max(1, int(band_height * (1.0 - overlap)))
+    bands: List[Tuple[int, int]] = []
+    top = 0
+    while True:
+        bottom = min(top + band_height, height)
+        bands.append((top, bottom))
+        if bottom >= height:
+            break
+        top += step
+        # Avoid a sliver as the final band: align it with the page bottom
+        if top + band_height > height:
+            top = max(0, height - band_height)
+    return bands
+
+
+def _section_for(center_y: float, page_height: int, band_height: int) -> str:
+    if center_y < band_height:
+        return "hero"
+    if page_height > 2 * band_height and center_y >= page_height - band_height:
+        return "footer"
+    return "mid_page"
+
+
+def _box(el: Dict[str, Any]) -> Optional[Tuple[int, int, int, int]]:
+    c = el.get("coordinates")
+    if not isinstance(c, dict):
+        return None
+    return int(c["x"]), int(c["y"]), int(c["width"]), int(c["height"])
+
+
+def _confidence(el: Dict[str, Any]) -> float:
+    try:
+        return float((el.get("analysis") or {}).get("confidence", 0.0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _overlap_ratio(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    inter = ix * iy
+    smaller = min(aw * ah, bw * bh)
+    return inter / smaller if smaller > 0 else 0.0
+
+
+def merge_seam_duplicates(elements: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Merge detections of the same element seen by two overlapping bands.
+
+    Two elements with the same role whose boxes share >= SEAM_MERGE_RATIO of the
+    smaller box become one: the union box, keeping the more confident element's
+    fields. Elements without coordinates are de-duplicated per (section, id).
+    """
+    merged: List[Dict[str, Any]] = []
+    seen_boxless = set()
+    for el in sorted(elements, key=_confidence, reverse=True):
+        box = _box(el)
+        if box is None:
+            key = (el.get("section"), el.get("id"))
+            if key in seen_boxless:
+                continue
+            seen_boxless.add(key)
+            merged.append(el)
+            continue
+        for kept in merged:
+            kept_box = _box(kept)
+            if kept_box is None or kept.get("role") != el.get("role"):
+                continue
+            if _overlap_ratio(box, kept_box) >= SEAM_MERGE_RATIO:
+                x0 = min(box[0], kept_box[0])
+                y0 = min(box[1], kept_box[1])
+                x1 = max(box[0] + box[2], kept_box[0] + kept_box[2])
+                y1 = max(box[1] + box[3], kept_box[1] + kept_box[3])
+                kept["coordinates"] = {"x": x0, "y": y0, "width": x1 - x0, "height": y1 - y0}
+                kept["merged_tiles"] = sorted(set(kept.get("merged_tiles", [kept.get("tile")]) + [el.get("tile")]))
+                break
+        else:
+            merged.append(el)
+    merged.sort(key=lambda e: (_box(e) or (0, 0, 0, 0))[1])
+    return merged
+
+
+def extract_visual_elements_tiled(
+    image_bytes: bytes,
+    band_height: Optional[int] = None,
+    overlap: float = DEFAULT_OVERLAP,
+    image: Optional[Image.Image] = None,
+) -> Dict[str, Any]:
+    """
+    Analyze a (tall) full-page screenshot band by band.
+
+    Returns the same top-level shape as extract_visual_elements (elements with
+    page coordinates, metrics, analysisStatus/error) plus:
+    - ``sections``: per-section report for hero / mid_page / footer
+    - ``tiles``: band geometry used for the run
+
+    A tile that fell back for a reason other than having few elements (e.g.
+    opencv_not_available) sets the result's analysisStatus / error.
+    """
+    page = image if image is not None else decode_image(image_bytes)
+    if page is None:
+        return {"elements": [], "metrics": {}}
+
+    width, height = page.size
+    band_h = int(band_height or default_band_height(width))
+    overlap = min(max(overlap, 0.0), 0.5)
+    bands = iter_bands(height, band_h, overlap)
+    # The extractor downsizes wide bands; map its coordinates back to page pixels
+    scale = EXTRACTOR_MAX_WIDTH / float(width) if width > EXTRACTOR_MAX_WIDTH else 1.0
+
+    all_elements: List[Dict[str, Any]] = []
+    band_metrics: List[Tuple[int, int, Dict[str, Any]]] = []
+    hero_palette: List[Any] = []
+    tile_fallback: Optional[Dict[str, Any]] = None
+
+    for tile_idx, (top, bottom) in enumerate(bands):
+        band = page.crop((0, top, width, bottom))
+        try:
+            extracted = extract_visual_elements(b"", image=band)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("Tile %d (%d-%d) extraction failed: %s", tile_idx, top, bottom, exc)
+            continue
+        finally:
+            del band
+
+        # Few elements in one band is normal; any other fallback applies to the page
+        error = extracted.get("error")
+        if tile_fallback is None and error and error != INSUFFICIENT_UI_ERROR:
+            tile_fallback = {"analysisStatus": extracted.get("analysisStatus") or "fallback", "error": error}
+
+        metrics = extracted.get("metrics") or {}
+        band_metrics.append((top, bottom, metrics))
+        if tile_idx == 0:
+            hero_palette = metrics.get("overall_color_palette", [])
+
+        for el in extracted.get("elements") or []:
+            el = dict(el)
+            el["tile"] = tile_idx
+            box = _box(el)
+            if box is not None:
+                x, y, w, h = box
+                el["coordinates"] = {
+                    "x": int(x / scale),
+                    "y": int(y / scale) + top,
+                    "width": int(w / scale),
+                    "height": int(h / scale),
+                }
+                center_y = el["coordinates"]["y"] + el["coordinates"]["height"] / 2
+            else:
+                center_y = (top + bottom) / 2
+            el["section"] = _section_for(center_y, height, band_h)
+            all_elements.append(el)
+
+    elements = merge_seam_duplicates(all_elements)
+
+    # Area-weighted page metrics; overlapping rows count once per band (close enough)
+    total_rows = sum(b - t for t, b, _ in band_metrics) or 1
+    edge_density = sum(float(m.get("edge_density", 0.0)) * (b - t) for t, b, m in band_metrics) / total_rows
+    text_density = sum(float(m.get("text_block_density", 0.0)) * (b - t) for t, b, m in band_metrics) / total_rows
+
+    sections: Dict[str, Dict[str, Any]] = {}
+    for name in SECTIONS:
+        in_section = [e for e in elements if e.get("section") == name]
+        section_bands = [
+            (t, b, m) for t, b, m in band_metrics
+            if _section_for((t + b) / 2, height, band_h) == name or (name == "hero" and t == 0)
+        ]
+        rows = sum(b - t for t, b, _ in section_bands)
+        roles: Dict[str, int] = {}
+        for e in in_section:
+            roles[e.get("role") or "other"] = roles.get(e.get("role") or "other", 0) + 1
+        sections[name] = {
+            "y_range": [min(t for t, _, _ in section_bands), max(b for _, b, _ in section_bands)] if section_bands else None,
+            "element_count": len(in_section),
+            "roles": roles,
+            "has_cta": any("cta" in (e.get("role") or "") for e in in_section),
+            "edge_density": round(sum(float(m.get("edge_density", 0.0)) * (b - t) for t, b, m in section_bands) / rows, 4) if rows else None,
+            "text_block_density": round(sum(float(m.get("text_block_density", 0.0)) * (b - t) for t, b, m in section_bands) / rows, 4) if rows else None,
+        }
+
+    result: Dict[str, Any] = {
+        "elements": elements,
+        "metrics": {
+            "edge_density": float(edge_density),
+            "text_block_density": float(text_density),
+            "cta_candidates": sum(int(m.get("cta_candidates", 0)) for _, _, m in band_metrics),
+            "overall_color_palette": hero_palette,
+            "detected_logos_count": sum(int(m.get("detected_logos_count", 0)) for _, _, m in band_metrics),
+        },
+        "sections": sections,
+        "tiles": {
+            "count": len(bands),
+            "band_height": band_h,
+            "overlap": overlap,
+            "page_width": width,
+            "page_height": height,
+        },
+    }
+    if tile_fallback is not None:
+        result.update(tile_fallback)
+    elif len(elements) < 4:
+        result["analysisStatus"] = "fallback"
+        result["error"] = INSUFFICIENT_UI_ERROR
+    return result
@@ -0,0 +1,194 @@
+"""
+Lightweight runtime for the learned visual trust classifier (low / medium / high).
+
+The full TensorFlow/Keras model is too heavy for the API process. Training
+exports a quantized artifact instead (see training/train_visual_trust_model.py
+--export), which this module loads with a small runtime:
+
+- .tflite: tflite-runtime / ai-edge-litert (falls back to tensorflow.lite if installed)
+- .onnx:   onnxruntime
+
+Everything is optional: when no artifact or runtime is available the API keeps
+using the OpenCV heuristics only.
+
+Config (env):
+- VISUAL_TRUST_MODEL_PATH: explicit artifact path (default: first models/visual_trust_model*.tflite|.onnx)
+- VISUAL_TRUST_MODEL_ENABLED: "false" disables the learned model
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent.parent
+MODELS_DIR = PROJECT_ROOT / "models"
+
+# Must match training/train_visual_trust_model.py
+CLASS_NAMES = ["low", "medium", "high"]
+IMAGE_SIZE = (224, 224)
+# Training images are hero screenshots; crop very tall captures to a hero-like aspect
+MAX_HERO_ASPECT = 0.75
+
+
+def _load_tflite_interpreter(path: str):
+    try:
+        from tflite_runtime.interpreter import Interpreter  # type: ignore[import-not-found]
+    except ImportError:
+        try:
+            from ai_edge_litert.interpreter import Interpreter  # type: ignore[import-not-found]
+        except ImportError:
+            try:
+                import tensorflow as tf  # type: ignore[import-not-found]
+
+                Interpreter = tf.lite.Interpreter
+            except ImportError:
+                return None
+    return Interpreter(model_path=path, num_threads=max(1, min(4, os.cpu_count() or 1)))
+
+
+def preprocess_for_model(image: Image.Image) -> np.ndarray:
+    """
+    RGB image -> float32 [224, 224, 3] in 0..255.
+
+    The Keras model embeds EfficientNet preprocess_input, so raw pixel values
+    are expected (same as image_dataset_from_directory during training).
+    """
+    img = image.convert("RGB")
+    w, h = img.size
+    if w > 0 and h > w * MAX_HERO_ASPECT * 2:
+        img = img.crop((0, 0, w, int(w * MAX_HERO_ASPECT)))
+    img = img.resize(IMAGE_SIZE, Image.BILINEAR)
+    return np.asarray(img, dtype=np.float32)
+
+
+class TrustModelRuntime:
+    """Batch predictor over an exported .tflite or .onnx visual trust model."""
+
+    def __init__(self, path: str | Path):
+        self.path = str(path)
+        self.backend = "onnx" if self.path.lower().endswith(".onnx") else "tflite"
+        self._lock = threading.Lock()
+        stat = os.stat(self.path)
+        self.fingerprint = hashlib.sha1(
+            f"{os.path.basename(self.path)}:{stat.st_size}:{int(stat.st_mtime)}".encode()
+        ).hexdigest()[:12]
+
+        if self.backend == "onnx":
+            import onnxruntime as ort  # type: ignore[import-not-found]
+
+            opts = ort.SessionOptions()
+            opts.intra_op_num_threads = max(1, min(4, os.cpu_count() or 1))
+            self._session = ort.InferenceSession(self.path, sess_options=opts, providers=["CPUExecutionProvider"])
+            self._input_name = self._session.get_inputs()[0].name
+        else:
+            self._interpreter = _load_tflite_interpreter(self.path)
+            if self._interpreter is None:
+                raise ImportError("No TFLite runtime installed (tflite-runtime / ai-edge-litert / tensorflow)")
+            self._interpreter.allocate_tensors()
+            self._input = self._interpreter.get_input_details()[0]
+            self._output = self._interpreter.get_output_details()[0]
+
+    def _predict_tflite(self, batch: np.ndarray) -> np.ndarray:
+        interp = self._interpreter
+        in_dtype = self._input["dtype"]
+        scale, zero_point = self._input.get("quantization", (0.0, 0))
+        if in_dtype in (np.int8, np.uint8) and scale:
+            batch = np.clip(np.round(batch / scale + zero_point), np.iinfo(in_dtype).min, np.iinfo(in_dtype).max)
+        batch = batch.astype(in_dtype)
+
+        if tuple(self._input["shape"]) != batch.shape:
+            interp.resize_tensor_input(self._input["index"], list(batch.shape))
+            interp.allocate_tensors()
+            self._input = interp.get_input_details()[0]
+            self._output = interp.get_output_details()[0]
+
+        interp.set_tensor(self._input["index"], batch)
+        interp.invoke()
+        out = interp.get_tensor(self._output["index"])
+        out_scale, out_zero = self._output.get("quantization", (0.0, 0))
+        if self._output["dtype"] in (np.int8, np.uint8) and out_scale:
+            out = (out.astype(np.float32) - out_zero) * out_scale
+        return out.astype(np.float32)
+
+    def predict(self, batch: np.ndarray) -> np.ndarray:
+        """[N, 224, 224, 3] float32 (0..255) -> [N, 3] class probabilities."""
+        batch = np.asarray(batch, dtype=np.float32)
+        if batch.ndim == 3:
+            batch = batch[None, ...]
+        with self._lock:
+            if self.backend == "onnx":
+                out = self._session.run(None, {self._input_name: batch})[0]
+            else:
+                out = self._predict_tflite(batch)
+        return np.asarray(out, dtype=np.float32)
+
+    def predict_images(self, images: List[Image.Image]) -> List[Dict[str, float]]:
+        batch = np.stack([preprocess_for_model(img) for img in images], axis=0)
+        probs = self.predict(batch)
+        return [{CLASS_NAMES[i]: float(row[i]) for i in range(len(CLASS_NAMES))} for row in probs]
+
+
+def find_model_artifact() -> Optional[Path]:
+    explicit = os.getenv("VISUAL_TRUST_MODEL_PATH")
+    if explicit:
+        p = Path(explicit)
+        return p if p.is_file() else None
+    if not MODELS_DIR.is_dir():
+        return None
+    for pattern in ("visual_trust_model*.tflite", "visual_trust_model*.onnx"):
+        matches = sorted(MODELS_DIR.glob(pattern))
+        if matches:
+            return matches[0]
+    return None
+
+
+_runtime: Optional[TrustModelRuntime] = None
+_runtime_checked = False
+_runtime_lock = threading.Lock()
+
+
+def get_trust_model() -> Optional[TrustModelRuntime]:
+    """Return the cached runtime, or None if disabled / no artifact / no runtime lib."""
+    global _runtime, _runtime_checked
+    if os.getenv("VISUAL_TRUST_MODEL_ENABLED", "true").lower() in ("0", "false", "no"):
+        return None
+    if _runtime_checked:
+        return _runtime
+    with _runtime_lock:
+        if not _runtime_checked:
+            path = find_model_artifact()
+            if path is not None:
+                try:
+                    _runtime = TrustModelRuntime(path)
+                    logger.info("Visual trust model loaded: %s (backend=%s)", path, _runtime.backend)
+                except Exception as exc:  # noqa: BLE001
+                    logger.warning("Visual trust model unavailable (%s): %s", path, exc)
+                    _runtime = None
+            _runtime_checked = True
+    return _runtime
+
+
+def trust_model_fingerprint() -> Optional[str]:
+    runtime = get_trust_model()
+    return runtime.fingerprint if runtime else None
+
+
+def predict_trust_distribution(image: Image.Image) -> Optional[Dict[str, float]]:
+    """Class probabilities for one image, or None when the learned model is unavailable."""
+    runtime = get_trust_model()
+    if runtime is None:
+        return None
+    try:
+        return runtime.predict_images([image])[0]
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("Visual trust model inference failed: %s", exc)
+        return None
@@ -8,7 +8,7 @@ import json
 import os
 from pathlib import Path
 from typing import Any, Dict
-from dotenv import load_dotenv
+from api.core.config import load_env
 
 from api.schemas.page_features import VisualFeatures
 
@@ -17,10 +17,7 @@ project_root = Path(__file__).parent.parent.parent
 env_file = project_root / ".env"
 
 # Load .env file if it exists
-if env_file.exists():
-    load_dotenv(env_file, override=True)
-else:
-    load_dotenv()
+load_env()
 
 OPENAI_MODEL = os.getenv("OPENAI_VISION_MODEL", "gpt-4o-mini")
 
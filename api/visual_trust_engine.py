@@ -5,6 +5,7 @@ import traceback
 from typing import Dict, Any
 
 from api.services.image_trust_service import analyze_image_trust_bytes
+from api.services.artifacts import read_artifact_bytes
 
 logger = logging.getLogger("visual_trust_engine")
 
@@ -204,11 +205,13 @@ def run_visual_trust_from_bytes(image_bytes: bytes) -> dict:
 
 
 async def analyze_visual_trust_from_path(image_path: str, timeout: int = 60) -> dict:
-    if not os.path.exists(image_path):
+    # Artifacts still queued by the write-behind queue are read from memory
+    try:
+        image_bytes = read_artifact_bytes(image_path)
+    except FileNotFoundError:
         return {"analysisStatus": "error", "error": f"image not found: {image_path}"}
     try:
-        with open(image_path, "rb") as f:
-            return run_visual_trust_from_bytes(f.read())
+        return run_visual_trust_from_bytes(image_bytes)
     except Exception as e:
         return {"analysisStatus": "error", "error": str(e)}
 
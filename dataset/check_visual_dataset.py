@@ -4,56 +4,48 @@ Small helper script to inspect the local visual trust dataset.
 Usage:
     python dataset/check_visual_dataset.py
 
-It scans dataset/images/ and counts how many image files exist in:
+It brings the dataset manifest (dataset/manifest.db, see
+api/services/dataset_manifest.py) up to date with dataset/images/ and
+reports how many images exist per label and split:
     - high_trust/
     - medium_trust/
     - low_trust/
 
-This does NOT modify any files or call external APIs.
+Only files that are new or changed since the last run are read, so repeated
+runs on a large dataset take a directory listing, not a full decode.
+
+This does NOT modify any image files or call external APIs.
 """
 
+import sys
 from pathlib import Path
 
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
-def count_images_in_folder(folder: Path) -> int:
-    """
-    Count image-like files in a folder.
-    This is a lightweight heuristic based on file extensions.
-    """
-    if not folder.exists():
-        return 0
-
-    image_exts = {".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"}
-    count = 0
-    for path in folder.iterdir():
-        if path.is_file() and path.suffix.lower() in image_exts:
-            count += 1
-    return count
+from api.services.dataset_manifest import LABEL_FOLDERS, dataset_manifest  # noqa: E402
 
 
 def main() -> None:
-    project_root = Path(__file__).resolve().parent.parent
-    dataset_root = project_root / "dataset" / "images"
+    dataset_root = PROJECT_ROOT / "dataset" / "images"
 
     # Ensure base folders exist (non-destructive: just mkdir if missing)
-    high_dir = dataset_root / "high_trust"
-    med_dir = dataset_root / "medium_trust"
-    low_dir = dataset_root / "low_trust"
-
-    for d in (dataset_root, high_dir, med_dir, low_dir):
+    for d in (dataset_root, *(dataset_root / folder for folder in LABEL_FOLDERS.values())):
         d.mkdir(parents=True, exist_ok=True)
 
-    high_count = count_images_in_folder(high_dir)
-    med_count = count_images_in_folder(med_dir)
-    low_count = count_images_in_folder(low_dir)
+    scan = dataset_manifest.scan()
+    summary = dataset_manifest.summary()
 
     print("Visual Trust Dataset Summary:")
-    print(f"  high_trust:   {high_count} images")
-    print(f"  medium_trust: {med_count} images")
-    print(f"  low_trust:    {low_count} images")
+    for label in ("high", "medium", "low"):
+        splits = summary["by_label"].get(label, {})
+        detail = ", ".join(f"{split}: {n}" for split, n in sorted(splits.items()))
+        name = f"{LABEL_FOLDERS[label]}:"
+        print(f"  {name:<14}{sum(splits.values())} images" + (f" ({detail})" if detail else ""))
+    print(f"  by status:    {summary['by_status']}")
+    print(f"  this scan:    {scan}")
 
 
 if __name__ == "__main__":
     main()
-
-
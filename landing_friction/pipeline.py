@@ -1,24 +1,50 @@
 """
 Landing friction dataset pipeline utilities shared between scripts and API endpoints.
+
+Builds are incremental. A SQLite manifest (dataset/manifest.db) records each
+sample file's size, mtime and sha256 together with its validation result and
+the validated sample:
+- files whose size and mtime are unchanged are not read at all; files whose
+  content hash is unchanged (touched, copied back) are not re-validated
+- changed files are validated in a process pool once there are at least
+  LANDING_FRICTION_POOL_MIN_FILES of them, serially otherwise
+- the dataset JSON and the fine-tune JSONL are streamed from the manifest
+  one sample at a time, and are not rewritten when no sample changed since
+  they were last written
+
+Config (env):
+- LANDING_FRICTION_WORKERS: validation processes (default: CPU count)
+- LANDING_FRICTION_POOL_MIN_FILES: changed files needed before the pool is
+  used (default: 200)
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import multiprocessing
+import os
+import textwrap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from dataclasses import asdict, dataclass
 from pathlib import Path
-from statistics import mean
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
 
-from openai import OpenAI
 from pydantic import ValidationError
 
+from api.core.config import get_env
+from api.memory.store import SQLiteStore
 from data.landing_friction.schema.landing_sample_schema import (
     Label,
     LandingFrictionSample,
 )
 
+if TYPE_CHECKING:
+    from openai import OpenAI
+
 LOGGER = logging.getLogger("landing_friction")
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
@@ -29,15 +55,43 @@ LABEL_DIRS: Dict[Label, Path] = {
     "high": DATA_ROOT / "high",
 }
 DATASET_PATH = DATA_ROOT / "dataset" / "landing_friction_dataset.json"
+MANIFEST_PATH = DATA_ROOT / "dataset" / "manifest.db"
 FINE_TUNE_JSONL_PATH = DATA_ROOT / "fine_tune" / "landing_friction_finetune.jsonl"
 FINE_TUNE_META_PATH = DATA_ROOT / "fine_tune" / "last_finetune_job.json"
 
+WORKERS = int(get_env("LANDING_FRICTION_WORKERS", str(os.cpu_count() or 1)))
+POOL_MIN_FILES = int(get_env("LANDING_FRICTION_POOL_MIN_FILES", "200"))
+WRITE_BATCH = 500
+
 SYSTEM_PROMPT = (
     "You are a cognitive friction analysis model. Given landing-page content, "
     "you must output a JSON object describing friction scores. "
     "Follow the existing CognitiveFrictionResult schema exactly."
 )
 
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    path TEXT PRIMARY KEY,
+    label TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    valid INTEGER NOT NULL,
+    error TEXT,
+    total_friction INTEGER,
+    sample_json TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_samples_label ON samples(label, path);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# One build at a time per process (the API runs builds as background jobs)
+_build_lock = threading.Lock()
+_stores: Dict[Path, SQLiteStore] = {}
+
 
 def ensure_directories() -> None:
     """Ensure all required landing friction directories exist."""
@@ -51,39 +105,195 @@ def ensure_directories() -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
-def _load_sample_file(path: Path, expected_label: Label) -> Optional[LandingFrictionSample]:
-    """Load and validate one sample file."""
+def _manifest_store() -> SQLiteStore:
+    store = _stores.get(MANIFEST_PATH)
+    if store is None:
+        store = _stores[MANIFEST_PATH] = SQLiteStore(MANIFEST_PATH, MANIFEST_SCHEMA)
+    return store
+
+
+def _get_meta(conn, key: str) -> Optional[str]:
+    row = conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+    return row["value"] if row else None
+
+
+def _set_meta(conn, key: str, value: Any) -> None:
+    conn.execute(
+        "INSERT INTO meta (key, value) VALUES (?, ?) "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, str(value)),
+    )
+
+
+def _manifest_key(path: Path) -> str:
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        sample = LandingFrictionSample.model_validate(payload)
-        if sample.label != expected_label:
-            LOGGER.warning(
-                "Label mismatch for %s: expected %s, found %s. Skipping.",
-                path,
-                expected_label,
-                sample.label,
-            )
-            return None
-        return sample
-    except (OSError, json.JSONDecodeError, ValidationError) as exc:
-        LOGGER.error("Invalid sample %s: %s", path, exc)
-        return None
+        return path.relative_to(DATA_ROOT).as_posix()
+    except ValueError:
+        return str(path)
 
 
-def _aggregate_samples() -> Tuple[List[LandingFrictionSample], List[str]]:
-    """Collect samples from label folders."""
-    ensure_directories()
-    samples: List[LandingFrictionSample] = []
-    invalid_files: List[str] = []
+def _validate_file(task: Tuple[str, Label, Optional[str]]) -> Dict[str, Any]:
+    """
+    Hash and validate one sample file (runs in pool workers, so it only uses
+    its arguments). Validation is skipped when the hash matches prev_sha.
+    """
+    path, expected_label, prev_sha = task
+    try:
+        raw = Path(path).read_bytes()
+    except OSError as exc:
+        return {"sha256": "", "valid": False, "error": str(exc)}
+    sha = hashlib.sha256(raw).hexdigest()
+    if sha == prev_sha:
+        return {"sha256": sha, "unchanged": True}
+    try:
+        sample = LandingFrictionSample.model_validate(json.loads(raw.decode("utf-8")))
+    except (UnicodeDecodeError, json.JSONDecodeError, ValidationError) as exc:
+        return {"sha256": sha, "valid": False, "error": str(exc)}
+    if sample.label != expected_label:
+        return {
+            "sha256": sha,
+            "valid": False,
+            "error": f"label mismatch: expected {expected_label}, found {sample.label}",
+        }
+    return {
+        "sha256": sha,
+        "valid": True,
+        "total_friction": sample.total_friction,
+        "sample_json": json.dumps(sample.model_dump(mode="json"), ensure_ascii=False),
+    }
+
+
+def _validate_all(tasks: List[Tuple[str, Label, Optional[str]]]) -> Iterator[Dict[str, Any]]:
+    """Results for tasks, in order."""
+    workers = min(WORKERS, len(tasks))
+    if workers > 1 and len(tasks) >= POOL_MIN_FILES:
+        # spawn, not fork: the API process has threads (jobs, write-behind)
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            yield from pool.map(_validate_file, tasks, chunksize=max(1, len(tasks) // (workers * 4)))
+    else:
+        for task in tasks:
+            yield _validate_file(task)
 
+
+def _scan_label_dirs() -> Iterator[Tuple[Label, Path, os.stat_result]]:
     for label, folder in LABEL_DIRS.items():
-        for path in sorted(folder.glob("*.json")):
-            sample = _load_sample_file(path, label)
-            if sample:
-                samples.append(sample)
-            else:
-                invalid_files.append(str(path))
-    return samples, invalid_files
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and entry.is_file():
+                    yield label, Path(entry.path), entry.stat()
+
+
+def _sync_manifest(full: bool = False) -> Dict[str, int]:
+    """
+    Bring the manifest up to date with the label folders. Returns counts of
+    files seen, validated, re-hashed without changes, and removed.
+    """
+    ensure_directories()
+    store = _manifest_store()
+    conn = store.connection()
+    known = {
+        row["path"]: row
+        for row in conn.execute("SELECT path, size, mtime_ns, sha256 FROM samples")
+    }
+
+    seen = set()
+    pending: List[Tuple[str, Label, int, int]] = []
+    tasks: List[Tuple[str, Label, Optional[str]]] = []
+    for label, path, stat in _scan_label_dirs():
+        key = _manifest_key(path)
+        seen.add(key)
+        row = known.get(key)
+        if not full and row is not None and (row["size"], row["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+            continue
+        pending.append((key, label, stat.st_size, stat.st_mtime_ns))
+        tasks.append((str(path), label, None if full or row is None else row["sha256"]))
+    removed = [key for key in known if key not in seen]
+
+    stats = {"seen": len(seen), "validated": 0, "unchanged": 0, "removed": len(removed)}
+    batch: List[Tuple[Tuple[str, Label, int, int], Dict[str, Any]]] = []
+    for item, result in zip(pending, _validate_all(tasks)):
+        if result.get("unchanged"):
+            stats["unchanged"] += 1
+        else:
+            stats["validated"] += 1
+            if not result["valid"]:
+                LOGGER.error("Invalid sample %s: %s", DATA_ROOT / item[0], result["error"])
+        batch.append((item, result))
+        if len(batch) >= WRITE_BATCH:
+            _write_manifest_rows(store, batch, [])
+            batch = []
+    _write_manifest_rows(store, batch, removed)
+    return stats
+
+
+def _write_manifest_rows(
+    store: SQLiteStore,
+    batch: List[Tuple[Tuple[str, Label, int, int], Dict[str, Any]]],
+    removed: List[str],
+) -> None:
+    """Apply validation results and removals; bumps the generation if any sample changed."""
+    changed = bool(removed)
+    with store.transaction() as tx:
+        for (key, label, size, mtime_ns), result in batch:
+            if result.get("unchanged"):
+                tx.execute("UPDATE samples SET size = ?, mtime_ns = ? WHERE path = ?", (size, mtime_ns, key))
+                continue
+            changed = True
+            tx.execute(
+                "INSERT OR REPLACE INTO samples "
+                "(path, label, size, mtime_ns, sha256, valid, error, total_friction, sample_json) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    label,
+                    size,
+                    mtime_ns,
+                    result["sha256"],
+                    int(result["valid"]),
+                    result.get("error"),
+                    result.get("total_friction"),
+                    result.get("sample_json"),
+                ),
+            )
+        tx.executemany("DELETE FROM samples WHERE path = ?", [(key,) for key in removed])
+        generation = _get_meta(tx, "generation")
+        if changed or generation is None:
+            _set_meta(tx, "generation", int(generation or 0) + 1)
+
+
+def _iter_valid_samples(conn) -> Iterator[Dict[str, Any]]:
+    """Valid samples in label-folder order, then by path (one row in memory at a time)."""
+    for label in LABEL_DIRS:
+        cursor = conn.execute(
+            "SELECT sample_json FROM samples WHERE label = ? AND valid = 1 ORDER BY path", (label,)
+        )
+        for row in cursor:
+            yield json.loads(row["sample_json"])
+
+
+@contextmanager
+def _atomic_text(path: Path) -> Iterator[TextIO]:
+    """Write path through a temporary file, replacing it only when writing succeeds."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with tmp.open("w", encoding="utf-8") as fp:
+            yield fp
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _write_json_array(fp: TextIO, items: Iterable[Dict[str, Any]]) -> int:
+    """Stream items as the same text json.dump(list(items), fp, indent=2) would write."""
+    count = 0
+    for item in items:
+        fp.write(",\n" if count else "[\n")
+        fp.write(textwrap.indent(json.dumps(item, indent=2), "  "))
+        count += 1
+    fp.write("\n]" if count else "[]")
+    return count
 
 
 @dataclass
@@ -93,42 +303,70 @@ class DatasetBuildResult:
     average_total_friction: Dict[str, float]
     output_path: str
     invalid_files: List[str]
+    validated_files: int = 0
+    up_to_date: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         return asdict(self)
 
 
-def build_landing_friction_dataset() -> DatasetBuildResult:
-    """Merge labeled samples into a single dataset JSON."""
-    samples, invalid_files = _aggregate_samples()
-    counts: Dict[str, int] = {label: 0 for label in LABEL_DIRS}
-    totals: Dict[str, List[int]] = {label: [] for label in LABEL_DIRS}
+def build_landing_friction_dataset(full: bool = False) -> DatasetBuildResult:
+    """
+    Merge labeled samples into a single dataset JSON. Only new or changed
+    sample files are validated; full=True re-validates every file and
+    rewrites the dataset.
+    """
+    with _build_lock:
+        return _build_dataset(full)
 
-    for sample in samples:
-        counts[sample.label] += 1
-        totals[sample.label].append(sample.total_friction)
 
-    averages: Dict[str, float] = {
-        label: round(mean(values), 2) if values else 0.0 for label, values in totals.items()
-    }
+def _build_dataset(full: bool) -> DatasetBuildResult:
+    sync = _sync_manifest(full=full)
+    conn = _manifest_store().connection()
 
-    DATASET_PATH.parent.mkdir(parents=True, exist_ok=True)
-    with DATASET_PATH.open("w", encoding="utf-8") as fp:
-        json.dump([sample.model_dump(mode="json") for sample in samples], fp, indent=2)
+    counts: Dict[str, int] = {label: 0 for label in LABEL_DIRS}
+    averages: Dict[str, float] = {label: 0.0 for label in LABEL_DIRS}
+    for row in conn.execute(
+        "SELECT label, COUNT(*) AS n, AVG(total_friction) AS average "
+        "FROM samples WHERE valid = 1 GROUP BY label"
+    ):
+        if row["label"] in counts:
+            counts[row["label"]] = row["n"]
+            averages[row["label"]] = round(row["average"], 2)
+    invalid_files = [
+        str(DATA_ROOT / row["path"])
+        for row in conn.execute("SELECT path FROM samples WHERE valid = 0 ORDER BY label, path")
+    ]
+
+    generation = _get_meta(conn, "generation")
+    up_to_date = (
+        not full
+        and DATASET_PATH.exists()
+        and _get_meta(conn, "dataset_generation") == generation
+    )
+    if not up_to_date:
+        with _atomic_text(DATASET_PATH) as fp:
+            _write_json_array(fp, _iter_valid_samples(conn))
+        with _manifest_store().transaction() as tx:
+            _set_meta(tx, "dataset_generation", generation)
 
     LOGGER.info(
-        "Landing friction dataset built: %s (samples=%s, invalid=%s)",
+        "Landing friction dataset %s: %s (samples=%s, invalid=%s, validated=%s)",
+        "up to date" if up_to_date else "built",
         DATASET_PATH,
-        len(samples),
+        sum(counts.values()),
         len(invalid_files),
+        sync["validated"],
     )
 
     return DatasetBuildResult(
-        total_samples=len(samples),
+        total_samples=sum(counts.values()),
         counts_by_label=counts,
         average_total_friction=averages,
         output_path=str(DATASET_PATH),
         invalid_files=invalid_files,
+        validated_files=sync["validated"],
+        up_to_date=up_to_date,
     )
 
 
@@ -137,6 +375,7 @@ class FineTunePreparationResult:
     dataset_examples: int
     output_path: str
     dataset_summary: Optional[DatasetBuildResult] = None
+    up_to_date: bool = False
 
     def to_dict(self) -> Dict[str, Any]:
         payload = asdict(self)
@@ -145,75 +384,85 @@ class FineTunePreparationResult:
         return payload
 
 
-def _load_dataset_records() -> List[LandingFrictionSample]:
-    if not DATASET_PATH.exists():
-        raise FileNotFoundError(
-            "Dataset file missing. Build the dataset before preparing fine-tune data."
-        )
-    data = json.loads(DATASET_PATH.read_text(encoding="utf-8"))
-    return [LandingFrictionSample.model_validate(obj) for obj in data]
-
-
-def _build_assistant_payload(sample: LandingFrictionSample) -> Dict[str, Any]:
-    if sample.expected_result:
-        return sample.expected_result
+def _build_assistant_payload(sample: Dict[str, Any]) -> Dict[str, Any]:
+    if sample.get("expected_result"):
+        return sample["expected_result"]
     return {
-        "total_friction": sample.total_friction,
-        "dimensions": sample.dimensions.model_dump(),
-        "analysis": sample.analysis,
-        "quick_fixes": sample.quick_fixes,
-        "rewrite_examples": sample.rewrite_examples,
+        "total_friction": sample["total_friction"],
+        "dimensions": sample["dimensions"],
+        "analysis": sample["analysis"],
+        "quick_fixes": sample["quick_fixes"],
+        "rewrite_examples": sample["rewrite_examples"],
     }
 
 
-def prepare_landing_friction_finetune(force_rebuild: bool = False) -> FineTunePreparationResult:
-    """Create OpenAI fine-tune JSONL file."""
-    dataset_summary: Optional[DatasetBuildResult] = None
-    if force_rebuild or not DATASET_PATH.exists():
-        dataset_summary = build_landing_friction_dataset()
-
-    samples = _load_dataset_records()
-    FINE_TUNE_JSONL_PATH.parent.mkdir(parents=True, exist_ok=True)
-
+def _finetune_record(sample: Dict[str, Any]) -> Dict[str, Any]:
     user_template = (
         "Sample ID: {id}\n"
         "Label: {label}\n"
         "{url_section}"
         "Landing Page Content:\n{content}"
     )
+    url_section = f"URL: {sample['url']}\n" if sample.get("url") else ""
+    user_message = user_template.format(
+        id=sample["id"],
+        label=sample["label"],
+        url_section=url_section,
+        content=sample["content"],
+    )
+    assistant_payload = _build_assistant_payload(sample)
+    return {
+        "messages": [
+            {"role": "system", "content": SYSTEM_PROMPT},
+            {"role": "user", "content": user_message},
+            {
+                "role": "assistant",
+                "content": json.dumps(assistant_payload, ensure_ascii=False),
+            },
+        ]
+    }
 
-    with FINE_TUNE_JSONL_PATH.open("w", encoding="utf-8") as fp:
-        for sample in samples:
-            url_section = f"URL: {sample.url}\n" if sample.url else ""
-            user_message = user_template.format(
-                id=sample.id,
-                label=sample.label,
-                url_section=url_section,
-                content=sample.content,
-            )
-            assistant_payload = _build_assistant_payload(sample)
-            record = {
-                "messages": [
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": user_message},
-                    {
-                        "role": "assistant",
-                        "content": json.dumps(assistant_payload, ensure_ascii=False),
-                    },
-                ]
-            }
-            fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+def prepare_landing_friction_finetune(force_rebuild: bool = False) -> FineTunePreparationResult:
+    """
+    Create OpenAI fine-tune JSONL file from the samples of the last dataset
+    build (built first if missing; force_rebuild=True rebuilds it in full).
+    """
+    with _build_lock:
+        dataset_summary: Optional[DatasetBuildResult] = None
+        conn = _manifest_store().connection()
+        # A dataset written before the manifest existed has nothing to stream from
+        if force_rebuild or not DATASET_PATH.exists() or _get_meta(conn, "dataset_generation") is None:
+            dataset_summary = _build_dataset(full=force_rebuild)
+
+        generation = _get_meta(conn, "dataset_generation")
+        up_to_date = (
+            not force_rebuild
+            and FINE_TUNE_JSONL_PATH.exists()
+            and _get_meta(conn, "finetune_generation") == generation
+        )
+        examples = conn.execute("SELECT COUNT(*) FROM samples WHERE valid = 1").fetchone()[0]
+        if not up_to_date:
+            examples = 0
+            with _atomic_text(FINE_TUNE_JSONL_PATH) as fp:
+                for sample in _iter_valid_samples(conn):
+                    fp.write(json.dumps(_finetune_record(sample), ensure_ascii=False) + "\n")
+                    examples += 1
+            with _manifest_store().transaction() as tx:
+                _set_meta(tx, "finetune_generation", generation)
 
     LOGGER.info(
-        "Prepared fine-tune JSONL: %s (examples=%s)",
+        "Prepared fine-tune JSONL%s: %s (examples=%s)",
+        " (up to date)" if up_to_date else "",
         FINE_TUNE_JSONL_PATH,
-        len(samples),
+        examples,
     )
 
     return FineTunePreparationResult(
-        dataset_examples=len(samples),
+        dataset_examples=examples,
         output_path=str(FINE_TUNE_JSONL_PATH),
         dataset_summary=dataset_summary,
+        up_to_date=up_to_date,
     )
 
 
@@ -231,6 +480,8 @@ class FineTuneJobInfo:
 
 def _get_client() -> OpenAI:
     """Instantiate OpenAI client using environment configuration."""
+    from openai import OpenAI
+
     return OpenAI()
 
 
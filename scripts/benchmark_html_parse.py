@@ -0,0 +1,119 @@
+"""
+Benchmark: repeated BeautifulSoup parses vs. one shared ParsedDocument.
+
+"before" replays what the URL pipeline used to do with one page: parse in
+page_extract (lxml), analyze_url.extract_text (lxml), decision_engine
+(lxml), decision_snapshot_extractor (html.parser) and pricing_signals
+(html.parser, twice). "after" runs the same extractors on one ParsedDocument
+inside a document_scope(), as a request does.
+
+retained is what is still allocated once the analysis returns (the documents
+live only as long as their scope, so it should stay near zero).
+
+Usage:
+    python scripts/benchmark_html_parse.py [page.html] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def _synthetic_page(sections: int = 120) -> str:
+    blocks = []
+    for i in range(sections):
+        blocks.append(
+            f"<section class='block pricing-plan'><h2>Section {i}</h2>"
+            f"<p>Trusted by {i * 10} teams. Cancel anytime, money back guarantee.</p>"
+            f"<div class='price'>${i + 9}/month</div>"
+            f"<a class='btn btn-primary' href='/signup/{i}'>Get started</a>"
+            f"<form><input name='email'><input type='submit' value='Join'></form></section>"
+        )
+    return (
+        "<html><head><title>Bench</title><meta name='description' content='bench page'>"
+        "<script>var x = 1;</script></head><body><header><nav><a href='/'>Home</a></nav>"
+        "<h1>Benchmark landing page</h1></header>"
+        + "".join(blocks)
+        + "<footer>Privacy - Terms</footer></body></html>"
+    )
+
+
+def _before(html: str) -> None:
+    from bs4 import BeautifulSoup
+
+    BeautifulSoup(html, "lxml").select("a,button,input[type='submit'],input[type='button']")
+    BeautifulSoup(html, "lxml").get_text("\n", strip=True)
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(["script", "style", "nav", "footer", "header"]):
+        tag.decompose()
+    soup.get_text(separator="\n", strip=True)
+    snap = BeautifulSoup(html, "html.parser")
+    snap.select('[class*="price"]')
+    snap.get_text()
+    BeautifulSoup(html, "html.parser").select('[class*="plan"]')
+    BeautifulSoup(html, "html.parser").get_text()
+
+
+def _after(html: str) -> None:
+    from api.brain.evidence.pricing_signals import extract_pricing_signals
+    from api.decision_engine import _extract_content_from_html
+    from api.routes.analyze_url import extract_text
+    from api.services.page_extract import extract_page_map
+    from api.utils.html_document import document_scope, parse_document
+
+    with document_scope():
+        doc = parse_document(html)
+        extract_page_map({"dom": {"html_excerpt": html}})
+        extract_text(doc)
+        _extract_content_from_html(doc)
+        doc.select('[class*="price"]')
+        _ = doc.text
+        extract_pricing_signals(html=doc)
+
+
+def _measure(fn, html: str, repeat: int):
+    fn(html)  # warm imports
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        timings.append(time.perf_counter() - t0)
+    gc.collect()
+    tracemalloc.start()
+    fn(html)
+    gc.collect()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak, retained
+
+
+def main() -> None:
+    _prepare_import_path()
+    parser = argparse.ArgumentParser(description="Benchmark HTML parse-once document model.")
+    parser.add_argument("html_file", nargs="?", help="HTML file to parse (default: synthetic page)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    html = Path(args.html_file).read_text(encoding="utf-8", errors="replace") if args.html_file else _synthetic_page()
+    print(f"HTML size: {len(html) / 1024:.1f} KB")
+    for name, fn in (("before (6 parses)", _before), ("after (1 parse)", _after)):
+        best, peak, retained = _measure(fn, html, args.repeat)
+        print(
+            f"{name:<20} best={best * 1000:8.1f} ms  peak_alloc={peak / 1024 / 1024:6.2f} MB"
+            f"  retained={retained / 1024 / 1024:6.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Benchmark: FastAPI's default JSON rendering vs. the orjson response path.
+
+"before" is what FastAPI did for an untyped endpoint result: jsonable_encoder
+over the whole payload, then JSONResponse.render (json.dumps). "after" is
+FastJSONResponse.render on the raw payload, which is what FastJSONRoute does.
+Payloads mimic each heavy endpoint: an analyze-url report with a base64
+screenshot, the psychology-with-image dict, and reports that embed the
+CognitiveFrictionResult / PsychologyAnalysisResult / HumanReportV1 models.
+
+Usage:
+    python scripts/benchmark_json_response.py [--repeat 20] [--screenshot-kb 600]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def _payloads(screenshot_kb: int) -> dict:
+    from api.cognitive_friction_engine import CognitiveFrictionResult
+    from api.psychology_engine import PsychologyAnalysisInput, _create_fallback_result
+    from api.schemas.human_report_v1 import HumanReportV1
+
+    screenshot = base64.b64encode(os.urandom(screenshot_kb * 768)).decode("ascii")
+    issues = [
+        {"id": f"issue_{i}", "problem": "Primary CTA competes with secondary links",
+         "severity": "high", "evidence": [{"selector": f"#cta-{i}", "bbox": [10, 20 * i, 200, 48], "score": 0.42}]}
+        for i in range(60)
+    ]
+    page_map = {"headlines": [{"tag": "h2", "text": f"Section {i}"} for i in range(120)],
+                "ctas": [{"label": "Get started", "href": f"/signup/{i}"} for i in range(40)]}
+    friction = CognitiveFrictionResult(
+        frictionScore=41.5, trustScore=62.0, emotionalClarityScore=55.0, motivationMatchScore=48.0,
+        decisionProbability=0.37, conversionLiftEstimate=12.5, explanationSummary="Too many competing actions.",
+    )
+    psychology = _create_fallback_result(PsychologyAnalysisInput(raw_text="Start your free trial today"), "benchmark")
+    human = HumanReportV1(url="https://example.com", verdict="needs_work", decision_probability=0.37,
+                          public_summary="Clarify the primary action.")
+    return {
+        "analyze-url": {"status": "ok", "issues": issues, "page_map": page_map,
+                        "screenshots": {"desktop": {"above_the_fold_data_url": "data:image/png;base64," + screenshot}}},
+        "psychology-analysis-with-image": {**psychology.model_dump(), "visual_trust": {"score": 0.61, "elements": issues}},
+        "cognitive-friction (embedded)": {"result": friction, "issues": issues},
+        "psychology-analysis (embedded)": {"result": psychology, "page_map": page_map},
+        "human-report (embedded)": {"report": human, "issues": issues},
+    }
+
+
+def _best(fn, payload, repeat: int) -> float:
+    fn(payload)
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(payload)
+        timings.append(time.perf_counter() - t0)
+    return min(timings)
+
+
+def main() -> None:
+    _prepare_import_path()
+    parser = argparse.ArgumentParser(description="Benchmark JSON response rendering per endpoint.")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--screenshot-kb", type=int, default=600, help="size of the base64 screenshot")
+    args = parser.parse_args()
+
+    from fastapi.encoders import jsonable_encoder
+    from fastapi.responses import JSONResponse
+
+    from api.cognitive_friction_engine import CognitiveFrictionResult
+    from api.core.json_response import HAS_ORJSON, FastJSONResponse, register_fast_model
+    from api.psychology_engine import PsychologyAnalysisResult
+    from api.schemas.human_report_v1 import HumanReportV1
+
+    register_fast_model(CognitiveFrictionResult, PsychologyAnalysisResult, HumanReportV1)
+
+    def before(payload):
+        return JSONResponse(jsonable_encoder(payload))
+
+    def after(payload):
+        return FastJSONResponse(payload)
+
+    print(f"orjson: {HAS_ORJSON}")
+    for name, payload in _payloads(args.screenshot_kb).items():
+        size = len(after(payload).body)
+        t_before = _best(before, payload, args.repeat)
+        t_after = _best(after, payload, args.repeat)
+        print(f"{name:<34} {size / 1024:8.1f} KB  before={t_before * 1000:7.2f} ms  "
+              f"after={t_after * 1000:7.2f} ms  x{t_before / t_after:5.1f}")
+
+
+if __name__ == "__main__":
+    main()
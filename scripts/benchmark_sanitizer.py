@@ -0,0 +1,127 @@
+"""
+Benchmark: one walk per sanitization concern vs. the single-pass sanitizer.
+
+"before" replays what analyze_human used to do with a report: deep_fix_strings
+and the Persian scrubber over debug (two full rebuilds), then the english_only
+walk over the response (a key path joined and a regex search for every
+string). "after" runs the same steps through ResponseSanitizer.
+
+Usage:
+    python scripts/benchmark_sanitizer.py [--issues 400] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+_NON_EN_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]")
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def _synthetic_report(issues: int) -> tuple:
+    response = {
+        "summary": {"goal": "leads", "headline": "Grow revenue with fewer clicks", "score": 71},
+        "issues": [
+            {
+                "id": f"issue_{i}",
+                "problem": "Primary CTA competes with secondary links" if i % 25 else "متن فارسی",
+                "why_it_hurts": "Visitors hesitate before committing",
+                "evidence": [{"selector": f"#cta-{i}", "text": "Get started", "score": 0.4 + i % 5 / 10}],
+            }
+            for i in range(issues)
+        ],
+        "quick_wins": [{"action": "Shorten the form", "reason": "Fewer fields convert better"}] * (issues // 4),
+    }
+    debug = {
+        "page_map": {"headlines": [{"tag": "h2", "text": f"Section {i}"} for i in range(issues)]},
+        "after_heuristics": {"quick_wins": ["cafÃ© menu" if i % 10 == 0 else "Add trust badge" for i in range(issues)]},
+    }
+    return response, debug
+
+
+def _before(response: dict, debug: dict) -> None:
+    from api.utils.english_only import sanitize_string
+    from api.utils.output_sanitize import fix_mojibake
+
+    def deep_fix(obj):
+        if isinstance(obj, str):
+            return fix_mojibake(obj)
+        if isinstance(obj, list):
+            return [deep_fix(x) for x in obj]
+        if isinstance(obj, dict):
+            return {k: deep_fix(v) for k, v in obj.items()}
+        return obj
+
+    def scrub(obj):
+        if isinstance(obj, str):
+            return "Analysis completed." if _NON_EN_RE.search(obj) else obj
+        if isinstance(obj, list):
+            return [scrub(x) for x in obj]
+        if isinstance(obj, dict):
+            return {k: scrub(v) for k, v in obj.items()}
+        return obj
+
+    def english(value, key_path=""):
+        if isinstance(value, str):
+            context = "issue" if "issue" in key_path.lower() else "content"
+            return sanitize_string(value, context=context)[0]
+        if isinstance(value, list):
+            return [english(x, key_path) for x in value]
+        if isinstance(value, dict):
+            return {k: english(v, f"{key_path}.{k}" if key_path else k) for k, v in value.items()}
+        return value
+
+    scrub(deep_fix(debug))
+    english(response)
+
+
+def _after(response: dict, debug: dict) -> None:
+    from api.routes.analyze_human import _DEBUG_SANITIZER
+    from api.utils.english_only import enforce_english_only
+
+    _DEBUG_SANITIZER.sanitize(debug)
+    enforce_english_only(response)
+
+
+def _measure(fn, payload: tuple, repeat: int):
+    fn(*payload)  # warm imports
+    timings = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*payload)
+        timings.append(time.perf_counter() - t0)
+    tracemalloc.start()
+    fn(*payload)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main() -> None:
+    _prepare_import_path()
+    parser = argparse.ArgumentParser(description="Benchmark the single-pass response sanitizer.")
+    parser.add_argument("--issues", type=int, default=400, help="issues in the synthetic report")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    import logging
+
+    logging.disable(logging.WARNING)  # rewrites log one warning per Persian string
+    payload = _synthetic_report(args.issues)
+    for name, fn in (("before (3 walks)", _before), ("after (2 walks, COW)", _after)):
+        best, peak = _measure(fn, payload, args.repeat)
+        print(f"{name:<22} best={best * 1000:8.2f} ms  peak_alloc={peak / 1024 / 1024:6.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
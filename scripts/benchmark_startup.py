@@ -0,0 +1,96 @@
+"""
+Benchmark: API cold start (import of api.main) and time until ready.
+
+Runs `python -X importtime -c "import api.main"` in fresh interpreters and
+reports the best wall time, the slowest modules by cumulative import time,
+and how long the startup warm-up (lazy routers, models, browser, caches; see
+api/core/warmup.py) takes after import. With --report the raw importtime
+profile of the best run is written to a file, for diffing before/after a
+change.
+
+Usage:
+    python scripts/benchmark_startup.py [--repeat 5] [--top 25] [--report importtime.txt]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+_LINE_RE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_READY_SNIPPET = """
+import asyncio, time
+t0 = time.perf_counter()
+import api.main as m
+t1 = time.perf_counter()
+asyncio.run(m.warmup.run())
+t2 = time.perf_counter()
+print(f"@@ {t1 - t0:.4f} {t2 - t1:.4f}")
+"""
+
+
+def _repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def _run(args: list) -> subprocess.CompletedProcess:
+    env = dict(os.environ, PYTHONPATH=str(_repo_root()))
+    return subprocess.run(
+        [sys.executable, *args], cwd=_repo_root(), env=env, capture_output=True, text=True
+    )
+
+
+def _parse_importtime(stderr: str) -> list:
+    """(cumulative_us, self_us, depth, module) per imported module."""
+    rows = []
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            rows.append((int(cumulative_us), int(self_us), (len(indent) - 1) // 2, module))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark API cold start.")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=25, help="slowest modules to list")
+    parser.add_argument("--report", help="write the raw -X importtime output here")
+    args = parser.parse_args()
+
+    best_import, best_ready, profile, stderr = None, None, [], ""
+    for _ in range(args.repeat):
+        proc = _run(["-X", "importtime", "-c", "import api.main"])
+        if proc.returncode != 0:
+            sys.exit(proc.stderr[-2000:])
+        rows = _parse_importtime(proc.stderr)
+        total = next((r[0] for r in rows if r[3] == "api.main"), 0)
+        if best_import is None or total < best_import:
+            best_import, profile, stderr = total, rows, proc.stderr
+
+        ready = _run(["-c", _READY_SNIPPET])
+        match = re.search(r"@@ ([\d.]+) ([\d.]+)", ready.stdout)
+        if match:
+            warm = float(match.group(2))
+            best_ready = warm if best_ready is None else min(best_ready, warm)
+
+    print(f"import api.main (best of {args.repeat}): {best_import / 1000:8.1f} ms")
+    if best_ready is not None:
+        print(f"warm-up until /ready:                  {best_ready * 1000:8.1f} ms")
+    print(f"\nslowest direct imports of api.main (cumulative):")
+    direct = sorted((r for r in profile if r[2] == 1), reverse=True)[:args.top]
+    for cumulative_us, self_us, _, module in direct:
+        print(f"  {cumulative_us / 1000:8.1f} ms  (self {self_us / 1000:6.1f} ms)  {module}")
+
+    if args.report:
+        Path(args.report).write_text(stderr, encoding="utf-8")
+        print(f"\nimporttime profile written to {args.report}")
+
+
+if __name__ == "__main__":
+    main()
@@ -15,13 +15,13 @@ def _prepare_import_path() -> None:
         sys.path.insert(0, str(repo_root))
 
 
-def main() -> None:
+def main(full: bool = False) -> None:
     _prepare_import_path()
     from landing_friction.pipeline import build_landing_friction_dataset
 
-    result = build_landing_friction_dataset()
-    print("✅ Landing friction dataset built")
-    print(f"Total samples: {result.total_samples}")
+    result = build_landing_friction_dataset(full=full)
+    print("✅ Landing friction dataset " + ("up to date" if result.up_to_date else "built"))
+    print(f"Total samples: {result.total_samples} (validated this run: {result.validated_files})")
     print("Counts by label:")
     for label, count in result.counts_by_label.items():
         print(f"  - {label}: {count}")
@@ -37,8 +37,13 @@ def main() -> None:
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Build landing friction dataset.")
-    _ = parser.parse_args()
-    main()
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Re-validate every sample file instead of only new or changed ones.",
+    )
+    args = parser.parse_args()
+    main(full=args.full)
 
 
 
@@ -0,0 +1,82 @@
+"""
+Bulk URL classifier.
+
+Reads URLs (one per line) or JSONL records ({"url": ..., "page_text": ...,
+"page_map": {...}}) and writes one JSONL line per input with the URL facts
+from the URL index (domain tags, channel, high-trust flag, URL flags). Records
+that carry page text also get the full context (intent, brand, page type) from
+build_context, which uses the same cache as the API.
+
+Usage:
+    python scripts/classify_urls.py urls.txt [-o facts.jsonl]
+    cat pages.jsonl | python scripts/classify_urls.py - --stats
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def _records(lines):
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        if line.startswith("{"):
+            yield json.loads(line)
+        else:
+            yield {"url": line}
+
+
+def main() -> None:
+    _prepare_import_path()
+    parser = argparse.ArgumentParser(description="Classify URLs in bulk with the URL index.")
+    parser.add_argument("input", help="URL list or JSONL file ('-' for stdin)")
+    parser.add_argument("-o", "--output", help="output JSONL file (default: stdout)")
+    parser.add_argument("--stats", action="store_true", help="print cache statistics to stderr")
+    args = parser.parse_args()
+
+    from api.brain.context.brand_context import build_context
+    from api.brain.context.url_index import get_url_index
+
+    index = get_url_index()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    sink = sys.stdout if not args.output else open(args.output, "w", encoding="utf-8")
+    count = 0
+    t0 = time.perf_counter()
+    try:
+        for record in _records(source):
+            url = record.get("url") or ""
+            row = index.classify(url).to_dict()
+            if record.get("page_text"):
+                row["context"] = build_context(url, record["page_text"], record.get("page_map"))
+            sink.write(json.dumps(row, ensure_ascii=False, default=str) + "\n")
+            count += 1
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    if args.stats:
+        elapsed = time.perf_counter() - t0
+        print(
+            f"{count} records in {elapsed * 1000:.1f} ms; "
+            f"domain cache {index.domains.hits}/{index.domains.hits + index.domains.misses} hits, "
+            f"context cache {index.contexts.hits}/{index.contexts.hits + index.contexts.misses} hits",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Visual trust dataset manifest tools.
+
+scan re-validates dataset/images/ incrementally; summary prints counts per
+label / split / status; export writes training shards per split.
+
+Usage:
+    python scripts/dataset_manifest.py scan
+    python scripts/dataset_manifest.py summary
+    python scripts/dataset_manifest.py export --out dataset/shards [--format npz|tfrecord] [--shard-size 1024]
+    python training/train_visual_trust_model.py --shards dataset/shards
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Visual trust dataset manifest tools.")
+    parser.add_argument("--root", help="dataset directory (default: dataset/)")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("scan", help="index new / changed images, mark vanished ones missing")
+    sub.add_parser("summary", help="counts per label, split and status")
+
+    export = sub.add_parser("export", help="write sharded training files per split")
+    export.add_argument("--out", required=True, help="output directory (one subdirectory per split)")
+    export.add_argument("--format", choices=["npz", "tfrecord"], default="npz")
+    export.add_argument("--shard-size", type=int, default=1024)
+    export.add_argument("--image-size", type=int, nargs=2, default=[224, 224], metavar=("HEIGHT", "WIDTH"))
+    export.add_argument("--splits", nargs="+", default=["train", "val", "test"])
+    export.add_argument("--no-scan", action="store_true", help="export the manifest as is")
+    args = parser.parse_args()
+
+    _prepare_import_path()
+    from api.services.dataset_manifest import DatasetManifest, dataset_manifest
+
+    manifest = DatasetManifest(root=args.root) if args.root else dataset_manifest
+    if args.command == "scan":
+        result = manifest.scan()
+    elif args.command == "summary":
+        result = manifest.summary()
+    else:
+        result = {"scan": None if args.no_scan else manifest.scan()}
+        for split in args.splits:
+            index = manifest.export_shards(
+                args.out, split, fmt=args.format, shard_size=args.shard_size, image_size=tuple(args.image_size)
+            )
+            result[split] = {"count": index["count"], "shards": len(index["shards"]), "skipped": index["skipped"]}
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
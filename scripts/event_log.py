@@ -0,0 +1,66 @@
+"""
+Analysis event log maintenance and reports.
+
+compact folds finished days into columnar partitions (run daily, e.g. from
+cron); report prints vectorized aggregations over the log.
+
+Usage:
+    python scripts/event_log.py compact [--until-day 2026-01-31]
+    python scripts/event_log.py report [--days 30] [--field blocker] [--by page_type] [--top 5]
+    python scripts/event_log.py report --issues --by page_type
+    python scripts/event_log.py report --scores --by domain
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+
+
+def _prepare_import_path() -> None:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Analysis event log tools.")
+    parser.add_argument("--root", help="event log directory (default: EVENT_LOG_DIR)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    compact = sub.add_parser("compact", help="fold finished days into columnar partitions")
+    compact.add_argument("--until-day", help="compact days before this YYYY-MM-DD (default: today, UTC)")
+
+    report = sub.add_parser("report", help="aggregate events")
+    report.add_argument("--days", type=int, help="only the last N days")
+    report.add_argument("--field", default="blocker", choices=["blocker", "page_type", "domain", "source"])
+    report.add_argument("--by", choices=["page_type", "domain", "source", "blocker"])
+    report.add_argument("--issues", action="store_true", help="count issue ids instead of --field")
+    report.add_argument("--scores", action="store_true", help="score statistics instead of counts")
+    report.add_argument("--source", help="only events from this source (analysis, decision_engine)")
+    report.add_argument("--page-type", help="only events with this page_type")
+    report.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    _prepare_import_path()
+    from api.memory.event_log import AnalysisEventLog, event_log
+
+    log = AnalysisEventLog(root=args.root) if args.root else event_log
+    if args.command == "compact":
+        result = log.compact(until_day=args.until_day)
+    else:
+        query = log.query(days=args.days).filter(source=args.source, page_type=args.page_type)
+        if args.scores:
+            result = query.score_stats(by=args.by)
+        elif args.issues:
+            result = query.issue_counts(by=args.by, top=args.top)
+        else:
+            result = query.count_by(args.field, by=args.by, top=args.top)
+        result = {"events": query.count(), "result": result}
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Tests for artifact zero-copy access: header-only image metadata, the
+metadata index written at save time, mmapped / queued reads, and serving
+through the server's zero-copy extension or an X-Accel-Redirect.
+"""
+
+import asyncio
+import base64
+import io
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+from PIL import Image
+
+from api.core.write_behind import write_behind
+from api.services import artifacts
+from api.services.artifacts import (
+    ArtifactFileResponse,
+    artifact_info,
+    artifact_response,
+    artifact_view,
+    file_to_data_uri,
+    image_header_info,
+    read_artifact_bytes,
+    save_artifact_bytes,
+)
+
+
+def _image(fmt: str, size=(37, 21)) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", size, (200, 40, 90)).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def artifacts_dir(tmp_path, monkeypatch):
+    directory = (tmp_path / "artifacts").resolve()
+    monkeypatch.setenv("ARTIFACTS_DIR", str(directory))
+    monkeypatch.delenv("ARTIFACTS_ACCEL_REDIRECT", raising=False)
+    artifacts._recent_info.clear()
+    yield directory
+    write_behind.flush(timeout=5)
+    store = artifacts._index_stores.pop(directory, None)
+    if store:
+        store.close_all()
+    artifacts._recent_info.clear()
+
+
+@pytest.mark.parametrize("fmt, media_type", [("PNG", "image/png"), ("JPEG", "image/jpeg"), ("GIF", "image/gif")])
+def test_header_info_matches_pil(fmt, media_type):
+    data = _image(fmt, size=(641, 333))
+    assert image_header_info(data) == (media_type, (641, 333))
+    assert image_header_info(memoryview(data)) == (media_type, (641, 333))
+    assert image_header_info(b"plain text") == ("application/octet-stream", None)
+
+
+def test_saved_artifacts_are_indexed_and_read_from_the_map(artifacts_dir, monkeypatch):
+    data = _image("PNG")
+    save_artifact_bytes("shot.png", data)
+
+    # Queued or written, the bytes and metadata are the same
+    with artifact_view("shot.png") as view:
+        assert bytes(view) == data
+    assert read_artifact_bytes("shot.png") == data
+    assert write_behind.flush(timeout=5)
+
+    artifacts._recent_info.clear()
+    info = artifact_info(artifacts_dir / "shot.png")
+    assert (info.width, info.height, info.size, info.media_type) == (37, 21, len(data), "image/png")
+    assert info.etag.startswith('"') and len(info.etag) == 34
+
+    # Answered from the index without reading the file again
+    artifacts._recent_info.clear()
+    with monkeypatch.context() as patched:
+        patched.setattr(artifacts, "describe_artifact", None)
+        assert artifact_info("shot.png") == info
+
+    # A rewrite of the same size is not served under the old hash
+    stat = (artifacts_dir / "shot.png").stat()
+    (artifacts_dir / "shot.png").write_bytes(b"x" * len(data))
+    os.utime(artifacts_dir / "shot.png", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    rewritten = artifact_info("shot.png")
+    assert rewritten.sha256 != info.sha256 and rewritten.size == info.size
+    artifacts._recent_info.clear()
+    assert artifact_info("shot.png") == rewritten
+
+    # So is a size change
+    (artifacts_dir / "shot.png").write_bytes(b"changed")
+    assert artifact_info("shot.png").media_type == "application/octet-stream"
+
+    with artifact_view(artifacts_dir / "shot.png") as view:
+        assert isinstance(view, memoryview) and view.readonly and bytes(view) == b"changed"
+    assert artifact_info("missing.png") is None
+    with pytest.raises(FileNotFoundError):
+        with artifact_view("missing.png"):
+            pass
+
+
+def test_file_to_data_uri_encodes_from_the_view(artifacts_dir):
+    data = _image("JPEG")
+    path = artifacts_dir / "a.jpg"
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    uri = file_to_data_uri(path, mime="image/jpeg")
+    assert uri == "data:image/jpeg;base64," + base64.b64encode(data).decode()
+
+
+def _run_response(response, extensions):
+    scope = {"type": "http", "method": "GET", "headers": [], "extensions": extensions}
+    messages = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        if message["type"] == "http.response.zerocopy":
+            message = dict(message, body=message["file"].read(message["count"]))
+        messages.append(message)
+
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def test_file_response_uses_zerocopy_when_offered(artifacts_dir):
+    data = _image("PNG")
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    (artifacts_dir / "z.png").write_bytes(data)
+    info = artifact_info("z.png")
+
+    messages = _run_response(artifact_response(artifacts_dir / "z.png", info), {"http.response.zerocopy": {}})
+    assert [m["type"] for m in messages] == ["http.response.start", "http.response.zerocopy"]
+    headers = dict(messages[0]["headers"])
+    assert headers[b"etag"] == info.etag.encode() and headers[b"content-type"] == b"image/png"
+    assert messages[1]["body"] == data
+
+    plain = _run_response(ArtifactFileResponse(str(artifacts_dir / "z.png")), {})
+    assert b"".join(m.get("body", b"") for m in plain[1:]) == data
+
+
+def test_accel_redirect_leaves_the_body_to_the_proxy(artifacts_dir, monkeypatch):
+    monkeypatch.setenv("ARTIFACTS_ACCEL_REDIRECT", "/_protected/artifacts/")
+    artifacts_dir.mkdir(parents=True, exist_ok=True)
+    (artifacts_dir / "r.png").write_bytes(_image("PNG"))
+    response = artifact_response(artifacts_dir / "r.png", artifact_info("r.png"), {"Cache-Control": "no-cache"})
+    assert response.headers["x-accel-redirect"] == "/_protected/artifacts/r.png"
+    assert response.headers["cache-control"] == "no-cache"
+    assert response.body == b""
+
+
+def test_serve_route_answers_conditional_requests(artifacts_dir):
+    from api.main import app
+
+    data = _image("PNG")
+    save_artifact_bytes("served.png", data)
+    assert write_behind.flush(timeout=5)
+
+    client = TestClient(app)
+    first = client.get("/api/artifacts/served.png")
+    assert first.status_code == 200 and first.content == data
+    etag = first.headers["etag"]
+    assert client.get("/api/artifacts/served.png", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get(f"/api/artifacts/{artifacts.ARTIFACT_INDEX_NAME}").status_code == 404
+
+    meta = client.get("/api/artifact-info/served.png").json()
+    assert (meta["width"], meta["height"]) == (37, 21)
@@ -0,0 +1,204 @@
+"""
+Tests for the pooled WAL SQLite store behind Decision Brain memory.
+"""
+
+import asyncio
+import json
+import sqlite3
+import threading
+
+import pytest
+
+from api.memory import brain_memory
+from api.memory.event_log import AnalysisEventLog
+from api.memory.store import SQLiteStore
+
+
+@pytest.fixture
+def memory_store(tmp_path, monkeypatch):
+    store = SQLiteStore(tmp_path / "brain.db", brain_memory.SCHEMA, migrations=[brain_memory._migrate_normalize_issues])
+    monkeypatch.setattr(brain_memory, "store", store)
+    monkeypatch.setattr(brain_memory, "weight_cache", brain_memory.WeightCache(check_interval=0))
+    monkeypatch.setattr(brain_memory, "event_log", AnalysisEventLog(root=tmp_path / "events"))
+    yield store
+    store.close_all()
+
+
+def test_pragmas_and_indexes(memory_store):
+    conn = memory_store.connection()
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+    assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == memory_store.busy_timeout_ms
+    indexes = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_analyses_page_type", "idx_analyses_domain_created", "idx_feedback_analysis_id"} <= indexes
+
+
+def test_connections_are_pooled_per_thread(memory_store):
+    main = memory_store.connection()
+    assert memory_store.connection() is main
+    other = []
+    t = threading.Thread(target=lambda: other.append(memory_store.connection()))
+    t.start()
+    t.join()
+    assert other[0] is not main
+
+
+def test_transaction_rolls_back_on_error(memory_store):
+    with pytest.raises(RuntimeError):
+        with memory_store.transaction() as conn:
+            conn.execute(
+                "INSERT INTO analyses (created_at, url, domain, page_type, ruleset_version, top_issues_json) "
+                "VALUES ('t', 'u', 'd', 'p', 'v', '[]')"
+            )
+            raise RuntimeError("boom")
+    assert memory_store.connection().execute("SELECT COUNT(*) FROM analyses").fetchone()[0] == 0
+
+
+def test_concurrent_writers(memory_store):
+    def write(n):
+        for i in range(20):
+            brain_memory.log_analysis(
+                url=f"https://site{n}.example/{i}", page_type="landing",
+                ruleset_version="v", top_issues=[{"id": "cta"}],
+            )
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert memory_store.connection().execute("SELECT COUNT(*) FROM analyses").fetchone()[0] == 80
+
+
+def test_async_facade_round_trip(memory_store):
+    async def scenario():
+        analysis_id = await brain_memory.log_analysis_async(
+            url="https://acme.example/pricing", page_type="pricing",
+            ruleset_version="v", top_issues=[{"id": "cta"}, {"id": "trust"}],
+        )
+        assert await brain_memory.analysis_exists_async(analysis_id)
+        assert not await brain_memory.analysis_exists_async(analysis_id + 1)
+        await brain_memory.insert_feedback_async(analysis_id=analysis_id, label="accurate")
+        summary = await brain_memory.calibrate_weights_async()
+        weights = await brain_memory.get_issue_weights_for_page_type_async("pricing")
+        return summary, weights
+
+    summary, weights = asyncio.run(scenario())
+    assert summary["weights_updated"] == 2
+    assert weights == {"cta": pytest.approx(1.6), "trust": pytest.approx(1.6)}
+
+
+def _log(page_type, *issue_ids):
+    return brain_memory.log_analysis(
+        url="https://acme.example/", page_type=page_type, ruleset_version="v",
+        top_issues=[{"id": i} for i in issue_ids],
+    )
+
+
+def test_calibration_only_touches_changed_pairs(memory_store):
+    first = _log("landing", "cta", "h1")
+    _log("pricing", "price")
+    assert brain_memory.calibrate_weights()["weights_updated"] == 3
+    assert brain_memory.calibrate_weights()["weights_updated"] == 0
+
+    brain_memory.insert_feedback(analysis_id=first, label="wrong", wrong_issues=["h1"])
+    summary = brain_memory.calibrate_weights()
+    assert summary["weights_updated"] == 1
+    assert summary["distinct_pairs"] == 3
+    weights = brain_memory.get_issue_weights_for_page_type("landing")
+    assert weights == {"cta": pytest.approx(1.0), "h1": pytest.approx(0.4)}
+
+
+def test_issues_are_normalized_in_report_order(memory_store):
+    analysis_id = brain_memory.log_analysis(
+        url="https://acme.example/", page_type="landing", ruleset_version="v",
+        top_issues=[{"id": "cta"}, {"severity": "high"}, "junk", {"id": "cta"}, {"id": "form"}],
+    )
+    rows = memory_store.connection().execute(
+        "SELECT issue_id FROM analysis_issues WHERE analysis_id = ? ORDER BY position", (analysis_id,)
+    ).fetchall()
+    assert [r["issue_id"] for r in rows] == ["cta", "cta", "form"]
+
+
+def test_full_rebuild_matches_running_counters(memory_store):
+    a = _log("landing", "cta", "trust")
+    b = _log("landing", "cta")
+    brain_memory.insert_feedback(analysis_id=a, label="partial")
+    brain_memory.insert_feedback(analysis_id=b, label="wrong")
+    brain_memory.insert_feedback(analysis_id=b + 1, label="accurate")  # analysis logged later
+    c = _log("landing", "trust")
+    assert c == b + 1
+    incremental = brain_memory.calibrate_weights()
+    before = brain_memory.get_issue_weights_for_page_type("landing")
+
+    full = brain_memory.calibrate_weights(full=True)
+    assert full["drift_pairs"] == 0
+    assert full["weights_updated"] == full["distinct_pairs"] == incremental["distinct_pairs"]
+    assert brain_memory.get_issue_weights_for_page_type("landing") == before
+
+
+def test_migration_backfills_legacy_database(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript(brain_memory.SCHEMA.split("CREATE TABLE IF NOT EXISTS analysis_issues")[0])
+    legacy.execute(
+        "INSERT INTO analyses (created_at, url, domain, page_type, ruleset_version, top_issues_json) "
+        "VALUES ('t', 'u', 'd', 'landing', 'v', ?)",
+        (json.dumps([{"id": "cta"}, {"id": "h1"}]),),
+    )
+    legacy.execute("INSERT INTO feedback (analysis_id, created_at, label) VALUES (1, 't', 'accurate')")
+    legacy.commit()
+    legacy.close()
+
+    store = SQLiteStore(path, brain_memory.SCHEMA, migrations=[brain_memory._migrate_normalize_issues])
+    monkeypatch.setattr(brain_memory, "store", store)
+    monkeypatch.setattr(brain_memory, "weight_cache", brain_memory.WeightCache(check_interval=0))
+    try:
+        assert store.connection().execute("PRAGMA user_version").fetchone()[0] == 1
+        assert brain_memory.calibrate_weights()["weights_updated"] == 2
+        assert brain_memory.get_issue_weights_for_page_type("landing") == {
+            "cta": pytest.approx(1.6), "h1": pytest.approx(1.6),
+        }
+    finally:
+        store.close_all()
+
+
+def test_weight_lookups_are_cached_until_calibration(memory_store, monkeypatch):
+    cache = brain_memory.WeightCache(check_interval=3600)
+    monkeypatch.setattr(brain_memory, "weight_cache", cache)
+    analysis_id = _log("landing", "cta")
+    brain_memory.calibrate_weights()
+
+    first = brain_memory.get_issue_weights_for_page_type("landing")
+    assert brain_memory.get_issue_weights_for_page_type("landing") is first
+    assert cache.stats["loads"] == 1 and cache.stats["hits"] == 1
+    with pytest.raises(TypeError):
+        first["cta"] = 2.0  # snapshots are shared, so read-only
+
+    # Unchanged calibration keeps the snapshot
+    brain_memory.calibrate_weights()
+    assert brain_memory.get_issue_weights_for_page_type("landing") is first
+
+    brain_memory.insert_feedback(analysis_id=analysis_id, label="accurate")
+    brain_memory.calibrate_weights()
+    assert brain_memory.get_issue_weights_for_page_type("landing") == {"cta": pytest.approx(1.6)}
+
+
+def test_calibration_in_another_worker_invalidates(memory_store, monkeypatch):
+    cache = brain_memory.WeightCache(check_interval=0)
+    monkeypatch.setattr(brain_memory, "weight_cache", cache)
+    _log("landing", "cta")
+    assert brain_memory.get_issue_weights_for_page_type("landing") == {}
+
+    # Another process calibrates: its weights + version bump land in the shared DB
+    other = sqlite3.connect(memory_store.path)
+    other.execute(
+        "INSERT INTO weights (updated_at, page_type, issue_id, weight, evidence_json) "
+        "VALUES ('t', 'landing', 'cta', 1.3, '{}')"
+    )
+    other.execute("UPDATE meta SET value = value + 1 WHERE key = 'weights_version'")
+    other.commit()
+    other.close()
+
+    assert brain_memory.get_issue_weights_for_page_type("landing") == {"cta": 1.3}
+    assert cache.stats["invalidations"] == 1
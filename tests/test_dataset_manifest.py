@@ -0,0 +1,121 @@
+"""
+Tests for the visual trust dataset manifest: uploads, duplicate detection,
+split assignment, incremental scans and shard export.
+"""
+
+import io
+import json
+import os
+import threading
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from api.services.dataset_manifest import CLASS_NAMES, DatasetManifest
+
+
+def _png(seed: int, size=(64, 48), shift: int = 0) -> bytes:
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 256, size=(size[1] // 8, size[0] // 8, 3), dtype=np.uint8)
+    image = Image.fromarray(pixels).resize(size, Image.NEAREST)
+    if shift:
+        image = Image.fromarray(np.clip(np.asarray(image).astype(int) + shift, 0, 255).astype(np.uint8))
+    buf = io.BytesIO()
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def manifest(tmp_path):
+    m = DatasetManifest(root=tmp_path / "dataset", db_path=tmp_path / "manifest.db", val_fraction=0.5)
+    yield m
+    m.store.close_all()
+
+
+def test_add_indexes_and_rejects_exact_duplicates(manifest):
+    first = manifest.add(_png(1), "high", "hero.png")
+    assert first["status"] == "ok" and not first["duplicate"]
+    assert first["split"] == manifest.split_for(first["sha256"])
+    assert (manifest.root / first["path"]).read_bytes() == _png(1)
+
+    again = manifest.add(_png(1), "low", "copy.png")
+    assert again["duplicate"] and again["path"] == first["path"]
+    assert len(list((manifest.images_dir / "low_trust").iterdir())) == 0
+
+    row = manifest.entries()[0]
+    assert (row["width"], row["height"], row["label"]) == (64, 48, "high")
+
+    with pytest.raises(ValueError):
+        manifest.add(b"not an image", "high", "x.png")
+    with pytest.raises(ValueError):
+        manifest.add(_png(2), "excellent", "x.png")
+
+
+def test_concurrent_uploads_of_the_same_image(manifest):
+    data = _png(3)
+    results = []
+
+    def upload():
+        results.append(manifest.add(data, "medium", "same.png"))
+
+    threads = [threading.Thread(target=upload) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sum(not r["duplicate"] for r in results) == 1
+    assert len(manifest.entries()) == 1
+    assert len([p for p in (manifest.images_dir / "medium_trust").iterdir() if not p.name.startswith(".")]) == 1
+
+
+def test_near_duplicate_inherits_split(manifest):
+    original = manifest.add(_png(4), "high", "a.png")
+    near = manifest.add(_png(4, shift=2), "high", "b.png")
+    assert near["sha256"] != original["sha256"]
+    assert near["status"] == "duplicate"
+    assert near["split"] == original["split"]
+    assert [r["path"] for r in manifest.entries()] == [original["path"]]
+
+
+def test_scan_is_incremental(manifest):
+    folder = manifest.images_dir / "low"
+    folder.mkdir(parents=True)
+    for n in range(3):
+        (folder / f"img{n}.png").write_bytes(_png(10 + n))
+    (folder / "broken.png").write_bytes(b"\x89PNG truncated")
+    (folder / "notes.txt").write_text("ignored")
+
+    first = manifest.scan()
+    assert first["seen"] == 4 and first["indexed"] == 4 and first["invalid"] == 1
+
+    second = manifest.scan()
+    assert second["unchanged"] == 4 and second["indexed"] == 0
+
+    (folder / "img0.png").unlink()
+    (folder / "img1.png").write_bytes(_png(99))
+    os.utime(folder / "img1.png", (1, 1))
+    third = manifest.scan()
+    assert third["missing"] == 1 and third["indexed"] == 1
+    assert manifest.summary()["by_status"] == {"ok": 2, "invalid": 1, "missing": 1}
+    assert {r["label"] for r in manifest.entries()} == {"low"}
+
+
+def test_export_npz_shards(manifest, tmp_path):
+    for n in range(7):
+        manifest.add(_png(20 + n), CLASS_NAMES[n % 3], f"{n}.png")
+    out = tmp_path / "shards"
+
+    rows = manifest.entries(split="train")
+    index = manifest.export_shards(out, "train", shard_size=2, image_size=(16, 24))
+    assert index["count"] == len(rows) and not index["skipped"]
+    assert [s["count"] for s in index["shards"]] == [2] * (len(rows) // 2) + [1] * (len(rows) % 2)
+
+    with np.load(out / "train" / index["shards"][0]["file"]) as shard:
+        assert shard["images"].shape == (2, 16, 24, 3) and shard["images"].dtype == np.uint8
+        assert list(shard["labels"]) == [CLASS_NAMES.index(r["label"]) for r in rows[:2]]
+        assert list(shard["sha256"]) == [r["sha256"] for r in rows[:2]]
+    assert json.loads((out / "train" / "index.json").read_text())["digest"] == index["digest"]
+
+    assert manifest.export_shards(out, "train", shard_size=2, image_size=(16, 24))["skipped"]
@@ -0,0 +1,93 @@
+"""
+Tests for the persistent decision memory layer.
+"""
+
+import pytest
+
+from api.utils.decision_memory_layer import DecisionMemoryLayer, FatigueLevel
+
+
+@pytest.fixture
+def layer(tmp_path):
+    layer = DecisionMemoryLayer(db_path=tmp_path / "decision.db", max_items=5)
+    yield layer
+    layer.store.close_all()
+
+
+def _add(layer, outcome, stage=None, fix="Add a risk-free trial badge", ctx="https://acme.example/"):
+    return layer.add_analysis(
+        context_id=ctx, primary_outcome=outcome, confidence_score=70.0, location="CTA",
+        what_to_change=fix, expected_lift="Medium (+10–25%)", url=ctx, inferred_stage=stage,
+    )
+
+
+def test_history_survives_a_new_instance(layer, tmp_path):
+    _add(layer, "Trust Gap")
+    _add(layer, "Outcome Unclear")
+    reopened = DecisionMemoryLayer(db_path=tmp_path / "decision.db", max_items=5)
+    try:
+        history = reopened.get_history("https://acme.example/")
+        assert [h.primary_outcome for h in history] == ["Trust Gap", "Outcome Unclear"]
+        assert [h.primary_outcome for h in reopened.get_history_for_url("https://acme.example/")] == [
+            "Trust Gap", "Outcome Unclear",
+        ]
+    finally:
+        reopened.store.close_all()
+
+
+def test_history_is_bounded_and_aggregates_follow_eviction(layer):
+    for outcome in ["Trust Gap", "Trust Gap", "Effort Too High", "Effort Too High",
+                    "Effort Too High", "Outcome Unclear", "Outcome Unclear"]:
+        _add(layer, outcome, stage="evaluation")
+    history = layer.get_history("https://acme.example/")
+    assert len(history) == 5
+    agg = layer._aggregate("https://acme.example/")
+    assert agg.total_analyses == 7 and agg.kept == 5
+    assert agg.outcome_counts == {"Effort Too High": 3, "Outcome Unclear": 2}
+    assert agg.trust_flags == "00000"
+    assert agg.stage_runs == [["evaluation", 5]]
+
+
+def test_repeated_fix_is_detected_case_and_punctuation_insensitive(layer):
+    _add(layer, "Trust Gap", fix="Add a risk-free trial badge.")
+    suppress, reason = layer.suppress_repeated_fixes("https://acme.example/", "add a RISK free trial badge")
+    assert suppress and "1 time" in reason
+    assert layer.suppress_repeated_fixes("https://acme.example/", "Shorten the form") == (False, None)
+    assert layer.suppress_repeated_fixes("https://other.example/", "Add a risk-free trial badge") == (False, None)
+
+
+def test_confidence_rules(layer):
+    ctx = "https://acme.example/"
+    assert layer.adjust_confidence_with_memory(ctx, "Trust Gap", 80.0) == (80.0, "")
+    _add(layer, "Trust Gap")
+    confidence, reason = layer.adjust_confidence_with_memory(ctx, "Trust Gap", 80.0)
+    assert confidence == 72.0 and "Limited history" in reason
+    _add(layer, "Trust Gap")
+    _add(layer, "Trust Gap")
+    confidence, reason = layer.adjust_confidence_with_memory(ctx, "Trust Gap", 80.0)
+    assert confidence == 88.0 and "Consistent pattern" in reason
+    confidence, reason = layer.adjust_confidence_with_memory(ctx, "Effort Too High", 80.0)
+    assert confidence == 68.0 and "Conflicting" in reason
+
+
+def test_history_insight_with_fatigue_trust_and_journey(layer):
+    ctx = "https://acme.example/"
+    assert layer.generate_history_insight(ctx, "Trust Gap").trajectory_summary == "First analysis for this context."
+
+    _add(layer, "Outcome Unclear", stage="sense_making")
+    for _ in range(4):
+        _add(layer, "Trust Gap", stage="evaluation")
+    insight = layer.generate_history_insight(ctx, "Trust Gap", 80.0, "evaluation")
+
+    assert "Outcome Unclear (resolved)" in insight.what_improved
+    assert any(item.startswith("Trust Gap (persists") for item in insight.what_remains_unresolved)
+    assert insight.fatigue_analysis.fatigue_level == FatigueLevel.MEDIUM
+    assert insight.trust_dynamics.trust_debt_trend == "increasing"
+    journey = insight.journey_insight
+    assert journey.interpretation == "stuck" and journey.action_recommendation == "unlock"
+    assert journey.observed_stage_trajectory == "sense_making → evaluation"
+
+    regression = layer.generate_history_insight(ctx, "Trust Gap", 80.0, "orientation").journey_insight
+    assert regression.interpretation == "regression" and regression.action_recommendation == "fix"
+    confidence, reason = layer.adjust_confidence_with_memory_stage_aware(ctx, "Trust Gap", 80.0, "orientation")
+    assert "regressed" in reason
@@ -0,0 +1,91 @@
+"""
+Tests for the in-browser DOM extraction post-processing (page map and
+element detections built from real bounding boxes).
+"""
+
+import asyncio
+
+from api.services import element_detection
+from api.services.dom_extract import extract_dom_structure, structure_to_detections
+from api.services.page_extract import extract_page_map
+
+STRUCTURE = {
+    "viewport": {"width": 390, "height": 844, "dpr": 2},
+    "document": {"width": 390, "height": 4000},
+    "headings": [
+        {"text": "Ship faster", "tag": "h1", "bbox": [20, 120, 350, 60], "atf": True, "visible": True, "style": {}},
+        {"text": "Pricing", "tag": "h2", "bbox": [20, 2400, 350, 40], "atf": False, "visible": True, "style": {}},
+    ],
+    "ctas": [
+        {"text": "Home", "tag": "a", "href": "/", "bbox": [10, 10, 60, 20], "atf": True, "visible": True, "filled": False},
+        {"text": "Start free trial", "tag": "button", "href": "", "bbox": [20, 300, 200, 48], "atf": True,
+         "visible": True, "filled": True},
+        {"text": "Contact", "tag": "a", "href": "/c", "bbox": [20, 3000, 80, 20], "atf": False, "visible": True},
+    ],
+    "forms": [{"text": "", "tag": "form", "bbox": [20, 1200, 350, 300], "atf": False, "visible": True,
+               "fields": 3, "required": 2, "field_types": ["email", "text", "select"], "submit": "Send"}],
+    "prices": [{"text": "$29/month", "match": "$29/month", "tag": "span", "bbox": [20, 2500, 100, 30],
+                "atf": False, "visible": True}],
+    "badges": [{"text": "", "label": "trustpilot rating", "tag": "img", "bbox": [20, 400, 100, 30],
+                "atf": True, "visible": True}],
+}
+
+
+def test_page_map_uses_dom_structure():
+    page_map = extract_page_map({"dom": {"structure": STRUCTURE, "html_excerpt": "<h1>ignored</h1>"}})
+
+    assert [h["text"] for h in page_map["headlines"]] == ["Ship faster", "Pricing"]
+    assert page_map["headlines"][0]["where"] == {"section": "hero", "selector": "h1", "bbox": [20, 120, 350, 60]}
+    # Filled above-the-fold button wins over the nav link
+    assert page_map["ctas"][0]["label"] == "Start free trial"
+    assert page_map["ctas"][0]["type"] == "primary"
+    assert page_map["ctas"][-1]["where"]["section"] == "body"
+    assert page_map["forms"][0]["fields"] == 3
+    assert page_map["offer_elements"][0]["text"] == "$29/month"
+    assert any(t["type"] == "badge" for t in page_map["trust_signals"])
+
+
+def test_page_map_falls_back_to_html_without_structure():
+    page_map = extract_page_map({"dom": {"html_excerpt": "<h1>From HTML</h1><a href='/x'>Go</a>"}})
+    assert page_map["headlines"][0]["text"] == "From HTML"
+    assert page_map["headlines"][0]["where"]["bbox"] == [0, 0, 0, 0]
+    assert page_map["ctas"][0]["label"] == "Go"
+
+
+def test_detections_from_dom_skip_vision(monkeypatch):
+    def no_vision():
+        raise AssertionError("vision API must not be called")
+
+    monkeypatch.setattr(element_detection, "get_client", no_vision)
+    result = asyncio.run(
+        element_detection.detect_elements_in_screenshot("/missing.png", viewport="mobile", dom_structure=STRUCTURE)
+    )
+    assert result["source"] == "dom"
+    assert result["image_size"] == [780, 1688]
+    types = [e["type"] for e in result["detected_elements"]]
+    assert types.count("cta") == 2 and "headline" in types and "badge" in types
+    assert "pricing" not in types  # below the fold
+    headline = next(e for e in result["detected_elements"] if e["type"] == "headline")
+    assert headline["bbox"] == [40, 240, 700, 120]  # scaled by devicePixelRatio
+
+
+def test_extract_dom_structure_is_one_round_trip():
+    class FakePage:
+        calls = 0
+
+        def evaluate(self, script, arg):
+            FakePage.calls += 1
+            assert arg["maxItems"] > 0
+            return dict(STRUCTURE, readable="text")
+
+    assert extract_dom_structure(FakePage())["readable"] == "text"
+    assert FakePage.calls == 1
+    assert structure_to_detections({}, "desktop")["detected_elements"] == []
+
+
+def test_extract_dom_structure_failure_returns_empty():
+    class BrokenPage:
+        def evaluate(self, script, arg):
+            raise RuntimeError("page closed")
+
+    assert extract_dom_structure(BrokenPage()) == {}
@@ -0,0 +1,140 @@
+"""
+Tests for the analysis event log: batching, compaction and vectorized queries.
+"""
+
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from api.memory.event_log import AnalysisEventLog, EventColumns
+
+DAY = 86400.0
+
+
+@pytest.fixture
+def log(tmp_path):
+    return AnalysisEventLog(root=tmp_path / "events", batch_size=1000, flush_seconds=60)
+
+
+def _fill(log, now):
+    rows = [
+        # (days ago, domain, page_type, issues, score)
+        (3, "a.example", "pricing", ["cta", "trust"], 0.4),
+        (3, "a.example", "pricing", ["trust"], 0.6),
+        (2, "b.example", "landing", ["cta"], None),
+        (2, "b.example", "pricing", ["trust", "form"], 0.8),
+        (0, "c.example", "landing", [], 0.2),
+    ]
+    for days_ago, domain, page_type, issues, score in rows:
+        log.append(source="analysis", domain=domain, page_type=page_type,
+                   blocker=issues[0] if issues else "", issues=issues, score=score, ts=now - days_ago * DAY)
+
+
+def test_append_is_buffered_until_flush(log):
+    log.append(source="analysis", domain="a.example", issues=["cta"])
+    assert not log.segments_dir.exists()
+    assert log.flush() == 1
+    segments = list(log.segments_dir.rglob("*.jsonl"))
+    assert len(segments) == 1 and segments[0].read_text().count("\n") == 1
+
+
+def test_background_writer_flushes_batches(tmp_path):
+    log = AnalysisEventLog(root=tmp_path / "events", batch_size=2, flush_seconds=60)
+    log.append(source="analysis")
+    log.append(source="analysis")
+    deadline = time.time() + 5
+    while log.stats["written"] < 2 and time.time() < deadline:
+        time.sleep(0.01)
+    assert log.stats["written"] == 2 and log.stats["batches"] == 1
+
+
+def test_compaction_keeps_query_results(log):
+    now = time.time()
+    _fill(log, now)
+    before = log.query().count_by("blocker", by="page_type")
+
+    result = log.compact()
+    assert [p["events"] for p in result["partitions"]] == [2, 2]
+    assert len(list(log.partitions_dir.iterdir())) == 2
+    assert len(list(log.segments_dir.rglob("*.jsonl"))) == 1  # today stays live
+
+    assert log.query().count_by("blocker", by="page_type") == before
+    assert before == {
+        "pricing": [("trust", 2), ("cta", 1)],
+        "landing": [("cta", 1), ("", 1)],
+    }
+
+    # Late events for a compacted day are merged into its partition
+    log.append(source="analysis", domain="a.example", page_type="pricing", issues=["cta"], ts=now - 3 * DAY)
+    log.compact()
+    assert log.query().count() == 6
+
+
+def test_compaction_recovers_from_a_crash_after_the_partition_write(log, monkeypatch):
+    now = time.time()
+    _fill(log, now)
+    real_unlink = Path.unlink
+
+    def crash(path, missing_ok=False):
+        if path.suffix == ".compacting":
+            raise KeyboardInterrupt("killed before the segments were deleted")
+        real_unlink(path, missing_ok=missing_ok)
+
+    monkeypatch.setattr(Path, "unlink", crash)
+    with pytest.raises(KeyboardInterrupt):
+        log.compact()
+    monkeypatch.setattr(Path, "unlink", real_unlink)
+
+    leftovers = list(log.segments_dir.rglob("*.compacting"))
+    assert len(leftovers) == 1 and len(list(log.partitions_dir.iterdir())) == 1
+    assert log.query().count() == 5  # the partition's segments are not read twice
+
+    # The same writer's next segment for that day is claimed under another name
+    log.append(source="analysis", ts=now - 3 * DAY)
+    log.compact()
+    assert not list(log.segments_dir.rglob("*.compacting"))
+    assert log.query().count() == 6
+    assert log.query().count_by("domain") == [("a.example", 2), ("b.example", 2), ("", 1), ("c.example", 1)]
+
+
+def test_vectorized_aggregations(log):
+    now = time.time()
+    _fill(log, now)
+    query = log.query()
+    assert query.issue_counts() == [("trust", 3), ("cta", 2), ("form", 1)]
+    assert query.issue_counts(by="domain", top=1) == {
+        "a.example": [("trust", 2)], "b.example": [("cta", 1)],
+    }
+    assert query.count_by("domain", top=2) == [("a.example", 2), ("b.example", 2)]
+    stats = query.score_stats(by="page_type")
+    assert stats["pricing"]["count"] == 3
+    assert stats["pricing"]["mean"] == pytest.approx(0.6)
+    assert stats["pricing"]["p50"] == pytest.approx(0.6)
+    assert stats["landing"] == {"count": 1, "mean": 0.2, "p50": 0.2, "p90": 0.2, "min": 0.2, "max": 0.2}
+
+    recent = log.query(days=1)
+    assert recent.count() == 1
+    assert log.query().filter(page_type="pricing", domain="b.example").count() == 1
+    assert log.query().filter(page_type="checkout").count() == 0
+
+
+def test_npz_round_trip(tmp_path):
+    columns = EventColumns.from_records([
+        {"t": 1.0, "src": "analysis", "d": "a.example", "pt": "pricing", "b": "cta", "i": ["cta", "trust"], "s": 0.5},
+        {"t": 2.0, "src": "analysis", "d": "b.example", "pt": "", "b": "", "i": []},
+    ])
+    path = tmp_path / "p.npz"
+    columns.save(path)
+    loaded = EventColumns.load(path)
+    assert loaded.categories == columns.categories
+    assert loaded.issue_categories == ["cta", "trust"]
+    assert np.array_equal(loaded.issue_offsets, [0, 2, 2])
+    assert np.isnan(loaded.score[1])
+
+
+def test_disabled_log_drops_events(tmp_path):
+    log = AnalysisEventLog(root=tmp_path / "events", enabled=False)
+    log.append(source="analysis")
+    assert log.flush() == 0
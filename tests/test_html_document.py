@@ -0,0 +1,110 @@
+"""
+Tests for the parse-once HTML document model and the extractors using it.
+"""
+
+import asyncio
+import gc
+import weakref
+
+from bs4 import BeautifulSoup
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+from api.brain.evidence.pricing_signals import _count_pricing_tiers, extract_pricing_signals
+from api.decision_engine import _extract_content_from_html
+from api.utils.html_document import (
+    DocumentScopeMiddleware,
+    ParsedDocument,
+    clear_document_cache,
+    document_scope,
+    parse_document,
+)
+
+HTML = """
+<html><head><title> Acme </title><meta name="description" content="Fast widgets">
+<script>var tracking = "hidden";</script></head>
+<body>
+  <header><nav><a href="/">Home</a></nav><h1>Header title</h1></header>
+  <main>
+    <h1>Buy widgets</h1><h2>Starter plan</h2><!-- comment -->
+    <div class="plan">Starter <span class="price">$9/month</span></div>
+    <div class="plan">Pro <span class="price">$29/month</span></div>
+    <a class="btn" href="/signup">Get started</a>
+    <form><input type="submit" value="Join"></form>
+  </main>
+  <footer>Privacy</footer>
+</body></html>
+"""
+
+
+def test_views_match_beautifulsoup():
+    doc = ParsedDocument(HTML)
+    soup = BeautifulSoup(HTML, "lxml")
+    assert doc.text == soup.get_text()
+    assert doc.text_excluding(separator="\n", strip=True) == soup.get_text("\n", strip=True)
+    assert "tracking" not in doc.visible_text
+    assert doc.title == "Acme"
+    assert doc.meta["description"] == "Fast widgets"
+    assert [h.name for h in doc.headings] == ["h1", "h1", "h2"]
+    assert len(doc.cta_nodes) == 3
+    assert len(doc.forms) == 1
+    assert [n.get_text() for n in doc.price_nodes] == ["$9/month", "$29/month"]
+    # Memoized: the same list object comes back
+    assert doc.select(".plan") is doc.select(".plan")
+
+
+def test_parse_document_reuses_parse_within_a_scope_only():
+    with document_scope():
+        doc = parse_document(HTML)
+        assert parse_document(HTML) is doc
+        assert parse_document(doc) is doc
+        # Worker threads started with the request's context share its documents
+        assert asyncio.run(_in_thread(HTML)) is doc
+        clear_document_cache()
+        assert parse_document(HTML) is not doc
+    released = weakref.ref(doc)
+    del doc
+    gc.collect()
+    assert released() is None
+    # Outside a scope nothing is kept
+    assert parse_document(HTML) is not parse_document(HTML)
+
+
+async def _in_thread(html):
+    return await asyncio.to_thread(parse_document, html)
+
+
+def test_middleware_scopes_documents_to_one_request():
+    seen = []
+
+    async def endpoint(request):
+        seen.append((parse_document(HTML), parse_document(HTML)))
+        return PlainTextResponse("ok")
+
+    app = DocumentScopeMiddleware(Starlette(routes=[Route("/", endpoint)]))
+    client = TestClient(app)
+    assert client.get("/").text == "ok" and client.get("/").text == "ok"
+    (a1, a2), (b1, _) = seen
+    assert a1 is a2 and a1 is not b1
+
+
+def test_extract_content_does_not_mutate_shared_document():
+    doc = parse_document(HTML)
+    content = _extract_content_from_html(doc)
+    assert content.startswith("Title: Acme")
+    assert "Meta Description: Fast widgets" in content
+    assert "Buy widgets" in content
+    assert "Header title" not in content
+    assert "Privacy" not in content
+    # The shared soup still has the header/footer
+    assert doc.soup.find("footer") is not None
+
+
+def test_pricing_signals_accept_parsed_document():
+    doc = parse_document(HTML)
+    assert _count_pricing_tiers(doc) == 2
+    signals = extract_pricing_signals(html=doc)
+    assert signals.signals["tier_count"] == 2
+    assert signals.signals["text_length"] == len(doc.text)
@@ -0,0 +1,135 @@
+"""
+Tests for batch image-trust analysis (Python API + NDJSON endpoint).
+"""
+
+import io
+import json
+import zipfile
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image, ImageDraw
+
+from api.routes.image_trust import router as image_trust_router
+from api.services import image_trust_service
+
+
+def _png(seed: int) -> bytes:
+    img = Image.new("RGB", (320, 200), (250, 250, 250))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((20, 20, 300, 60), fill=(10, 10, 10))
+    draw.rectangle((100 + seed, 120, 200 + seed, 150), fill=(20, 80, 200))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _stub_extractor(monkeypatch):
+    seen = []
+
+    def fake_extract(image_bytes, debug=False, image=None):
+        # The batch path must hand over the shared decoded image
+        seen.append(image is not None)
+        return {"elements": [{"id": "h", "role": "headline"}] * 4, "metrics": {}}
+
+    monkeypatch.setattr(image_trust_service, "get_visual_cache", lambda: None)
+    monkeypatch.setattr(image_trust_service, "extract_visual_elements", fake_extract)
+    return seen
+
+
+def test_analyze_image_trust_batch_orders_results_and_reports_throughput(monkeypatch):
+    seen = _stub_extractor(monkeypatch)
+    images = [(f"shot_{i}.png", _png(i * 10)) for i in range(6)] + [("broken.png", b"nope")]
+
+    out = image_trust_service.analyze_image_trust_batch(images, max_workers=3)
+
+    assert [r["index"] for r in out["results"]] == list(range(7))
+    assert all(r["success"] for r in out["results"][:6])
+    assert out["results"][6]["success"] is False
+    assert out["results"][6]["analysis"]["status"] == "error"
+    assert all(seen)
+
+    summary = out["summary"]
+    assert summary["type"] == "summary"
+    assert summary["count"] == 7
+    assert summary["ok"] == 6
+    assert summary["failed"] == 1
+    assert summary["workers"] == 3
+    assert summary["images_per_s"] is not None
+
+
+def test_batch_endpoint_streams_ndjson_for_files_and_zip(monkeypatch):
+    _stub_extractor(monkeypatch)
+    app = FastAPI()
+    app.include_router(image_trust_router, prefix="/api/analyze/image-trust")
+    client = TestClient(app)
+
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        zf.writestr("a/one.png", _png(1))
+        zf.writestr("a/two.png", _png(2))
+        zf.writestr("a/readme.txt", "ignored")
+        zf.writestr("__MACOSX/a/._one.png", "ignored")
+
+    resp = client.post(
+        "/api/analyze/image-trust/batch?workers=2",
+        files=[
+            ("files", ("x.png", _png(3), "image/png")),
+            ("archive", ("shots.zip", buf.getvalue(), "application/zip")),
+        ],
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = [json.loads(line) for line in resp.text.splitlines() if line.strip()]
+    results = [line for line in lines if line["type"] == "result"]
+    assert lines[-1]["type"] == "summary"
+    assert lines[-1]["count"] == 3
+    assert sorted(r["filename"] for r in results) == ["a/one.png", "a/two.png", "x.png"]
+
+
+def test_batch_endpoint_requires_images():
+    app = FastAPI()
+    app.include_router(image_trust_router, prefix="/api/analyze/image-trust")
+    client = TestClient(app)
+    resp = client.post("/api/analyze/image-trust/batch")
+    assert resp.status_code == 400
+
+
+def test_zip_members_are_checked_before_decompressing():
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("small.png", _png(1))
+        zf.writestr("bomb.png", b"\0" * (4 * 1024 * 1024))  # ~4 KB compressed
+
+    reads = []
+    budget = image_trust_service.BatchBudget(max_images=10, max_image_bytes=1024 * 1024, max_total_bytes=10**9)
+    with pytest.raises(image_trust_service.BatchLimitError, match="bomb.png"):
+        for name, data in image_trust_service.iter_zip_images(buf.getvalue(), budget):
+            reads.append(name)
+    assert reads == ["small.png"]
+
+    counted = image_trust_service.BatchBudget(max_images=1)
+    with pytest.raises(image_trust_service.BatchLimitError, match="Too many images"):
+        list(image_trust_service.iter_zip_images(buf.getvalue(), counted))
+
+    total = image_trust_service.BatchBudget(max_images=10, max_image_bytes=10**9, max_total_bytes=1024 * 1024)
+    with pytest.raises(image_trust_service.BatchLimitError, match="Batch is over"):
+        list(image_trust_service.iter_zip_images(buf.getvalue(), total))
+
+
+def test_batch_endpoint_rejects_oversized_batches(monkeypatch):
+    _stub_extractor(monkeypatch)
+    monkeypatch.setattr(image_trust_service, "BATCH_MAX_IMAGE_BYTES", 100)
+    app = FastAPI()
+    app.include_router(image_trust_router, prefix="/api/analyze/image-trust")
+    client = TestClient(app)
+
+    resp = client.post("/api/analyze/image-trust/batch", files=[("files", ("big.png", _png(1), "image/png"))])
+    assert resp.status_code == 413 and "big.png" in resp.json()["detail"]
+
+    resp = client.post(
+        "/api/analyze/image-trust/batch", files=[("archive", ("shots.zip", b"not a zip", "application/zip"))]
+    )
+    assert resp.status_code == 400
@@ -0,0 +1,58 @@
+"""
+Tests for the orjson response path: numpy-aware dumps, registered model fast
+path, and FastJSONRoute rendering untyped results without jsonable_encoder.
+"""
+
+import json
+
+import numpy as np
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.core.json_response import FastJSONResponse, FastJSONRoute, dumps, register_fast_model
+
+
+class _Score(BaseModel):
+    value: float
+    label: str
+
+
+def test_dumps_handles_numpy_models_and_sets():
+    register_fast_model(_Score)
+    payload = {
+        "score": np.float32(0.5),
+        "count": np.int64(3),
+        "bbox": np.array([1, 2, 3]),
+        "model": _Score(value=1.5, label="ok"),
+        "tags": {"cta"},
+        1: "int key",
+    }
+    assert json.loads(dumps(payload)) == {
+        "score": 0.5, "count": 3, "bbox": [1, 2, 3], "model": {"value": 1.5, "label": "ok"},
+        "tags": ["cta"], "1": "int key",
+    }
+
+
+def test_untyped_routes_render_directly_and_model_routes_keep_fastapi_path():
+    app = FastAPI(default_response_class=FastJSONResponse)
+    router = APIRouter(route_class=FastJSONRoute)
+
+    @router.get("/report", status_code=201)
+    async def report():
+        return {"score": np.float64(0.25), "flags": np.array([True, False])}
+
+    @router.get("/typed", response_model=_Score)
+    def typed():
+        return {"value": 2, "label": "typed"}
+
+    app.include_router(router)
+    routes = {r.path: r for r in router.routes}
+    assert hasattr(routes["/report"].endpoint, "__wrapped__")
+    assert not hasattr(routes["/typed"].endpoint, "__wrapped__")
+
+    client = TestClient(app)
+    response = client.get("/report")
+    assert response.status_code == 201
+    assert response.json() == {"score": 0.25, "flags": [True, False]}
+    assert client.get("/typed").json() == {"value": 2.0, "label": "typed"}
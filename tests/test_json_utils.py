@@ -0,0 +1,85 @@
+"""
+Tests for model-output JSON parsing: fences / prose, truncation repair,
+streamed chunks and schema validation.
+"""
+
+import json
+
+import pytest
+from pydantic import BaseModel, ValidationError
+
+from api.json_utils import JSONParseError, PartialJSONParser, parse_partial_json, safe_parse_json
+
+PAYLOAD = {
+    "overall": {"score": 72, "label": "good"},
+    "analysis": {"pillars": [1, 2, {"note": "say \"hi\""}], "summary": "clear"},
+    "ok": True,
+}
+TEXT = json.dumps(PAYLOAD)
+
+
+class _Overall(BaseModel):
+    score: float
+    label: str = "unknown"
+
+
+class _Report(BaseModel):
+    overall: _Overall
+    ok: bool = False
+
+
+@pytest.mark.parametrize("raw", [
+    TEXT,
+    "```json\n" + TEXT + "\n```",
+    "Here is the analysis:\n" + TEXT + "\nLet me know if you need more.",
+    TEXT + "\n```",
+])
+def test_wrapped_output_parses(raw):
+    assert safe_parse_json(raw) == PAYLOAD
+
+
+def test_truncated_output_keeps_complete_members():
+    cut = TEXT[:TEXT.index('"summary"') + 14]  # inside the "clear" string
+    assert safe_parse_json(cut) == {
+        "overall": {"score": 72, "label": "good"},
+        "analysis": {"pillars": [1, 2, {"note": 'say "hi"'}]},
+    }
+    with pytest.raises(JSONParseError):
+        safe_parse_json(cut, allow_partial=False)
+    with pytest.raises(JSONParseError):
+        safe_parse_json('{"overall": ')  # nothing complete before the cut
+    with pytest.raises(ValueError, match="non-JSON format|not valid JSON"):
+        safe_parse_json("- bullet one\n- bullet two")
+
+
+def test_trailing_number_at_the_cut_is_dropped():
+    # The cut may be inside 72 or 3.5: never keep a guess
+    assert safe_parse_json('{"a": 1, "score": 7') == {"a": 1}
+    assert safe_parse_json('{"a": [1, 2, 3') == {"a": [1, 2]}
+    assert parse_partial_json('{"a": [1, 2.') == ({"a": [1]}, False)
+    with pytest.raises(JSONParseError):
+        safe_parse_json('{"score": 7')
+    # Literals cannot be longer than themselves
+    assert safe_parse_json('{"a": 1, "ok": true') == {"a": 1, "ok": True}
+    assert safe_parse_json('{"a": [null') == {"a": [None]}
+
+
+def test_streamed_chunks_match_one_shot_parse():
+    parser = PartialJSONParser()
+    partials = [parser.feed(TEXT[i:i + 5]) for i in range(0, len(TEXT), 5)]
+    assert parser.complete and partials[-1] == PAYLOAD
+    assert partials[0] == {}  # only the opening brace so far
+    for cut in range(1, len(TEXT)):
+        streamed = PartialJSONParser()
+        for i in range(0, cut, 3):
+            streamed.feed(TEXT[i:min(i + 3, cut)])
+        assert streamed.close() == parse_partial_json(TEXT[:cut])[0]
+
+
+def test_schema_validation_in_same_call():
+    report = safe_parse_json("```json\n" + TEXT + "\n```", schema=_Report)
+    assert isinstance(report, _Report) and report.overall.score == 72 and report.ok
+    partial = safe_parse_json('{"overall": {"score": 40}, "ok": tr', schema=_Report)
+    assert partial.overall.label == "unknown" and partial.ok is False
+    with pytest.raises(ValidationError):
+        safe_parse_json('{"overall": {"label": "x"}}', schema=_Report)
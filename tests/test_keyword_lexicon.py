@@ -0,0 +1,65 @@
+"""
+Tests for the compiled keyword lexicon: exact `kw in text.lower()` semantics,
+overlapping keywords and positions on both backends, and detector parity.
+"""
+
+import re
+
+import pytest
+
+from api.utils import keyword_lexicon
+from api.utils.keyword_lexicon import Lexicon
+
+GROUPS = {
+    "proof": ["review", "reviews", "customer reviews", "rating", "star"],
+    "pricing": ["plan", "plans", "pricing plan", "per month"],
+}
+TEXT = "Customer Reviews: 5 STAR rating. Pricing plans from $9 per month; starter plan."
+
+
+def _naive_positions(text, keywords):
+    text = text.lower()
+    return {kw: [m.start() for m in re.finditer("(?=%s)" % re.escape(kw), text)]
+            for kw in keywords if kw in text}
+
+
+@pytest.fixture(params=[False, True], ids=["in-scan", "aho-corasick"])
+def backend(request, monkeypatch):
+    if request.param and not keyword_lexicon.HAS_AHOCORASICK:
+        pytest.skip("pyahocorasick not installed")
+    monkeypatch.setattr(keyword_lexicon, "HAS_AHOCORASICK", request.param)
+    return request.param
+
+
+def test_counts_and_positions_match_substring_semantics(backend):
+    hits = Lexicon(GROUPS).scan(TEXT)
+    all_keywords = [kw for kws in GROUPS.values() for kw in kws]
+
+    assert hits.found("proof") == ["review", "reviews", "customer reviews", "rating", "star"]
+    assert hits.count("pricing") == 4
+    assert hits.positions == _naive_positions(TEXT, all_keywords)
+    # "star" inside "starter" counts, like `"star" in text` did
+    assert len(hits.positions["star"]) == 2
+
+
+def test_matches_ad_hoc_keywords_and_patterns(backend):
+    lexicon = Lexicon(GROUPS, patterns={"price": [r"\$\d+", r"€\d+"]})
+    hits = lexicon.scan(TEXT)
+    assert hits.matches(["Rating", "not there", "from $9"]) == ["Rating", "from $9"]
+    assert hits.pattern_hits("price") == [True, False]
+    assert hits.pattern_count("price") == 1
+    assert lexicon.scan(TEXT) is hits  # memoized per text
+    assert Lexicon({}).scan(None).positions == {}
+
+
+def test_page_type_and_signal_engine_use_shared_scan():
+    from api.brain.context.page_type import PAGE_TYPE_LEXICON, detect_page_type
+    from api.services.signal_engine import _count_keywords, _find_keywords_in_text
+
+    text = "Add to cart. Free shipping and returns. Size, color, quantity. In stock."
+    page_type = detect_page_type("https://shop.example/products/mug", text, None, None, None)
+    assert page_type.type == "ecommerce_product"
+    assert page_type.signals["ecommerce_keywords"] == PAGE_TYPE_LEXICON.scan(text).count("ecommerce") == 7
+
+    assert _find_keywords_in_text("Money-back GUARANTEE", ["guarantee", "refund"]) == ["guarantee"]
+    assert _count_keywords("", ["guarantee"]) == 0
@@ -0,0 +1,170 @@
+"""
+Tests for the incremental landing friction dataset builder and the
+background jobs that run it.
+"""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+
+from api.core.jobs import JobRunner
+from landing_friction import pipeline
+
+
+def _sample(sample_id: str, label: str, friction: int = 40, **extra) -> dict:
+    payload = {
+        "id": sample_id,
+        "label": label,
+        "content": f"Landing page {sample_id}",
+        "total_friction": friction,
+        "dimensions": {
+            "clarity": 50,
+            "overload": 40,
+            "trust": 60,
+            "emotion": 30,
+            "decision_flow": 45,
+            "cta_strength": 55,
+        },
+        "analysis": "ok",
+        "quick_fixes": ["shorten the hero"],
+    }
+    payload.update(extra)
+    return payload
+
+
+@pytest.fixture
+def data_root(tmp_path, monkeypatch):
+    root = tmp_path / "landing_friction"
+    labels = {label: root / label for label in ("low", "medium", "high")}
+    monkeypatch.setattr(pipeline, "DATA_ROOT", root)
+    monkeypatch.setattr(pipeline, "LABEL_DIRS", labels)
+    monkeypatch.setattr(pipeline, "DATASET_PATH", root / "dataset" / "landing_friction_dataset.json")
+    monkeypatch.setattr(pipeline, "MANIFEST_PATH", root / "dataset" / "manifest.db")
+    monkeypatch.setattr(pipeline, "FINE_TUNE_JSONL_PATH", root / "fine_tune" / "landing_friction_finetune.jsonl")
+    pipeline.ensure_directories()
+    yield root
+    store = pipeline._stores.pop(root / "dataset" / "manifest.db", None)
+    if store:
+        store.close_all()
+
+
+def _write(path, payload) -> None:
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def test_build_validates_only_changed_files(data_root):
+    for n in range(3):
+        _write(data_root / "low" / f"s{n}.json", _sample(f"low-{n}", "low", friction=10 * n))
+    _write(data_root / "high" / "h.json", _sample("high-0", "high", friction=90))
+    _write(data_root / "high" / "wrong_label.json", _sample("x", "low"))
+    (data_root / "medium" / "broken.json").write_text("{", encoding="utf-8")
+
+    first = pipeline.build_landing_friction_dataset()
+    assert first.validated_files == 6 and not first.up_to_date
+    assert first.counts_by_label == {"low": 3, "medium": 0, "high": 1}
+    assert first.average_total_friction == {"low": 10.0, "medium": 0.0, "high": 90.0}
+    assert sorted(first.invalid_files) == sorted(
+        [str(data_root / "high" / "wrong_label.json"), str(data_root / "medium" / "broken.json")]
+    )
+
+    second = pipeline.build_landing_friction_dataset()
+    assert second.validated_files == 0 and second.up_to_date
+    assert second.invalid_files == first.invalid_files
+
+    # Touched without a content change: re-hashed, not re-validated
+    os.utime(data_root / "low" / "s0.json", ns=(1, 1))
+    assert pipeline.build_landing_friction_dataset().up_to_date
+
+    _write(data_root / "low" / "s1.json", _sample("low-1", "low", friction=70))
+    (data_root / "low" / "s2.json").unlink()
+    third = pipeline.build_landing_friction_dataset()
+    assert third.validated_files == 1 and not third.up_to_date
+    assert third.counts_by_label["low"] == 2 and third.average_total_friction["low"] == 35.0
+
+    assert pipeline.build_landing_friction_dataset(full=True).validated_files == 5
+
+
+def test_streamed_dataset_matches_json_dump(data_root):
+    assert pipeline.build_landing_friction_dataset().total_samples == 0
+    assert json.loads(pipeline.DATASET_PATH.read_text(encoding="utf-8")) == []
+
+    samples = [
+        _sample("m-2", "medium", url="https://example.com/b"),
+        _sample("h-1", "high", rewrite_examples={"cta": "Start now"}),
+        _sample("l-1", "low", content="قیمت و ارسال رایگان"),
+        _sample("m-1", "medium", expected_result={"total_friction": 12}),
+    ]
+    for sample in samples:
+        _write(data_root / sample["label"] / f"{sample['id']}.json", sample)
+    pipeline.build_landing_friction_dataset()
+
+    ordered = [samples[2], samples[3], samples[0], samples[1]]
+    expected = [pipeline.LandingFrictionSample.model_validate(s).model_dump(mode="json") for s in ordered]
+    assert pipeline.DATASET_PATH.read_text(encoding="utf-8") == json.dumps(expected, indent=2)
+
+
+def test_prepare_finetune_streams_records_and_skips_when_unchanged(data_root):
+    _write(data_root / "low" / "a.json", _sample("a", "low", url="https://example.com/"))
+    _write(data_root / "high" / "b.json", _sample("b", "high", expected_result={"total_friction": 80}))
+
+    first = pipeline.prepare_landing_friction_finetune()
+    assert first.dataset_examples == 2 and first.dataset_summary is not None
+    lines = pipeline.FINE_TUNE_JSONL_PATH.read_text(encoding="utf-8").splitlines()
+    records = [json.loads(line) for line in lines]
+    assert records[0]["messages"][1]["content"].startswith("Sample ID: a\nLabel: low\nURL: https://example.com/\n")
+    assert json.loads(records[0]["messages"][2]["content"])["dimensions"]["clarity"] == 50
+    assert json.loads(records[1]["messages"][2]["content"]) == {"total_friction": 80}
+
+    again = pipeline.prepare_landing_friction_finetune()
+    assert again.up_to_date and again.dataset_examples == 2 and again.dataset_summary is None
+
+    _write(data_root / "medium" / "c.json", _sample("c", "medium"))
+    pipeline.build_landing_friction_dataset()
+    third = pipeline.prepare_landing_friction_finetune()
+    assert not third.up_to_date and third.dataset_examples == 3
+
+
+def test_large_batches_validate_in_a_process_pool(data_root, monkeypatch):
+    monkeypatch.setattr(pipeline, "POOL_MIN_FILES", 4)
+    monkeypatch.setattr(pipeline, "WORKERS", 2)
+    for n in range(6):
+        _write(data_root / "medium" / f"{n:02d}.json", _sample(f"m{n}", "medium", friction=n))
+    (data_root / "medium" / "zz.json").write_text("not json", encoding="utf-8")
+
+    result = pipeline.build_landing_friction_dataset()
+    assert result.validated_files == 7
+    assert result.counts_by_label["medium"] == 6
+    assert result.invalid_files == [str(data_root / "medium" / "zz.json")]
+    ids = [s["id"] for s in json.loads(pipeline.DATASET_PATH.read_text(encoding="utf-8"))]
+    assert ids == [f"m{n}" for n in range(6)]
+
+
+def test_job_runner_coalesces_queued_jobs():
+    runner = JobRunner(max_workers=1, history=10)
+    release = threading.Event()
+    calls = []
+
+    def blocker():
+        release.wait(5)
+        return "blocked"
+
+    def work():
+        calls.append(1)
+        return len(calls)
+
+    running = runner.submit("block", blocker)
+    first = runner.submit("work", work)
+    second = runner.submit("work", work)
+    assert first is second and first.status == "queued"
+
+    failing = runner.submit("fail", lambda: 1 / 0)
+    release.set()
+    asyncio.run(runner.wait(failing, timeout=5))
+    assert running.status == "succeeded" and first.result == 1 and calls == [1]
+    assert failing.status == "failed" and "ZeroDivisionError" in failing.error
+    assert failing.to_dict()["duration_ms"] is not None
+    assert [job.name for job in runner.list()] == ["fail", "work", "block"]
+    assert runner.get(first.id) is first
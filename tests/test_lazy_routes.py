@@ -0,0 +1,104 @@
+"""
+Tests for deferred imports: lazy routers keep eager route precedence, load on
+first request / preload / OpenAPI, and LazyModule reports availability.
+"""
+
+import asyncio
+import sys
+import textwrap
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from api.core.lazy import LazyModule, include_lazy_router, load_lazy_routers, pending_lazy_routers
+
+
+@pytest.fixture
+def router_module(tmp_path, monkeypatch):
+    """Write a throwaway router module and return its name."""
+    name = f"_lazy_router_{len(sys.modules)}"
+    (tmp_path / f"{name}.py").write_text(textwrap.dedent('''
+        from fastapi import APIRouter
+
+        router = APIRouter()
+
+        @router.get("/items/{item_id}")
+        def item(item_id: int):
+            return {"source": "lazy", "item_id": item_id}
+
+        @router.get("/shared")
+        def shared():
+            return {"source": "lazy"}
+    '''))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield name
+    sys.modules.pop(name, None)
+
+
+def _app(router_module):
+    app = FastAPI()
+    include_lazy_router(app, router_module, paths=["/api/items", "/api/shared"], prefix="/api")
+
+    later = APIRouter()
+
+    @later.get("/api/shared")
+    def shared_later():
+        return {"source": "eager"}
+
+    app.include_router(later)
+    return app
+
+
+def test_router_is_imported_on_first_request(router_module):
+    app = _app(router_module)
+    client = TestClient(app)
+
+    assert router_module not in sys.modules
+    assert pending_lazy_routers(app) == [router_module]
+    assert client.get("/api/items/3").json() == {"source": "lazy", "item_id": 3}
+    assert router_module in sys.modules
+    assert pending_lazy_routers(app) == []
+    assert client.get("/api/items/4").json()["item_id"] == 4
+
+
+def test_route_precedence_matches_eager_include(router_module):
+    client = TestClient(_app(router_module))
+    # Included before the eager router, so it still wins after loading
+    assert client.get("/api/shared").json() == {"source": "lazy"}
+
+
+def test_unrelated_paths_do_not_load(router_module):
+    app = _app(router_module)
+    client = TestClient(app)
+    assert client.get("/api/itemsx").status_code == 404
+    assert router_module not in sys.modules
+
+
+def test_preload_and_openapi(router_module):
+    app = _app(router_module)
+    asyncio.run(load_lazy_routers(app))
+    assert pending_lazy_routers(app) == []
+
+    app2 = _app(router_module)
+    paths = TestClient(app2).get("/openapi.json").json()["paths"]
+    assert "/api/items/{item_id}" in paths
+
+
+def test_missing_optional_router_is_skipped():
+    app = FastAPI()
+    include_lazy_router(app, "_no_such_router_module", paths=["/missing"], optional=True)
+    client = TestClient(app)
+    assert client.get("/missing").status_code == 404
+    assert pending_lazy_routers(app) == []
+
+
+def test_lazy_module():
+    json_module = LazyModule("json")
+    assert json_module.available
+    assert json_module.dumps({"a": 1}) == '{"a": 1}'
+
+    missing = LazyModule("_no_such_module_for_lazy_test")
+    assert not missing.available
+    with pytest.raises(ImportError):
+        missing.anything
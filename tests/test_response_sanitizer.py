@@ -0,0 +1,51 @@
+"""
+Tests for the single-pass response sanitizer: ASCII fast path, copy-on-write
+containers, fused repair + non-English hook, numpy scrubbing.
+"""
+
+import numpy as np
+
+from api.utils.output_sanitize import deep_fix_strings, fix_mojibake
+from api.utils.response_sanitizer import ResponseSanitizer, key_path
+from api.utils.text_sanitize import sanitize_any
+
+
+def test_ascii_payload_is_returned_untouched():
+    payload = {"issues": [{"problem": "CTA is weak", "score": 3}], "summary": {"goal": "leads"}}
+    assert deep_fix_strings(payload) is payload
+    assert sanitize_any(payload) is payload
+
+
+def test_only_changed_branches_are_copied():
+    clean = {"ctas": ["Buy now"]}
+    payload = {"clean": clean, "broken": ["ok", "cafÃ©"]}
+    out = deep_fix_strings(payload)
+
+    assert out is not payload
+    assert out["clean"] is clean
+    assert out["broken"] == ["ok", "café"]
+    assert payload["broken"][1] == "cafÃ©"  # input not mutated
+
+
+def test_repairs_and_non_english_hook_run_in_one_walk():
+    seen = []
+
+    def hook(text, path):
+        seen.append(key_path(path))
+        return "[en]"
+
+    sanitizer = ResponseSanitizer(repairs=(fix_mojibake,), non_english=hook)
+    out = sanitizer.sanitize({"issues": [{"problem": "متن فارسی", "note": "cafÃ©"}], "n": 1})
+
+    assert out == {"issues": [{"problem": "[en]", "note": "café"}], "n": 1}
+    assert seen == ["issues.problem"]
+
+
+def test_numpy_values_become_builtins():
+    out = ResponseSanitizer().sanitize({"score": np.float32(0.5), "flags": np.array([1, 2]), "ok": np.bool_(True)})
+    assert out == {"score": 0.5, "flags": [1, 2], "ok": True}
+    assert type(out["score"]) is float and type(out["flags"][0]) is int and type(out["ok"]) is bool
+
+
+def test_ascii_trigger_keeps_entity_unescaping():
+    assert sanitize_any({"t": "Terms &amp; conditions"}) == {"t": "Terms & conditions"}
@@ -0,0 +1,255 @@
+"""
+Tests for the two-tier shared cache: SQLite and Redis-protocol backends
+(the latter against an in-test stand-in server), namespacing, TTLs, size
+limits, degradation when the backend is down, and the capture / LLM users.
+"""
+
+import asyncio
+import socketserver
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from api.core import cache as cache_module
+from api.core.cache import Cache, RespCacheBackend, SQLiteCacheBackend, TTLCache, cached_completion_text
+
+
+class _Clock:
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _RespStandIn(socketserver.ThreadingTCPServer):
+    """Just enough of a Redis server for the backend: AUTH, SELECT, PING, GET, SET [PX], DEL, SCAN."""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, password=None):
+        super().__init__(("127.0.0.1", 0), _RespHandler)
+        self.password = password
+        self.data = {}
+        self.commands = []
+
+    @property
+    def url(self) -> str:
+        auth = f":{self.password}@" if self.password else ""
+        return f"redis://{auth}127.0.0.1:{self.server_address[1]}/2"
+
+
+class _RespHandler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(size + 2)[:-2])
+        return args
+
+    def _bulk(self, value):
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        authed = server.password is None
+        while True:
+            args = self._read_command()
+            if args is None:
+                return
+            name = args[0].upper().decode()
+            server.commands.append(name)
+            if name == "AUTH":
+                authed = args[1].decode() == server.password
+                reply = b"+OK\r\n" if authed else b"-WRONGPASS invalid password\r\n"
+            elif not authed:
+                reply = b"-NOAUTH Authentication required.\r\n"
+            elif name in ("SELECT", "SET", "PING"):
+                if name == "SET":
+                    expires = None
+                    if len(args) > 3 and args[3].upper() == b"PX":
+                        expires = time.monotonic() + int(args[4]) / 1000
+                    server.data[args[1]] = (args[2], expires)
+                reply = b"+PONG\r\n" if name == "PING" else b"+OK\r\n"
+            elif name == "GET":
+                value, expires = server.data.get(args[1], (None, None))
+                if expires is not None and expires <= time.monotonic():
+                    value = None
+                reply = self._bulk(value)
+            elif name == "DEL":
+                removed = sum(server.data.pop(key, None) is not None for key in args[1:])
+                reply = b":%d\r\n" % removed
+            elif name == "SCAN":
+                prefix = args[3].rstrip(b"*").replace(b"\\", b"")
+                keys = [key for key in server.data if key.startswith(prefix)]
+                reply = b"*2\r\n" + self._bulk(b"0") + b"*%d\r\n" % len(keys) + b"".join(map(self._bulk, keys))
+            else:
+                reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+@pytest.fixture
+def resp_server():
+    server = _RespStandIn(password="s3cret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def sqlite_backend(tmp_path):
+    backend = SQLiteCacheBackend(tmp_path / "shared.db", clock=_Clock())
+    yield backend
+    backend.close()
+
+
+def test_workers_share_entries_through_the_sqlite_file(sqlite_backend):
+    worker_a = Cache("capture", sqlite_backend, ttl=60)
+    worker_b = Cache("capture", sqlite_backend, ttl=60)
+
+    worker_a.set("k", {"status": "ok", "items": [1, 2]})
+    first = worker_b.get("k")
+    assert first == {"status": "ok", "items": [1, 2]}
+    first["items"].append(3)
+    assert worker_b.get("k") == {"status": "ok", "items": [1, 2]}
+    assert worker_b.stats == {"local": 1, "shared": 1, "miss": 0, "errors": 0}
+
+    # Namespaces and versions do not see each other's keys
+    assert Cache("llm", sqlite_backend).get("k") is None
+    assert Cache("capture", sqlite_backend, version="v2").get("k") is None
+
+    sqlite_backend._clock.now += 61
+    assert Cache("capture", sqlite_backend).get("k") is None
+
+    raw = Cache("frames", sqlite_backend, codec="bytes")
+    raw.set("png", b"\x89PNG")
+    assert Cache("frames", sqlite_backend, codec="bytes").get("png") == b"\x89PNG"
+
+    worker_a.set("other", [1])
+    worker_a.clear()
+    assert Cache("capture", sqlite_backend).get("other") is None
+    assert Cache("frames", sqlite_backend, codec="bytes").get("png") == b"\x89PNG"
+
+
+def test_sqlite_backend_evicts_least_recently_read(sqlite_backend):
+    clock = sqlite_backend._clock
+    sqlite_backend.max_bytes = 1000
+    for n in range(4):
+        sqlite_backend.set(f"k{n}", b"x" * 200)
+        clock.now += 100
+    sqlite_backend.get("k0")  # read recently: survives
+    sqlite_backend.set("short", b"y" * 10, ttl=5)
+    clock.now += 10
+    sqlite_backend.set("k4", b"x" * 300)  # writes past max_bytes // 16 trigger evict()
+
+    assert sqlite_backend.get("short") is None
+    assert sqlite_backend.get("k0") is not None and sqlite_backend.get("k4") is not None
+    assert sqlite_backend.get("k1") is None
+    total = sqlite_backend.store.connection().execute("SELECT SUM(size) FROM cache_entries").fetchone()[0]
+    assert total <= 900
+
+
+def test_values_over_the_size_limit_stay_local(sqlite_backend):
+    cache = Cache("capture", sqlite_backend, max_value_bytes=100)
+    cache.set("big", "z" * 500)
+    assert cache.get("big") == "z" * 500
+    assert Cache("capture", sqlite_backend).get("big") is None
+
+
+def test_resp_backend_against_stand_in(resp_server):
+    backend = RespCacheBackend(resp_server.url)
+    assert backend.ping()
+    assert resp_server.commands[:2] == ["AUTH", "SELECT"]
+
+    worker_a = Cache("llm", backend, ttl=0.2)
+    worker_b = Cache("llm", RespCacheBackend(resp_server.url), ttl=0.2)
+    worker_a.set("answer", "42")
+    assert worker_b.get("answer") == "42"
+    assert worker_b.stats["shared"] == 1
+
+    time.sleep(0.25)
+    assert Cache("llm", backend).get("answer") is None
+
+    Cache("visual", backend).set("a", 1)
+    Cache("llm", backend).set("b", 2)
+    Cache("visual", backend).clear()
+    assert Cache("visual", backend).get("a") is None
+    assert Cache("llm", backend).get("b") == 2
+
+    with pytest.raises(cache_module.RespError):
+        RespCacheBackend(resp_server.url.replace("s3cret", "wrong")).get("x")
+    backend.close()
+
+
+def test_unreachable_backend_degrades_to_local():
+    with socketserver.TCPServer(("127.0.0.1", 0), socketserver.BaseRequestHandler) as probe:
+        port = probe.server_address[1]
+    cache = Cache("capture", RespCacheBackend(f"redis://127.0.0.1:{port}/0", timeout=0.5), retry_seconds=60)
+    assert cache.get("k") is None
+    cache.set("k", {"v": 1})
+    assert cache.get("k") == {"v": 1}
+    assert cache.stats["errors"] == 1
+
+
+def test_ttl_cache_per_entry_ttl():
+    clock = _Clock(0)
+    local = TTLCache(ttl=10, max_items=4, clock=clock)
+    local.put("a", 1)
+    local.put("b", 2, ttl=1)
+    clock.now = 5
+    assert local.get("a") == 1 and local.get("b") is None
+
+
+@pytest.fixture
+def shared_registry(sqlite_backend, monkeypatch):
+    monkeypatch.setattr(cache_module, "_backend", sqlite_backend)
+    monkeypatch.setattr(cache_module, "_backend_ready", True)
+    monkeypatch.setattr(cache_module, "_caches", {})
+    return sqlite_backend
+
+
+def test_llm_answers_are_cached_by_request(shared_registry):
+    calls = []
+
+    def create(**request):
+        calls.append(request)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"answer {len(calls)}"))])
+
+    messages = [{"role": "user", "content": "hi"}]
+    assert cached_completion_text(create, model="m", messages=messages, temperature=0.3) == "answer 1"
+    assert cached_completion_text(create, model="m", messages=messages, temperature=0.3) == "answer 1"
+    assert cached_completion_text(create, model="m", messages=messages, temperature=0.7) == "answer 2"
+    assert len(calls) == 2
+
+
+def test_page_captures_are_reused_until_refresh(shared_registry, monkeypatch):
+    from api.services import page_capture
+
+    captures = []
+
+    async def fake_capture(url, base_url=None):
+        captures.append(url)
+        return {"status": "error" if "down" in url else "ok", "n": len(captures)}
+
+    monkeypatch.setattr(page_capture, "_capture_page_artifacts", fake_capture)
+
+    async def scenario():
+        first = await page_capture.capture_page_artifacts("https://example.com")
+        again = await page_capture.capture_page_artifacts("https://example.com")
+        fresh = await page_capture.capture_page_artifacts("https://example.com", refresh=True)
+        await page_capture.capture_page_artifacts("https://down.example.com")
+        await page_capture.capture_page_artifacts("https://down.example.com")
+        return first, again, fresh
+
+    first, again, fresh = asyncio.run(scenario())
+    assert first == again == {"status": "ok", "n": 1}
+    assert fresh["n"] == 2
+    assert captures.count("https://down.example.com") == 2
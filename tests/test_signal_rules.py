@@ -0,0 +1,76 @@
+"""
+Tests for the declarative signal rule engine and the 12 signals declared in
+signal_engine.
+"""
+
+import asyncio
+
+import pytest
+
+from api.services import signal_engine
+from api.services.signal_rules import Keywords, Outcome, SignalRule, compile_plan, gte
+from api.utils.keyword_lexicon import Lexicon
+
+PAGE_TEXT = (
+    "We help teams grow and reduce churn. Trusted by 2,000 customers - read the reviews and testimonials. "
+    "Free trial, cancel anytime, no credit card. Pricing plans from $29 per month. "
+    "Contact support, privacy and terms. Sign up with your email."
+)
+HEADLINES = [{"tag": "h1", "text": "Grow revenue"}, {"tag": "h2", "text": "How it works"}]
+CTAS = [{"label": "Get started"}, {"label": "Submit"}]
+
+
+def _by_id(signals):
+    return {s["id"]: s for s in signals}
+
+
+def test_declared_rules_cover_the_12_signals():
+    assert [r.rule.id for r in signal_engine.SIGNAL_PLAN.rules] == [d["id"] for d in signal_engine.SIGNAL_DEFINITIONS]
+
+
+def test_plan_evaluates_tokenized_page():
+    page = signal_engine.SIGNAL_PLAN.tokenize(PAGE_TEXT, HEADLINES, CTAS)
+    signals = _by_id(signal_engine.SIGNAL_PLAN.evaluate(page))
+
+    assert signals["value_prop_presence"]["status"] == "present"
+    assert signals["value_prop_presence"]["evidence"]["keywords"] == ["help", "grow", "reduce"]
+    assert signals["social_proof_presence"]["reason"] == "Found 4 social proof indicators"
+    assert signals["risk_reducers"]["evidence"]["keywords"] == ["free trial", "cancel anytime", "no credit card"]
+    assert signals["cta_clarity"]["status"] == "weak"
+    assert signals["cta_clarity"]["evidence"] == {"text": "submit"}
+    assert signals["cta_competition"]["reason"] == "2 CTA(s) in hero - moderate competition"
+    assert signals["information_hierarchy"]["confidence"] == 0.9
+    assert signals["cognitive_load"]["status"] == "low"
+    assert "evidence" not in signal_engine.SIGNAL_PLAN.evaluate_rule(
+        "cta_clarity", signal_engine.SIGNAL_PLAN.tokenize("", [], []))
+
+
+def test_detect_signals_falls_back_to_rules_without_llm(monkeypatch):
+    import api.chat
+
+    def no_llm():
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(api.chat, "get_client", no_llm)
+    result = asyncio.run(signal_engine.detect_signals(
+        {"dom": {"readable_text_excerpt": PAGE_TEXT}}, {"headlines": HEADLINES, "ctas": CTAS}))
+    batch = signal_engine.evaluate_signals_batch([(PAGE_TEXT, HEADLINES, CTAS), ("", [], [])])
+
+    assert batch[0] == result
+    assert len(batch[1]["signals"]) == 12
+    assert batch[1]["summary"]["primary_issue"] is not None
+
+
+def test_compile_plan_rejects_undeclared_measures():
+    lexicon = Lexicon({"proof": ["review"]})
+    fallback = Outcome("missing", 0.8, "none", "add proof", evidence={})
+
+    bad_reason = SignalRule(id="s", label="S", category="trust", keywords={"proof": "page"}, outcomes=(
+        Outcome("present", 0.9, "{reviews} found", "ok", when=gte("proof", 1)), fallback))
+    with pytest.raises(ValueError, match="undeclared"):
+        compile_plan([bad_reason], lexicon, {"page": lambda p: p.page_text}, {}, {})
+
+    no_fallback = SignalRule(id="s", label="S", category="trust", keywords={"proof": "page"}, outcomes=(
+        Outcome("present", 0.9, "found", "ok", when=gte("proof", 1), evidence={"k": Keywords("proof")}),))
+    with pytest.raises(ValueError, match="fallback"):
+        compile_plan([no_fallback], lexicon, {"page": lambda p: p.page_text}, {}, {})
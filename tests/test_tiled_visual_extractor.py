@@ -0,0 +1,118 @@
+"""
+Tests for tile-based analysis of tall full-page screenshots.
+"""
+
+from PIL import Image
+
+from api.vision import tiled_visual_extractor
+from api.vision.tiled_visual_extractor import (
+    extract_visual_elements_tiled,
+    iter_bands,
+    merge_seam_duplicates,
+)
+
+
+def test_iter_bands_overlap_and_cover_page():
+    bands = iter_bands(5000, 1000, overlap=0.2)
+    assert bands[0] == (0, 1000)
+    assert bands[-1][1] == 5000
+    for (t0, b0), (t1, _b1) in zip(bands, bands[1:]):
+        assert t1 < b0  # consecutive bands overlap
+    assert all(b - t == 1000 for t, b in bands)
+    assert iter_bands(600, 1000) == [(0, 600)]
+
+
+def test_merge_seam_duplicates_unions_same_role_boxes():
+    a = {"id": "cta_1", "role": "cta", "tile": 0, "analysis": {"confidence": 0.9},
+         "coordinates": {"x": 100, "y": 900, "width": 200, "height": 80}}
+    b = {"id": "cta_1", "role": "cta", "tile": 1, "analysis": {"confidence": 0.6},
+         "coordinates": {"x": 100, "y": 920, "width": 200, "height": 100}}
+    other = {"id": "h", "role": "headline", "tile": 1, "analysis": {"confidence": 0.5},
+             "coordinates": {"x": 100, "y": 920, "width": 200, "height": 100}}
+    merged = merge_seam_duplicates([b, a, other])
+    ctas = [e for e in merged if e["role"] == "cta"]
+    assert len(ctas) == 1
+    assert ctas[0]["coordinates"] == {"x": 100, "y": 900, "width": 200, "height": 120}
+    assert ctas[0]["merged_tiles"] == [0, 1]
+    assert len(merged) == 2
+
+
+def test_tiled_extraction_maps_coordinates_and_sections(monkeypatch):
+    calls = []
+
+    def fake_extract(image_bytes, debug=False, image=None):
+        calls.append(image.size)
+        # One CTA at the top of every band, in extractor (resized) coordinates
+        return {
+            "elements": [{"id": "cta", "role": "cta", "analysis": {"confidence": 0.8},
+                          "coordinates": {"x": 10, "y": 10, "width": 100, "height": 40}}],
+            "metrics": {"edge_density": 0.1, "text_block_density": 0.2, "cta_candidates": 1},
+        }
+
+    monkeypatch.setattr(tiled_visual_extractor, "extract_visual_elements", fake_extract)
+    page = Image.new("RGB", (2880, 12000), (255, 255, 255))
+
+    out = extract_visual_elements_tiled(b"", band_height=1600, image=page)
+
+    # Bands never exceed band_height: memory is bounded by one band's working set
+    assert all(h <= 1600 for _w, h in calls)
+    assert out["tiles"]["count"] == len(calls) > 2
+    # 2880px page is downsized to 1440 by the extractor -> coordinates scale by 2
+    first = out["elements"][0]
+    assert first["coordinates"] == {"x": 20, "y": 20, "width": 200, "height": 80}
+    assert first["section"] == "hero"
+    assert out["elements"][-1]["section"] == "footer"
+    assert set(out["sections"]) == {"hero", "mid_page", "footer"}
+    assert out["sections"]["mid_page"]["element_count"] >= 1
+    assert out["sections"]["hero"]["has_cta"] is True
+    assert out["metrics"]["cta_candidates"] == len(calls)
+
+
+def test_tiled_analysis_with_a_model_decodes_the_page_once(monkeypatch):
+    import io
+
+    from api.services import image_trust_service
+
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 1200), (240, 240, 240)).save(buf, format="PNG")
+    decodes, seen = [], []
+    real_decode = image_trust_service.decode_image
+
+    def counting_decode(data):
+        decodes.append(1)
+        return real_decode(data)
+
+    def fake_tiled(image_bytes, image=None):
+        seen.append(image)
+        return {"elements": [{"id": "h", "role": "headline"}] * 4, "metrics": {}, "sections": [], "tiles": []}
+
+    monkeypatch.setattr(image_trust_service, "decode_image", counting_decode)
+    monkeypatch.setattr(image_trust_service, "extract_visual_elements_tiled", fake_tiled)
+    monkeypatch.setattr(image_trust_service, "get_trust_model", lambda: object())
+    monkeypatch.setattr(
+        image_trust_service,
+        "predict_trust_distribution",
+        lambda image: seen.append(image) or {"low": 0.2, "medium": 0.3, "high": 0.5},
+    )
+
+    result = image_trust_service.analyze_image_trust_bytes(buf.getvalue(), tiled=True)
+    assert decodes == [1]
+    assert seen[0] is seen[1] and seen[0].size == (400, 1200)
+    assert result["sections"] == []
+
+
+def test_tiles_report_missing_opencv(monkeypatch):
+    from types import SimpleNamespace
+
+    from api.vision import local_visual_extractor
+
+    monkeypatch.setattr(local_visual_extractor, "cv2", SimpleNamespace(available=False))
+    page = Image.new("RGB", (800, 3000), (255, 255, 255))
+
+    band = local_visual_extractor.extract_visual_elements(b"", image=page.crop((0, 0, 800, 600)))
+    assert band["error"] == "opencv_not_available" and "edge_density" in band["metrics"]
+
+    out = extract_visual_elements_tiled(b"", image=page)
+    assert out["analysisStatus"] == "fallback"
+    assert out["error"] == "opencv_not_available"
+    assert out["tiles"]["count"] > 1
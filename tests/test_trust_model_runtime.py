@@ -0,0 +1,75 @@
+"""
+Tests for the lightweight learned visual trust model runtime and its blending
+into the local visual trust result.
+"""
+
+import numpy as np
+from PIL import Image
+
+from api.services import image_trust_service
+from api.vision import trust_model_runtime
+from api.vision.trust_model_runtime import preprocess_for_model
+
+
+def _reset_runtime(monkeypatch):
+    monkeypatch.setattr(trust_model_runtime, "_runtime", None)
+    monkeypatch.setattr(trust_model_runtime, "_runtime_checked", False)
+
+
+def test_no_artifact_means_no_model(monkeypatch, tmp_path):
+    _reset_runtime(monkeypatch)
+    monkeypatch.setenv("VISUAL_TRUST_MODEL_PATH", str(tmp_path / "missing.tflite"))
+    assert trust_model_runtime.get_trust_model() is None
+    assert trust_model_runtime.predict_trust_distribution(Image.new("RGB", (10, 10))) is None
+
+
+def test_model_can_be_disabled(monkeypatch):
+    _reset_runtime(monkeypatch)
+    monkeypatch.setenv("VISUAL_TRUST_MODEL_ENABLED", "false")
+    assert trust_model_runtime.get_trust_model() is None
+
+
+def test_preprocess_keeps_raw_pixels_and_crops_tall_pages():
+    tall = Image.new("RGB", (1000, 8000), (255, 255, 255))
+    tall.paste((0, 0, 0), (0, 4000, 1000, 8000))
+    x = preprocess_for_model(tall)
+    assert x.shape == (224, 224, 3)
+    assert x.dtype == np.float32
+    # Hero crop only keeps the (white) top of the page, pixels stay in 0..255
+    assert float(x.min()) == 255.0
+
+
+def test_model_probs_fill_distribution_and_blend_score(monkeypatch):
+    monkeypatch.setenv("VISUAL_TRUST_MODEL_WEIGHT", "0.5")
+    extracted = {"elements": [{"id": "h", "role": "headline"}] * 4, "metrics": {}}
+
+    heuristic = image_trust_service._build_local_visual_result(b"", extracted=extracted)
+    assert heuristic.distribution is None
+
+    blended = image_trust_service._build_local_visual_result(
+        b"", extracted=extracted, model_probs={"low": 0.0, "medium": 0.0, "high": 1.0}
+    )
+    assert blended.distribution == {"low": 0.0, "medium": 0.0, "high": 100.0}
+    assert blended.overall_score == (heuristic.overall_score + 100.0) / 2
+    assert any("Learned visual trust model" in line for line in blended.narrative)
+
+
+def test_analyze_uses_runtime_when_available(monkeypatch):
+    class FakeRuntime:
+        fingerprint = "fake"
+
+        def predict_images(self, images):
+            return [{"low": 0.8, "medium": 0.2, "high": 0.0} for _ in images]
+
+    monkeypatch.setattr(trust_model_runtime, "_runtime", FakeRuntime())
+    monkeypatch.setattr(trust_model_runtime, "_runtime_checked", True)
+    monkeypatch.setattr(image_trust_service, "get_visual_cache", lambda: None)
+    monkeypatch.setattr(
+        image_trust_service,
+        "extract_visual_elements",
+        lambda image_bytes, debug=False, image=None: {"elements": [{"id": "h", "role": "headline"}] * 4, "metrics": {}},
+    )
+
+    img = Image.new("RGB", (64, 64), (10, 20, 30))
+    res = image_trust_service.analyze_image_trust_bytes(b"x", image=img)
+    assert res["distribution"]["low"] == 80.0
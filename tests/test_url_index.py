@@ -0,0 +1,99 @@
+"""
+Tests for the URL classification index: suffix-trie lookups, compiled URL
+flags, TTL expiry, and the cached context results.
+"""
+
+from api.brain.context import brand_context
+from api.brain.context.url_index import (
+    URL_PATTERNS,
+    DomainSuffixTrie,
+    TTLCache,
+    UrlPatternMatcher,
+    classify_url,
+    content_fingerprint,
+    get_url_index,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_trie_exact_and_subdomain_entries():
+    trie = DomainSuffixTrie()
+    trie.add("amazon.com", "exact")
+    trie.add("example.org", "tree", include_subdomains=True)
+
+    assert trie.lookup("amazon.com") == {"exact"}
+    assert trie.lookup("aws.amazon.com") == frozenset()
+    assert trie.lookup("com") == frozenset()
+    assert trie.lookup("example.org") == {"tree"}
+    assert trie.lookup("a.b.example.org") == {"tree"}
+    assert trie.lookup("notexample.org") == frozenset()
+
+
+def test_matcher_reports_overlapping_flags():
+    matcher = UrlPatternMatcher(URL_PATTERNS)
+
+    assert matcher.match("https://x.com/pricing") == {"pricing", "pricing_path"}
+    assert matcher.match("https://x.com/p?tab=pricing") == {"pricing"}
+    assert matcher.match("https://x.com/signup") == {"signup", "signup_path"}
+    assert matcher.match("https://x.com/sign-up") == {"signup"}
+    assert matcher.match("https://x.com/docs/products") == {"docs", "product"}
+    assert matcher.match("https://x.com/about") == frozenset()
+
+
+def test_ttl_cache_expires_and_evicts():
+    clock = FakeClock()
+    cache = TTLCache(ttl=10, max_items=2, clock=clock)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+
+    cache.put("c", 3)  # "b" is least recently used
+    assert cache.get("b") is None
+    assert len(cache) == 2
+
+    clock.now = 10
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.hits == 1 and cache.misses == 3
+
+
+def test_classify_url_matches_domain_lists():
+    facts = classify_url("https://www.amazon.com/product/123")
+    assert facts.domain == brand_context.normalize_domain("https://www.amazon.com/product/123")
+    assert "large_ecommerce" in facts.domain_tags or "enterprise" in facts.domain_tags
+    assert facts.marketplace and facts.channel == "marketplace_product"
+    assert "product" in facts.flags
+
+    other = classify_url("https://janedoe.io/pricing")
+    assert other.domain_tags == frozenset()
+    assert other.channel == "generic_saas"
+    assert other.host_label == "janedoe"
+    assert classify_url("https://janedoe.io/pricing") is other
+
+
+def test_build_context_is_cached_per_content():
+    index = get_url_index()
+    index.contexts.clear()
+    url = "https://example.org/pricing"
+    text = "Start your free trial. Pricing plans per month."
+
+    first = brand_context.build_context(url, text, None)
+    first["page_type"]["type"] = "mutated"
+    second = brand_context.build_context(url, text, None)
+    assert index.contexts.hits == 1
+    assert second["page_type"]["type"] != "mutated"
+
+    brand_context.build_context(url, text + " Book a demo.", None)
+    assert index.contexts.hits == 1
+
+
+def test_content_fingerprint_tolerates_unsortable_keys():
+    assert content_fingerprint("a", {1: "x", "b": "y"}) == content_fingerprint("a", {1: "x", "b": "y"})
+    assert content_fingerprint("a", None) != content_fingerprint("b", None)
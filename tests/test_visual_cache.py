@@ -0,0 +1,111 @@
+"""
+Tests for the visual trust result cache (exact-hash + perceptual near-duplicate tiers).
+"""
+
+import io
+
+import pytest
+from PIL import Image, ImageDraw
+
+from api.services import image_trust_service
+from api.services.visual_cache import VisualResultCache, compute_dhash, hamming_distance
+
+
+def _hero_png(shift: int = 0, fmt: str = "PNG") -> bytes:
+    img = Image.new("RGB", (640, 400), (245, 245, 245))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle((40, 40, 600, 110), fill=(20, 20, 20))
+    draw.rectangle((220 + shift, 250, 420 + shift, 300), fill=(30, 90, 220))
+    draw.ellipse((500, 320, 560, 380), fill=(200, 40, 40))
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, quality=90)
+    return buf.getvalue()
+
+
+def _fake_result(score: float = 72.0) -> dict:
+    return {"status": "ok", "label": "High", "overall_score": score, "elements": [], "narrative": []}
+
+
+def test_dhash_is_stable_across_reencoding():
+    png = _hero_png()
+    jpg = _hero_png(fmt="JPEG")
+    assert png != jpg
+    h_png = compute_dhash(png)
+    h_jpg = compute_dhash(jpg)
+    assert h_png is not None and h_jpg is not None
+    assert hamming_distance(h_png, h_jpg) <= 3
+    assert compute_dhash(b"not an image") is None
+
+
+def test_cache_tiers_memory_sqlite_phash(tmp_path):
+    db = tmp_path / "vc.db"
+    cache = VisualResultCache(db_path=db, max_items=8)
+    png = _hero_png()
+
+    hit, key = cache.lookup(png)
+    assert hit is None
+    cache.store(key, _fake_result())
+
+    hit, _ = cache.lookup(png)
+    assert hit["cache"]["tier"] == "memory"
+    assert hit["overall_score"] == 72.0
+
+    # Fresh process (empty LRU) reads through to SQLite
+    cold = VisualResultCache(db_path=db, max_items=8)
+    hit, _ = cold.lookup(png)
+    assert hit["cache"]["tier"] == "sqlite"
+
+    # Same page re-encoded: different bytes, visually identical
+    cold2 = VisualResultCache(db_path=db, max_items=8)
+    hit, _ = cold2.lookup(_hero_png(fmt="JPEG"))
+    assert hit is not None
+    assert hit["cache"]["tier"] == "phash"
+    assert hit["cache"]["distance"] <= cold2.phash_threshold
+
+
+def test_cache_lru_is_bounded_and_hits_are_copies(tmp_path):
+    cache = VisualResultCache(db_path=tmp_path / "vc.db", max_items=2, phash_threshold=0)
+    keys = []
+    for shift in (0, 60, 120):
+        data = _hero_png(shift=shift)
+        _, key = cache.lookup(data)
+        cache.store(key, _fake_result(score=float(shift)))
+        keys.append(data)
+    assert len(cache._lru) == 2
+
+    hit, _ = cache.lookup(keys[-1])
+    hit["overall_score"] = -1
+    again, _ = cache.lookup(keys[-1])
+    assert again["overall_score"] == 120.0
+
+    # The stored entry does not share nested objects with the caller's result
+    result = _fake_result()
+    _, key = cache.lookup(keys[0])
+    cache.store(key, result)
+    result["elements"].append({"type": "cta"})
+    hit, _ = cache.lookup(keys[0])
+    assert hit["elements"] == []
+
+
+def test_analyze_image_trust_bytes_uses_cache(tmp_path, monkeypatch):
+    cache = VisualResultCache(db_path=tmp_path / "vc.db")
+    monkeypatch.setattr(image_trust_service, "get_visual_cache", lambda: cache)
+    calls = {"n": 0}
+
+    def fake_extract(image_bytes, debug=False, image=None):
+        calls["n"] += 1
+        return {"elements": [{"id": "h", "role": "headline"}] * 4, "metrics": {}}
+
+    monkeypatch.setattr(image_trust_service, "extract_visual_elements", fake_extract)
+
+    png = _hero_png()
+    first = image_trust_service.analyze_image_trust_bytes(png)
+    second = image_trust_service.analyze_image_trust_bytes(png)
+    assert first["cache"]["tier"] == "miss"
+    assert second["cache"]["tier"] == "memory"
+    assert second["overall_score"] == first["overall_score"]
+    assert calls["n"] == 1
+
+    # debug runs bypass the cache
+    image_trust_service.analyze_image_trust_bytes(png, debug=True)
+    assert calls["n"] == 2
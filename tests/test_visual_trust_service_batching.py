@@ -0,0 +1,70 @@
+"""
+Tests for dynamic micro-batching in visual_trust_service.
+"""
+
+import asyncio
+import io
+
+import numpy as np
+from PIL import Image
+
+from visual_trust_service.app import MicroBatcher, predictions_to_result, preprocess_image
+
+
+def test_concurrent_requests_share_one_forward_pass():
+    calls = []
+
+    def fake_predict(batch):
+        calls.append(batch.shape[0])
+        # Row i echoes the mean pixel of image i so we can check the mapping
+        means = batch.reshape(batch.shape[0], -1).mean(axis=1)
+        return np.stack([means, 1 - means, np.zeros_like(means)], axis=1)
+
+    async def run():
+        batcher = MicroBatcher(fake_predict, max_batch=8, max_wait_ms=50)
+        inputs = [np.full((224, 224, 3), i / 10.0, dtype=np.float32) for i in range(6)]
+        outs = await asyncio.gather(*(batcher.submit(x) for x in inputs))
+        await batcher.stop()
+        return outs, batcher.stats
+
+    outs, stats = asyncio.run(run())
+    assert calls == [6]
+    assert stats["batches"] == 1 and stats["items"] == 6
+    for i, row in enumerate(outs):
+        assert abs(float(row[0]) - i / 10.0) < 1e-6
+
+
+def test_batches_are_capped_and_errors_propagate():
+    calls = []
+
+    def fake_predict(batch):
+        calls.append(batch.shape[0])
+        if batch.shape[0] == 1:
+            raise RuntimeError("boom")
+        return np.zeros((batch.shape[0], 3))
+
+    async def run():
+        batcher = MicroBatcher(fake_predict, max_batch=4, max_wait_ms=20)
+        x = np.zeros((224, 224, 3), dtype=np.float32)
+        results = await asyncio.gather(*(batcher.submit(x) for _ in range(9)), return_exceptions=True)
+        await batcher.stop()
+        return results
+
+    results = asyncio.run(run())
+    assert calls == [4, 4, 1]
+    assert isinstance(results[-1], RuntimeError)
+    assert all(isinstance(r, np.ndarray) for r in results[:8])
+
+
+def test_preprocess_and_result_shape():
+    img = Image.new("RGBA", (2400, 600), (255, 0, 0, 128))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    x = preprocess_image(buf.getvalue())
+    assert x.shape == (224, 224, 3)
+    assert x.dtype == np.float32
+    assert 0.0 <= float(x.min()) and float(x.max()) <= 1.0
+
+    res = predictions_to_result(np.array([0.1, 0.2, 0.7]))
+    assert res["label"] == "high"
+    assert set(res["probs"]) == {"low", "medium", "high"}
@@ -0,0 +1,99 @@
+"""
+Tests for the startup warm-up runner: concurrency, timeouts, failures, task
+selection via env, readiness, and the offline warm-up tasks.
+"""
+
+import asyncio
+import threading
+import time
+
+from api.core.warmup import WarmupRunner
+from api.services import warmup as warmup_tasks
+
+
+def test_tasks_run_concurrently_and_report():
+    runner = WarmupRunner(enabled=True, timeout=5)
+    barrier = threading.Barrier(2, timeout=2)
+
+    def sync_a():
+        barrier.wait()  # only passes if sync_b runs at the same time
+        return {"a": 1}
+
+    def sync_b():
+        barrier.wait()
+        return {"b": 2}
+
+    async def async_c():
+        await asyncio.sleep(0)
+        return "done"
+
+    runner.register("a", sync_a)
+    runner.register("b", sync_b)
+    runner.register("c", async_c)
+    assert not runner.ready
+
+    status = asyncio.run(runner.run())
+
+    assert runner.ready and status["ready"]
+    assert {name: t["status"] for name, t in status["tasks"].items()} == {"a": "ok", "b": "ok", "c": "ok"}
+    assert status["tasks"]["a"]["detail"] == {"a": 1}
+    assert status["tasks"]["c"]["detail"] == "done"
+    assert all(t["duration_ms"] is not None for t in status["tasks"].values())
+
+
+def test_failures_and_timeouts_do_not_block_readiness():
+    runner = WarmupRunner(enabled=True, timeout=0.05)
+
+    def broken():
+        raise RuntimeError("no browser")
+
+    runner.register("broken", broken)
+    runner.register("slow", lambda: time.sleep(0.3))
+    status = asyncio.run(runner.run())
+
+    assert runner.ready
+    assert status["tasks"]["broken"]["status"] == "failed"
+    assert "no browser" in status["tasks"]["broken"]["error"]
+    assert status["tasks"]["slow"]["status"] == "timeout"
+
+
+def test_task_selection_from_env(monkeypatch):
+    ran = []
+    runner = WarmupRunner(enabled=True)
+    for name in ("a", "b", "c"):
+        runner.register(name, lambda name=name: ran.append(name))
+    runner.register("optional", lambda: ran.append("optional"), default=False)
+
+    monkeypatch.setenv("WARMUP_SKIP", "b")
+    asyncio.run(runner.run())
+    assert sorted(ran) == ["a", "c"]
+    assert runner.tasks["b"].status == "skipped"
+    assert runner.tasks["optional"].status == "skipped"
+
+    ran.clear()
+    monkeypatch.delenv("WARMUP_SKIP")
+    monkeypatch.setenv("WARMUP_TASKS", "optional, a")
+    asyncio.run(runner.run())
+    assert sorted(ran) == ["a", "optional"]
+
+
+def test_disabled_runner_is_ready():
+    runner = WarmupRunner(enabled=False)
+    runner.register("a", lambda: 1 / 0)
+    assert runner.ready
+    assert asyncio.run(runner.run())["tasks"]["a"]["status"] == "pending"
+
+
+def test_synthetic_analysis_of_bundled_fixture():
+    result = warmup_tasks.run_synthetic_analysis()
+    assert result["headlines"] > 0
+    assert result["signals"] > 0
+    assert result["page_type"]
+
+
+def test_default_tasks_registered(monkeypatch):
+    monkeypatch.setenv("WARMUP_SYNTHETIC_ANALYSIS", "true")
+    runner = WarmupRunner(enabled=True)
+    warmup_tasks.register_default_tasks(runner)
+    names = [t.name for t in runner.selected()]
+    assert {"brain_prompt", "sqlite", "playwright", "trust_model", "opencv", "synthetic_analysis"} <= set(names)
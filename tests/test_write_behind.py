@@ -0,0 +1,142 @@
+"""
+Tests for the write-behind persistence queue: batching per sink, failure
+isolation, flush, write-through, pending file reads, and queued analyses.
+"""
+
+import csv
+import threading
+
+import pytest
+
+from api.core.write_behind import WriteBehindQueue, write_behind
+from api.memory import brain_memory
+from api.memory.event_log import AnalysisEventLog
+from api.memory.store import SQLiteStore
+
+
+@pytest.fixture
+def memory_store(tmp_path, monkeypatch):
+    store = SQLiteStore(tmp_path / "brain.db", brain_memory.SCHEMA, migrations=[brain_memory._migrate_normalize_issues])
+    monkeypatch.setattr(brain_memory, "store", store)
+    monkeypatch.setattr(brain_memory, "event_log", AnalysisEventLog(root=tmp_path / "events"))
+    yield store
+    store.close_all()
+
+
+def test_items_are_batched_per_sink_in_order():
+    queue = WriteBehindQueue(enabled=True, batch_size=100)
+    started, gate = threading.Event(), threading.Event()
+    batches = []
+
+    def slow(items):
+        started.set()
+        gate.wait(2)
+        batches.append(("slow", list(items)))
+
+    queue.register("slow", slow)
+    queue.register("rows", lambda items: batches.append(("rows", list(items))))
+    queue.put("slow", 0)  # keeps the writer busy while the rest queues up
+    assert started.wait(2)
+    for n in range(5):
+        queue.put("rows", n)
+    queue.put("slow", 1)
+    assert queue.stats()["depth"] == 7
+    gate.set()
+
+    assert queue.flush(timeout=5)
+    assert batches == [("slow", [0]), ("rows", [0, 1, 2, 3, 4]), ("slow", [1])]
+    stats = queue.stats()
+    assert stats["depth"] == 0 and stats["written"] == 7 and stats["failed"] == 0
+
+
+def test_failing_item_does_not_drop_its_batch():
+    queue = WriteBehindQueue(enabled=True)
+    written = []
+
+    def handler(items):
+        if "bad" in items:
+            raise ValueError("bad item")
+        written.extend(items)
+
+    queue.register("rows", handler)
+    with queue._cond:  # queue everything before the writer can pick it up
+        queue._queue.extend(("rows", item) for item in ["a", "bad", "b"])
+    queue.put("rows", "c")
+    assert queue.flush(timeout=5)
+    assert sorted(written) == ["a", "b", "c"]
+    assert queue.stats()["failed"] == 1
+
+
+def test_disabled_or_full_queue_writes_through():
+    written = []
+    disabled = WriteBehindQueue(enabled=False)
+    disabled.register("rows", written.extend)
+    disabled.put("rows", 1)
+    assert written == [1] and disabled.stats()["write_through"] == 1
+
+    full = WriteBehindQueue(enabled=True, max_depth=1)
+    gate = threading.Event()
+    full.register("slow", lambda items: gate.wait(2))
+    full.register("rows", written.extend)
+    full.put("slow", None)
+    full.put("rows", 2)  # queue full: written by the caller
+    assert written == [1, 2]
+    gate.set()
+    assert full.flush(timeout=5)
+
+
+def test_several_workers_default_to_write_through(monkeypatch):
+    monkeypatch.delenv("WRITE_BEHIND_ENABLED", raising=False)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert not WriteBehindQueue().enabled
+    monkeypatch.setenv("WRITE_BEHIND_ENABLED", "true")
+    assert WriteBehindQueue().enabled
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    monkeypatch.delenv("WRITE_BEHIND_ENABLED")
+    assert WriteBehindQueue().enabled
+
+
+def test_files_and_csv_rows(tmp_path):
+    queue = WriteBehindQueue(enabled=True)
+    gate = threading.Event()
+    queue.register("slow", lambda items: gate.wait(2))
+    queue.put("slow", None)
+
+    target = tmp_path / "shots" / "atf.png"
+    queue.write_bytes(target, b"png")
+    labels = tmp_path / "labels.csv"
+    queue.append_csv_row(labels, ["a.png", "high"])
+    queue.append_csv_row(labels, ["b.png", "low"])
+    assert not target.exists()
+    assert queue.pending_bytes(target) == b"png"
+
+    gate.set()
+    assert queue.flush(timeout=5)
+    assert target.read_bytes() == b"png"
+    assert queue.pending_bytes(target) is None
+    with labels.open(newline="") as f:
+        assert list(csv.reader(f)) == [["a.png", "high"], ["b.png", "low"]]
+
+
+def test_queued_analysis_has_id_before_it_is_written(memory_store):
+    first = brain_memory.queue_analysis(
+        url="https://acme.example/", page_type="landing", ruleset_version="v",
+        top_issues=[{"id": "cta"}],
+    )
+    second = brain_memory.queue_analysis(
+        url="https://acme.example/pricing", page_type="pricing", ruleset_version="v",
+        top_issues=[{"id": "price"}],
+    )
+    assert second == first + 1
+    assert brain_memory.analysis_exists(first)
+
+    assert write_behind.flush(timeout=5)
+    rows = memory_store.connection().execute("SELECT id, page_type FROM analyses ORDER BY id").fetchall()
+    assert [(r["id"], r["page_type"]) for r in rows] == [(first, "landing"), (second, "pricing")]
+    assert brain_memory.analysis_exists(second)
+    assert not brain_memory.analysis_exists(second + 1000)
+
+    # Direct writes continue after the reserved ids
+    assert brain_memory.log_analysis(
+        url="https://acme.example/", page_type="landing", ruleset_version="v", top_issues=[],
+    ) > second
@@ -12,18 +12,36 @@ Dataset structure:
         medium/   (mid-level, acceptable but not premium visuals)
         high/     (premium / professional visuals)
 
+Alternatively, train from shards exported from the dataset manifest
+(scripts/dataset_manifest.py export --out dataset/shards): a few large
+.npz / TFRecord files of pre-resized pixels, read sequentially, with the
+train / val split fixed by the manifest.
+
 Usage:
     # Train the model
     python training/train_visual_trust_model.py
 
+    # Train from manifest shards
+    python training/train_visual_trust_model.py --shards dataset/shards
+
     # Predict on a single image
     python training/train_visual_trust_model.py --predict path/to/image.jpg
+
+    # Export a quantized CPU artifact for the API (+ parity check vs Keras)
+    python training/train_visual_trust_model.py --export tflite --quantize float16 --parity
+    python training/train_visual_trust_model.py --export onnx --quantize int8 --parity
+
+The exported artifact (models/visual_trust_model.<quant>.tflite|onnx) is loaded
+by api/vision/trust_model_runtime.py with tflite-runtime or onnxruntime, so the
+API never imports TensorFlow.
 """
 
 import argparse
+import json
 import os
+import sys
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterator, List, Optional
 
 import numpy as np
 import tensorflow as tf
@@ -142,6 +160,73 @@ def load_datasets():
     return train_ds, val_ds, detected_class_names
 
 
+def _shard_dataset(split_dir: Path):
+    """tf.data pipeline over the shards of one split (see api/services/dataset_manifest.py)."""
+    index = json.loads((split_dir / "index.json").read_text(encoding="utf-8"))
+    files = [str(split_dir / shard["file"]) for shard in index["shards"]]
+    height, width = index["image_size"]
+    AUTOTUNE = tf.data.AUTOTUNE
+
+    if index["format"] == "tfrecord":
+        spec = {
+            "image_raw": tf.io.FixedLenFeature([], tf.string),
+            "label": tf.io.FixedLenFeature([], tf.int64),
+        }
+
+        def parse(record):
+            example = tf.io.parse_single_example(record, spec)
+            image = tf.reshape(tf.io.decode_raw(example["image_raw"], tf.uint8), (height, width, 3))
+            return image, example["label"]
+
+        ds = tf.data.TFRecordDataset(files, num_parallel_reads=AUTOTUNE).map(parse, num_parallel_calls=AUTOTUNE)
+    else:
+        def generate():
+            for path in files:
+                with np.load(path) as shard:
+                    yield from zip(shard["images"], shard["labels"])
+
+        ds = tf.data.Dataset.from_generator(
+            generate,
+            output_signature=(
+                tf.TensorSpec((height, width, 3), tf.uint8),
+                tf.TensorSpec((), tf.int64),
+            ),
+        )
+    # Same dtype / value range as image_dataset_from_directory
+    ds = ds.map(lambda image, label: (tf.cast(image, tf.float32), label), num_parallel_calls=AUTOTUNE)
+    return ds, index
+
+
+def load_shard_datasets(shards_dir: Path):
+    """
+    Load training and validation datasets from manifest shards.
+
+    Returns the same (train_ds, val_ds, class_names) as load_datasets(); labels
+    follow CLASS_NAMES (low=0, medium=1, high=2).
+    """
+    train_dir, val_dir = shards_dir / "train", shards_dir / "val"
+    for split_dir in (train_dir, val_dir):
+        if not (split_dir / "index.json").exists():
+            raise RuntimeError(
+                f"No shards in {split_dir}. "
+                f"Export them first: python scripts/dataset_manifest.py export --out {shards_dir}"
+            )
+
+    print(f"[INFO] Loading datasets from shards: {shards_dir}")
+    train_ds, train_index = _shard_dataset(train_dir)
+    val_ds, val_index = _shard_dataset(val_dir)
+    if train_index["class_names"] != CLASS_NAMES:
+        raise ValueError(f"Shards use class names {train_index['class_names']}, expected {CLASS_NAMES}")
+    if list(train_index["image_size"]) != list(IMAGE_SIZE):
+        raise ValueError(f"Shards are {train_index['image_size']}, the model expects {list(IMAGE_SIZE)}")
+    print(f"[INFO] {train_index['count']} training / {val_index['count']} validation images")
+
+    AUTOTUNE = tf.data.AUTOTUNE
+    train_ds = train_ds.shuffle(1000, seed=SEED).batch(BATCH_SIZE).prefetch(AUTOTUNE)
+    val_ds = val_ds.batch(BATCH_SIZE).prefetch(AUTOTUNE)
+    return train_ds, val_ds, list(CLASS_NAMES)
+
+
 # ====================================================
 # Model Building
 # ====================================================
@@ -192,10 +277,13 @@ def build_model(num_classes: int = 3):
 # Training
 # ====================================================
 
-def train_model():
-    """Main training pipeline."""
+def train_model(shards_dir: Optional[Path] = None):
+    """Main training pipeline (from training_data/images/, or from manifest shards)."""
     try:
-        train_ds, val_ds, detected_class_names = load_datasets()
+        if shards_dir is not None:
+            train_ds, val_ds, detected_class_names = load_shard_datasets(shards_dir)
+        else:
+            train_ds, val_ds, detected_class_names = load_datasets()
     except RuntimeError as e:
         print(f"[ERROR] {e}")
         return
@@ -304,6 +392,145 @@ def predict_visual_trust(image_path: str) -> Dict:
     }
 
 
+# ====================================================
+# Lightweight export (TFLite / ONNX) + parity check
+# ====================================================
+
+EXPORT_FORMATS = ("tflite", "onnx")
+QUANTIZATIONS = ("float16", "int8", "none")
+REPRESENTATIVE_SAMPLES = 100
+
+
+def _dataset_image_paths(limit: Optional[int] = None) -> List[Path]:
+    image_exts = {".jpg", ".jpeg", ".png", ".webp"}
+    paths: List[Path] = []
+    for label in CLASS_NAMES:
+        folder = DATASET_DIR / label
+        if not folder.exists():
+            continue
+        paths.extend(p for p in sorted(folder.iterdir()) if p.is_file() and p.suffix.lower() in image_exts)
+    if limit is not None:
+        # Interleave classes so a small sample still covers all labels
+        paths = paths[:: max(1, len(paths) // limit)][:limit] if len(paths) > limit else paths
+    return paths
+
+
+def _load_image_array(path: Path) -> np.ndarray:
+    img = tf.keras.utils.load_img(str(path), target_size=IMAGE_SIZE)
+    return tf.keras.utils.img_to_array(img).astype("float32")
+
+
+def representative_dataset() -> Iterator[List[np.ndarray]]:
+    """Calibration samples for full-integer quantization."""
+    for path in _dataset_image_paths(limit=REPRESENTATIVE_SAMPLES):
+        yield [np.expand_dims(_load_image_array(path), axis=0)]
+
+
+def export_path(fmt: str, quantization: str) -> Path:
+    return MODELS_DIR / f"visual_trust_model.{quantization}.{fmt}"
+
+
+def export_lite_model(fmt: str = "tflite", quantization: str = "float16") -> Path:
+    """
+    Export the trained Keras model to a small CPU inference artifact.
+
+    - tflite + float16: weights stored as fp16 (~half size, near-identical output)
+    - tflite + int8: full-integer weights/activations calibrated on the dataset
+      (float input/output kept so callers don't need quantization params)
+    - onnx + int8: dynamic int8 weight quantization via onnxruntime
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if quantization not in QUANTIZATIONS:
+        raise ValueError(f"Unknown quantization: {quantization}")
+
+    model = load_visual_trust_model()
+    out_path = export_path(fmt, quantization)
+    MODELS_DIR.mkdir(parents=True, exist_ok=True)
+
+    if fmt == "tflite":
+        converter = tf.lite.TFLiteConverter.from_keras_model(model)
+        if quantization != "none":
+            converter.optimizations = [tf.lite.Optimize.DEFAULT]
+        if quantization == "float16":
+            converter.target_spec.supported_types = [tf.float16]
+        elif quantization == "int8":
+            if not check_dataset_exists():
+                raise RuntimeError("int8 quantization needs calibration images in training_data/images/")
+            converter.representative_dataset = representative_dataset
+            converter.target_spec.supported_ops = [
+                tf.lite.OpsSet.TFLITE_BUILTINS_INT8,
+                tf.lite.OpsSet.TFLITE_BUILTINS,
+            ]
+        out_path.write_bytes(converter.convert())
+    else:
+        if quantization == "float16":
+            raise ValueError("ONNX export supports quantization 'none' or 'int8'")
+        import tf2onnx  # optional training-time dependency
+
+        spec = (tf.TensorSpec((None, *IMAGE_SIZE, 3), tf.float32, name="input"),)
+        fp32_path = export_path("onnx", "none")
+        tf2onnx.convert.from_keras(model, input_signature=spec, opset=13, output_path=str(fp32_path))
+        if quantization == "int8":
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+
+            quantize_dynamic(str(fp32_path), str(out_path), weight_type=QuantType.QInt8)
+
+    size_mb = out_path.stat().st_size / (1024 * 1024)
+    keras_mb = MODEL_PATH.stat().st_size / (1024 * 1024) if MODEL_PATH.exists() else float("nan")
+    print(f"[INFO] Exported {fmt}/{quantization} model to: {out_path} ({size_mb:.1f} MB, keras: {keras_mb:.1f} MB)")
+    return out_path
+
+
+def check_export_parity(artifact_path: Path, max_images: int = 50) -> Dict:
+    """
+    Compare the exported artifact against the Keras model on dataset images.
+
+    Both models see the serving preprocessing (preprocess_for_model), and the
+    exported one goes through the same runtime call as the API
+    (TrustModelRuntime.predict_images), so this also verifies the serving
+    preprocessing/dequantization path.
+    """
+    if str(PROJECT_ROOT) not in sys.path:
+        sys.path.insert(0, str(PROJECT_ROOT))
+    from PIL import Image
+
+    from api.vision.trust_model_runtime import TrustModelRuntime, preprocess_for_model
+
+    paths = _dataset_image_paths(limit=max_images)
+    if not paths:
+        raise RuntimeError(f"No images found in {DATASET_DIR} for the parity check")
+
+    images = []
+    for path in paths:
+        with Image.open(path) as img:
+            images.append(img.convert("RGB"))
+    batch = np.stack([preprocess_for_model(img) for img in images], axis=0)
+    keras_probs = load_visual_trust_model().predict(batch, verbose=0)
+    lite = TrustModelRuntime(artifact_path)
+    lite_probs = np.array(
+        [[dist[name] for name in CLASS_NAMES] for img in images for dist in lite.predict_images([img])],
+        dtype=np.float32,
+    )
+
+    abs_diff = np.abs(keras_probs - lite_probs)
+    report = {
+        "artifact": str(artifact_path),
+        "backend": lite.backend,
+        "images": len(paths),
+        "top1_agreement": float(np.mean(np.argmax(keras_probs, 1) == np.argmax(lite_probs, 1))),
+        "max_abs_diff": float(abs_diff.max()),
+        "mean_abs_diff": float(abs_diff.mean()),
+    }
+    print("\n" + "=" * 60)
+    print("Export Parity (Keras vs exported)")
+    print("=" * 60)
+    for key, value in report.items():
+        print(f"  {key}: {value}")
+    print("=" * 60)
+    return report
+
+
 # ====================================================
 # CLI
 # ====================================================
@@ -319,8 +546,44 @@ def main():
         help="If provided, skips training and runs prediction on the given image path.",
     )
 
+    parser.add_argument(
+        "--shards",
+        type=Path,
+        help="Train from shards exported by scripts/dataset_manifest.py instead of training_data/images/.",
+    )
+
+    parser.add_argument(
+        "--export",
+        choices=EXPORT_FORMATS,
+        help="Export the trained model to a lightweight CPU artifact (tflite or onnx).",
+    )
+    parser.add_argument(
+        "--quantize",
+        choices=QUANTIZATIONS,
+        default="float16",
+        help="Quantization for --export (default: float16).",
+    )
+    parser.add_argument(
+        "--parity",
+        action="store_true",
+        help="After --export, compare the artifact's predictions with the Keras model.",
+    )
+
     args = parser.parse_args()
 
+    if args.export:
+        try:
+            artifact = export_lite_model(args.export, args.quantize)
+            if args.parity:
+                report = check_export_parity(artifact)
+                if report["top1_agreement"] < 0.95:
+                    print("[WARN] Exported model disagrees with Keras on >5% of images.")
+                    return 2
+        except Exception as e:
+            print(f"[ERROR] Export failed: {e}")
+            return 1
+        return 0
+
     if args.predict:
         # Inference mode
         try:
@@ -339,7 +602,7 @@ def main():
             return 1
     else:
         # Training mode
-        train_model()
+        train_model(args.shards)
 
     return 0
 
@@ -1,216 +1,287 @@
-from fastapi import FastAPI, UploadFile, File
-
-from fastapi.responses import JSONResponse
-
-import numpy as np
-
-from PIL import Image
-
+"""
+Visual Trust Service - Keras classifier (low / medium / high) behind FastAPI.
+
+Inference path:
+- The model is loaded and warmed with a dummy batch at startup, so the first
+  real request does not pay for graph tracing.
+- Decode + resize run in a thread pool (PIL releases the GIL).
+- Concurrent requests are queued for a few ms and run as ONE batched forward
+  pass (dynamic micro-batching), so throughput scales with batch size instead
+  of serializing on model.predict.
+
+Config (env):
+- VT_MAX_BATCH: max images per forward pass (default: 16)
+- VT_BATCH_WAIT_MS: max time to wait for a batch to fill (default: 5)
+- VT_DECODE_WORKERS: decode/resize thread pool size (default: 4)
+"""
+import asyncio
 import io
-
 import os
-
-import tensorflow as tf
-
+import time
 import traceback
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
 
+import numpy as np
+from fastapi import FastAPI, File, UploadFile
+from fastapi.responses import JSONResponse
+from PIL import Image
 
 
-app = FastAPI(title="Visual Trust Service", version="1.0")
-
-
+app = FastAPI(title="Visual Trust Service", version="1.1")
 
 MODELS_DIR = os.path.join(os.path.dirname(__file__), "models")
 
-keras_files = [f for f in os.listdir(MODELS_DIR) if f.endswith(".keras")]
-
-if not keras_files:
-
-    raise RuntimeError(f"No .keras model found in {MODELS_DIR}")
-
+CLASS_NAMES = ["low", "medium", "high"]
 
+INPUT_SIZE = (224, 224)
+MAX_SIDE = 1600
+MIN_FILE_BYTES = 1000
 
-MODEL_PATH = os.path.join(MODELS_DIR, keras_files[0])
+MAX_BATCH = int(os.getenv("VT_MAX_BATCH", "16"))
+BATCH_WAIT_MS = float(os.getenv("VT_BATCH_WAIT_MS", "5"))
+DECODE_WORKERS = int(os.getenv("VT_DECODE_WORKERS", "4"))
 
+MODEL_PATH: Optional[str] = None
 model = None
+model_error: Optional[str] = None
 
+_decode_pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS, thread_name_prefix="vt-decode")
+# model.predict is not re-entrant-friendly; a single inference thread keeps the loop free
+_predict_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vt-predict")
 
 
-CLASS_NAMES = ["low", "medium", "high"]
-
+def find_model_path() -> str:
+    keras_files = sorted(f for f in os.listdir(MODELS_DIR) if f.endswith(".keras")) if os.path.isdir(MODELS_DIR) else []
+    if not keras_files:
+        raise RuntimeError(f"No .keras model found in {MODELS_DIR}")
+    return os.path.join(MODELS_DIR, keras_files[0])
 
 
 def load_model_once():
-
-    global model
-
+    global model, MODEL_PATH
     if model is None:
+        import tensorflow as tf  # heavy import, deferred to startup
 
+        MODEL_PATH = find_model_path()
         model = tf.keras.models.load_model(MODEL_PATH)
-
+    return model
 
 
 def preprocess_image(file_bytes: bytes) -> np.ndarray:
-
-    img = Image.open(io.BytesIO(file_bytes)).convert("RGB")
-
-    img = img.resize((224, 224))
-
-    arr = np.array(img).astype("float32") / 255.0
-
-    return np.expand_dims(arr, axis=0)
-
-
-
-@app.get("/health")
-
-def health():
-
+    """Decode + resize to a float32 [224, 224, 3] array in [0, 1]."""
+    img = Image.open(io.BytesIO(file_bytes))
+    img = img.convert("RGB")  # fixes RGBA/alpha and weird modes
+
+    # hard safety limit: if huge screenshot, shrink first
+    w, h = img.size
+    if max(w, h) > MAX_SIDE:
+        scale = MAX_SIDE / float(max(w, h))
+        img = img.resize((int(w * scale), int(h * scale)), Image.BILINEAR)
+
+    img = img.resize(INPUT_SIZE, Image.BILINEAR)
+    return np.asarray(img, dtype=np.float32) / 255.0
+
+
+def predictions_to_result(preds: np.ndarray) -> dict:
+    idx = int(np.argmax(preds))
+    return {
+        "analysisStatus": "ok",
+        "label": CLASS_NAMES[idx],
+        "confidence": float(preds[idx]),
+        "probs": {CLASS_NAMES[i]: float(preds[i]) for i in range(len(CLASS_NAMES))},
+    }
+
+
+class MicroBatcher:
+    """
+    Collects single-image requests into batches for one forward pass.
+
+    ``predict_fn`` receives a stacked [N, 224, 224, 3] array and returns [N, C].
+    A batch is flushed when it reaches ``max_batch`` or ``max_wait_ms`` after
+    its first item arrived, whichever comes first.
+    """
+
+    def __init__(
+        self,
+        predict_fn: Callable[[np.ndarray], np.ndarray],
+        max_batch: int = MAX_BATCH,
+        max_wait_ms: float = BATCH_WAIT_MS,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.predict_fn = predict_fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.executor = executor
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"batches": 0, "items": 0, "max_batch_seen": 0}
+
+    def start(self) -> None:
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, x: np.ndarray) -> np.ndarray:
+        """Queue one preprocessed [224, 224, 3] array and await its prediction row."""
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((x, fut))
+        return await fut
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            first = await self._queue.get()
+            items = [first]
+            deadline = loop.time() + self.max_wait
+            while len(items) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # Drain anything already queued without waiting further
+            while len(items) < self.max_batch and not self._queue.empty():
+                items.append(self._queue.get_nowait())
+
+            batch = np.stack([x for x, _ in items], axis=0)
+            try:
+                preds = await loop.run_in_executor(self.executor, self.predict_fn, batch)
+            except Exception as e:  # noqa: BLE001
+                for _, fut in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            self.stats["items"] += len(items)
+            self.stats["max_batch_seen"] = max(self.stats["max_batch_seen"], len(items))
+            for i, (_, fut) in enumerate(items):
+                if not fut.done():
+                    fut.set_result(preds[i])
+
+
+def _predict_batch(batch: np.ndarray) -> np.ndarray:
+    return load_model_once().predict(batch, verbose=0)
+
+
+batcher = MicroBatcher(_predict_batch, executor=_predict_pool)
+
+
+@app.on_event("startup")
+async def startup():
+    """Load + warm the model before serving, then start the batcher."""
+    global model_error
+    loop = asyncio.get_running_loop()
     try:
+        started = time.perf_counter()
+        await loop.run_in_executor(_predict_pool, load_model_once)
+        # Warm-up: trace the graph for both single and full batch shapes
+        for n in sorted({1, batcher.max_batch}):
+            dummy = np.zeros((n, INPUT_SIZE[1], INPUT_SIZE[0], 3), dtype=np.float32)
+            await loop.run_in_executor(_predict_pool, _predict_batch, dummy)
+        print(f"Visual trust model loaded + warmed in {time.perf_counter() - started:.2f}s: {MODEL_PATH}")
+    except Exception as e:  # noqa: BLE001
+        model_error = f"{type(e).__name__}: {e}"
+        print(f"Visual trust model failed to load: {model_error}")
+    batcher.start()
 
-        load_model_once()
-
-        return {
 
-            "ok": True,
+@app.on_event("shutdown")
+async def shutdown():
+    await batcher.stop()
 
-            "modelLoaded": True,
 
-            "modelFile": os.path.basename(MODEL_PATH)
+async def _preprocess_async(raw: bytes) -> np.ndarray:
+    return await asyncio.get_running_loop().run_in_executor(_decode_pool, preprocess_image, raw)
 
-        }
 
-    except Exception as e:
+def _error(status_code: int, e: Exception, hint: Optional[str] = None) -> JSONResponse:
+    content = {
+        "analysisStatus": "error",
+        "errorType": type(e).__name__,
+        "error": str(e),
+        "traceback": traceback.format_exc()[:2000],
+    }
+    if hint:
+        content["hint"] = hint
+    return JSONResponse(status_code=status_code, content=content)
 
-        return JSONResponse(status_code=500, content={"ok": False, "error": str(e)})
 
+@app.get("/health")
+def health():
+    if model is None:
+        return JSONResponse(
+            status_code=500,
+            content={"ok": False, "modelLoaded": False, "error": model_error or "model not loaded yet"},
+        )
+    return {
+        "ok": True,
+        "modelLoaded": True,
+        "modelFile": os.path.basename(MODEL_PATH or ""),
+        "batching": {
+            "maxBatch": batcher.max_batch,
+            "waitMs": batcher.max_wait * 1000.0,
+            **batcher.stats,
+        },
+    }
 
 
 @app.post("/analyze")
-
 async def analyze(file: UploadFile = File(...)):
+    raw = await file.read()
+    if not raw or len(raw) < MIN_FILE_BYTES:
+        return JSONResponse(status_code=400, content={"analysisStatus": "error", "error": "Empty or too small file"})
 
     try:
-
-        load_model_once()
-
-
-
-        try:
-
-            raw = await file.read()
-
-            if not raw or len(raw) < 1000:
-
-                return JSONResponse(status_code=400, content={"analysisStatus":"error","error":"Empty or too small file"})
-
-
-
-            img = Image.open(io.BytesIO(raw))
-
-            img = img.convert("RGB")  # fixes RGBA/alpha and weird modes
-
-
-
-            # hard safety limit: if huge screenshot, shrink first
-
-            max_side = 1600
-
-            w, h = img.size
-
-            if max(w, h) > max_side:
-
-                scale = max_side / float(max(w, h))
-
-                img = img.resize((int(w*scale), int(h*scale)), Image.BILINEAR)
-
-
-
-            # model input size (use 224x224 as default; keep if your code already defines a target)
-
-            target = (224, 224)
-
-            img = img.resize(target, Image.BILINEAR)
-
-
-
-            x = np.asarray(img, dtype=np.float32) / 255.0
-
-            x = np.expand_dims(x, axis=0)  # [1,224,224,3]
-
-
-
-            # then run model.predict(x) exactly as before, no other logic changes
-
-
-
-        except Exception as e:
-
-            return JSONResponse(
-
-                status_code=503,
-
-                content={
-
-                    "analysisStatus":"error",
-
-                    "errorType": type(e).__name__,
-
-                    "error": str(e),
-
-                    "traceback": traceback.format_exc()[:2000],
-
-                    "hint": "Image decode/preprocess failed. Ensure RGB conversion + resize."
-
-                }
-
-            )
-
-
-
-        preds = model.predict(x, verbose=0)[0]
-
-        idx = int(np.argmax(preds))
-
-
-
-        return {
-
-            "analysisStatus": "ok",
-
-            "label": CLASS_NAMES[idx],
-
-            "confidence": float(preds[idx]),
-
-            "probs": {
-
-                CLASS_NAMES[i]: float(preds[i])
-
-                for i in range(len(CLASS_NAMES))
-
-            }
-
-        }
-
-
-
+        x = await _preprocess_async(raw)
     except Exception as e:
+        return _error(503, e, hint="Image decode/preprocess failed. Ensure RGB conversion + resize.")
 
-        return JSONResponse(
-
-            status_code=503,
-
-            content={
-
-                "analysisStatus":"error",
-
-                "errorType": type(e).__name__,
-
-                "error": str(e),
-
-                "traceback": traceback.format_exc()[:2000]
-
-            }
-
-        )
-
+    try:
+        preds = await batcher.submit(x)
+    except Exception as e:
+        return _error(503, e)
+    return predictions_to_result(preds)
+
+
+@app.post("/analyze/batch")
+async def analyze_batch(files: List[UploadFile] = File(...)):
+    """
+    Multi-image analysis. Images are decoded in parallel and submitted to the
+    micro-batcher together, so they share forward passes with each other and
+    with concurrent single-image requests.
+    """
+    raws = [await f.read() for f in files]
+
+    async def _one(name: str, raw: bytes) -> dict:
+        if not raw or len(raw) < MIN_FILE_BYTES:
+            return {"filename": name, "analysisStatus": "error", "error": "Empty or too small file"}
+        try:
+            x = await _preprocess_async(raw)
+            preds = await batcher.submit(x)
+        except Exception as e:  # noqa: BLE001
+            return {"filename": name, "analysisStatus": "error", "errorType": type(e).__name__, "error": str(e)}
+        return {"filename": name, **predictions_to_result(preds)}
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(_one(f.filename or f"image_{i}", raw) for i, (f, raw) in enumerate(zip(files, raws))))
+    elapsed = time.perf_counter() - started
+    return {
+        "results": results,
+        "count": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "images_per_s": round(len(results) / elapsed, 2) if elapsed > 0 else None,
+    }